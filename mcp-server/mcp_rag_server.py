@@ -5,11 +5,34 @@ MCP RAG Server - 위키피디아 문서 기반 질문 답변 시스템
 """
 
 import os
+import sys
+import json
+import base64
+import hashlib
+import socket
+import signal
 import logging
+import argparse
+import threading
 from pathlib import Path
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional, Tuple
+from urllib.parse import quote
 import re
-from fastmcp import FastMCP
+from fastmcp import FastMCP, Context
+from fastmcp.resources import FunctionResource
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from tool_stats import StatsRegistry, StatsMiddleware, note_results
+from title_index import (
+    TitleIndex, FUZZY_MIN_SIMILARITY, build_aliases, title_features, query_features, trigrams
+)
+
+# 프로젝트 루트를 Python 경로에 추가 (공통 설정 사용)
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.config import WIKI_DOCUMENTS, WIKI_ENGLISH_NAMES
+from utils.doc_store import SegmentStore
 
 # 로깅 설정 (stderr로 출력 - MCP 서버에서는 stdout 사용 금지)
 logging.basicConfig(
@@ -20,21 +43,71 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # FastMCP 서버 초기화
-mcp = FastMCP("rag-server")
+mcp = FastMCP("rag-server", on_duplicate_resources="replace")
+
+# 도구 호출 통계 (프로세스 단위)
+STATS = StatsRegistry()
+mcp.add_middleware(StatsMiddleware(STATS))
 
 # 상수 설정
 DATA_DIR = Path("../data/mcp_docs")
+STORE_DIR = Path("../data/store/mcp")   # 세그먼트 저장소 (있으면 DATA_DIR 대신 사용, utils/doc_store.py)
 SUPPORTED_EXTENSIONS = {".md"}
+MIN_RELEVANCE_SCORE = 0.1  # 최소 관련성 임계값
+DEFAULT_MAX_BYTES = 6000    # get_relevant_content 응답 본문 기본 크기 제한 (UTF-8 바이트)
 
-def get_all_documents() -> List[Dict[str, Any]]:
+# 문서 카탈로그 캐시 (워밍업 시 한 번 로드, 이후 읽기 전용으로 공유)
+_catalog: Optional[List[Dict[str, Any]]] = None
+_content_cache: Dict[Path, str] = {}
+_doc_store: Optional[SegmentStore] = None
+_store_keys: Dict[Path, str] = {}
+_title_index: Optional[TitleIndex] = None
+_registered_resources: Dict[str, FunctionResource] = {}
+_section_cache: Dict[Tuple[str, Optional[str]], List[Dict[str, Any]]] = {}   # (제목, 버전) → 카탈로그 섹션 목록
+_catalog_json: Optional[Tuple[str, str]] = None   # (카탈로그 버전, 직렬화한 catalog://documents 응답)
+_catalog_lock = threading.Lock()
+_ready = threading.Event()
+_http_workers = 1   # HTTP 워커 프로세스 수 (2 이상이면 워커마다 카탈로그가 따로 있어 refresh_catalog를 거부)
+
+def scan_store() -> List[Dict[str, Any]]:
+    """
+    세그먼트 저장소의 색인에서 문서 정보를 수집 (디렉토리 스캔/본문 읽기 없음)
+    
+    Returns:
+        문서 정보 리스트 [{"title", "path", "size", "version", "heading"}, ...]
+    """
+    global _doc_store
+    if _doc_store is None:
+        _doc_store = SegmentStore(STORE_DIR)
+    else:
+        _doc_store.refresh()
+    
+    documents = []
+    for key in _doc_store.keys():
+        entry = _doc_store.entry(key)
+        documents.append({
+            "title": key,
+            "path": STORE_DIR / f"{key}.md",
+            "size": entry["size"],
+            "version": entry["sha"][:12],
+            "heading": entry["meta"].get("heading")
+        })
+    
+    logger.info(f"세그먼트 저장소에서 {len(documents)}개 문서를 찾았습니다: {STORE_DIR}")
+    return documents
+
+def scan_documents() -> List[Dict[str, Any]]:
     """
-    data/raw 폴더에서 모든 문서 파일 정보를 가져옴
+    data/mcp_docs 폴더를 스캔하여 문서 파일 정보를 수집 (세그먼트 저장소가 있으면 저장소 색인 사용)
     
     Returns:
         문서 정보 리스트 [{"title": str, "path": Path, "size": int}, ...]
     """
     documents = []
     
+    if SegmentStore.exists(STORE_DIR):
+        return scan_store()
+    
     if not DATA_DIR.exists():
         logger.warning(f"데이터 디렉토리가 존재하지 않습니다: {DATA_DIR}")
         return documents
@@ -51,29 +124,213 @@ def get_all_documents() -> List[Dict[str, Any]]:
     logger.info(f"총 {len(documents)}개 문서를 발견했습니다.")
     return documents
 
-def calculate_relevance_score(query: str, title: str) -> float:
+def load_catalog(force: bool = False) -> List[Dict[str, Any]]:
     """
-    질문과 파일 제목 간의 관련성 점수 계산
+    문서 카탈로그와 본문 캐시를 로드 (이미 로드되어 있으면 재사용)
     
     Args:
-        query: 사용자 질문
-        title: 파일 제목
+        force: True이면 디렉토리를 다시 스캔하여 캐시를 갱신
+        
+    Returns:
+        문서 정보 리스트
+    """
+    global _catalog, _content_cache, _title_index, _store_keys
+    
+    with _catalog_lock:
+        if _catalog is not None and not force:
+            return _catalog
+        
+        documents = scan_documents()
+        contents = {}
+        aliases = {}
+        store_keys = {}
+        for doc in documents:
+            if "version" in doc:
+                # 저장소 문서: 버전과 첫 헤더는 색인에 있으므로 본문은 요청할 때 mmap으로 읽음
+                store_keys[doc["path"]] = doc["title"]
+                aliases[doc["title"]] = build_aliases(doc["title"], doc["heading"], WIKI_DOCUMENTS, WIKI_ENGLISH_NAMES)
+                continue
+            try:
+                content = doc["path"].read_text(encoding='utf-8')
+            except Exception as e:
+                logger.error(f"파일 읽기 오류 ({doc['path']}): {e}")
+                continue
+            contents[doc["path"]] = content
+            doc["version"] = hashlib.sha1(content.encode('utf-8')).hexdigest()[:12]
+            
+            # 본문 첫 헤더(# 위키 제목)와 설정의 한영 매핑으로 별칭 구성
+            header = re.match(r'#\s+(.+)', content.lstrip())
+            page_title = header.group(1).strip() if header else None
+            aliases[doc["title"]] = build_aliases(doc["title"], page_title, WIKI_DOCUMENTS, WIKI_ENGLISH_NAMES)
+        
+        # 새 객체로 교체하여 읽는 쪽은 잠금 없이 사용
+        _title_index = TitleIndex(documents, aliases)
+        _content_cache = contents
+        _store_keys = store_keys
+        _catalog = documents
+        return _catalog
+
+def get_all_documents() -> List[Dict[str, Any]]:
+    """
+    캐시된 문서 카탈로그를 반환 (최초 호출 시 로드)
+    
+    Returns:
+        문서 정보 리스트 [{"title": str, "path": Path, "size": int}, ...]
+    """
+    STATS.record_cache("catalog", _catalog is not None)
+    if _catalog is None:
+        return load_catalog()
+    return _catalog
+
+def document_uri(title: str, section: Optional[str] = None) -> str:
+    """문서(또는 섹션) 리소스 URI 생성 (예: doc://cnn, doc://cnn/개요)"""
+    uri = f"doc://{quote(title, safe='')}"
+    if section is not None:
+        uri += f"/{quote(section, safe='')}"
+    return uri
+
+def _document_reader(title: str):
+    """문서 리소스 읽기 함수 생성 (캐시된 본문 반환)"""
+    def read_document() -> str:
+        doc = find_document(title)
+        if not doc:
+            raise ValueError(f"'{title}' 문서를 찾을 수 없습니다.")
+        return read_document_text(doc["path"])
+    return read_document
+
+def sync_document_resources(previous_versions: Dict[str, str]) -> Dict[str, List[str]]:
+    """
+    카탈로그의 각 문서를 doc://{title} 리소스로 등록/갱신
+    
+    내용이 바뀐 문서만 다시 등록하고, 사라진 문서의 리소스는 비활성화합니다.
+    리소스 설명과 태그에 내용 해시(version)를 넣어 클라이언트가 변경 여부를 판단할 수 있게 합니다.
+    
+    Args:
+        previous_versions: 갱신 전 {제목: 버전}
+        
+    Returns:
+        {"added": [...], "changed": [...], "removed": [...]} 제목 리스트
+    """
+    current_versions = {doc["title"]: doc.get("version") for doc in get_all_documents()}
+    diff = {"added": [], "changed": [], "removed": []}
+    
+    for doc in get_all_documents():
+        title = doc["title"]
+        version = current_versions[title]
+        if title not in previous_versions:
+            diff["added"].append(title)
+        elif previous_versions[title] != version:
+            diff["changed"].append(title)
+        elif title in _registered_resources:
+            continue
+        
+        resource = FunctionResource.from_function(
+            _document_reader(title),
+            uri=document_uri(title),
+            name=title,
+            description=f"{title} 문서 (version {version}, {doc['size']} bytes)",
+            mime_type="text/markdown",
+            tags={f"version:{version}"}
+        )
+        _registered_resources[title] = mcp.add_resource(resource)
+    
+    for title in previous_versions:
+        if title not in current_versions:
+            diff["removed"].append(title)
+            resource = _registered_resources.pop(title, None)
+            if resource:
+                resource.disable()
+    
+    return diff
+
+def catalog_version(documents: List[Dict[str, Any]]) -> str:
+    """문서 제목과 버전으로 만든 카탈로그 버전 (본문을 읽지 않음)"""
+    return hashlib.sha1(
+        "".join(f"{doc['title']}:{doc.get('version')};" for doc in documents).encode('utf-8')
+    ).hexdigest()[:12]
+
+def build_catalog_json() -> str:
+    """
+    catalog://documents 응답을 만들어 카탈로그 버전별로 캐시
+    섹션 목록은 문서 버전마다 한 번만 계산하므로, 카탈로그를 갱신해도 바뀐 문서만 다시 읽습니다.
+    
+    Returns:
+        직렬화한 카탈로그 JSON
+    """
+    global _catalog_json, _section_cache
+    
+    documents = get_all_documents()
+    version = catalog_version(documents)
+    cached = _catalog_json
+    STATS.record_cache("catalog_resource", cached is not None and cached[0] == version)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    sections_by_doc = {}
+    entries = []
+    for doc in documents:
+        key = (doc["title"], doc.get("version"))
+        sections = _section_cache.get(key)
+        if sections is None:
+            sections = [
+                {"title": section["title"], "line": section["line"], "bytes": section["bytes"],
+                 "uri": document_uri(doc["title"], section["title"])}
+                for section in list_sections(read_document_lines(doc["path"]))
+            ]
+        sections_by_doc[key] = sections
+        entries.append({
+            "title": doc["title"],
+            "uri": document_uri(doc["title"]),
+            "version": doc.get("version"),
+            "size": doc["size"],
+            "sections": sections
+        })
+    
+    payload = json.dumps({"version": version, "documents": entries}, ensure_ascii=False)
+    # 새 객체로 교체 (지금 카탈로그에 없는 문서 버전의 섹션 목록은 버림)
+    _section_cache = sections_by_doc
+    _catalog_json = (version, payload)
+    return payload
+
+def warm_up() -> None:
+    """카탈로그와 본문을 미리 로드하고 카탈로그 응답까지 만든 뒤 준비 완료 상태로 전환"""
+    previous_versions = {doc["title"]: doc.get("version") for doc in (_catalog or [])}
+    documents = load_catalog(force=True)
+    sync_document_resources(previous_versions)
+    build_catalog_json()
+    _ready.set()
+    logger.info(f"워밍업 완료: {len(documents)}개 문서 로드")
+
+def score_features(query_feat: Dict[str, Any], title_feat: Dict[str, Any],
+                   fuzzy_similarity: float = 0.0) -> float:
+    """
+    미리 계산된 질문/제목 특징값으로 관련성 점수 계산
+    
+    Args:
+        query_feat: query_features() 결과
+        title_feat: title_features() 결과
+        fuzzy_similarity: 별칭과의 트라이그램 유사도 (0.0 ~ 1.0)
         
     Returns:
         관련성 점수 (0.0 ~ 1.0)
     """
-    query_lower = query.lower()
-    title_lower = title.lower()
+    query_lower = query_feat["lower"]
+    title_lower = title_feat["lower"]
     
     score = 0.0
     
-    # 정확한 매칭 (가장 높은 점수)
+    # 정확한 매칭 (가장 높은 점수) - 한국어/영어 별칭 포함
     if title_lower in query_lower or query_lower in title_lower:
         score += 0.8
+    elif any(alias in query_feat["normalized"] for alias in title_feat["aliases"]):
+        score += 0.8
+    elif fuzzy_similarity:
+        # 철자가 조금 다른 별칭 (예: "트랜스포머스", "transformers")
+        score += fuzzy_similarity * 0.6
     
     # 단어별 매칭
-    query_words = set(re.findall(r'\b\w+\b', query_lower))
-    title_words = set(re.findall(r'\b\w+\b', title_lower))
+    query_words = query_feat["words"]
+    title_words = title_feat["words"]
     
     if query_words and title_words:
         common_words = query_words.intersection(title_words)
@@ -81,22 +338,271 @@ def calculate_relevance_score(query: str, title: str) -> float:
         score += word_score * 0.6
     
     # 키워드 기반 매칭 (AI/ML 관련)
-    ai_keywords = {
-        'ai', 'artificial', 'intelligence', '인공지능', 'ai',
-        'machine', 'learning', '머신러닝', '기계학습', 'ml',
-        'deep', 'deeplearning', '딥러닝', 'neural', 'network', '신경망',
-        'cnn', 'rnn', 'lstm', 'gru', 'transformer', 'gpt',
-        'reinforcement', '강화학습', 'alphago', '알파고'
-    }
-    
-    query_ai_words = set(query_lower.split()) & ai_keywords
-    title_ai_words = set(title_lower.split()) & ai_keywords
-    
-    if query_ai_words and title_ai_words:
+    if query_feat["ai_words"] and title_feat["ai_words"]:
         score += 0.3
     
     return min(score, 1.0)
 
+def calculate_relevance_score(query: str, title: str) -> float:
+    """
+    질문과 파일 제목 간의 관련성 점수 계산
+    
+    Args:
+        query: 사용자 질문
+        title: 파일 제목
+        
+    Returns:
+        관련성 점수 (0.0 ~ 1.0)
+    """
+    title_feat = _title_index.features.get(title) if _title_index else None
+    if title_feat is None:
+        title_feat = title_features(title)
+    
+    query_feat = query_features(query)
+    
+    # 질문 단어와 별칭 간 트라이그램 유사도
+    fuzzy_similarity = 0.0
+    for token in query_feat["tokens"]:
+        token_grams = trigrams(token)
+        for alias in title_feat["aliases"]:
+            alias_grams = trigrams(alias)
+            common = len(token_grams & alias_grams)
+            if common:
+                fuzzy_similarity = max(fuzzy_similarity, common / len(token_grams | alias_grams))
+    
+    if fuzzy_similarity < FUZZY_MIN_SIMILARITY:
+        fuzzy_similarity = 0.0
+    
+    return score_features(query_feat, title_feat, fuzzy_similarity)
+
+def rank_documents(queries: List[str], documents: List[Dict[str, Any]],
+                   min_score: float = MIN_RELEVANCE_SCORE) -> List[List[tuple]]:
+    """
+    여러 질문을 카탈로그 한 번 순회로 모두 채점
+    
+    Args:
+        queries: 질문 리스트
+        documents: 문서 정보 리스트
+        min_score: 결과에 포함할 최소 관련성 점수
+        
+    Returns:
+        질문별 [(점수, 문서), ...] 리스트 (점수 내림차순)
+    """
+    rankings = [[] for _ in queries]
+    index = _title_index if documents is _catalog else None
+    
+    # 질문별 특징값과 별칭 유사도는 질문당 한 번만 계산
+    prepared = []
+    for query in queries:
+        query_feat = query_features(query)
+        fuzzy = {}
+        if index:
+            for token in query_feat["tokens"]:
+                for doc_index, similarity in index.fuzzy(token):
+                    fuzzy[doc_index] = max(fuzzy.get(doc_index, 0.0), similarity)
+        prepared.append((query_feat, fuzzy))
+    
+    for doc_index, doc in enumerate(documents):
+        title_feat = index.features[doc["title"]] if index else title_features(doc["title"])
+        for ranking, (query_feat, fuzzy) in zip(rankings, prepared):
+            score = score_features(query_feat, title_feat, fuzzy.get(doc_index, 0.0))
+            if score > min_score:
+                ranking.append((score, doc))
+    
+    for ranking in rankings:
+        ranking.sort(key=lambda x: x[0], reverse=True)
+    
+    return rankings
+
+def find_document(title: str) -> Optional[Dict[str, Any]]:
+    """
+    제목으로 문서 찾기 (파일명, 위키 제목, 한국어/영어 별칭, 유사 철자)
+    
+    Args:
+        title: 파일 제목 (확장자 제외) 또는 별칭
+        
+    Returns:
+        문서 정보 또는 None
+    """
+    documents = get_all_documents()
+    if _title_index is not None:
+        return _title_index.resolve(title)
+    
+    title_lower = title.lower()
+    for doc in documents:
+        if doc["title"].lower() == title_lower:
+            return doc
+    return None
+
+def read_document_text(file_path: Path) -> str:
+    """
+    문서 본문 반환 (캐시 → 세그먼트 저장소 → 파일 순서)
+    
+    Args:
+        file_path: 파일 경로 (저장소 문서는 카탈로그의 path)
+        
+    Returns:
+        본문 텍스트
+    """
+    content = _content_cache.get(file_path)
+    STATS.record_cache("content", content is not None)
+    if content is None and _doc_store is not None and file_path in _store_keys:
+        content = _doc_store.get(_store_keys[file_path])
+    if content is None:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    return content
+
+def read_document_lines(file_path: Path) -> List[str]:
+    """
+    문서 본문을 줄 단위로 반환 (YAML 메타데이터 제외, 캐시 우선)
+    
+    Args:
+        file_path: 파일 경로
+        
+    Returns:
+        본문 줄 리스트
+    """
+    content = read_document_text(file_path)
+    
+    # YAML 메타데이터 제거
+    if content.startswith('---'):
+        parts = content.split('---', 2)
+        if len(parts) >= 3:
+            content = parts[2].strip()
+    
+    return content.split('\n')
+
+def find_relevant_windows(lines: List[str], query: str) -> List[tuple]:
+    """
+    질문 키워드가 포함된 줄 주변 구간을 찾아 겹치는 구간을 병합
+    
+    Args:
+        lines: 본문 줄 리스트
+        query: 사용자 질문
+        
+    Returns:
+        [(시작 줄, 끝 줄), ...] 구간 리스트 (끝 줄은 미포함)
+    """
+    keywords = query.lower().split()
+    windows = []
+    
+    for i, line in enumerate(lines):
+        line_lower = line.lower()
+        if any(keyword in line_lower for keyword in keywords):
+            start = max(0, i - 2)
+            end = min(len(lines), i + 8)
+            if windows and start <= windows[-1][1]:
+                windows[-1] = (windows[-1][0], max(windows[-1][1], end))
+            else:
+                windows.append((start, end))
+    
+    return windows
+
+def list_sections(lines: List[str]) -> List[Dict[str, Any]]:
+    """
+    마크다운 헤더 목록과 각 섹션의 줄/바이트 오프셋을 계산
+    
+    Args:
+        lines: 본문 줄 리스트
+        
+    Returns:
+        [{"line": int, "level": int, "title": str, "end": int, "bytes": int}, ...]
+    """
+    headers = []
+    for i, line in enumerate(lines):
+        match = re.match(r'^(#{1,6})\s+(.*)', line)
+        if match:
+            headers.append({"line": i, "level": len(match.group(1)), "title": match.group(2).strip()})
+    
+    for index, header in enumerate(headers):
+        # 같은 수준 이하의 다음 헤더 전까지가 섹션 (하위 섹션 포함)
+        header["end"] = len(lines)
+        for next_header in headers[index + 1:]:
+            if next_header["level"] <= header["level"]:
+                header["end"] = next_header["line"]
+                break
+        header["bytes"] = sum(len(line.encode('utf-8')) + 1 for line in lines[header["line"]:header["end"]])
+    
+    return headers
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    """페이지 상태를 불투명 커서 문자열로 인코딩"""
+    raw = json.dumps(state, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str) -> Optional[Dict[str, Any]]:
+    """커서 문자열을 페이지 상태로 디코딩 (잘못되거나 변조된 커서이면 None)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        return None
+    if not isinstance(state, dict) or not all(key in state for key in ("t", "q", "v", "s")):
+        return None
+    state.setdefault("c", 0)
+    for key in ("w", "l", "c"):
+        value = state.get(key)
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            return None
+    return state
+
+def paginate_windows(lines: List[str], windows: List[tuple], window_index: int, line_index: int,
+                     max_lines: int, max_bytes: int, char_index: int = 0) -> tuple:
+    """
+    구간들을 순서대로 바이트/줄 수 제한까지 잘라서 반환
+    
+    Args:
+        lines: 본문 줄 리스트
+        windows: [(시작 줄, 끝 줄), ...] 구간 리스트
+        window_index: 시작 구간 번호
+        line_index: 시작 줄 번호
+        max_lines: 최대 줄 수
+        max_bytes: 최대 바이트 수 (UTF-8)
+        char_index: 시작 줄에서 이어서 읽을 문자 위치 (이전 페이지에서 긴 줄이 잘린 경우)
+        
+    Returns:
+        (출력 줄 리스트, 다음 구간 번호, 다음 줄 번호, 다음 문자 위치) - 모두 출력했으면 다음 구간 번호는 len(windows),
+        한 줄이 페이지보다 길어 잘렸으면 다음 문자 위치가 0보다 큼
+    """
+    output = []
+    used_bytes = 0
+    
+    while window_index < len(windows) and len(output) < max_lines:
+        start, end = windows[window_index]
+        if line_index < start:
+            line_index, char_index = start, 0
+        
+        if line_index >= end:
+            window_index += 1
+            if window_index < len(windows) and output:
+                output.append("...")
+                used_bytes += 4
+            continue
+        
+        line = lines[line_index][char_index:]
+        size = len(line.encode('utf-8')) + 1
+        
+        if used_bytes + size > max_bytes:
+            if not output:
+                # 한 줄이 제한보다 길면 들어가는 만큼만 내보내고 나머지는 다음 페이지에서 이어감
+                piece = line.encode('utf-8')[:max_bytes].decode('utf-8', errors='ignore') or line[:1]
+                output.append(piece)
+                char_index += len(piece)
+                if char_index >= len(lines[line_index]):
+                    line_index, char_index = line_index + 1, 0
+            break
+        
+        output.append(line)
+        used_bytes += size
+        line_index, char_index = line_index + 1, 0
+    
+    # 현재 구간을 다 읽었으면 다음 구간으로 이동
+    while window_index < len(windows) and line_index >= windows[window_index][1]:
+        window_index += 1
+    
+    return output, window_index, line_index, char_index
+
 def extract_relevant_content(file_path: Path, query: str, max_lines: int = 50) -> str:
     """
     파일에서 질문과 관련된 내용을 추출
@@ -110,16 +616,7 @@ def extract_relevant_content(file_path: Path, query: str, max_lines: int = 50) -
         관련 내용 텍스트
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # YAML 메타데이터 제거
-        if content.startswith('---'):
-            parts = content.split('---', 2)
-            if len(parts) >= 3:
-                content = parts[2].strip()
-        
-        lines = content.split('\n')
+        lines = read_document_lines(file_path)
         query_lower = query.lower()
         relevant_lines = []
         
@@ -162,23 +659,19 @@ async def search_files(query: str, max_results: int = 3) -> str:
     documents = get_all_documents()
     
     if not documents:
+        note_results(0)
         return "검색 가능한 문서가 없습니다. data/raw 폴더에 마크다운 파일을 추가해주세요."
     
     # 관련성 점수 계산 및 정렬
-    scored_docs = []
-    for doc in documents:
-        score = calculate_relevance_score(query, doc["title"])
-        if score > 0.1:  # 최소 관련성 임계값
-            scored_docs.append((score, doc))
-    
-    # 점수 순으로 정렬
-    scored_docs.sort(key=lambda x: x[0], reverse=True)
+    scored_docs = rank_documents([query], documents)[0]
     
     if not scored_docs:
+        note_results(0)
         return f"'{query}'와 관련된 문서를 찾을 수 없습니다. 다른 검색어를 시도해보세요."
     
     # 최대 결과 수만큼 반환
     result_docs = scored_docs[:max_results]
+    note_results(len(result_docs))
     
     result = f"'{query}'에 대해 {len(result_docs)}개의 관련 문서를 찾았습니다:\n\n"
     
@@ -193,47 +686,352 @@ async def search_files(query: str, max_results: int = 3) -> str:
     return result
 
 @mcp.tool()
-async def get_relevant_content(file_title: str, query: str, max_lines: int = 50) -> str:
+async def search_many(queries: List[str], max_results: int = 3) -> str:
+    """
+    여러 질문(하위 질의)을 한 번에 검색하여 질의별 순위와 중복 제거된 파일 목록을 반환
+    비교 질문("CNN과 RNN의 차이는?")처럼 여러 하위 질의로 나뉘는 경우 사용
+    
+    Args:
+        queries: 검색할 질문이나 검색어 리스트
+        max_results: 질의별 반환할 최대 파일 수 (기본값: 3)
+    """
+    queries = [query.strip() for query in queries if query and query.strip()]
+    logger.info(f"일괄 검색 요청: {queries}")
+    
+    if not queries:
+        return "검색할 질의가 없습니다. 하나 이상의 검색어를 입력해주세요."
+    
+    documents = get_all_documents()
+    
+    if not documents:
+        note_results(0)
+        return "검색 가능한 문서가 없습니다. data/mcp_docs 폴더에 마크다운 파일을 추가해주세요."
+    
+    rankings = [ranking[:max_results] for ranking in rank_documents(queries, documents)]
+    
+    # 질의 간 중복 파일 제거 (처음 등장한 순서대로 번호 부여)
+    file_ids: Dict[str, int] = {}
+    unique_docs = []
+    for ranking in rankings:
+        for _, doc in ranking:
+            if doc["title"] not in file_ids:
+                file_ids[doc["title"]] = len(unique_docs) + 1
+                unique_docs.append(doc)
+    
+    note_results(len(unique_docs))
+    if not unique_docs:
+        return f"{len(queries)}개 질의와 관련된 문서를 찾을 수 없습니다. 다른 검색어를 시도해보세요."
+    
+    result = f"{len(queries)}개 질의에 대해 {len(unique_docs)}개의 관련 문서를 찾았습니다:\n\n"
+    
+    result += "[문서]\n"
+    for doc in unique_docs:
+        result += f"D{file_ids[doc['title']]}. **{doc['title']}** ({doc['size']} bytes) - {doc['path']}\n"
+    
+    result += "\n[질의별 순위]\n"
+    for query, ranking in zip(queries, rankings):
+        if ranking:
+            ranked = ", ".join(f"D{file_ids[doc['title']]}({score:.2f})" for score, doc in ranking)
+        else:
+            ranked = "관련 문서 없음"
+        result += f"- '{query}': {ranked}\n"
+    
+    result += "\n💡 이 파일들의 내용을 보려면 `get_relevant_content` 도구를 사용하세요."
+    
+    return result
+
+@mcp.tool()
+async def get_relevant_content(file_title: str, query: str, max_lines: int = 50,
+                               max_bytes: int = DEFAULT_MAX_BYTES, cursor: str = "",
+                               headers_only: bool = False, start_line: int = -1) -> str:
     """
     특정 파일에서 질문과 관련된 내용을 추출
+    응답은 max_bytes로 제한되며, 남은 내용이 있으면 다음 페이지용 cursor를 함께 반환
     
     Args:
         file_title: 파일 제목 (확장자 제외)
         query: 사용자의 질문
-        max_lines: 추출할 최대 줄 수 (기본값: 50)
+        max_lines: 페이지당 추출할 최대 줄 수 (기본값: 50)
+        max_bytes: 페이지당 본문 최대 크기 (UTF-8 바이트, 기본값: 6000)
+        cursor: 이전 응답에서 받은 다음 페이지 커서 (첫 페이지는 빈 문자열)
+        headers_only: True이면 본문 대신 섹션 헤더와 줄/바이트 오프셋만 반환
+        start_line: 0 이상이면 질문 매칭 대신 해당 줄의 섹션을 반환 (headers_only 결과의 L 번호)
     """
     logger.info(f"내용 추출 요청: '{file_title}' 파일에서 '{query}' 관련 내용")
     
-    documents = get_all_documents()
-    
     # 파일 제목으로 문서 찾기
-    target_file = None
-    for doc in documents:
-        if doc["title"].lower() == file_title.lower():
-            target_file = doc["path"]
-            break
+    doc = find_document(file_title)
     
-    if not target_file:
-        available_titles = [doc["title"] for doc in documents]
+    if not doc:
+        note_results(0)
+        available_titles = [doc["title"] for doc in get_all_documents()]
         return f"'{file_title}' 파일을 찾을 수 없습니다.\n사용 가능한 파일들: {', '.join(available_titles[:10])}"
     
-    # 관련 내용 추출
-    content = extract_relevant_content(target_file, query, max_lines)
+    target_file = doc["path"]
+    
+    try:
+        lines = read_document_lines(target_file)
+    except Exception as e:
+        logger.error(f"파일 읽기 오류 ({target_file}): {e}")
+        return f"파일을 읽을 수 없습니다: {e}"
+    
+    sections = list_sections(lines)
+    
+    if headers_only:
+        total_bytes = sum(len(line.encode('utf-8')) + 1 for line in lines)
+        result = f"## {file_title}\n"
+        result += f"**섹션 목록** (총 {len(lines)}줄, {total_bytes} bytes):\n\n"
+        for section in sections:
+            indent = "  " * (section["level"] - 1)
+            result += f"{indent}- L{section['line']} {section['title']} ({section['bytes']} bytes)\n"
+        result += f"\n💡 특정 섹션만 보려면 `start_line`에 L 번호를 지정하세요."
+        return result
+    
+    # 페이지 상태 복원 (문서 버전이나 요청이 바뀌었으면 커서 무효)
+    query_hash = hashlib.sha1(query.encode('utf-8')).hexdigest()[:8]
+    window_index, line_index, char_index = 0, 0, 0
+    if cursor:
+        state = decode_cursor(cursor)
+        if (not state or state.get("t") != doc["title"] or state.get("q") != query_hash
+                or state.get("v") != doc.get("version") or state.get("s") != start_line):
+            return "커서가 유효하지 않거나 문서가 변경되었습니다. cursor 없이 다시 요청해주세요."
+        window_index, line_index, char_index = state["w"], state["l"], state["c"]
+    
+    if start_line >= 0:
+        section_end = next((section["end"] for section in sections if section["line"] == start_line), None)
+        if section_end is None:
+            section_end = next((section["line"] for section in sections if section["line"] > start_line), len(lines))
+        windows = [(start_line, section_end)] if start_line < len(lines) else []
+        note_results(len(windows))
+    else:
+        windows = find_relevant_windows(lines, query)
+        note_results(len(windows))
+        # 관련 내용이 없으면 파일 시작 부분 반환
+        if not windows:
+            windows = [(0, min(len(lines), max_lines))]
+    
+    page_lines, next_window, next_line, next_char = paginate_windows(
+        lines, windows, window_index, line_index, max(1, max_lines), max(1, max_bytes), char_index
+    )
+    content = '\n'.join(page_lines)
     
     result = f"## {file_title}\n"
     result += f"**질문:** {query}\n\n"
-    result += f"**관련 내용:**\n\n{content}\n\n"
+    result += f"**관련 내용** (구간 {min(window_index + 1, len(windows))}/{len(windows)}, {len(content.encode('utf-8'))} bytes):\n\n{content}\n\n"
     result += f"📄 파일 경로: {target_file}"
     
+    if next_window < len(windows):
+        next_cursor = encode_cursor({
+            "t": doc["title"], "q": query_hash, "v": doc.get("version"),
+            "s": start_line, "w": next_window, "l": next_line, "c": next_char
+        })
+        if next_char:
+            result += f"\n✂️ L{next_line} 줄이 페이지보다 길어 {next_char}번째 문자에서 잘렸습니다. 다음 페이지에서 이어집니다."
+        result += f"\n➡️ 남은 구간이 있습니다. 다음 페이지: cursor=\"{next_cursor}\""
+    
     return result
 
-if __name__ == "__main__":
+@mcp.tool()
+async def server_stats(reset: bool = False) -> str:
+    """
+    서버 통계 조회: 도구별 호출 수, 지연 시간 히스토그램(p50/p90/p99), 결과 없음 비율,
+    응답 바이트 수, 캐시 적중률 (HTTP 다중 워커에서는 응답한 워커의 통계)
+    
+    Args:
+        reset: True이면 조회 후 통계를 초기화
+    """
+    snapshot = STATS.snapshot()
+    if reset:
+        STATS.reset()
+    return json.dumps(snapshot, ensure_ascii=False, indent=2)
+
+@mcp.tool()
+async def refresh_catalog(ctx: Context) -> str:
+    """
+    data/mcp_docs 폴더(또는 세그먼트 저장소 색인)를 다시 읽어 카탈로그, 제목 색인, 문서 리소스를 갱신
+    변경이 있으면 resources/list_changed 알림과 변경 문서별 resources/updated 알림을 보냄
+    (HTTP 다중 워커에서는 요청을 받은 워커만 갱신되고 알림을 받을 세션도 없으므로 거부, 서버를 재시작해야 함)
+    """
+    if _http_workers > 1:
+        logger.warning(f"다중 워커({_http_workers}개) HTTP 모드에서 refresh_catalog 요청을 거부했습니다.")
+        note_results(0)
+        return (f"HTTP 다중 워커({_http_workers}개) 모드에서는 카탈로그를 갱신할 수 없습니다. "
+                f"요청을 받은 워커만 다시 읽게 되어 워커마다 문서 목록이 달라지고, stateless 모드라 변경 알림을 "
+                f"보낼 세션도 없습니다. 문서를 반영하려면 서버를 재시작하세요.")
+    
+    previous_versions = {doc["title"]: doc.get("version") for doc in get_all_documents()}
+    load_catalog(force=True)
+    diff = sync_document_resources(previous_versions)
+    build_catalog_json()
+    
+    changed = any(diff.values())
+    if changed:
+        await ctx.send_resource_list_changed()
+        for title in diff["changed"]:
+            await ctx.session.send_resource_updated(document_uri(title))
+    
+    note_results(sum(len(titles) for titles in diff.values()))
+    summary = ", ".join(f"{key}: {len(titles)}" for key, titles in diff.items())
+    logger.info(f"카탈로그 갱신: {summary}")
+    
+    if not changed:
+        return f"변경된 문서가 없습니다. (총 {len(get_all_documents())}개 문서)"
+    
+    result = f"카탈로그를 갱신했습니다. (총 {len(get_all_documents())}개 문서)\n"
+    for key, label in (("added", "추가"), ("changed", "변경"), ("removed", "삭제")):
+        if diff[key]:
+            result += f"- {label}: {', '.join(diff[key])}\n"
+    return result
+
+@mcp.resource("catalog://documents", mime_type="application/json")
+def catalog_resource() -> str:
+    """
+    문서 카탈로그: 문서별 URI, 버전(내용 해시), 크기, 섹션 URI 목록
+    클라이언트는 버전이 바뀐 문서만 다시 읽으면 됩니다. (워밍업/갱신 때 만든 응답을 카탈로그 버전별로 재사용)
+    """
+    return build_catalog_json()
+
+@mcp.resource("doc://{title}/{section}", mime_type="text/markdown")
+def document_section_resource(title: str, section: str) -> str:
+    """
+    문서의 한 섹션 (섹션 제목 또는 L 번호, 예: doc://cnn/개요, doc://cnn/L4)
+    """
+    doc = find_document(title)
+    if not doc:
+        raise ValueError(f"'{title}' 문서를 찾을 수 없습니다.")
+    
+    lines = read_document_lines(doc["path"])
+    sections = list_sections(lines)
+    
+    line_match = re.fullmatch(r'[Ll](\d+)', section)
+    for candidate in sections:
+        if (line_match and candidate["line"] == int(line_match.group(1))) or candidate["title"] == section:
+            return '\n'.join(lines[candidate["line"]:candidate["end"]])
+    
+    raise ValueError(f"'{title}' 문서에 '{section}' 섹션이 없습니다.")
+
+@mcp.custom_route("/healthz", methods=["GET"])
+async def healthz(request: Request) -> JSONResponse:
+    """워밍업이 끝난 뒤에만 200을 반환하는 준비 상태 확인 엔드포인트"""
+    if not _ready.is_set():
+        return JSONResponse({"status": "warming_up"}, status_code=503)
+    
+    return JSONResponse({
+        "status": "ready",
+        "documents": len(get_all_documents()),
+        "pid": os.getpid()
+    })
+
+def start_stats_dump(stats_file: Optional[str], interval_s: float) -> None:
+    """통계 파일 경로가 지정되었으면 주기적 덤프 시작 (워커 프로세스마다 호출)"""
+    if stats_file:
+        STATS.start_periodic_dump(stats_file, interval_s)
+        logger.info(f"통계 덤프: {stats_file} ({interval_s:.0f}초 간격, PID {os.getpid()})")
+
+def serve_http(host: str, port: int, workers: int = 1, path: str = "/mcp/",
+               stats_file: Optional[str] = None, stats_interval: float = 60.0) -> None:
+    """
+    HTTP(Streamable HTTP) 전송 방식으로 서버 실행
+    
+    워커가 여러 개이면 부모 프로세스에서 카탈로그를 로드하고 소켓을 연 뒤
+    fork 하므로 모든 워커가 같은 카탈로그를 읽기 전용으로 공유합니다.
+    세션이 특정 워커에 묶이지 않도록 다중 워커에서는 stateless 모드를 사용합니다.
+    
+    Args:
+        host: 바인딩할 호스트
+        port: 바인딩할 포트
+        workers: 워커 프로세스 수
+        path: MCP 엔드포인트 경로
+        stats_file: 통계를 주기적으로 기록할 JSONL 파일 경로
+        stats_interval: 통계 기록 주기 (초)
+    """
+    import uvicorn
+    
+    global _http_workers
+    
+    if workers > 1 and not hasattr(os, "fork"):
+        logger.warning("이 플랫폼은 fork를 지원하지 않아 단일 워커로 실행합니다.")
+        workers = 1
+    _http_workers = workers
+    
+    if workers == 1:
+        # 포트를 먼저 열고 백그라운드에서 워밍업 (완료 전까지 /healthz는 503)
+        threading.Thread(target=warm_up, daemon=True).start()
+        start_stats_dump(stats_file, stats_interval)
+        mcp.run(transport="http", host=host, port=port, path=path)
+        return
+    
+    warm_up()
+    
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    
+    app = mcp.http_app(path=path, stateless_http=True)
+    children = []
+    
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            start_stats_dump(stats_file, stats_interval)
+            config = uvicorn.Config(app, lifespan="on", timeout_graceful_shutdown=0)
+            uvicorn.Server(config).run(sockets=[sock])
+            os._exit(0)
+        children.append(pid)
+    
+    logger.info(f"HTTP 서버 시작: http://{host}:{port}{path} (워커 {workers}개, PID {children})")
+    
+    def _terminate(signum, frame):
+        for child in children:
+            try:
+                os.kill(child, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    
+    signal.signal(signal.SIGTERM, _terminate)
+    signal.signal(signal.SIGINT, _terminate)
+    
+    for child in children:
+        try:
+            os.waitpid(child, 0)
+        except ChildProcessError:
+            pass
+    sock.close()
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="MCP RAG 서버")
+    parser.add_argument("--transport", choices=["stdio", "http"], default="stdio",
+                        help="전송 방식 (기본값: stdio)")
+    parser.add_argument("--host", default="127.0.0.1", help="HTTP 바인딩 호스트 (기본값: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="HTTP 바인딩 포트 (기본값: 8000)")
+    parser.add_argument("--workers", type=int, default=1, help="HTTP 워커 프로세스 수 (기본값: 1)")
+    parser.add_argument("--path", default="/mcp/", help="MCP 엔드포인트 경로 (기본값: /mcp/)")
+    parser.add_argument("--stats-file", help="도구 통계를 주기적으로 기록할 JSONL 파일 (stdout 사용 불가)")
+    parser.add_argument("--stats-interval", type=float, default=60.0, help="통계 기록 주기, 초 (기본값: 60)")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """서버 진입점"""
+    args = parse_args(argv)
     logger.info("MCP RAG 서버를 시작합니다...")
     
     # 데이터 디렉토리 확인
-    if not DATA_DIR.exists():
+    if not DATA_DIR.exists() and not SegmentStore.exists(STORE_DIR):
         logger.warning(f"데이터 디렉토리가 없습니다: {DATA_DIR}")
-        logger.info("../data/raw/ 폴더를 생성하고 마크다운 파일을 추가해주세요.")
+        logger.info("../data/mcp_docs/ 폴더를 생성하고 마크다운 파일을 추가해주세요.")
     
-    # FastMCP 서버 실행
-    mcp.run()
\ No newline at end of file
+    if args.transport == "http":
+        serve_http(args.host, args.port, max(1, args.workers), args.path,
+                   args.stats_file, args.stats_interval)
+    else:
+        # FastMCP 서버 실행 (stdio)
+        warm_up()
+        start_stats_dump(args.stats_file, args.stats_interval)
+        mcp.run()
+
+if __name__ == "__main__":
+    main()
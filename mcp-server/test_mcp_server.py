@@ -11,6 +11,7 @@ from pathlib import Path
 # 서버 모듈 임포트
 try:
     from mcp_rag_server import get_all_documents, calculate_relevance_score, extract_relevant_content
+    import mcp_rag_server
 except ImportError:
     print("❌ mcp_rag_server.py를 찾을 수 없습니다.")
     sys.exit(1)
@@ -128,6 +129,202 @@ async def test_edge_cases():
     
     return True
 
+async def test_batch_search():
+    """일괄 검색(search_many) 기능 테스트"""
+    print("\n\n📚 일괄 검색 테스트")
+    print("-" * 50)
+    
+    from fastmcp import Client
+    
+    queries = ["CNN", "RNN", "차이"]
+    async with Client(mcp_rag_server.mcp) as client:
+        response = await client.call_tool("search_many", {"queries": queries})
+    
+    text = response.content[0].text
+    print(text)
+    
+    # 질의별 순위가 모두 포함되어야 함
+    return all(f"'{query}'" in text for query in queries)
+
+async def test_paginated_content():
+    """커서 기반 페이지네이션 테스트"""
+    print("\n\n📑 페이지네이션 테스트")
+    print("-" * 50)
+    
+    import re
+    from fastmcp import Client
+    
+    documents = get_all_documents()
+    if not documents:
+        print("⚠️  테스트할 문서가 없습니다.")
+        return False
+    
+    title = documents[0]["title"]
+    cursor = ""
+    pages = 0
+    
+    async with Client(mcp_rag_server.mcp) as client:
+        response = await client.call_tool("get_relevant_content",
+                                          {"file_title": title, "query": "정의", "headers_only": True})
+        print(response.content[0].text)
+        
+        # 작은 페이지로 끝까지 넘겨보기
+        while pages < 100:
+            response = await client.call_tool("get_relevant_content", {
+                "file_title": title, "query": "정의", "max_bytes": 200, "cursor": cursor
+            })
+            pages += 1
+            match = re.search(r'cursor="([^"]+)"', response.content[0].text)
+            if not match:
+                break
+            cursor = match.group(1)
+        
+        print(f"   페이지 수 (max_bytes=200): {pages}")
+        
+        response = await client.call_tool("get_relevant_content",
+                                          {"file_title": title, "query": "정의", "cursor": "invalid"})
+        print(f"   잘못된 커서: {response.content[0].text}")
+        
+        # 변조된 커서: JSON이지만 딕셔너리가 아니거나, 위치 값이 정수가 아니거나 음수
+        import hashlib
+        doc = next(doc for doc in get_all_documents() if doc["title"] == title)
+        valid = {"t": title, "q": hashlib.sha1("정의".encode('utf-8')).hexdigest()[:8], "v": doc.get("version"),
+                 "s": -1, "w": 0, "l": 0}
+        response = await client.call_tool("get_relevant_content", {
+            "file_title": title, "query": "정의", "cursor": mcp_rag_server.encode_cursor(valid)
+        })
+        accepted = "커서가 유효하지 않" not in response.content[0].text
+        tampered = ["MQ"] + [mcp_rag_server.encode_cursor(dict(valid, **change))
+                             for change in ({"w": "x"}, {"l": -1}, {"w": True}, {"l": None}, {"c": -1})]
+        rejected = 0
+        for bad in tampered:
+            response = await client.call_tool("get_relevant_content",
+                                              {"file_title": title, "query": "정의", "cursor": bad})
+            rejected += "커서가 유효하지 않" in response.content[0].text
+        print(f"   정상 커서 수락: {accepted}, 변조된 커서 거부: {rejected}/{len(tampered)}")
+    
+    # 페이지보다 긴 줄은 버려지지 않고 문자 위치 커서로 다음 페이지에서 이어져야 함
+    lines = ["# 제목", "가나다라마바사" * 40 + "끝", "마지막 줄"]
+    windows = [(0, len(lines))]
+    state = (0, 0, 0)
+    pieces = []
+    while state[0] < len(windows) and len(pieces) < 100:
+        page, *state = mcp_rag_server.paginate_windows(lines, windows, state[0], state[1], 50, 100, state[2])
+        pieces.append(page)
+    long_line_kept = (''.join(piece for page in pieces for piece in page) == ''.join(lines)
+                      and all(len('\n'.join(page).encode('utf-8')) <= 100 for page in pieces))
+    print(f"   긴 줄 이어 읽기: {len(pieces)}페이지, 원문 복원 {'✅' if long_line_kept else '❌'}")
+    
+    return pages < 100 and accepted and rejected == len(tampered) and long_line_kept
+
+async def test_server_stats():
+    """도구 통계(server_stats) 테스트"""
+    print("\n\n📊 도구 통계 테스트")
+    print("-" * 50)
+    
+    import json
+    from fastmcp import Client
+    
+    mcp_rag_server.STATS.reset()
+    async with Client(mcp_rag_server.mcp) as client:
+        await client.call_tool("search_files", {"query": "딥러닝"})
+        await client.call_tool("search_files", {"query": "존재하지않는검색어"})
+        response = await client.call_tool("server_stats", {})
+    
+    snapshot = json.loads(response.content[0].text)
+    search_stats = snapshot["tools"].get("search_files", {})
+    print(f"   search_files 호출: {search_stats.get('calls')}회, 결과 없음 비율: {search_stats.get('empty_rate')}")
+    print(f"   지연 시간: {search_stats.get('latency')}")
+    
+    # stdout 경로로는 덤프할 수 없어야 함
+    try:
+        mcp_rag_server.STATS.start_periodic_dump("/dev/stdout")
+        return False
+    except ValueError:
+        pass
+    
+    return search_stats.get("calls") == 2 and search_stats.get("empty_results", 0) >= 1
+
+async def test_document_resources():
+    """문서 리소스와 카탈로그 갱신 테스트"""
+    print("\n\n📚 문서 리소스 테스트")
+    print("-" * 50)
+    
+    import json
+    from fastmcp import Client
+    
+    mcp_rag_server.warm_up()
+    async with Client(mcp_rag_server.mcp) as client:
+        catalog = json.loads((await client.read_resource("catalog://documents"))[0].text)
+        print(f"   카탈로그 버전: {catalog['version']}, 문서 수: {len(catalog['documents'])}")
+        if not catalog["documents"]:
+            return True
+        
+        # 카탈로그는 워밍업 때 만든 응답을 재사용하므로 다시 읽어도 본문을 읽지 않음
+        read_lines = mcp_rag_server.read_document_lines
+        reads = []
+        mcp_rag_server.read_document_lines = lambda path: reads.append(path) or read_lines(path)
+        try:
+            again = json.loads((await client.read_resource("catalog://documents"))[0].text)
+        finally:
+            mcp_rag_server.read_document_lines = read_lines
+        print(f"   다시 읽은 카탈로그: 본문 읽기 {len(reads)}회, 같은 응답: {again == catalog}")
+        if reads or again != catalog:
+            return False
+        
+        entry = catalog["documents"][0]
+        content = (await client.read_resource(entry["uri"]))[0].text
+        print(f"   {entry['uri']} (version {entry['version']}): {len(content)}자")
+        
+        resources = await client.list_resources()
+        listed = [resource for resource in resources if str(resource.uri) == entry["uri"]]
+        if not listed or entry["version"] not in (listed[0].description or ""):
+            return False
+        
+        if entry["sections"]:
+            section = entry["sections"][0]
+            section_text = (await client.read_resource(section["uri"]))[0].text
+            print(f"   섹션 {section['title']}: {len(section_text)}자")
+        
+        response = await client.call_tool("refresh_catalog", {})
+        print(f"   갱신 결과: {response.content[0].text.strip()}")
+        
+        # HTTP 다중 워커에서는 다른 워커를 갱신할 수 없으므로 거부
+        mcp_rag_server._http_workers = 4
+        try:
+            refused = await client.call_tool("refresh_catalog", {})
+        finally:
+            mcp_rag_server._http_workers = 1
+        print(f"   다중 워커 갱신 결과: {refused.content[0].text.strip()[:40]}...")
+    
+    return ("변경된 문서가 없습니다" in response.content[0].text
+            and "재시작" in refused.content[0].text)
+
+async def test_http_readiness():
+    """HTTP 모드 /healthz 준비 상태 테스트"""
+    print("\n\n🌐 HTTP 준비 상태 테스트")
+    print("-" * 50)
+    
+    import httpx
+    
+    app = mcp_rag_server.mcp.http_app()
+    transport = httpx.ASGITransport(app=app)
+    
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        mcp_rag_server._ready.clear()
+        response = await client.get("/healthz")
+        print(f"   워밍업 전: {response.status_code}")
+        if response.status_code != 503:
+            return False
+        
+        mcp_rag_server.warm_up()
+        response = await client.get("/healthz")
+        print(f"   워밍업 후: {response.status_code} {response.json()}")
+        if response.status_code != 200:
+            return False
+    
+    return True
+
 async def main():
     """메인 테스트 함수"""
     print("🚀 MCP RAG Server 테스트 시작")
@@ -156,6 +353,11 @@ async def main():
         success &= await test_search_functionality()
         success &= await test_content_extraction()
         success &= await test_edge_cases()
+        success &= await test_batch_search()
+        success &= await test_paginated_content()
+        success &= await test_server_stats()
+        success &= await test_document_resources()
+        success &= await test_http_readiness()
         
         print("\n" + "=" * 60)
         if success:
@@ -0,0 +1,227 @@
+"""
+문서 제목 색인 모듈
+- 정규화된 제목과 한국어/영어 별칭의 정확 매칭 (해시 조회)
+- 문자 트라이그램 역색인 기반 유사 제목 검색
+- 관련성 점수 계산에 쓰는 제목 특징값 사전 계산
+"""
+
+import re
+import unicodedata
+from urllib.parse import unquote
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# AI/ML 도메인 키워드 (관련성 점수 계산용)
+AI_KEYWORDS = frozenset({
+    'ai', 'artificial', 'intelligence', '인공지능',
+    'machine', 'learning', '머신러닝', '기계학습', 'ml',
+    'deep', 'deeplearning', '딥러닝', 'neural', 'network', '신경망',
+    'cnn', 'rnn', 'lstm', 'gru', 'transformer', 'gpt',
+    'reinforcement', '강화학습', 'alphago', '알파고'
+})
+
+WORD_PATTERN = re.compile(r'\b\w+\b')
+NON_WORD_PATTERN = re.compile(r'[\W_]+')
+PARENTHESIS_PATTERN = re.compile(r'\s*\([^)]*\)')
+
+FUZZY_MIN_SIMILARITY = 0.4  # 유사 매칭으로 인정할 최소 트라이그램 유사도
+
+
+def normalize_title(text: str) -> str:
+    """
+    제목 비교용 정규화 (유니코드 NFC, 소문자, 공백/기호 제거)
+
+    Args:
+        text: 원본 문자열
+
+    Returns:
+        정규화된 문자열 (예: "기계 학습" → "기계학습")
+    """
+    text = unicodedata.normalize('NFC', text).lower()
+    return NON_WORD_PATTERN.sub('', text)
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    양끝을 공백으로 채운 문자 트라이그램 집합 (짧은 제목도 매칭되도록)
+
+    Args:
+        text: 정규화된 문자열
+
+    Returns:
+        트라이그램 집합
+    """
+    if not text:
+        return set()
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def title_variants(title: str) -> List[str]:
+    """제목과 괄호 설명을 뺀 제목 (예: "트랜스포머 (기계 학습)" → "트랜스포머")"""
+    variants = [title]
+    stripped = PARENTHESIS_PATTERN.sub('', title).strip()
+    if stripped and stripped != title:
+        variants.append(stripped)
+    return variants
+
+
+def build_aliases(stem: str, page_title: Optional[str], wiki_documents: Dict[str, str],
+                  english_names: Dict[str, str]) -> List[str]:
+    """
+    문서 하나의 별칭 목록 생성
+
+    Args:
+        stem: 파일명 (확장자 제외, 예: "cnn")
+        page_title: 문서 본문 첫 헤더의 위키 제목 (예: "합성곱 신경망")
+        wiki_documents: {키워드: 위키 URL} 설정
+        english_names: {위키 제목: 영어명} 설정
+
+    Returns:
+        별칭 리스트 (파일명 포함)
+    """
+    page_titles = []
+    if page_title:
+        page_titles.append(page_title)
+
+    url = wiki_documents.get(stem)
+    if url:
+        page_titles.append(unquote(url.rsplit('/', 1)[-1]).replace('_', ' '))
+
+    aliases = [stem]
+    for title in page_titles:
+        aliases.extend(title_variants(title))
+        english_name = english_names.get(title)
+        if english_name:
+            aliases.append(english_name)
+
+    return aliases
+
+
+class TitleIndex:
+    """정규화 제목/별칭 해시 색인과 트라이그램 역색인"""
+
+    def __init__(self, documents: List[Dict[str, Any]], aliases: Dict[str, Iterable[str]]):
+        """
+        색인 구축 (카탈로그 로드 시 한 번)
+
+        Args:
+            documents: 문서 정보 리스트 [{"title": str, ...}, ...]
+            aliases: {문서 제목: [별칭, ...]}
+        """
+        self.documents = documents
+        self.exact: Dict[str, Set[int]] = {}
+        self.alias_keys: List[Tuple[int, str, Set[str]]] = []   # (문서 번호, 정규화 별칭, 트라이그램)
+        self.postings: Dict[str, List[int]] = {}                # 트라이그램 → alias_keys 번호
+        self.features: Dict[str, Dict[str, Any]] = {}
+
+        for doc_index, doc in enumerate(documents):
+            title = doc["title"]
+            keys = []
+            for alias in [title, *aliases.get(title, [])]:
+                key = normalize_title(alias)
+                if key and key not in keys:
+                    keys.append(key)
+
+            for key in keys:
+                self.exact.setdefault(key, set()).add(doc_index)
+                alias_id = len(self.alias_keys)
+                grams = trigrams(key)
+                self.alias_keys.append((doc_index, key, grams))
+                for gram in grams:
+                    self.postings.setdefault(gram, []).append(alias_id)
+
+            self.features[title] = title_features(title, keys)
+
+    def resolve(self, title: str) -> Optional[Dict[str, Any]]:
+        """
+        제목/별칭으로 문서 찾기 (정확 매칭 후 트라이그램 유사 매칭)
+
+        Args:
+            title: 찾을 제목 ("트랜스포머", "Machine Learning", "cnn" 등)
+
+        Returns:
+            문서 정보 또는 None
+        """
+        key = normalize_title(title)
+        if not key:
+            return None
+
+        doc_indexes = self.exact.get(key)
+        if doc_indexes:
+            return self.documents[min(doc_indexes)]
+
+        matches = self.fuzzy(key, limit=1)
+        if matches and matches[0][1] >= 0.5:
+            return self.documents[matches[0][0]]
+        return None
+
+    def fuzzy(self, key: str, limit: int = 5,
+              min_similarity: float = FUZZY_MIN_SIMILARITY) -> List[Tuple[int, float]]:
+        """
+        트라이그램 역색인으로 유사한 별칭을 가진 문서 검색
+
+        Args:
+            key: 정규화된 검색어
+            limit: 최대 결과 수
+            min_similarity: 최소 자카드 유사도
+
+        Returns:
+            [(문서 번호, 유사도), ...] 유사도 내림차순
+        """
+        query_grams = trigrams(key)
+        if not query_grams:
+            return []
+
+        shared: Dict[int, int] = {}
+        for gram in query_grams:
+            for alias_id in self.postings.get(gram, ()):
+                shared[alias_id] = shared.get(alias_id, 0) + 1
+
+        best: Dict[int, float] = {}
+        for alias_id, common in shared.items():
+            doc_index, _, grams = self.alias_keys[alias_id]
+            similarity = common / (len(query_grams) + len(grams) - common)
+            if similarity >= min_similarity and similarity > best.get(doc_index, 0.0):
+                best[doc_index] = similarity
+
+        return sorted(best.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+def title_features(title: str, alias_keys: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    관련성 점수 계산용 제목 특징값 (카탈로그 로드 시 미리 계산)
+
+    Args:
+        title: 파일 제목
+        alias_keys: 정규화된 별칭 리스트
+
+    Returns:
+        특징값 딕셔너리
+    """
+    title_lower = title.lower()
+    return {
+        "lower": title_lower,
+        "words": set(WORD_PATTERN.findall(title_lower)),
+        "ai_words": set(title_lower.split()) & AI_KEYWORDS,
+        "aliases": alias_keys if alias_keys is not None else [normalize_title(title)]
+    }
+
+
+def query_features(query: str) -> Dict[str, Any]:
+    """
+    관련성 점수 계산용 질문 특징값 (질문당 한 번 계산)
+
+    Args:
+        query: 사용자 질문
+
+    Returns:
+        특징값 딕셔너리
+    """
+    query_lower = query.lower()
+    return {
+        "lower": query_lower,
+        "normalized": normalize_title(query),
+        "words": set(WORD_PATTERN.findall(query_lower)),
+        "ai_words": set(query_lower.split()) & AI_KEYWORDS,
+        "tokens": [normalize_title(token) for token in WORD_PATTERN.findall(query_lower)]
+    }
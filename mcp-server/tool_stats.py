@@ -0,0 +1,229 @@
+"""
+MCP 도구 호출 통계 수집 모듈
+- 도구별 지연 시간 히스토그램, 결과 수, 응답 바이트 수 집계
+- 캐시 적중률 집계
+- JSONL 파일로 주기적 덤프 (stdout은 MCP 프로토콜 전용이므로 사용 금지)
+"""
+
+import os
+import json
+import time
+import logging
+import bisect
+import threading
+import contextvars
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fastmcp.server.middleware import Middleware, MiddlewareContext, CallNext
+
+logger = logging.getLogger(__name__)
+
+# 지연 시간 버킷 상한 (밀리초), 마지막 버킷은 그 이상 전부
+LATENCY_BUCKETS_MS = [0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+# 현재 도구 호출의 결과 수를 기록할 자리 (미들웨어가 호출마다 새로 설정)
+_current_call: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "current_tool_call", default=None
+)
+
+
+class LatencyHistogram:
+    """고정 버킷 지연 시간 히스토그램"""
+
+    def __init__(self, bounds: List[float] = LATENCY_BUCKETS_MS):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        """측정값 하나를 기록"""
+        self.counts[bisect.bisect_left(self.bounds, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def percentile(self, q: float) -> float:
+        """
+        버킷 상한 기준 백분위 추정값
+
+        Args:
+            q: 백분위 (0.0 ~ 1.0)
+
+        Returns:
+            추정 지연 시간 (밀리초)
+        """
+        if not self.count:
+            return 0.0
+
+        target = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                return min(float(self.bounds[i]), self.max_ms) if i < len(self.bounds) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        """직렬화용 딕셔너리"""
+        labels = [f"<={bound}ms" for bound in self.bounds] + [f">{self.bounds[-1]}ms"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.5), 3),
+            "p90_ms": round(self.percentile(0.9), 3),
+            "p99_ms": round(self.percentile(0.99), 3),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": {label: count for label, count in zip(labels, self.counts) if count}
+        }
+
+
+class ToolStats:
+    """도구 하나의 호출 통계"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.empty_results = 0
+        self.total_results = 0
+        self.total_bytes = 0
+        self.latency = LatencyHistogram()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """직렬화용 딕셔너리"""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "empty_results": self.empty_results,
+            "empty_rate": round(self.empty_results / self.calls, 3) if self.calls else 0.0,
+            "avg_results": round(self.total_results / self.calls, 2) if self.calls else 0.0,
+            "bytes_returned": self.total_bytes,
+            "avg_bytes": round(self.total_bytes / self.calls) if self.calls else 0,
+            "latency": self.latency.to_dict()
+        }
+
+
+class StatsRegistry:
+    """프로세스 단위 통계 저장소 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tools: Dict[str, ToolStats] = {}
+        self._caches: Dict[str, Dict[str, int]] = {}
+        self._started_at = time.time()
+        self._dump_thread: Optional[threading.Thread] = None
+
+    def record_call(self, tool: str, duration_s: float, result_count: Optional[int],
+                    response_bytes: int, error: bool = False) -> None:
+        """
+        도구 호출 한 번을 기록
+
+        Args:
+            tool: 도구 이름
+            duration_s: 소요 시간 (초)
+            result_count: 결과 수 (도구가 보고하지 않았으면 None)
+            response_bytes: 응답 크기 (UTF-8 바이트)
+            error: 예외 발생 여부
+        """
+        with self._lock:
+            stats = self._tools.setdefault(tool, ToolStats())
+            stats.calls += 1
+            stats.latency.observe(duration_s * 1000)
+            stats.total_bytes += response_bytes
+            if error:
+                stats.errors += 1
+            if result_count is not None:
+                stats.total_results += result_count
+                if result_count == 0:
+                    stats.empty_results += 1
+
+    def record_cache(self, cache: str, hit: bool) -> None:
+        """캐시 조회 결과(적중/실패)를 기록"""
+        with self._lock:
+            counters = self._caches.setdefault(cache, {"hits": 0, "misses": 0})
+            counters["hits" if hit else "misses"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 통계를 딕셔너리로 반환"""
+        with self._lock:
+            caches = {}
+            for name, counters in self._caches.items():
+                total = counters["hits"] + counters["misses"]
+                caches[name] = {**counters, "hit_rate": round(counters["hits"] / total, 3) if total else 0.0}
+
+            return {
+                "timestamp": time.time(),
+                "pid": os.getpid(),
+                "uptime_s": round(time.time() - self._started_at, 1),
+                "tools": {name: stats.to_dict() for name, stats in sorted(self._tools.items())},
+                "caches": caches
+            }
+
+    def reset(self) -> None:
+        """모든 통계 초기화"""
+        with self._lock:
+            self._tools.clear()
+            self._caches.clear()
+            self._started_at = time.time()
+
+    def start_periodic_dump(self, path: str, interval_s: float = 60.0) -> None:
+        """
+        통계를 주기적으로 JSONL 파일에 추가 기록하는 백그라운드 스레드 시작
+
+        Args:
+            path: 기록할 파일 경로 (stdout 계열 경로는 허용하지 않음)
+            interval_s: 기록 주기 (초)
+        """
+        if path in ("-", "/dev/stdout", "/dev/fd/1", "/proc/self/fd/1"):
+            raise ValueError("stdout은 MCP 프로토콜 전용이므로 통계 덤프 경로로 사용할 수 없습니다.")
+
+        dump_path = Path(path)
+        dump_path.parent.mkdir(parents=True, exist_ok=True)
+
+        def _loop():
+            while True:
+                time.sleep(interval_s)
+                try:
+                    with open(dump_path, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(self.snapshot(), ensure_ascii=False) + "\n")
+                except OSError as e:
+                    # 디스크가 가득 차거나 경로가 사라져도 스레드는 살려 두고 다음 주기에 다시 시도
+                    logger.warning(f"통계 덤프 기록 실패 ({dump_path}): {e}")
+
+        self._dump_thread = threading.Thread(target=_loop, name="stats-dump", daemon=True)
+        self._dump_thread.start()
+
+
+def note_results(count: int) -> None:
+    """현재 실행 중인 도구의 결과 수를 보고 (도구 함수 안에서 호출)"""
+    call = _current_call.get()
+    if call is not None:
+        call["results"] = count
+
+
+class StatsMiddleware(Middleware):
+    """모든 도구 호출의 지연 시간, 결과 수, 응답 크기를 기록하는 미들웨어"""
+
+    def __init__(self, registry: StatsRegistry):
+        self.registry = registry
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        call: Dict[str, Any] = {"results": None}
+        token = _current_call.set(call)
+        start_time = time.perf_counter()
+
+        try:
+            result = await call_next(context)
+        except Exception:
+            self.registry.record_call(context.message.name, time.perf_counter() - start_time,
+                                      call["results"], 0, error=True)
+            raise
+        finally:
+            _current_call.reset(token)
+
+        response_bytes = sum(len(getattr(block, "text", "").encode('utf-8')) for block in result.content)
+        self.registry.record_call(context.message.name, time.perf_counter() - start_time,
+                                  call["results"], response_bytes)
+        return result
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+벡터 색인(HNSW) 설정 스윕 벤치마크
+- 거리(space)와 HNSW M / construction_ef / search_ef 조합마다 임시 Chroma 컬렉션을 만들어
+  구축 시간, 디스크 크기, 쿼리 지연 시간(p50/p95), 정확 검색(numpy 전수 비교) 대비 recall@k 비교
+- 벡터는 현재 활성 벡터 DB의 임베딩(--vectordb) 또는 군집 구조를 흉내 낸 합성 단위 벡터 사용
+- 쿼리는 말뭉치에서 무작위로 뺀 벡터 (색인에는 넣지 않음)
+- 결과로 목표 재현율을 만족하는 가장 빠른 설정을 utils/config.py 형식으로 출력
+
+사용법:
+    python rag/benchmark_index.py                                   # 합성 벡터 10,000개
+    python rag/benchmark_index.py --vectordb                        # data/vectordb 활성 버전의 임베딩
+    python rag/benchmark_index.py --m 8,16,32 --search-ef 10,50,100 --k 10 --target-recall 0.95
+"""
+
+import sys
+import time
+import shutil
+import tempfile
+import argparse
+import itertools
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import chromadb
+from chromadb.config import Settings
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from rag.vector_store import COLLECTION_NAME, index_metadata
+from utils.benchmark_quantization import synthetic_vectors
+from utils.config import VECTOR_SPACE, HNSW_M, HNSW_CONSTRUCTION_EF, HNSW_SEARCH_EF
+from utils.index_versions import IndexVersions
+
+ADD_BATCH_SIZE = 1000   # Chroma에 한 번에 추가할 벡터 수
+
+
+def load_vectordb(root: Path) -> np.ndarray:
+    """활성 벡터 DB 버전의 임베딩 읽기"""
+    directory = IndexVersions(root).active_dir()
+    client = chromadb.PersistentClient(path=str(directory), settings=Settings(anonymized_telemetry=False))
+    collection = client.get_collection(name=COLLECTION_NAME)
+    batches = []
+    offset = 0
+    while True:
+        rows = collection.get(limit=ADD_BATCH_SIZE, offset=offset, include=['embeddings'])
+        if not len(rows['ids']):
+            break
+        batches.append(np.asarray(rows['embeddings'], dtype=np.float32))
+        offset += len(rows['ids'])
+    if not batches:
+        raise ValueError(f"임베딩이 없습니다: {directory}")
+    return np.concatenate(batches)
+
+
+def exact_top_k(vectors: np.ndarray, queries: np.ndarray, k: int, space: str,
+                block: int = 256) -> Tuple[np.ndarray, float]:
+    """
+    정확 검색 (전수 비교) 상위 k개
+
+    Returns:
+        ((쿼리 수, k) 인덱스 배열, 쿼리당 평균 시간(초))
+    """
+    if space == "cosine":
+        vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    squared_norms = (vectors ** 2).sum(axis=1) if space == "l2" else None
+
+    started = time.perf_counter()
+    results = []
+    for i in range(0, len(queries), block):
+        scores = queries[i:i + block] @ vectors.T
+        if space == "l2":
+            # |x - q|^2 = |x|^2 - 2 q·x + |q|^2 (|q|^2는 순위에 영향 없음)
+            scores = 2 * scores - squared_norms
+        top = np.argpartition(-scores, k, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+        results.append(np.take_along_axis(top, order, axis=1))
+    return np.concatenate(results), (time.perf_counter() - started) / len(queries)
+
+
+def directory_size(path: Path) -> int:
+    """디렉토리 안 파일 크기 합 (바이트)"""
+    return sum(entry.stat().st_size for entry in path.rglob("*") if entry.is_file())
+
+
+def measure(vectors: np.ndarray, queries: np.ndarray, truth: np.ndarray, k: int,
+            metadata: Dict[str, Any]) -> Dict[str, float]:
+    """
+    설정 하나로 임시 컬렉션을 구축하고 측정
+
+    Args:
+        vectors: 색인할 벡터
+        queries: 쿼리 벡터
+        truth: 정확 검색 결과 (쿼리별 상위 k개 인덱스)
+        k: 검색 결과 수
+        metadata: index_metadata() 결과
+
+    Returns:
+        {"build", "size_mb", "p50_ms", "p95_ms", "recall"}
+    """
+    directory = Path(tempfile.mkdtemp(prefix="hnsw_bench_"))
+    try:
+        client = chromadb.PersistentClient(path=str(directory), settings=Settings(anonymized_telemetry=False))
+        collection = client.create_collection(name="benchmark", metadata=metadata)
+
+        started = time.perf_counter()
+        for i in range(0, len(vectors), ADD_BATCH_SIZE):
+            batch = vectors[i:i + ADD_BATCH_SIZE]
+            collection.add(ids=[str(i + j) for j in range(len(batch))], embeddings=batch)
+        build = time.perf_counter() - started
+
+        collection.query(query_embeddings=queries[:1], n_results=k, include=[])   # 색인 로드 (측정 제외)
+        latencies = []
+        hits = 0
+        for query, expected in zip(queries, truth):
+            started = time.perf_counter()
+            ids = collection.query(query_embeddings=query[None, :], n_results=k, include=[])['ids'][0]
+            latencies.append(time.perf_counter() - started)
+            hits += len(set(map(int, ids)) & set(expected.tolist()))
+
+        size = directory_size(directory)
+        if hasattr(client, "clear_system_cache"):
+            client.clear_system_cache()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    return {"build": build, "size_mb": size / 1024 / 1024,
+            "p50_ms": float(np.percentile(latencies, 50)) * 1000, "p95_ms": float(np.percentile(latencies, 95)) * 1000,
+            "recall": hits / (len(queries) * k)}
+
+
+def parse_ints(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="벡터 색인(HNSW) 설정 스윕 벤치마크")
+    parser.add_argument("--vectordb", nargs="?", const=str(project_root / "data" / "vectordb"), default=None,
+                        help="활성 벡터 DB 버전의 임베딩 사용 (경로 생략 시 data/vectordb)")
+    parser.add_argument("--synthetic", type=int, default=10000, help="합성 벡터 수 (--vectordb가 없을 때)")
+    parser.add_argument("--dim", type=int, default=1536, help="합성 벡터 차원 (text-embedding-ada-002는 1536)")
+    parser.add_argument("--queries", type=int, default=200, help="쿼리 수 (말뭉치에서 빼서 사용)")
+    parser.add_argument("--k", type=int, default=10, help="recall@k의 k (검색 결과 수)")
+    parser.add_argument("--spaces", default=VECTOR_SPACE, help="비교할 거리 (예: cosine,l2)")
+    parser.add_argument("--m", default=f"8,{HNSW_M},32", help="비교할 HNSW M 값")
+    parser.add_argument("--construction-ef", default=str(HNSW_CONSTRUCTION_EF), help="비교할 construction_ef 값")
+    parser.add_argument("--search-ef", default=f"{HNSW_SEARCH_EF},50,100", help="비교할 search_ef 값")
+    parser.add_argument("--target-recall", type=float, default=0.95, help="추천 설정이 만족할 최소 재현율")
+    args = parser.parse_args()
+
+    vectors = load_vectordb(Path(args.vectordb)) if args.vectordb else synthetic_vectors(args.synthetic, args.dim)
+    if len(vectors) <= args.queries + args.k:
+        print(f"벡터가 너무 적습니다: {len(vectors)}개 (쿼리 {args.queries}개 + k {args.k})")
+        return False
+    rng = np.random.default_rng(1)
+    order = rng.permutation(len(vectors))
+    queries, vectors = vectors[order[:args.queries]], vectors[order[args.queries:]]
+    spaces = [space.strip() for space in args.spaces.split(",") if space.strip()]
+    grid = list(itertools.product(spaces, parse_ints(args.m), parse_ints(args.construction_ef),
+                                  parse_ints(args.search_ef)))
+
+    print(f"📊 벡터 {len(vectors):,}개 ({vectors.shape[1]}차원, {vectors.nbytes / 1024 / 1024:.0f}MB), "
+          f"쿼리 {len(queries)}개, recall@{args.k}, 설정 {len(grid)}개")
+    truth = {}
+    for space in spaces:
+        truth[space], exact_seconds = exact_top_k(vectors, queries, args.k, space)
+        print(f"  - 정확 검색 ({space}, numpy 전수 비교): 쿼리당 {exact_seconds * 1000:.2f}ms")
+
+    header = (f"\n{'space':>7} {'M':>4} {'c_ef':>5} {'s_ef':>5} {'구축(s)':>8} {'크기(MB)':>9} "
+              f"{'p50(ms)':>8} {'p95(ms)':>8} {'recall':>7}")
+    print(header)
+    results = []
+    for space, m, construction_ef, search_ef in grid:
+        result = measure(vectors, queries, truth[space], args.k, index_metadata(space, m, construction_ef, search_ef))
+        results.append(((space, m, construction_ef, search_ef), result))
+        print(f"{space:>7} {m:>4} {construction_ef:>5} {search_ef:>5} {result['build']:>8.2f} "
+              f"{result['size_mb']:>9.1f} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['recall']:>7.3f}")
+
+    passing = [item for item in results if item[1]["recall"] >= args.target_recall]
+    print(f"\n📋 recall@{args.k} ≥ {args.target_recall} 중 p50 지연 시간이 가장 짧은 설정:")
+    if not passing:
+        print("  - 없음 (search_ef나 M을 더 크게 해서 다시 측정하세요)")
+        return True
+    (space, m, construction_ef, search_ef), result = min(passing, key=lambda item: item[1]["p50_ms"])
+    print(f"  - p50 {result['p50_ms']:.2f}ms, p95 {result['p95_ms']:.2f}ms, recall {result['recall']:.3f}, "
+          f"구축 {result['build']:.1f}s, {result['size_mb']:.1f}MB")
+    print(f'  VECTOR_SPACE = "{space}"\n  HNSW_M = {m}\n  HNSW_CONSTRUCTION_EF = {construction_ef}\n'
+          f'  HNSW_SEARCH_EF = {search_ef}')
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
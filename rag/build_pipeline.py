@@ -0,0 +1,286 @@
+"""
+스트리밍 벡터 DB 구축 모듈
+read → chunk → embed → write 네 단계를 utils/stage_pipeline.py의 크기 제한 큐로 이어서 실행합니다.
+- read: rag_docs 파일(또는 세그먼트 저장소)을 문서 하나씩 읽음
+- chunk: 청크 저장소(utils/chunk_store.py)를 갱신하고(바뀐 문서만 다시 분할), 유사 중복 청크를 빼고 배치로 묶음
+- embed: 여러 스레드가 동시에 임베딩 요청
+- write: 한 스레드가 Chroma에 기록
+메모리에는 큐 크기만큼의 문서/배치만 머물므로 말뭉치가 메모리보다 커도 구축할 수 있고, 파일 읽기와 임베딩 요청,
+Chroma 쓰기가 서로를 기다리지 않고 겹쳐서 실행됩니다.
+대표 청크의 중복 목록은 뒤에 나오는 청크까지 보아야 완성되므로, 모든 청크를 쓴 뒤 대표 청크 메타데이터만 갱신합니다.
+Chroma는 메타데이터를 덮어쓰지 않고 합치므로 모든 청크를 빈 중복 목록과 함께 기록해, 지난 구축의 중복 목록이 남지 않게 합니다.
+중복 탐지 인덱스와 중복 목록, 이번 구축에서 본 문서 목록은 SQLite(청크 저장소 옆의 임시 파일, 청크 저장소의 임시
+테이블)에 두므로 청크 수가 늘어도 메모리에 쌓이지 않습니다.
+
+체크포인트(utils/build_checkpoint.py)를 지정하면 Chroma에 기록을 마친 청크를 배치마다 남기고, 다시 실행할 때
+본문과 메타데이터가 그대로인 청크는 임베딩하지 않습니다. 끝나면 기대 청크 id와 Chroma에 저장된 id를 비교합니다.
+"""
+
+import os
+import json
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from utils.build_checkpoint import BuildCheckpoint
+from utils.chunk_store import ChunkStore, SourceDocument
+from utils.config import BUILD_QUEUE_SIZE, BUILD_EMBED_WORKERS
+from utils.dedup import ChunkDeduplicator
+from utils.doc_store import text_sha
+from utils.stage_pipeline import Stage, StagePipeline
+from .vector_store import EMBEDDING_BATCH_SIZE, EMBEDDING_MODEL, chunk_metadata, duplicate_metadata
+
+# 청크 저장소 형식의 청크 배치 (ChunkStore.iter_chunks 항목 목록)
+Batch = List[Dict[str, Any]]
+
+
+def indexed_metadata(chunk: Dict[str, Any], duplicate_ids: Sequence[str] = ()) -> Dict[str, Any]:
+    """벡터 저장소에 기록할 메타데이터 (중복 목록이 없으면 빈 값으로 기록해 이전 구축의 목록을 지움)"""
+    return {**chunk_metadata(chunk), **duplicate_metadata(list(duplicate_ids))}
+
+
+def metadata_hash(chunk: Dict[str, Any], duplicate_ids: Sequence[str] = ()) -> str:
+    """청크 메타데이터 해시 (문서 크기나 중복 목록이 바뀌면 메타데이터만 갱신)"""
+    return text_sha(json.dumps(indexed_metadata(chunk, duplicate_ids), sort_keys=True, ensure_ascii=False))
+
+
+def written_record(chunk: Dict[str, Any]) -> tuple:
+    """체크포인트에 남길 청크 기록"""
+    return chunk["chunk_id"], chunk["doc_id"], chunk["text_hash"], chunk["meta_hash"]
+
+
+class ChunkStage:
+    """chunk 단계: 문서 → 임베딩할 청크 배치 (중복 탐지 상태를 가지므로 한 스레드에서만 실행)"""
+
+    def __init__(self, chunk_store: ChunkStore, vector_store, checkpoint: Optional[BuildCheckpoint] = None,
+                 deduplicate: bool = True, batch_size: int = EMBEDDING_BATCH_SIZE):
+        """
+        Args:
+            chunk_store: 청크 저장소
+            vector_store: 벡터 저장소 (메타데이터만 바뀐 청크 갱신용)
+            checkpoint: 구축 체크포인트 (이 단계 전용 연결, None이면 모든 청크를 임베딩)
+            deduplicate: 유사 중복 청크는 임베딩하지 않음
+            batch_size: 임베딩 요청 하나에 담을 청크 수
+        """
+        self.chunk_store = chunk_store
+        self.vector_store = vector_store
+        self.checkpoint = checkpoint
+        self.deduplicator = None
+        if deduplicate:
+            # 말뭉치 전체의 대표 청크 인덱스는 디스크에 (구축이 끝나면 close()에서 삭제)
+            handle, path = tempfile.mkstemp(prefix="dedup_", suffix=".sqlite", dir=str(chunk_store.path.parent))
+            os.close(handle)
+            self.deduplicator = ChunkDeduplicator(path=path)
+        self.batch_size = batch_size
+        self.pending: Batch = []
+        chunk_store.clear_seen()
+        self.stats = {"documents": 0, "chunked": 0, "unchanged": 0, "chunks": 0, "duplicates": 0, "resumed": 0, "relabeled": 0}
+
+    def __call__(self, document: SourceDocument) -> Iterator[Batch]:
+        doc_id, source, content = document
+        self.chunk_store.mark_seen(doc_id)
+        self.stats["documents"] += 1
+        if self.chunk_store.update_document(doc_id, source, content) is None:
+            self.stats["unchanged"] += 1
+        else:
+            self.stats["chunked"] += 1
+
+        kept = []
+        for chunk in self.chunk_store.chunks_of(doc_id):
+            self.stats["chunks"] += 1
+            if self.deduplicator:
+                canonical = self.deduplicator.find_or_add(chunk["chunk_id"], chunk["text"])
+                if canonical is not None:
+                    self.stats["duplicates"] += 1
+                    continue
+            chunk["meta_hash"] = metadata_hash(chunk)
+            kept.append(chunk)
+
+        written = {}
+        if self.checkpoint:
+            self.checkpoint.expect(doc_id, [chunk["chunk_id"] for chunk in kept])
+            written = self.checkpoint.written_of(doc_id)
+
+        relabel = []
+        for chunk in kept:
+            previous = written.get(chunk["chunk_id"])
+            if previous == (chunk["text_hash"], chunk["meta_hash"]):
+                self.stats["resumed"] += 1
+                continue
+            if previous and previous[0] == chunk["text_hash"]:
+                relabel.append(chunk)
+                continue
+            self.pending.append(chunk)
+            if len(self.pending) == self.batch_size:
+                yield self.pending
+                self.pending = []
+
+        if relabel:
+            # 본문이 그대로면 임베딩도 그대로이므로 메타데이터만 갱신 (지난 구축의 중복 목록도 지움)
+            self.vector_store.update_metadatas([chunk["chunk_id"] for chunk in relabel],
+                                               [indexed_metadata(chunk) for chunk in relabel])
+            self.checkpoint.mark_written(written_record(chunk) for chunk in relabel)
+            self.stats["relabeled"] += len(relabel)
+
+    def flush(self) -> Iterator[Batch]:
+        """마지막 문서 뒤에 남은 청크 배치"""
+        if self.pending:
+            yield self.pending
+            self.pending = []
+
+    def duplicate_groups(self) -> Iterator[tuple]:
+        """(대표 청크 id, [중복 청크 id]) (중복 제거를 하지 않으면 없음)"""
+        return self.deduplicator.duplicate_groups() if self.deduplicator else iter(())
+
+    def close(self) -> None:
+        """중복 탐지 인덱스 파일 삭제"""
+        if self.deduplicator:
+            self.deduplicator.close()
+
+
+def build_streaming(vector_store, chunk_store: ChunkStore, documents: Iterable[SourceDocument],
+                    checkpoint_path: Optional[Union[str, Path]] = None, deduplicate: bool = True,
+                    embed_workers: int = BUILD_EMBED_WORKERS, queue_size: int = BUILD_QUEUE_SIZE,
+                    batch_size: int = EMBEDDING_BATCH_SIZE) -> Dict[str, Any]:
+    """
+    문서를 읽어 청크 저장소를 갱신하면서 임베딩하여 벡터 저장소에 기록
+
+    Args:
+        vector_store: 벡터 저장소 (get_embeddings, write_embeddings, update_metadatas, delete_ids,
+                      existing_ids, iter_ids, get_collection_info)
+        chunk_store: 청크 저장소 (documents에 없는 문서는 삭제)
+        documents: (문서 id, 출처 경로, 본문) 이터러블 (read 단계 스레드에서 읽음)
+        checkpoint_path: 구축 체크포인트 경로 (None이면 체크포인트 없이 모든 청크를 임베딩)
+        deduplicate: 유사 중복 청크는 임베딩하지 않음
+        embed_workers: 동시 임베딩 요청 수
+        queue_size: 단계 사이 큐에 쌓아 둘 최대 항목 수
+        batch_size: 임베딩 요청 하나에 담을 청크 수
+
+    Returns:
+        {"documents", "chunked", "unchanged", "removed", "chunks", "duplicates", "resumed", "relabeled",
+         "written", "failed", "verification": verify_collection() 결과 (체크포인트가 없으면 None),
+         "elapsed", "stages": 단계별 처리량}
+    """
+    reader = writer = None
+    if checkpoint_path:
+        reader = BuildCheckpoint(checkpoint_path, EMBEDDING_MODEL)
+        writer = BuildCheckpoint(checkpoint_path, EMBEDDING_MODEL)
+        if reader.counts()["written"] and not vector_store.get_collection_info().get('document_count'):
+            print("벡터 저장소가 비어 있어 체크포인트를 비웁니다.")
+            reader.clear()
+        reader.begin_run()
+
+    chunk_stage = None
+    try:
+        chunk_stage = ChunkStage(chunk_store, vector_store, reader, deduplicate, batch_size)
+        lock = threading.Lock()
+        failed_ids = set()
+        written = [0]
+
+        def embed(batch: Batch) -> Optional[List[tuple]]:
+            embeddings = vector_store.get_embeddings([chunk["text"] for chunk in batch])
+            if not embeddings:
+                print(f"임베딩 생성에 실패했습니다: {batch[0]['chunk_id']} 외 {len(batch) - 1}개 청크")
+                with lock:
+                    failed_ids.update(chunk["chunk_id"] for chunk in batch)
+                return None
+            return [(batch, embeddings)]
+
+        def write(item: tuple) -> None:
+            batch, embeddings = item
+            written[0] += vector_store.write_embeddings([chunk["text"] for chunk in batch],
+                                                        [indexed_metadata(chunk) for chunk in batch],
+                                                        [chunk["chunk_id"] for chunk in batch], embeddings)
+            # Chroma 쓰기가 끝난 뒤에 기록 (이 사이에 중단되면 다음 실행에서 이 배치만 다시 임베딩)
+            if writer:
+                writer.mark_written(written_record(chunk) for chunk in batch)
+
+        pipeline = StagePipeline(documents, [
+            Stage("chunk", chunk_stage, flush=chunk_stage.flush, unit="문서"),
+            Stage("embed", embed, workers=embed_workers, count=len, unit="청크"),
+            Stage("write", write, count=lambda item: len(item[0]), unit="청크"),
+        ], queue_size=queue_size, source_unit="문서")
+        run = pipeline.run()
+
+        removed = chunk_store.remove_unseen()
+
+        # 대표 청크 메타데이터에 중복 청크 목록 기록 (임베딩에 실패한 대표 청크는 제외, 배치 단위로 갱신)
+        # 체크포인트에는 중복 목록까지 포함한 해시를 남겨, 다음 구축에서 목록이 사라지거나 바뀌면 다시 기록되게 함
+        ids, metadatas, records = [], [], []
+
+        def update_canonical() -> None:
+            vector_store.update_metadatas(ids, metadatas)
+            if writer:
+                writer.mark_written(records)
+            ids.clear()
+            metadatas.clear()
+            records.clear()
+
+        for canonical, duplicate_ids in chunk_stage.duplicate_groups():
+            if canonical in failed_ids:
+                continue
+            doc_id, _, index = canonical.rpartition("_chunk_")
+            chunk = chunk_store.get_chunk(doc_id, int(index))
+            ids.append(canonical)
+            metadatas.append(indexed_metadata(chunk, duplicate_ids))
+            records.append((canonical, doc_id, chunk["text_hash"], metadata_hash(chunk, duplicate_ids)))
+            if len(ids) == batch_size:
+                update_canonical()
+        if ids:
+            update_canonical()
+
+        verification = verify_collection(vector_store, reader) if reader else None
+    finally:
+        if chunk_stage:
+            chunk_stage.close()
+        for checkpoint in (reader, writer):
+            if checkpoint:
+                checkpoint.close()
+
+    return {**chunk_stage.stats, "removed": removed,
+            "written": written[0], "failed": len(failed_ids), "verification": verification, **run}
+
+
+def verify_collection(vector_store, checkpoint: BuildCheckpoint, sample: int = 10) -> Dict[str, Any]:
+    """
+    기대 청크 id / 체크포인트 / Chroma에 저장된 id를 맞춤
+    (기대하지 않는 청크는 삭제하고, Chroma에 없는 기대 청크는 체크포인트에서 지워 다음 실행에서 다시 임베딩)
+
+    Args:
+        vector_store: 벡터 저장소
+        checkpoint: 구축 체크포인트 (이번 구축의 기대 청크가 기록된 상태)
+        sample: 결과에 담을 누락 청크 id 수
+
+    Returns:
+        {"expected", "stored", "missing", "removed", "missing_ids": 누락 청크 id 일부}
+    """
+    # 체크포인트에는 있지만 이번 구축에서 기대하지 않는 청크 (삭제된 문서, 줄어든 문서, 중복이 된 청크)
+    unexpected = checkpoint.unexpected_ids()
+    if unexpected:
+        vector_store.delete_ids(unexpected)
+        checkpoint.unmark(unexpected)
+
+    expected = present = 0
+    missing_ids: List[str] = []
+    missing = 0
+    for ids in checkpoint.iter_expected():
+        stored = vector_store.existing_ids(ids)
+        lost = [chunk_id for chunk_id in ids if chunk_id not in stored]
+        expected += len(ids)
+        present += len(ids) - len(lost)
+        if lost:
+            checkpoint.unmark(lost)
+            missing += len(lost)
+            missing_ids.extend(lost[:sample - len(missing_ids)])
+
+    # 체크포인트 없이 기록된 청크 (예: 체크포인트 도입 전 구축) 중 기대하지 않는 청크
+    extra: List[str] = []
+    if vector_store.get_collection_info().get('document_count', 0) > present:
+        for ids in vector_store.iter_ids():
+            extra.extend(chunk_id for chunk_id, ok in zip(ids, checkpoint.is_expected(ids)) if not ok)
+        if extra:
+            vector_store.delete_ids(extra)
+
+    return {"expected": expected, "stored": vector_store.get_collection_info().get('document_count', 0),
+            "missing": missing, "removed": len(unexpected) + len(extra), "missing_ids": missing_ids}
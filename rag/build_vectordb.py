@@ -4,10 +4,21 @@
 
 이 스크립트는 data/raw 디렉토리의 마크다운 파일들을 처리하여
 ChromaDB 벡터 데이터베이스를 구축합니다.
+
+--ledger를 지정하면 문서별 chunk → embed → index 진행 상황을 작업 장부에 기록하여
+중단된 구축을 마지막으로 끝난 단계부터 이어서 실행합니다 (활성 버전을 복사한 새 버전에서 바뀐 문서만 교체하고,
+실패한 문서가 없으면 검증 후 전환. 실패가 남으면 다음 실행이 같은 버전에 이어서 구축).
+--store를 지정하면 rag_docs 파일 대신 세그먼트 저장소(data/store/rag)의 문서를 읽습니다.
+청크 분할 결과는 청크 저장소(data/chunks.sqlite)에 남으므로, 다시 구축할 때는 바뀐 문서만 다시 분할합니다.
+구축은 새 버전 디렉토리(data/vectordb/versions/)에서 진행하고, 검증을 마치면 활성 버전을 원자적으로 전환하므로
+구축하는 동안에도 기존 벡터 DB로 검색할 수 있습니다. 새 버전은 활성 버전을 복사해서 시작하여 바뀐 청크만 임베딩하고,
+--fresh를 지정하면 빈 버전에서 모든 청크를 다시 임베딩합니다.
+--resume을 지정하면 중단된 구축 중인 버전에 이어서, 체크포인트에 기록된 청크는 다시 임베딩하지 않고 구축합니다.
 """
 
 import os
 import sys
+import argparse
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -16,12 +27,99 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from rag import RAGSystem
+from rag.ledger_build import BUILD_STAGES, build_with_ledger
+from rag.vector_store import VectorStore, EMBEDDING_MODEL
+from utils.config import LEDGER_PATH, DOC_STORE_DIR, CHUNK_STORE_PATH
+from utils.job_ledger import JobLedger, parse_shard, print_status
 
 load_dotenv()
 
 
+def parse_args() -> argparse.Namespace:
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="RAG 벡터 데이터베이스 구축")
+    parser.add_argument("--ledger", nargs="?", const=str(LEDGER_PATH), default=None,
+                        help=f"작업 장부를 사용해 이어서 구축 (경로 생략 시 {LEDGER_PATH})")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="장부 모드에서 청크/임베딩을 함께 실행할 프로세스 수 (Chroma 쓰기는 한 프로세스)")
+    parser.add_argument("--shard", default=None,
+                        help="장부 모드에서 맡을 샤드 (\"i/n\": n개 노드 중 i번째)")
+    parser.add_argument("--stages", default=",".join(BUILD_STAGES),
+                        help="장부 모드에서 실행할 단계 (예: 다른 노드에서는 chunk,embed만)")
+    parser.add_argument("--store", nargs="?", const=str(DOC_STORE_DIR), default=None,
+                        help=f"rag_docs 파일 대신 세그먼트 저장소의 rag/ 문서를 읽음 (경로 생략 시 {DOC_STORE_DIR})")
+    parser.add_argument("--resume", action="store_true",
+                        help="중단된 구축 중인 버전에 이어서 구축 (기록된 청크는 다시 임베딩하지 않음)")
+    parser.add_argument("--fresh", action="store_true",
+                        help="활성 버전을 복사하지 않고 빈 버전에서 모든 청크를 다시 임베딩")
+    parser.add_argument("--chunks", default=str(CHUNK_STORE_PATH),
+                        help=f"청크 저장소 경로 (기본값: {CHUNK_STORE_PATH})")
+    args = parser.parse_args()
+    args.rag_store = str(Path(args.store) / "rag") if args.store else None
+    return args
+
+
+def build_from_ledger(args: argparse.Namespace) -> bool:
+    """
+    작업 장부를 사용한 구축 (이미 끝난 단계는 건너뜀)
+    index 단계는 활성 버전이 아니라 구축 중인 버전에 기록하므로, 검색하는 쪽은 문서가 지워졌다가 다시 채워지는
+    중간 상태를 보지 않습니다. 실패한 문서가 없으면 검증 후 전환하고, 남으면 다음 실행이 같은 버전에 이어서 구축합니다.
+    """
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = [stage for stage in stages if stage not in BUILD_STAGES]
+    if unknown:
+        print(f"오류: 알 수 없는 단계입니다: {', '.join(unknown)} (가능: {', '.join(BUILD_STAGES)})")
+        return False
+    
+    rag_system = RAGSystem(store_dir=args.rag_store) if "index" in stages else None
+    with JobLedger(args.ledger) as ledger:
+        shards = parse_shard(args.shard, ledger.num_shards)
+    
+    build_store = version = None
+    if rag_system:
+        # 장부의 index 완료 상태는 그 단계를 기록한 버전에만 맞으므로, 장부로 구축하던 버전이 있으면 그대로 이어서 구축
+        version = rag_system.versions.pending("ledger")
+        if version:
+            print(f"장부로 구축하던 버전에 이어서 구축합니다: {version}")
+        else:
+            version = rag_system.versions.create(builder="ledger")
+            print(f"새 버전에 구축합니다: {version} (활성 버전을 복사해서 시작)")
+        build_store = VectorStore(str(rag_system.vectordb_dir), version=version)
+    
+    print(f"\n작업 장부로 구축합니다: {args.ledger} (단계: {', '.join(stages)}, 프로세스 {args.workers}개)")
+    stats = build_with_ledger(args.ledger, str(project_root / "data" / "rag_docs"), build_store,
+                              stages=stages, workers=args.workers, shards=shards, store_dir=args.rag_store)
+    
+    print(f"\n처리 문서: {stats['documents']}개, 완료 단계: {stats['stages']}개, 실패: {stats['failed']}개")
+    with JobLedger(args.ledger) as ledger:
+        print_status(ledger)
+    if not build_store:
+        return stats["failed"] == 0
+    
+    if stats["failed"]:
+        print(f"실패한 문서가 있어 전환하지 않습니다. 검색은 기존 활성 버전을 계속 사용하고, 다시 실행하면 {version}에 "
+              f"이어서 구축합니다.")
+        return False
+    
+    check = build_store.validate()
+    print(f"검색 확인: 저장된 임베딩 {check['checked']}개 중 {check['found']}개가 자기 자신을 찾음")
+    if check['found'] != check['checked']:
+        print(f"검색 확인에 실패하여 전환하지 않습니다 ({version}은 구축 중으로 남음).")
+        return False
+    
+    build_store.build_quantized()
+    chunks = build_store.get_collection_info().get('document_count', 0)
+    rag_system.versions.activate(version, {'chunks': chunks, 'embedding_model': EMBEDDING_MODEL})
+    print(f"활성 버전을 {version}(으)로 전환했습니다 (청크 {chunks}개).")
+    removed = rag_system.versions.gc()
+    if removed:
+        print(f"이전 버전 삭제: {', '.join(removed)}")
+    return True
+
+
 def main():
     """메인 실행 함수"""
+    args = parse_args()
     print("=== RAG 벡터 데이터베이스 구축 ===")
     
     # OpenAI API 키 확인
@@ -30,28 +128,26 @@ def main():
         print("환경변수를 설정하거나 .env 파일을 생성해주세요.")
         return False
     
+    if args.ledger:
+        return build_from_ledger(args)
+    
     # RAG 시스템 초기화
     try:
-        rag_system = RAGSystem()
+        rag_system = RAGSystem(store_dir=args.rag_store, chunk_store_path=args.chunks)
         print("RAG 시스템이 초기화되었습니다.")
     except Exception as e:
         print(f"RAG 시스템 초기화 실패: {e}")
         return False
     
-    # 기존 데이터베이스 정보 확인
+    # 기존 데이터베이스 정보 확인 (구축하는 동안에도 검색에 계속 사용)
     collection_info = rag_system.get_collection_info()
     if collection_info and collection_info.get('document_count', 0) > 0:
-        print(f"기존 벡터 데이터베이스 발견: {collection_info['document_count']}개 문서")
-        response = input("기존 데이터를 삭제하고 새로 구축하시겠습니까? (y/N): ")
-        if response.lower() == 'y':
-            rag_system.reset_database()
-        else:
-            print("작업을 취소했습니다.")
-            return True
+        print(f"현재 활성 벡터 데이터베이스: {collection_info['document_count']}개 청크 "
+              f"(버전: {collection_info.get('version') or '(versions 이전 구조)'})")
     
     # 벡터 데이터베이스 구축
     print("\n벡터 데이터베이스 구축을 시작합니다...")
-    success = rag_system.build_vector_database()
+    success = rag_system.build_vector_database(resume=args.resume, fresh=args.fresh)
     
     if success:
         print("\n=== 구축 완료 ===")
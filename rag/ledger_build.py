@@ -0,0 +1,241 @@
+"""
+작업 장부 기반 벡터 DB 구축 모듈
+rag_docs 문서마다 chunk → embed → index 단계를 utils/job_ledger.py 장부에 기록하여,
+중단되어도 마지막으로 끝난 단계부터 이어서 실행합니다 (청크와 임베딩은 장부에 저장되어 다시 요청하지 않음).
+청크/임베딩 단계는 여러 프로세스나 노드가 나눠 실행하고, Chroma 쓰기(index)는 한 프로세스만 수행합니다.
+store_dir를 지정하면 rag_docs 파일 대신 세그먼트 저장소(utils/doc_store.py)의 문서를 읽습니다.
+"""
+
+import json
+import time
+import random
+import hashlib
+import multiprocessing
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import openai
+
+from utils.config import EMBED_MAX_RETRIES, EMBED_BACKOFF
+from utils.crawler import retry_after_seconds
+from utils.dedup import ChunkDeduplicator
+from utils.doc_store import SegmentStore
+from utils.job_ledger import JobLedger, StageHandler, run_worker
+from utils.text_processor import TextProcessor
+from .vector_store import VectorStore, EMBEDDING_MODEL, EMBEDDING_BATCH_SIZE
+
+BUILD_STAGES = ("chunk", "embed", "index")
+
+# 배치 단위로 다시 시도할 임베딩 오류 (429, 5xx, 연결/타임아웃), 그 밖의 오류는 곧바로 문서 실패로 기록
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError)
+
+
+def file_hash(path: Path) -> str:
+    """파일 내용 해시 (내용이 바뀐 문서만 다시 색인)"""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def register_rag_documents(ledger: JobLedger, data_dir: Path,
+                           store: Optional[SegmentStore] = None) -> Dict[str, int]:
+    """
+    rag_docs 파일을 장부에 등록 (process 단계까지 끝난 것으로 보고, 내용이 바뀐 문서는 chunk부터 다시 실행)
+
+    Args:
+        ledger: 작업 장부
+        data_dir: RAG용 텍스트 디렉토리
+        store: RAG용 세그먼트 저장소 (지정하면 색인의 본문 해시로 등록, 파일은 읽지 않음)
+
+    Returns:
+        JobLedger.register 결과
+    """
+    if store is not None:
+        return ledger.register({key: store.entry(key)["sha"] for key in store.keys()}, completed_stage="process")
+    return ledger.register({path.stem: file_hash(path) for path in sorted(data_dir.glob("*.txt"))},
+                           completed_stage="process")
+
+
+def document_location(data_dir: Path, store_dir: Optional[Path], doc_id: str) -> str:
+    """문서 위치 (메타데이터의 file_path)"""
+    return str(store_dir / doc_id) if store_dir else str(data_dir / f"{doc_id}.txt")
+
+
+def chunk_handler(data_dir: Path, store_dir: Optional[Path] = None) -> StageHandler:
+    """chunk 단계: rag_docs 파일(또는 저장소)을 읽어 청크 목록(JSON)을 만듦 (문서 안의 유사 중복 청크는 제외)"""
+    text_processor = TextProcessor()
+    store = SegmentStore(store_dir) if store_dir else None
+
+    def handle(doc_id: str, load) -> bytes:
+        if store is not None:
+            if doc_id not in store:
+                store.refresh()
+            content = store.get(doc_id)
+            if content is None:
+                raise KeyError(f"저장소에 문서가 없습니다: {doc_id}")
+        else:
+            with open(data_dir / f"{doc_id}.txt", 'r', encoding='utf-8') as f:
+                content = f.read()
+        chunked = text_processor.chunk_with_offsets(content)
+        kept, _ = ChunkDeduplicator().deduplicate([(str(i), chunk["text"]) for i, chunk in enumerate(chunked)])
+        chunks = [chunked[i]["text"] for i in kept]
+        spans = [[chunked[i]["start"], chunked[i]["end"]] for i in kept]
+        return json.dumps({"chunks": chunks, "spans": spans, "size": len(content)},
+                          ensure_ascii=False).encode('utf-8')
+
+    return handle
+
+
+def create_embeddings(client, texts: List[str], model: str = EMBEDDING_MODEL,
+                      max_retries: int = EMBED_MAX_RETRIES, backoff: float = EMBED_BACKOFF) -> List[List[float]]:
+    """
+    배치 하나 임베딩 (429/5xx/연결 오류는 이 배치만 지수 백오프로 재시도, Retry-After가 더 길면 그만큼 대기)
+
+    Args:
+        client: OpenAI 클라이언트
+        texts: 임베딩할 청크 본문
+        model: 임베딩 모델
+        max_retries: 최대 재시도 횟수
+        backoff: 첫 재시도 대기 시간 (초, 재시도마다 두 배)
+
+    Returns:
+        청크별 임베딩
+
+    Raises:
+        openai.OpenAIError: 재시도할 수 없는 오류이거나 재시도 후에도 실패한 경우
+    """
+    attempt = 0
+    while True:
+        try:
+            response = client.embeddings.create(model=model, input=texts)
+            return [item.embedding for item in response.data]
+        except RETRYABLE_ERRORS as e:
+            if attempt >= max_retries:
+                raise
+            attempt += 1
+            response = getattr(e, "response", None)
+            retry_after = retry_after_seconds(response) if response is not None else None
+            delay = backoff * (2 ** (attempt - 1)) * (1 + random.random() * 0.1)
+            time.sleep(max(delay, retry_after or 0.0))
+
+
+def embed_handler(client=None, model: str = EMBEDDING_MODEL, max_retries: int = EMBED_MAX_RETRIES,
+                  backoff: float = EMBED_BACKOFF) -> StageHandler:
+    """
+    embed 단계: 청크를 배치로 임베딩하여 float32 배열로 저장
+    (클라이언트는 작업자마다 하나, 일시적 오류는 배치 단위로 재시도하고 그래도 실패하면 문서 단위로 장부가 재시도)
+    """
+    # 재시도는 create_embeddings가 하므로 클라이언트 자체 재시도는 끔
+    embedding_client = client or openai.OpenAI(max_retries=0)
+
+    def handle(doc_id: str, load) -> bytes:
+        chunks = json.loads(load("chunk"))["chunks"]
+        vectors = array('f')
+        for i in range(0, len(chunks), EMBEDDING_BATCH_SIZE):
+            for embedding in create_embeddings(embedding_client, chunks[i:i + EMBEDDING_BATCH_SIZE], model,
+                                               max_retries, backoff):
+                vectors.extend(embedding)
+        return vectors.tobytes()
+
+    return handle
+
+
+def unpack_embeddings(data: bytes, count: int) -> List[List[float]]:
+    """embed 단계 결과를 청크별 벡터 목록으로 변환"""
+    vectors = array('f')
+    vectors.frombytes(data)
+    if count == 0:
+        return []
+    dims = len(vectors) // count
+    return [vectors[i * dims:(i + 1) * dims].tolist() for i in range(count)]
+
+
+def index_handler(vector_store: VectorStore, data_dir: Path, store_dir: Optional[Path] = None) -> StageHandler:
+    """index 단계: 저장된 청크와 임베딩으로 문서의 청크를 교체 (다시 실행해도 결과가 같음)"""
+    def handle(doc_id: str, load) -> None:
+        chunk_data = json.loads(load("chunk"))
+        chunks = chunk_data["chunks"]
+        embeddings = unpack_embeddings(load("embed"), len(chunks))
+        metadata = {
+            'file_name': doc_id,
+            'source': 'rag_docs',
+            'file_size': chunk_data["size"],
+            'preprocessed_size': chunk_data["size"],
+            'chunk_count': len(chunks)
+        }
+        vector_store.replace_document(doc_id, document_location(data_dir, store_dir, doc_id),
+                                      chunks, embeddings, metadata, chunk_data.get("spans"))
+        return None
+
+    return handle
+
+
+def build_handlers(stages: Sequence[str], data_dir: Path, vector_store: Optional[VectorStore] = None,
+                   store_dir: Optional[Path] = None) -> Dict[str, StageHandler]:
+    """실행할 단계의 함수 모음 (index 단계에는 vector_store 필요)"""
+    handlers: Dict[str, StageHandler] = {}
+    if "chunk" in stages:
+        handlers["chunk"] = chunk_handler(data_dir, store_dir)
+    if "embed" in stages:
+        handlers["embed"] = embed_handler()
+    if "index" in stages:
+        if vector_store is None:
+            raise ValueError("index 단계에는 VectorStore가 필요합니다.")
+        handlers["index"] = index_handler(vector_store, data_dir, store_dir)
+    return handlers
+
+
+def _embedding_worker(ledger_path: str, data_dir: str, shards: Optional[List[int]],
+                      store_dir: Optional[str] = None) -> None:
+    """보조 작업자 프로세스: chunk/embed 단계만 실행 (Chroma에는 쓰지 않음)"""
+    handlers = build_handlers(("chunk", "embed"), Path(data_dir), store_dir=Path(store_dir) if store_dir else None)
+    with JobLedger(ledger_path) as ledger:
+        stats = run_worker(ledger, handlers, shards=shards)
+    print(f"  - 보조 작업자 완료: 문서 {stats['documents']}개, 단계 {stats['stages']}개, 실패 {stats['failed']}개")
+
+
+def build_with_ledger(ledger_path: str, data_dir: str, vector_store: Optional[VectorStore],
+                      stages: Sequence[str] = BUILD_STAGES, workers: int = 1,
+                      shards: Optional[List[int]] = None, store_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    장부를 사용해 벡터 DB 구축 (이미 끝난 단계는 건너뛰고, 실패한 문서는 백오프 후 재시도)
+
+    Args:
+        ledger_path: 장부 파일 경로
+        data_dir: RAG용 텍스트 디렉토리
+        vector_store: 벡터 저장소 (index 단계를 실행하지 않으면 None)
+        stages: 이 프로세스가 실행할 단계
+        workers: chunk/embed를 함께 실행할 프로세스 수 (index는 이 프로세스만 실행)
+        shards: 맡을 샤드 번호 (None이면 전체)
+        store_dir: RAG용 세그먼트 저장소 (지정하면 data_dir 대신 사용)
+
+    Returns:
+        {"registered", "documents", "stages", "failed", "lost", "counts"}
+    """
+    data_path = Path(data_dir)
+    store_path = Path(store_dir) if store_dir else None
+    with JobLedger(ledger_path) as ledger:
+        ledger.release_dead_owners()
+        if store_path:
+            with SegmentStore(store_path) as store:
+                registered = register_rag_documents(ledger, data_path, store)
+        else:
+            registered = register_rag_documents(ledger, data_path)
+        print(f"장부 등록: 새 문서 {registered['added']}개, 내용 변경 {registered['changed']}개")
+
+        helpers = []
+        if workers > 1 and ("chunk" in stages or "embed" in stages):
+            for _ in range(workers - 1):
+                process = multiprocessing.Process(target=_embedding_worker, args=(ledger_path, data_dir, shards, store_dir))
+                process.start()
+                helpers.append(process)
+
+        try:
+            handlers = build_handlers(stages, data_path, vector_store, store_path)
+            stats: Dict[str, Any] = run_worker(ledger, handlers, shards=shards)
+        finally:
+            for process in helpers:
+                process.join()
+
+        stats["registered"] = registered
+        stats["counts"] = ledger.counts()
+    return stats
@@ -38,7 +38,7 @@ class RAGGPTSystem:
             chunk_index = result['metadata']['chunk_index'] + 1
             total_chunks = result['metadata']['total_chunks']
             content = result['document']
-            similarity = 1 - result['distance']
+            similarity = result['similarity']
             
             context_parts.append(f"[문서 {i}] {file_name} (청크 {chunk_index}/{total_chunks}, 유사도: {similarity:.3f})\n{content}")
         
@@ -134,7 +134,7 @@ class RAGGPTSystem:
                 file_name = search_result['metadata']['file_name']
                 chunk_index = search_result['metadata']['chunk_index'] + 1
                 total_chunks = search_result['metadata']['total_chunks']
-                similarity = 1 - search_result['distance']
+                similarity = search_result['similarity']
                 print(f"{i}. {file_name} (청크 {chunk_index}/{total_chunks}, 유사도: {similarity:.3f})")
         
         if result.get('tokens_used'):
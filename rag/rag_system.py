@@ -1,42 +1,112 @@
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from utils.build_checkpoint import BuildCheckpoint, copy_checkpoint
+from utils.chunk_store import ChunkStore, iter_source_documents
+from utils.config import CHUNK_STORE_PATH, BUILD_CHECKPOINT_FILE
+from utils.index_versions import IndexVersions
 from utils.markdown_processor import MarkdownProcessor
-from .vector_store import VectorStore
+from utils.stage_pipeline import print_stage_stats
+from .build_pipeline import build_streaming
+from .vector_store import VectorStore, EMBEDDING_MODEL
 
 
 class RAGSystem:
     """완전한 RAG 시스템 클래스"""
     
-    def __init__(self, data_dir: str = "data/rag_docs", vectordb_dir: str = "data/vectordb"):
+    def __init__(self, data_dir: str = "data/rag_docs", vectordb_dir: str = "data/vectordb",
+                 store_dir: Optional[str] = None, chunk_store_path: str = str(CHUNK_STORE_PATH)):
         self.data_dir = Path(data_dir)
         self.vectordb_dir = Path(vectordb_dir)
+        # 세그먼트 저장소(utils/doc_store.py)의 rag 저장소를 지정하면 data_dir 대신 사용
+        self.store_dir = Path(store_dir) if store_dir else None
+        # 청크 분할 결과 저장소 (utils/chunk_store.py, 바뀐 문서만 다시 분할)
+        self.chunk_store_path = Path(chunk_store_path)
+        # 벡터 DB 버전 (구축은 새 버전에서 하고, 끝나면 ACTIVE 포인터를 바꿔 전환)
+        self.versions = IndexVersions(self.vectordb_dir)
         
-        # 컴포넌트 초기화
+        # 컴포넌트 초기화 (검색용: ACTIVE 포인터를 따라감)
         self.vector_store = VectorStore(str(self.vectordb_dir))
     
-    def build_vector_database(self) -> bool:
-        """RAG용 텍스트 파일들을 처리하여 벡터 데이터베이스를 구축합니다."""
+    def build_vector_database(self, resume: bool = False, fresh: bool = False) -> bool:
+        """
+        RAG용 텍스트 파일들을 read → chunk → embed → write 파이프라인으로 처리하여 새 버전의 벡터 데이터베이스를
+        구축하고, 검증을 마치면 활성 버전으로 전환합니다 (구축하는 동안 검색은 이전 버전을 계속 사용).
+        새 버전은 활성 버전을 복사해서 시작하고 체크포인트에 기록된 청크는 다시 임베딩하지 않으므로,
+        바뀐 청크만 임베딩합니다.
+        
+        Args:
+            resume: 중단된 구축 중인 버전에 이어서 구축 (없으면 새 버전)
+            fresh: 활성 버전을 복사하지 않고 빈 버전에서 모든 청크를 다시 임베딩
+        """
         try:
-            print("RAG용 텍스트 파일 처리 중...")
-            
-            # 텍스트 파일 처리
-            processed_documents = self.process_text_files()
-            
-            if not processed_documents:
-                print("처리할 텍스트 파일이 없습니다.")
-                return False
-            
-            print(f"총 {len(processed_documents)}개의 텍스트 파일이 처리되었습니다.")
-            
-            # 벡터 저장소에 추가
-            print("벡터 저장소에 문서 추가 중...")
-            success = self.vector_store.add_documents(processed_documents)
-            
-            if success:
-                print("벡터 데이터베이스 구축이 완료되었습니다.")
-                self.print_statistics(processed_documents)
+            version = self.versions.pending("streaming") if resume else None
+            if version:
+                print(f"구축 중이던 버전에 이어서 구축합니다: {version}")
+                build_store = VectorStore(str(self.vectordb_dir), version=version)
             else:
-                print("벡터 데이터베이스 구축에 실패했습니다.")
+                # 색인 설정(utils/config.py)이 바뀌었으면 디렉토리 복사 대신 새 색인에 임베딩을 복사
+                self.vector_store.refresh()
+                migrate = not fresh and not self.vector_store.index_matches()
+                version = self.versions.create(seed=not fresh and not migrate)
+                print(f"새 버전에 구축합니다: {version}" + (" (모든 청크를 다시 임베딩)" if fresh else ""))
+                build_store = VectorStore(str(self.vectordb_dir), version=version)
+                if migrate:
+                    print(f"색인 설정이 바뀌었습니다: {self.vector_store.index_config()} → {build_store.index_config()}")
+                    copied = build_store.copy_from(self.vector_store)
+                    copy_checkpoint(self.vector_store.persist_directory / BUILD_CHECKPOINT_FILE,
+                                    self.versions.path(version) / BUILD_CHECKPOINT_FILE)
+                    print(f"기존 임베딩 {copied}개를 새 색인으로 복사했습니다 (다시 임베딩하지 않음).")
+            
+            with ChunkStore(self.chunk_store_path) as chunk_store:
+                print("RAG용 텍스트 파일 처리 및 벡터 저장소 추가 중...")
+                stats = build_streaming(build_store, chunk_store,
+                                        iter_source_documents(self.data_dir, self.store_dir),
+                                        checkpoint_path=self.versions.path(version) / BUILD_CHECKPOINT_FILE)
+                
+                if not stats['documents']:
+                    print("처리할 텍스트 파일이 없습니다.")
+                    return False
+                
+                print(f"총 {stats['documents']}개의 텍스트 파일이 처리되었습니다 "
+                      f"(새로 분할 {stats['chunked']}개, 변경 없음 {stats['unchanged']}개, 삭제 {stats['removed']}개).")
+                print(f"청크 {stats['chunks']}개 중 {stats['written']}개 추가 "
+                      f"(이전 기록 {stats['resumed']}개, 메타데이터만 갱신 {stats['relabeled']}개, "
+                      f"유사 중복 {stats['duplicates']}개 제외, 임베딩 실패 {stats['failed']}개)")
+                
+                verification = stats['verification']
+                print(f"일관성 검사: 기대 청크 {verification['expected']}개, 저장된 청크 {verification['stored']}개, "
+                      f"누락 {verification['missing']}개, 정리 {verification['removed']}개")
+                if verification['missing']:
+                    print(f"누락된 청크 (일부): {', '.join(verification['missing_ids'])}")
+                success = verification['expected'] > 0 and verification['missing'] == 0
+                
+                if success:
+                    check = build_store.validate()
+                    print(f"검색 확인: 저장된 임베딩 {check['checked']}개 중 {check['found']}개가 자기 자신을 찾음")
+                    success = check['found'] == check['checked']
+                
+                if success:
+                    memory = build_store.build_quantized()
+                    if memory:
+                        print(f"양자화 색인({build_store.index_mode}): 메모리 {memory['resident'] / 1024 / 1024:.1f}MB "
+                              f"(float32 {memory['baseline'] / 1024 / 1024:.1f}MB의 1/{memory['ratio']:.0f}), "
+                              f"원본 벡터 메모리 맵 {memory['mapped'] / 1024 / 1024:.1f}MB")
+                
+                if success:
+                    self.versions.activate(version, {'chunks': verification['stored'],
+                                                     'embedding_model': EMBEDDING_MODEL})
+                    self.vector_store.refresh()
+                    print(f"활성 버전을 {version}(으)로 전환했습니다.")
+                    removed = self.versions.gc()
+                    if removed:
+                        print(f"이전 버전 삭제: {', '.join(removed)}")
+                    print("벡터 데이터베이스 구축이 완료되었습니다.")
+                    self.print_statistics(chunk_store)
+                    print_stage_stats(stats)
+                else:
+                    print("벡터 데이터베이스 구축에 실패했습니다.")
+                    print(f"검색은 기존 활성 버전을 계속 사용합니다. 다시 실행하면(--resume) {version}에 이어서 "
+                          f"누락된 청크만 임베딩합니다.")
             
             return success
             
@@ -61,27 +131,21 @@ class RAGSystem:
             print(f"검색 중 오류 발생: {e}")
             return []
     
-    def print_statistics(self, processed_documents: List[Dict[str, Any]]):
-        """처리된 문서들의 통계 정보를 출력합니다."""
-        total_chunks = sum(len(doc['chunks']) for doc in processed_documents)
-        total_files = len(processed_documents)
-        total_original_size = sum(doc['metadata']['file_size'] for doc in processed_documents)
-        total_preprocessed_size = sum(doc['metadata']['preprocessed_size'] for doc in processed_documents)
+    def print_statistics(self, chunk_store: ChunkStore):
+        """청크 저장소에 저장된 문서들의 통계 정보를 출력합니다."""
+        stats = chunk_store.stats()
         
         print("\n=== 처리 통계 ===")
-        print(f"총 파일 수: {total_files}")
-        print(f"총 청크 수: {total_chunks}")
-        print(f"원본 크기: {total_original_size:,} 문자")
-        print(f"전처리 후 크기: {total_preprocessed_size:,} 문자")
-        print(f"압축률: {((total_original_size - total_preprocessed_size) / total_original_size * 100):.1f}%")
+        print(f"총 파일 수: {stats['documents']}")
+        print(f"총 청크 수: {stats['chunks']}")
+        print(f"원본 크기: {stats['document_chars']:,} 문자")
+        print(f"청크 크기 합: {stats['chunk_chars']:,} 문자 (겹침 포함)")
+        print(f"청크 저장소: {self.chunk_store_path} ({stats['chunker']})")
         print(f"벡터 DB 저장 경로: {self.vectordb_dir}")
         
         print("\n파일별 상세 정보:")
-        for doc in processed_documents:
-            original_size = doc['metadata']['file_size']
-            preprocessed_size = doc['metadata']['preprocessed_size']
-            compression_rate = ((original_size - preprocessed_size) / original_size * 100)
-            print(f"  - {doc['file_name']}: {len(doc['chunks'])}개 청크, {original_size:,} → {preprocessed_size:,} 문자 ({compression_rate:.1f}% 압축)")
+        for doc in chunk_store.documents():
+            print(f"  - {doc['doc_id']}: {doc['chunk_count']}개 청크, {doc['size']:,} 문자")
         
         # 벡터 저장소 정보
         collection_info = self.vector_store.get_collection_info()
@@ -90,79 +154,31 @@ class RAGSystem:
             print(f"  - 컬렉션명: {collection_info['collection_name']}")
             print(f"  - 저장된 문서 수: {collection_info['document_count']}")
             print(f"  - 저장 경로: {collection_info['persist_directory']}")
-    
-    def process_text_files(self) -> List[Dict[str, Any]]:
-        """RAG용 텍스트 파일들을 처리합니다."""
-        processed_documents = []
-        
-        # 텍스트 파일들 찾기
-        text_files = list(self.data_dir.glob("*.txt"))
-        
-        if not text_files:
-            print(f"텍스트 파일을 찾을 수 없습니다: {self.data_dir}")
-            return processed_documents
-        
-        for file_path in text_files:
-            try:
-                result = self.process_single_text_file(file_path)
-                if result:
-                    processed_documents.append(result)
-            except Exception as e:
-                print(f"파일 처리 중 오류 발생 ({file_path.name}): {e}")
-                continue
-        
-        return processed_documents
-    
-    def process_single_text_file(self, file_path: Path) -> Dict[str, Any]:
-        """단일 텍스트 파일을 처리합니다."""
-        try:
-            print(f"파일 처리 중: {file_path.name}")
-            
-            # 파일 읽기
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # 청크로 분할
-            from utils.text_processor import TextProcessor
-            text_processor = TextProcessor()
-            chunks = text_processor.split_into_chunks(content)
-            
-            # 메타데이터 생성
-            metadata = {
-                'file_name': file_path.stem,
-                'source': 'rag_docs',
-                'file_size': len(content),
-                'preprocessed_size': len(content),
-                'chunk_count': len(chunks)
-            }
-            
-            result = {
-                'file_path': str(file_path),
-                'file_name': file_path.stem,
-                'original_content': content,
-                'cleaned_text': content,
-                'chunks': chunks,
-                'metadata': metadata
-            }
-            
-            print(f"파일 처리 완료: {len(chunks)}개 청크 생성")
-            return result
-                
-        except Exception as e:
-            print(f"파일 처리 중 오류 발생: {e}")
-            return {}
+            print(f"  - 활성 버전: {collection_info.get('version') or '(versions 이전 구조)'}")
+            index = collection_info['index']
+            print(f"  - 색인: {index['space']} (M={index['M']}, construction_ef={index['construction_ef']}, "
+                  f"search_ef={index['search_ef']})")
+            memory = collection_info.get('quantized')
+            if memory:
+                print(f"  - 양자화 색인: {self.vector_store.index_mode}, 메모리 {memory['resident'] / 1024 / 1024:.1f}MB "
+                      f"(1/{memory['ratio']:.0f})")
+            elif self.vector_store.index_mode != "hnsw":
+                print("  - 양자화 색인: 없음 (Chroma로 검색, 다시 구축하면 만들어짐)")
     
     def get_collection_info(self) -> Dict[str, Any]:
         """벡터 저장소 정보를 반환합니다."""
         return self.vector_store.get_collection_info()
     
     def reset_database(self) -> bool:
-        """벡터 데이터베이스를 초기화합니다."""
+        """활성 벡터 데이터베이스를 초기화합니다 (검색 중인 컬렉션을 지우므로, 재구축에는 build_vector_database(fresh=True) 사용)."""
         try:
             print("벡터 데이터베이스 초기화 중...")
+            checkpoint_path = self.vector_store.persist_directory / BUILD_CHECKPOINT_FILE
             success = self.vector_store.delete_collection()
             
             if success:
+                with BuildCheckpoint(checkpoint_path, EMBEDDING_MODEL) as checkpoint:
+                    checkpoint.clear()
                 # 새로운 벡터 저장소 인스턴스 생성
                 self.vector_store = VectorStore(str(self.vectordb_dir))
                 print("벡터 데이터베이스가 초기화되었습니다.")
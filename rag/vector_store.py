@@ -1,46 +1,244 @@
 import chromadb
 from chromadb.config import Settings
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Any, Dict, List, Optional
 import openai
 import os
+import shutil
 from dotenv import load_dotenv
 
+from utils.config import (VECTOR_SPACE, HNSW_M, HNSW_CONSTRUCTION_EF, HNSW_SEARCH_EF, VECTOR_INDEX_MODE,
+                          QUANTIZED_RESCORE, QUANTIZED_RESCORE_DTYPE)
+from utils.index_versions import IndexVersions
+from utils.quantized_index import QuantizedIndex
+
 load_dotenv()
 
+EMBEDDING_MODEL = "text-embedding-ada-002"
+EMBEDDING_BATCH_SIZE = 50   # 배치 크기 설정 (토큰 제한 고려)
+COLLECTION_NAME = "markdown_documents"
+QUANTIZED_DIR = "quantized"   # Chroma 디렉토리 안의 양자화 색인 (utils/quantized_index.py)
+SPACES = ("cosine", "ip", "l2")
+# 설정 없이 만든 컬렉션의 Chroma 기본값
+DEFAULT_INDEX = {"space": "l2", "M": 16, "construction_ef": 100, "search_ef": 10}
+
+
+def index_metadata(space: str = VECTOR_SPACE, m: int = HNSW_M, construction_ef: int = HNSW_CONSTRUCTION_EF,
+                   search_ef: int = HNSW_SEARCH_EF) -> Dict[str, Any]:
+    """컬렉션을 만들 때 넘길 HNSW 색인 설정 메타데이터"""
+    if space not in SPACES:
+        raise ValueError(f"지원하지 않는 거리입니다: {space} (가능: {', '.join(SPACES)})")
+    return {"hnsw:space": space, "hnsw:M": m, "hnsw:construction_ef": construction_ef, "hnsw:search_ef": search_ef}
+
+
+def index_config(metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """컬렉션 메타데이터 → 색인 설정 {"space", "M", "construction_ef", "search_ef"}"""
+    metadata = metadata or {}
+    return {key: metadata.get(f"hnsw:{key}", default) for key, default in DEFAULT_INDEX.items()}
+
+
+def similarity(distance: float, space: str) -> float:
+    """
+    Chroma 거리 → 유사도 (클수록 비슷함)
+    cosine/ip는 1 - 거리, l2는 거리 제곱을 단위 벡터 기준 코사인 유사도로 환산 (OpenAI 임베딩은 단위 벡터)
+    """
+    if space == "l2":
+        return 1 - distance / 2
+    return 1 - distance
+
+
+def span_metadata(spans: Optional[List[List[int]]], index: int) -> Dict[str, int]:
+    """청크의 원문 글자 오프셋 메타데이터 (오프셋이 없으면 빈 딕셔너리)"""
+    if not spans:
+        return {}
+    start, end = spans[index]
+    return {'char_start': start, 'char_end': end}
+
+
+def chunk_metadata(chunk: Dict[str, Any]) -> Dict[str, Any]:
+    """청크 저장소의 청크 → 벡터 저장소 메타데이터"""
+    return {
+        'file_name': chunk['doc_id'],
+        'file_path': chunk['source'],
+        'chunk_index': chunk['chunk_index'],
+        'total_chunks': chunk['chunk_count'],
+        'char_start': chunk['char_start'],
+        'char_end': chunk['char_end'],
+        'source': 'rag_docs',
+        'file_size': chunk['doc_size'],
+        'preprocessed_size': chunk['doc_size'],
+        'chunk_count': chunk['chunk_count']
+    }
+
+
+def duplicate_metadata(duplicate_ids: List[str]) -> Dict[str, Any]:
+    """대표 청크에 기록할 중복 청크 id와 파일명 (Chroma 메타데이터 값은 스칼라만 허용되므로 쉼표로 이어서 저장)"""
+    files = {chunk_id.rsplit("_chunk_", 1)[0] for chunk_id in duplicate_ids}
+    return {
+        'duplicate_count': len(duplicate_ids),
+        'duplicate_ids': ",".join(duplicate_ids),
+        'duplicate_files': ",".join(sorted(files))
+    }
+
 
 class VectorStore:
     """ChromaDB를 사용한 벡터 저장소 관리 클래스"""
     
-    def __init__(self, persist_directory: str = "data/vectordb"):
-        self.persist_directory = Path(persist_directory)
-        self.persist_directory.mkdir(parents=True, exist_ok=True)
+    def __init__(self, persist_directory: str = "data/vectordb", version: Optional[str] = None,
+                 index: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            persist_directory: 벡터 DB 디렉토리 (버전 디렉토리와 ACTIVE 포인터가 있는 곳)
+            version: 열 버전 (구축용). None이면 ACTIVE 포인터가 가리키는 버전을 열고, 포인터가 바뀌면 다시 엶
+            index: 컬렉션을 새로 만들 때의 색인 설정 (index_metadata() 결과, 기본값은 utils/config.py 설정)
+        """
+        self.versions = IndexVersions(persist_directory)
+        self.versions.root.mkdir(parents=True, exist_ok=True)
+        self.version = version
+        self.index_metadata = index or index_metadata()
+        # "hnsw"면 Chroma로 검색, "int8"/"binary"면 양자화 색인으로 후보를 고르고 원본 벡터로 다시 점수를 매김
+        self.index_mode = VECTOR_INDEX_MODE
+        
+        # OpenAI API 키 확인
+        if not os.getenv("OPENAI_API_KEY"):
+            raise ValueError("OPENAI_API_KEY 환경변수가 설정되지 않았습니다.")
+        
+        self.pointer_stamp = self.versions.pointer_stamp()
+        self.open(self.versions.path(version) if version else self.versions.active_dir())
+    
+    def open(self, directory: Path) -> None:
+        """Chroma 디렉토리를 열고 컬렉션을 가져옵니다."""
+        directory.mkdir(parents=True, exist_ok=True)
         
         # ChromaDB 클라이언트 초기화
-        self.client = chromadb.PersistentClient(
-            path=str(self.persist_directory),
+        client = chromadb.PersistentClient(
+            path=str(directory),
             settings=Settings(
                 anonymized_telemetry=False,
                 allow_reset=True
             )
         )
         
-        # OpenAI API 키 확인
-        if not os.getenv("OPENAI_API_KEY"):
-            raise ValueError("OPENAI_API_KEY 환경변수가 설정되지 않았습니다.")
+        # 컬렉션 가져오기 또는 생성 (색인 설정은 만들 때만 정할 수 있으므로 기존 컬렉션은 그대로 사용)
+        names = [getattr(collection, "name", collection) for collection in client.list_collections()]
+        if COLLECTION_NAME in names:
+            collection = client.get_collection(name=COLLECTION_NAME)
+        else:
+            collection = client.create_collection(
+                name=COLLECTION_NAME,
+                metadata={"description": "마크다운 문서 임베딩 저장소", **self.index_metadata}
+            )
+        quantized, stamp = self.load_quantized(directory)
+        # 검색 중인 스레드는 이전 컬렉션을 그대로 사용하고, 다음 검색부터 새 컬렉션을 사용
+        self.client, self.collection, self.persist_directory = client, collection, directory
+        self.quantized, self.quantized_stamp = quantized, stamp
+    
+    def load_quantized(self, directory: Path) -> tuple:
+        """
+        양자화 색인을 엽니다 (index_mode가 "hnsw"이거나 아직 없으면 (구축 전) None, Chroma로 검색).
+        열 수 없는 색인(예: 청크 id를 ids.json에 두던 이전 형식)도 None이며, 다시 구축하면 새 색인을 엽니다.
         
-        # 컬렉션 생성 또는 가져오기
-        self.collection = self.client.get_or_create_collection(
-            name="markdown_documents",
-            metadata={"description": "마크다운 문서 임베딩 저장소"}
-        )
+        Returns:
+            (QuantizedIndex 또는 None, QuantizedIndex.stamp() 값)
+        """
+        if self.index_mode == "hnsw":
+            return None, None
+        stamp = QuantizedIndex.stamp(directory / QUANTIZED_DIR)
+        if not stamp:
+            return None, stamp
+        try:
+            return QuantizedIndex(directory / QUANTIZED_DIR), stamp
+        except (OSError, ValueError) as e:
+            print(f"양자화 색인을 열 수 없어 Chroma로 검색합니다 (다시 구축하세요): {e}")
+            return None, stamp
+    
+    def refresh(self) -> bool:
+        """
+        ACTIVE 포인터가 바뀌었으면 새 활성 버전을 엽니다 (버전을 지정해서 열었으면 그대로).
+        포인터가 그대로여도 양자화 색인을 그 자리에서 다시 만들었으면 (장부 기반 구축) 양자화 색인만 다시 엽니다.
+        """
+        if self.version:
+            return False
+        stamp = self.versions.pointer_stamp()
+        if stamp == self.pointer_stamp:
+            self.refresh_quantized()
+            return False
+        self.pointer_stamp = stamp
+        directory = self.versions.active_dir()
+        if directory == self.persist_directory:
+            return False
+        self.open(directory)
+        print(f"벡터 DB 활성 버전이 바뀌었습니다: {directory}")
+        return True
+    
+    def refresh_quantized(self) -> bool:
+        """양자화 색인 파일이 바뀌었으면 다시 엽니다 (다시 만드는 중이라 열 수 없으면 다음 검색에서 다시 시도)."""
+        if self.index_mode == "hnsw":
+            return False
+        if QuantizedIndex.stamp(self.persist_directory / QUANTIZED_DIR) == self.quantized_stamp:
+            return False
+        try:
+            self.quantized, self.quantized_stamp = self.load_quantized(self.persist_directory)
+        except (OSError, ValueError):
+            return False
+        return True
+    
+    def index_config(self) -> Dict[str, Any]:
+        """현재 컬렉션의 색인 설정 {"space", "M", "construction_ef", "search_ef"}"""
+        return index_config(self.collection.metadata)
+    
+    def index_matches(self) -> bool:
+        """현재 컬렉션이 설정한 색인 설정으로 만들어졌는지"""
+        return self.index_config() == index_config(self.index_metadata)
+    
+    def copy_from(self, source: "VectorStore", batch_size: int = 1000) -> int:
+        """다른 벡터 저장소의 청크를 임베딩째 복사합니다 (색인 설정만 바뀌었을 때 다시 임베딩하지 않음)."""
+        copied = 0
+        while True:
+            rows = source.collection.get(limit=batch_size, offset=copied,
+                                         include=['embeddings', 'documents', 'metadatas'])
+            if not len(rows['ids']):
+                return copied
+            self.collection.upsert(ids=rows['ids'], embeddings=rows['embeddings'],
+                                   documents=rows['documents'], metadatas=rows['metadatas'])
+            copied += len(rows['ids'])
+    
+    def build_quantized(self, batch_size: int = 1000) -> Dict[str, Any]:
+        """
+        저장된 임베딩으로 양자화 색인을 만듭니다 (임베딩 API는 호출하지 않음, index_mode가 "hnsw"면 색인을 지움).
+        
+        Returns:
+            QuantizedIndex.memory() 결과 (만들지 않았으면 빈 딕셔너리)
+        """
+        directory = self.persist_directory / QUANTIZED_DIR
+        count = self.collection.count()
+        if self.index_mode == "hnsw" or not count:
+            # 활성 버전에서 복사해 온 이전 양자화 색인이 남지 않도록
+            self.quantized, self.quantized_stamp = None, None
+            shutil.rmtree(directory, ignore_errors=True)
+            return {}
+        
+        def batches():
+            offset = 0
+            while offset < count:
+                rows = self.collection.get(limit=batch_size, offset=offset, include=['embeddings'])
+                if not len(rows['ids']):
+                    return
+                yield rows['ids'], rows['embeddings']
+                offset += len(rows['ids'])
+        
+        dim = len(self.collection.get(limit=1, include=['embeddings'])['embeddings'][0])
+        quantized = QuantizedIndex.build(directory, batches(), count, dim, mode=self.index_mode,
+                                         space=self.index_config()['space'], rescore_dtype=QUANTIZED_RESCORE_DTYPE)
+        self.quantized, self.quantized_stamp = quantized, QuantizedIndex.stamp(directory)
+        return quantized.memory()
     
     def get_embeddings(self, texts: List[str]) -> List[List[float]]:
         """OpenAI API를 사용하여 텍스트를 임베딩합니다."""
         try:
             client = openai.OpenAI()
             response = client.embeddings.create(
-                model="text-embedding-ada-002",
+                model=EMBEDDING_MODEL,
                 input=texts
             )
             return [item.embedding for item in response.data]
@@ -48,64 +246,66 @@ class VectorStore:
             print(f"임베딩 생성 중 오류 발생: {e}")
             return []
     
-    def add_documents(self, documents: List[Dict[str, Any]]) -> bool:
-        """문서들을 벡터 저장소에 추가합니다."""
-        try:
-            all_texts = []
-            all_metadatas = []
-            all_ids = []
-            
-            for doc in documents:
-                file_name = doc['file_name']
-                chunks = doc['chunks']
-                
-                for i, chunk in enumerate(chunks):
-                    chunk_id = f"{file_name}_chunk_{i}"
-                    all_ids.append(chunk_id)
-                    all_texts.append(chunk)
-                    all_metadatas.append({
-                        'file_name': file_name,
-                        'file_path': doc['file_path'],
-                        'chunk_index': i,
-                        'total_chunks': len(chunks),
-                        'source': 'markdown',
-                        **doc['metadata']
-                    })
-            
-            # 배치 크기 설정 (토큰 제한 고려)
-            batch_size = 50
-            total_added = 0
-            
-            for i in range(0, len(all_texts), batch_size):
-                batch_texts = all_texts[i:i + batch_size]
-                batch_metadatas = all_metadatas[i:i + batch_size]
-                batch_ids = all_ids[i:i + batch_size]
-                
-                print(f"배치 {i//batch_size + 1} 처리 중... ({len(batch_texts)}개 청크)")
-                
-                # 임베딩 생성
-                embeddings = self.get_embeddings(batch_texts)
-                
-                if not embeddings:
-                    print(f"배치 {i//batch_size + 1} 임베딩 생성에 실패했습니다.")
-                    continue
-                
-                # ChromaDB에 추가
-                self.collection.add(
-                    embeddings=embeddings,
-                    documents=batch_texts,
-                    metadatas=batch_metadatas,
-                    ids=batch_ids
-                )
-                
-                total_added += len(batch_texts)
-            
-            print(f"총 {total_added}개의 청크가 벡터 저장소에 추가되었습니다.")
-            return total_added > 0
-            
-        except Exception as e:
-            print(f"문서 추가 중 오류 발생: {e}")
-            return False
+    def write_embeddings(self, texts: List[str], metadatas: List[Dict[str, Any]], ids: List[str],
+                         embeddings: List[List[float]]) -> int:
+        """임베딩이 끝난 청크 배치를 ChromaDB에 추가합니다 (같은 id가 있으면 덮어써서 다시 실행해도 결과가 같음)."""
+        self.collection.upsert(
+            embeddings=embeddings,
+            documents=texts,
+            metadatas=metadatas,
+            ids=ids
+        )
+        return len(texts)
+    
+    def delete_ids(self, ids: List[str]) -> None:
+        """청크를 id로 삭제합니다."""
+        for i in range(0, len(ids), EMBEDDING_BATCH_SIZE):
+            self.collection.delete(ids=ids[i:i + EMBEDDING_BATCH_SIZE])
+    
+    def existing_ids(self, ids: List[str]) -> set:
+        """ids 중 컬렉션에 저장된 id를 반환합니다."""
+        return set(self.collection.get(ids=ids, include=[])['ids'])
+    
+    def iter_ids(self, batch_size: int = 1000):
+        """컬렉션에 저장된 모든 id를 batch_size개씩 반환합니다."""
+        offset = 0
+        while True:
+            ids = self.collection.get(limit=batch_size, offset=offset, include=[])['ids']
+            if not ids:
+                return
+            yield ids
+            offset += len(ids)
+    
+    def update_metadatas(self, ids: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """이미 추가된 청크의 메타데이터를 바꿉니다 (임베딩은 그대로)."""
+        for i in range(0, len(ids), EMBEDDING_BATCH_SIZE):
+            self.collection.update(ids=ids[i:i + EMBEDDING_BATCH_SIZE],
+                                   metadatas=metadatas[i:i + EMBEDDING_BATCH_SIZE])
+    
+    def replace_document(self, file_name: str, file_path: str, chunks: List[str],
+                         embeddings: List[List[float]], metadata: Dict[str, Any],
+                         spans: Optional[List[List[int]]] = None) -> int:
+        """문서 하나의 청크를 교체합니다 (기존 청크 삭제 후 추가, 다시 실행해도 결과가 같음)."""
+        self.collection.delete(where={"file_name": file_name})
+        
+        for i in range(0, len(chunks), EMBEDDING_BATCH_SIZE):
+            batch_chunks = chunks[i:i + EMBEDDING_BATCH_SIZE]
+            self.collection.add(
+                embeddings=embeddings[i:i + EMBEDDING_BATCH_SIZE],
+                documents=batch_chunks,
+                metadatas=[{
+                    'file_name': file_name,
+                    'file_path': file_path,
+                    'chunk_index': i + j,
+                    'total_chunks': len(chunks),
+                    'source': 'markdown',
+                    **span_metadata(spans, i + j),
+                    **metadata
+                } for j in range(len(batch_chunks))],
+                ids=[f"{file_name}_chunk_{i + j}" for j in range(len(batch_chunks))]
+            )
+        
+        return len(chunks)
     
     def search(self, query: str, n_results: int = 5) -> List[Dict[str, Any]]:
         """쿼리와 유사한 문서를 검색합니다."""
@@ -116,8 +316,13 @@ class VectorStore:
             if not query_embedding:
                 return []
             
-            # 유사도 검색
-            results = self.collection.query(
+            # 유사도 검색 (재구축 후 활성 버전이 바뀌었으면 새 버전에서 검색)
+            self.refresh()
+            collection, quantized = self.collection, self.quantized
+            if quantized:
+                return self.search_quantized(collection, quantized, query_embedding[0], n_results)
+            space = index_config(collection.metadata)['space']
+            results = collection.query(
                 query_embeddings=query_embedding,
                 n_results=n_results,
                 include=['documents', 'metadatas', 'distances']
@@ -129,7 +334,8 @@ class VectorStore:
                 search_results.append({
                     'document': results['documents'][0][i],
                     'metadata': results['metadatas'][0][i],
-                    'distance': results['distances'][0][i]
+                    'distance': results['distances'][0][i],
+                    'similarity': similarity(results['distances'][0][i], space)
                 })
             
             return search_results
@@ -138,19 +344,50 @@ class VectorStore:
             print(f"검색 중 오류 발생: {e}")
             return []
     
+    @staticmethod
+    def search_quantized(collection, quantized: QuantizedIndex, query_embedding: List[float],
+                         n_results: int) -> List[Dict[str, Any]]:
+        """양자화 색인으로 검색하고 본문과 메타데이터는 Chroma에서 id로 가져옵니다."""
+        hits = quantized.search(query_embedding, n_results, rescore=QUANTIZED_RESCORE)
+        rows = collection.get(ids=[chunk_id for chunk_id, _ in hits], include=['documents', 'metadatas'])
+        found = {chunk_id: (document, metadata)
+                 for chunk_id, document, metadata in zip(rows['ids'], rows['documents'], rows['metadatas'])}
+        return [{
+            'document': found[chunk_id][0],
+            'metadata': found[chunk_id][1],
+            'distance': distance,
+            'similarity': similarity(distance, quantized.space)
+        } for chunk_id, distance in hits if chunk_id in found]
+    
     def get_collection_info(self) -> Dict[str, Any]:
         """컬렉션 정보를 반환합니다."""
         try:
-            count = self.collection.count()
+            self.refresh()
+            collection = self.collection
             return {
-                'collection_name': self.collection.name,
-                'document_count': count,
-                'persist_directory': str(self.persist_directory)
+                'collection_name': collection.name,
+                'document_count': collection.count(),
+                'persist_directory': str(self.persist_directory),
+                'version': self.version or self.versions.active(),
+                'index': index_config(collection.metadata),
+                'quantized': self.quantized.memory() if self.quantized else None
             }
         except Exception as e:
             print(f"컬렉션 정보 조회 중 오류 발생: {e}")
             return {}
     
+    def validate(self, sample: int = 5) -> Dict[str, int]:
+        """
+        저장된 청크 몇 개의 임베딩으로 검색하여 자기 자신이 나오는지 확인합니다
+        (전환 전에 새 버전의 색인이 열리고 검색되는지 확인, 임베딩 API는 호출하지 않음).
+        """
+        rows = self.collection.get(limit=sample, include=['embeddings'])
+        if not len(rows['ids']):
+            return {'checked': 0, 'found': 0}
+        results = self.collection.query(query_embeddings=rows['embeddings'], n_results=3, include=[])
+        found = sum(chunk_id in ids for chunk_id, ids in zip(rows['ids'], results['ids']))
+        return {'checked': len(rows['ids']), 'found': found}
+    
     def delete_collection(self) -> bool:
         """컬렉션을 삭제합니다."""
         try:
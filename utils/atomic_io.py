@@ -0,0 +1,67 @@
+"""
+원자적 파일 저장 모듈
+같은 디렉토리의 임시 파일에 쓴 뒤 os.replace로 이름을 바꿔, 중단되어도 반쯤 쓴 파일이 남지 않게 합니다.
+임시 파일은 0600으로 만들어지므로 이름을 바꾸기 전에 open()으로 만든 파일과 같은 권한(기존 파일이 있으면 그 권한)으로 맞춥니다.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Union
+
+PathLike = Union[str, Path]
+
+
+def _read_umask() -> int:
+    """현재 프로세스의 umask (os.umask는 설정과 조회를 함께 하므로 한 번 바꿨다가 되돌림)"""
+    mask = os.umask(0o022)
+    os.umask(mask)
+    return mask
+
+
+# 새 파일 권한 (open()으로 만들 때와 같은 0666 & ~umask, 모듈을 불러올 때 한 번 계산)
+DEFAULT_FILE_MODE = 0o666 & ~_read_umask()
+
+
+def atomic_write_bytes(path: PathLike, data: bytes) -> None:
+    """
+    바이트를 원자적으로 저장
+
+    Args:
+        path: 저장할 파일 경로
+        data: 저장할 내용
+    """
+    _atomic_write(Path(path), data, 'wb', None)
+
+
+def atomic_write_text(path: PathLike, text: str, encoding: str = 'utf-8') -> None:
+    """
+    텍스트를 원자적으로 저장 (open(path, 'w')와 같은 텍스트 모드로 기록)
+
+    Args:
+        path: 저장할 파일 경로
+        text: 저장할 내용
+        encoding: 인코딩
+    """
+    _atomic_write(Path(path), text, 'w', encoding)
+
+
+def _atomic_write(path: Path, data, mode: str, encoding) -> None:
+    """임시 파일에 쓰고 디스크에 내린 뒤 권한을 맞추고 이름을 바꿔 원자적으로 저장"""
+    try:
+        file_mode = path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        file_mode = DEFAULT_FILE_MODE
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, file_mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,221 @@
+"""
+위키피디아 HTML 파싱 벤치마크 스크립트
+- 저장된 위키 페이지(HTML)로 파싱 방식(HTML_PARSERS)별 페이지당 파싱 시간, 전체 변환 시간, 최대 메모리 비교
+- 방식별 변환 결과가 같은지도 함께 확인
+- 최대 메모리는 tracemalloc 기준 파이썬 힙 사용량 (lxml 내부 C 메모리는 포함되지 않음)
+- 저장된 페이지가 없으면 --download 로 받아오거나, 위키 문서 구조를 흉내 낸 합성 페이지 사용
+
+사용법:
+    python utils/benchmark_parsing.py --download          # data/fixtures/wiki_html 에 페이지 저장
+    python utils/benchmark_parsing.py --repeat 5
+    python utils/benchmark_parsing.py --synthetic 4       # 네트워크 없이 합성 페이지로 측정
+"""
+
+import io
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Dict, List
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.config import DATA_ROOT, WIKI_DOCUMENTS, DEFAULT_HEADERS
+from utils.data_parser import WikiDataParser, HTML_PARSERS
+
+FIXTURE_DIR = DATA_ROOT / "fixtures" / "wiki_html"
+
+WORDS = ["신경망", "학습", "모델", "데이터", "알고리즘", "입력", "출력", "가중치", "계층", "함수",
+         "분류", "예측", "특징", "훈련", "오차", "최적화", "확률", "벡터", "행렬", "연산"]
+
+
+def build_synthetic_page(seed: int, sections: int = 12) -> str:
+    """
+    위키피디아 문서 구조를 흉내 낸 합성 HTML 페이지 생성
+    (스킨 헤더/사이드바, 정보상자, 각주, 수식, 목록, 내비게이션 상자, 참고 문헌 포함)
+
+    Args:
+        seed: 난수 시드 (같은 시드면 같은 페이지)
+        sections: 본문 섹션 수
+
+    Returns:
+        HTML 문자열
+    """
+    rng = random.Random(seed)
+
+    def sentence(n: int = 12) -> str:
+        return " ".join(rng.choice(WORDS) for _ in range(n)) + "."
+
+    def link(text: str) -> str:
+        return f'<a href="/wiki/{text}" title="{text}">{text}</a>'
+
+    parts = ['<!DOCTYPE html><html lang="ko"><head><meta charset="UTF-8">',
+             f'<title>합성 문서 {seed} - 위키백과</title>']
+    # 스킨 스크립트/스타일 (본문과 무관한 큰 덩어리)
+    parts.append('<script>' + "var mw=" + "{" + ",".join(f'"k{i}":{i}' for i in range(3000)) + "};</script>")
+    parts.append('<style>' + "".join(f".c{i}{{margin:{i}px}}" for i in range(2000)) + '</style></head><body>')
+    parts.append('<div id="mw-navigation"><ul>' + "".join(f'<li>{link(f"메뉴{i}")}</li>' for i in range(300)) + '</ul></div>')
+    parts.append('<div id="p-lang" class="vector-menu"><ul>' + "".join(
+        f'<li class="interlanguage-link"><a href="https://x{i}.wikipedia.org/" lang="x{i}">'
+        f'<span class="autonym">언어{i}</span></a></li>' for i in range(250)) + '</ul></div>')
+    parts.append(f'<h1 id="firstHeading" class="firstHeading mw-first-heading">'
+                 f'<span class="mw-page-title-main">합성 문서 {seed} (기계 학습)</span></h1>')
+    parts.append('<div id="mw-content-text" class="mw-body-content"><div class="mw-content-ltr mw-parser-output" lang="ko">')
+
+    # 해트노트, 정보상자, 목차
+    parts.append(f'<div role="note" class="hatnote navigation-not-searchable">{sentence(6)}</div>')
+    rows = "".join(f'<tr><th>{rng.choice(WORDS)}</th><td>{link(rng.choice(WORDS))}</td></tr>' for _ in range(15))
+    parts.append(f'<table class="infobox vevent"><tbody>{rows}</tbody></table>')
+    parts.append('<div id="toc" class="toc"><ul>' + "".join(f'<li>{i} 섹션</li>' for i in range(sections)) + '</ul></div>')
+    parts.append(f'<p><b>합성 문서 {seed}</b>는 {sentence(30)}<sup class="reference"><a href="#cite-1">[1]</a></sup></p>')
+
+    for index in range(sections):
+        parts.append(f'<div class="mw-heading mw-heading2"><h2 id="s{index}">{rng.choice(["개요", "역사", "구조", "응용", "원리"])} {index}</h2>'
+                     '<span class="mw-editsection"><span class="mw-editsection-bracket">[</span>'
+                     f'{link("편집")}<span class="mw-editsection-bracket">]</span></span></div>')
+        for _ in range(rng.randint(3, 6)):
+            math = ('<span class="mwe-math-element"><span class="mwe-math-mathml-inline" style="display: none;">'
+                    '<math><semantics><mrow><mi>x</mi><mo>+</mo><mn>1</mn></mrow>'
+                    '<annotation encoding="application/x-tex">{\\displaystyle x+1}</annotation></semantics></math></span>'
+                    '<img class="mwe-math-fallback-image-inline" alt="{\\displaystyle x+1}" src="x.svg"></span>')
+            parts.append(f'<p>{sentence(25)} {math} {link(rng.choice(WORDS))} {sentence(20)}'
+                         f'<sup class="reference"><a href="#cite-{index}">[{index + 2}]</a></sup></p>')
+        if index % 3 == 0:
+            parts.append('<ul>' + "".join(f'<li>{link(rng.choice(WORDS))}: {sentence(8)}</li>' for _ in range(6)) + '</ul>')
+        if index % 4 == 1:
+            parts.append('<div class="mwe-math-element"><img class="mwe-math-fallback-image-display" '
+                         'alt="{\\displaystyle \\sum _{i=1}^{n}w_{i}x_{i}}" src="s.svg"></div>')
+
+    parts.append('<div class="mw-heading mw-heading2"><h2 id="refs">각주</h2></div>')
+    parts.append('<div class="reflist"><ol class="references">' +
+                 "".join(f'<li id="cite-{i}">{sentence(10)}</li>' for i in range(40)) + '</ol></div>')
+    navbox_links = "".join(f'<li>{link(f"항목{i}")}</li>' for i in range(150))
+    parts.append(f'<div role="navigation" class="navbox"><table class="nowraplinks"><tr><td><ul>{navbox_links}</ul></td></tr></table></div>')
+    parts.append('</div></div>')
+    parts.append('<div id="catlinks" class="catlinks"><ul>' + "".join(f'<li>{link(f"분류{i}")}</li>' for i in range(20)) + '</ul></div>')
+    parts.append('<div id="footer"><ul>' + "".join(f'<li>{link(f"정보{i}")}</li>' for i in range(100)) + '</ul></div>')
+    parts.append('</body></html>')
+    return "".join(parts)
+
+
+def download_fixtures(fixture_dir: Path) -> int:
+    """WIKI_DOCUMENTS 페이지를 받아 fixture_dir에 저장 (저장한 파일 수 반환)"""
+    from utils.crawler import WikiCrawler
+
+    fixture_dir.mkdir(parents=True, exist_ok=True)
+
+    def save(keyword, response):
+        (fixture_dir / f"{keyword}.html").write_bytes(response.content)
+        return True
+
+    crawler = WikiCrawler(workers=4, rate_per_host=2.0, burst=2, headers=DEFAULT_HEADERS)
+    try:
+        results = crawler.crawl(WIKI_DOCUMENTS, save)
+    finally:
+        crawler.close()
+
+    for keyword, outcome in results.items():
+        if not outcome["ok"]:
+            print(f"  - {keyword}: 저장 실패 ({outcome['error']})")
+    return sum(1 for outcome in results.values() if outcome["ok"])
+
+
+def load_pages(fixture_dir: Path, synthetic: int) -> Dict[str, bytes]:
+    """벤치마크할 페이지 로드 (저장된 페이지가 없거나 synthetic > 0이면 합성 페이지)"""
+    if synthetic <= 0 and fixture_dir.exists():
+        pages = {path.stem: path.read_bytes() for path in sorted(fixture_dir.glob("*.html"))}
+        if pages:
+            return pages
+
+    count = synthetic if synthetic > 0 else 4
+    print(f"ℹ️  저장된 페이지가 없어 합성 페이지 {count}개를 사용합니다. (--download 로 실제 페이지 저장 가능)")
+    return {f"synthetic{i}": build_synthetic_page(i).encode('utf-8') for i in range(count)}
+
+
+def measure(parser: WikiDataParser, html: bytes, repeat: int):
+    """
+    한 페이지의 파싱 시간, 파싱+변환 시간(각각 최소값)과 최대 메모리 측정
+
+    Returns:
+        (파싱 초, 전체 초, 최대 메모리 바이트, 변환 결과)
+    """
+    best_parse = best_total = float('inf')
+    result = None
+    for _ in range(repeat):
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            parser._parse_content(html)
+            best_parse = min(best_parse, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            result = parser.parse_wikipedia_html(html)
+            best_total = min(best_total, time.perf_counter() - start)
+
+    with redirect_stdout(io.StringIO()):
+        tracemalloc.start()
+        parser.parse_wikipedia_html(html)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return best_parse, best_total, peak, result
+
+
+def main():
+    """메인 실행 함수"""
+    arg_parser = argparse.ArgumentParser(description="위키피디아 HTML 파싱 벤치마크")
+    arg_parser.add_argument("--fixtures", default=str(FIXTURE_DIR), help="저장된 HTML 페이지 디렉토리")
+    arg_parser.add_argument("--download", action="store_true", help="WIKI_DOCUMENTS 페이지를 받아 저장한 뒤 측정")
+    arg_parser.add_argument("--synthetic", type=int, default=0, help="합성 페이지 수 (0이면 저장된 페이지 사용)")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="페이지당 반복 횟수 (최소 시간 사용)")
+    args = arg_parser.parse_args()
+
+    fixture_dir = Path(args.fixtures)
+    if args.download:
+        print(f"📥 페이지 저장: {fixture_dir}")
+        print(f"  - {download_fixtures(fixture_dir)}개 저장")
+
+    pages = load_pages(fixture_dir, args.synthetic)
+    parsers = {mode: WikiDataParser("benchmark", str(DATA_ROOT / "raw"), html_parser=mode) for mode in HTML_PARSERS}
+
+    print(f"\n📊 {len(pages)}개 페이지, 반복 {args.repeat}회 (파싱/전체 ms, 최대 메모리 MB)")
+    header = f"{'페이지':<16}{'크기(KB)':>10}"
+    for mode in HTML_PARSERS:
+        header += f"{mode + ' 파싱':>18}{mode + ' 전체':>18}{mode + ' MB':>14}"
+    print(header + f"{'일치':>6}")
+
+    totals = {mode: {"parse": 0.0, "total": 0.0, "peak": 0} for mode in HTML_PARSERS}
+    mismatches: List[str] = []
+    for name, html in pages.items():
+        row = f"{name:<16}{len(html) / 1024:>10.0f}"
+        outputs = []
+        for mode in HTML_PARSERS:
+            parse_s, total_s, peak, result = measure(parsers[mode], html, args.repeat)
+            totals[mode]["parse"] += parse_s
+            totals[mode]["total"] += total_s
+            totals[mode]["peak"] = max(totals[mode]["peak"], peak)
+            outputs.append(result)
+            row += f"{parse_s * 1000:>18.1f}{total_s * 1000:>18.1f}{peak / 1024 / 1024:>14.1f}"
+        same = all(output == outputs[0] for output in outputs)
+        if not same:
+            mismatches.append(name)
+        print(row + f"{'예' if same else '아니오':>6}")
+
+    baseline, fast = totals["html.parser"], totals["lxml"]
+    print("\n📋 요약 (페이지당 평균)")
+    for mode in HTML_PARSERS:
+        print(f"  - {mode}: 파싱 {totals[mode]['parse'] / len(pages) * 1000:.1f}ms, "
+              f"전체 {totals[mode]['total'] / len(pages) * 1000:.1f}ms, "
+              f"최대 메모리 {totals[mode]['peak'] / 1024 / 1024:.1f}MB")
+    print(f"  - 파싱 속도 향상: {baseline['parse'] / fast['parse']:.1f}배, "
+          f"전체 속도 향상: {baseline['total'] / fast['total']:.1f}배, "
+          f"최대 메모리 감소: {baseline['peak'] / max(fast['peak'], 1):.1f}배")
+    if mismatches:
+        print(f"  ⚠️  변환 결과가 다른 페이지: {', '.join(mismatches)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+양자화 벡터 색인 벤치마크
+- 양자화하지 않은 float32 정확 검색(메모리에 전체 벡터)을 기준으로, int8/binary 양자화 + 원본 벡터 재점수
+  설정별 메모리 상주 크기, 쿼리 지연 시간(p50), recall@k 비교
+- 벡터는 군집 구조를 흉내 낸 합성 단위 벡터, 또는 현재 활성 벡터 DB의 임베딩(--vectordb, chromadb 필요)
+- 쿼리는 말뭉치에서 무작위로 뺀 벡터 (색인에는 넣지 않음)
+
+사용법:
+    python utils/benchmark_quantization.py                          # 합성 벡터 20,000개 (1536차원)
+    python utils/benchmark_quantization.py --vectordb               # data/vectordb 활성 버전의 임베딩
+    python utils/benchmark_quantization.py --modes int8,binary --rescore 1,4,10 --rescore-dtype float32
+"""
+
+import sys
+import time
+import tempfile
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.config import VECTOR_SPACE, QUANTIZED_RESCORE_DTYPE
+from utils.quantized_index import QuantizedIndex, exact_scores
+
+
+def synthetic_vectors(count: int, dim: int, clusters: int = 50, seed: int = 0) -> np.ndarray:
+    """
+    군집 구조를 가진 합성 단위 벡터 (문서 주제별로 모이는 임베딩 흉내)
+
+    Args:
+        count: 벡터 수
+        dim: 차원
+        clusters: 군집 수
+        seed: 난수 시드
+
+    Returns:
+        (count, dim) float32 배열 (행마다 단위 벡터)
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, count)] + 0.6 * rng.standard_normal((count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="양자화 벡터 색인 벤치마크")
+    parser.add_argument("--vectordb", nargs="?", const=str(project_root / "data" / "vectordb"), default=None,
+                        help="활성 벡터 DB 버전의 임베딩 사용 (경로 생략 시 data/vectordb)")
+    parser.add_argument("--synthetic", type=int, default=20000, help="합성 벡터 수 (--vectordb가 없을 때)")
+    parser.add_argument("--dim", type=int, default=1536, help="합성 벡터 차원 (text-embedding-ada-002는 1536)")
+    parser.add_argument("--queries", type=int, default=200, help="쿼리 수 (말뭉치에서 빼서 사용)")
+    parser.add_argument("--k", type=int, default=10, help="recall@k의 k (검색 결과 수)")
+    parser.add_argument("--space", default=VECTOR_SPACE, help="거리 (cosine, ip, l2)")
+    parser.add_argument("--modes", default="int8,binary", help="비교할 양자화 모드")
+    parser.add_argument("--rescore", default="1,4,10,40", help="비교할 재점수 후보 배율 (후보 k × 배율개)")
+    parser.add_argument("--rescore-dtype", default=QUANTIZED_RESCORE_DTYPE, help="원본 벡터 자료형 (float16, float32)")
+    args = parser.parse_args()
+
+    if args.vectordb:
+        from rag.benchmark_index import load_vectordb
+        vectors = load_vectordb(Path(args.vectordb))
+    else:
+        vectors = synthetic_vectors(args.synthetic, args.dim)
+    if len(vectors) <= args.queries + args.k:
+        print(f"벡터가 너무 적습니다: {len(vectors)}개 (쿼리 {args.queries}개 + k {args.k})")
+        return False
+    order = np.random.default_rng(1).permutation(len(vectors))
+    queries, vectors = vectors[order[:args.queries]], vectors[order[args.queries:]]
+    if args.space == "cosine":
+        vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+    # 기준: float32 벡터 전체를 메모리에 두고 정확 검색
+    truth, latencies = [], []
+    for query in queries:
+        started = time.perf_counter()
+        scores = exact_scores(vectors, query, args.space)
+        top = np.argpartition(-scores, args.k)[:args.k]
+        latencies.append(time.perf_counter() - started)
+        truth.append(set(top.tolist()))
+    baseline_mb = vectors.nbytes / 1024 / 1024
+
+    print(f"📊 벡터 {len(vectors):,}개 ({vectors.shape[1]}차원), 쿼리 {len(queries)}개, recall@{args.k}, "
+          f"거리 {args.space}, 원본 벡터 {args.rescore_dtype} 메모리 맵")
+    print(f"\n{'모드':>8} {'재점수':>6} {'상주(MB)':>9} {'축소':>7} {'맵(MB)':>8} {'p50(ms)':>8} {'recall':>7}")
+    print(f"{'float32':>8} {'-':>6} {baseline_mb:>9.1f} {'1.0x':>7} {'-':>8} "
+          f"{np.percentile(latencies, 50) * 1000:>8.2f} {1.0:>7.3f}")
+
+    ids = [str(i) for i in range(len(vectors))]
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in [mode.strip() for mode in args.modes.split(",") if mode.strip()]:
+            batches = ((ids[i:i + 1000], vectors[i:i + 1000]) for i in range(0, len(vectors), 1000))
+            index = QuantizedIndex.build(Path(tmp) / mode, batches, len(vectors), vectors.shape[1],
+                                         mode=mode, space=args.space, rescore_dtype=args.rescore_dtype)
+            memory = index.memory()
+            for rescore in [int(value) for value in args.rescore.split(",") if value.strip()]:
+                hits, latencies = 0, []
+                for query, expected in zip(queries, truth):
+                    started = time.perf_counter()
+                    results = index.search(query, args.k, rescore=rescore)
+                    latencies.append(time.perf_counter() - started)
+                    hits += len({int(chunk_id) for chunk_id, _ in results} & expected)
+                print(f"{mode:>8} {rescore:>6} {memory['resident'] / 1024 / 1024:>9.1f} {memory['ratio']:>6.1f}x "
+                      f"{memory['mapped'] / 1024 / 1024:>8.1f} {np.percentile(latencies, 50) * 1000:>8.2f} "
+                      f"{hits / (len(queries) * args.k):>7.3f}")
+            del index
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,168 @@
+"""
+벡터 DB 구축 체크포인트 모듈
+Chroma에 기록을 마친 청크 id를 (본문 해시, 메타데이터 해시)와 함께 SQLite에 남겨, 중단된 구축을 다시 실행하면
+이미 기록된 청크는 임베딩을 다시 요청하지 않고 건너뜁니다 (rag/build_vectordb.py --resume).
+- Chroma 쓰기(upsert)가 끝난 배치만 기록하므로, 쓰기 도중 중단되어도 다음 실행에서 그 배치만 다시 임베딩
+- 본문이 바뀐 청크는 다시 임베딩, 메타데이터만 바뀐 청크는 메타데이터만 갱신
+- 이번 구축에서 기대하는 청크 id를 함께 기록하여, 끝난 뒤 기대 id / 체크포인트 / Chroma에 저장된 id를 비교
+체크포인트 파일은 벡터 DB 디렉토리 안에 두어 벡터 DB와 함께 지워지게 합니다.
+"""
+
+import time
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS written (
+    chunk_id TEXT PRIMARY KEY,
+    doc_id TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    meta_hash TEXT NOT NULL,
+    written_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS written_doc ON written (doc_id);
+CREATE TABLE IF NOT EXISTS expected (
+    chunk_id TEXT PRIMARY KEY,
+    doc_id TEXT NOT NULL
+);
+"""
+
+# 기록한 청크: (청크 id, 문서 id, 본문 해시, 메타데이터 해시)
+WrittenChunk = Tuple[str, str, str, str]
+
+
+class BuildCheckpoint:
+    """Chroma에 기록된 청크를 추적하는 SQLite 체크포인트 (스레드마다 인스턴스를 따로 열어서 사용)"""
+
+    def __init__(self, path: Union[str, Path], embedding_model: str):
+        """
+        Args:
+            path: SQLite 파일 경로
+            embedding_model: 임베딩 모델 이름 (기록된 모델과 다르면 체크포인트를 비움)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # 구축 파이프라인 단계 스레드로 넘겨 사용할 수 있음 (동시에 두 스레드가 쓰지는 않음)
+        self.conn = sqlite3.connect(str(self.path), timeout=60, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # 기록 완료 표시가 전원이 나가도 남도록 커밋마다 디스크에 반영
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.executescript(SCHEMA)
+
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'embedding_model'").fetchone()
+        if row and row[0] != embedding_model:
+            print(f"임베딩 모델이 바뀌었습니다 ({row[0]} → {embedding_model}): 모든 청크를 다시 임베딩합니다.")
+            self.clear()
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('embedding_model', ?)",
+                          (embedding_model,))
+
+    def _write(self, statement: str, rows: Iterable[tuple]) -> int:
+        """여러 행을 한 트랜잭션으로 기록"""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            count = self.conn.executemany(statement, rows).rowcount
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+        return count
+
+    def written_of(self, doc_id: str) -> Dict[str, Tuple[str, str]]:
+        """문서의 기록된 청크 ({청크 id: (본문 해시, 메타데이터 해시)})"""
+        return {chunk_id: (text_hash, meta_hash) for chunk_id, text_hash, meta_hash in self.conn.execute(
+            "SELECT chunk_id, text_hash, meta_hash FROM written WHERE doc_id = ?", (doc_id,))}
+
+    def mark_written(self, chunks: Iterable[WrittenChunk]) -> int:
+        """Chroma 기록을 마친 청크 표시 (Chroma 쓰기가 끝난 뒤에 호출)"""
+        now = time.time()
+        return self._write("INSERT OR REPLACE INTO written (chunk_id, doc_id, text_hash, meta_hash, written_at) "
+                           "VALUES (?, ?, ?, ?, ?)", [(*chunk, now) for chunk in chunks])
+
+    def unmark(self, chunk_ids: Iterable[str]) -> int:
+        """기록 표시 삭제 (Chroma에 없거나 지운 청크)"""
+        return self._write("DELETE FROM written WHERE chunk_id = ?", [(chunk_id,) for chunk_id in chunk_ids])
+
+    def begin_run(self) -> None:
+        """새 구축 시작 (이전 실행의 기대 청크 목록 삭제)"""
+        self.conn.execute("DELETE FROM expected")
+
+    def expect(self, doc_id: str, chunk_ids: Iterable[str]) -> None:
+        """이번 구축에서 Chroma에 있어야 하는 청크 기록"""
+        self._write("INSERT OR REPLACE INTO expected (chunk_id, doc_id) VALUES (?, ?)",
+                    [(chunk_id, doc_id) for chunk_id in chunk_ids])
+
+    def unexpected_ids(self) -> List[str]:
+        """기록되었지만 이번 구축에서 기대하지 않는 청크 (삭제된 문서, 줄어든 문서의 뒤쪽 청크, 중복이 된 청크)"""
+        return [row[0] for row in self.conn.execute(
+            "SELECT chunk_id FROM written WHERE chunk_id NOT IN (SELECT chunk_id FROM expected)")]
+
+    def missing_ids(self) -> List[str]:
+        """기대하지만 기록되지 않은 청크 (임베딩/쓰기에 실패한 청크)"""
+        return [row[0] for row in self.conn.execute(
+            "SELECT chunk_id FROM expected WHERE chunk_id NOT IN (SELECT chunk_id FROM written)")]
+
+    def iter_expected(self, batch_size: int = 500) -> Iterator[List[str]]:
+        """기대 청크 id를 batch_size개씩 (id 순서)"""
+        last = ""
+        while True:
+            rows = self.conn.execute("SELECT chunk_id FROM expected WHERE chunk_id > ? ORDER BY chunk_id LIMIT ?",
+                                     (last, batch_size)).fetchall()
+            if not rows:
+                return
+            yield [row[0] for row in rows]
+            last = rows[-1][0]
+
+    def is_expected(self, chunk_ids: List[str]) -> List[bool]:
+        """청크 id마다 기대 청크인지"""
+        found = set()
+        for i in range(0, len(chunk_ids), 500):
+            batch = chunk_ids[i:i + 500]
+            found.update(row[0] for row in self.conn.execute(
+                f"SELECT chunk_id FROM expected WHERE chunk_id IN ({','.join('?' * len(batch))})", batch))
+        return [chunk_id in found for chunk_id in chunk_ids]
+
+    def counts(self) -> Dict[str, int]:
+        """{"written": 기록된 청크 수, "expected": 기대 청크 수}"""
+        written = self.conn.execute("SELECT COUNT(*) FROM written").fetchone()[0]
+        expected = self.conn.execute("SELECT COUNT(*) FROM expected").fetchone()[0]
+        return {"written": written, "expected": expected}
+
+    def clear(self) -> None:
+        """체크포인트 비우기 (벡터 DB를 초기화할 때)"""
+        self.conn.execute("DELETE FROM written")
+        self.conn.execute("DELETE FROM expected")
+
+    def close(self) -> None:
+        """연결 종료"""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def copy_checkpoint(source: Union[str, Path], target: Union[str, Path]) -> bool:
+    """
+    체크포인트 복사 (청크를 임베딩째 다른 컬렉션으로 옮길 때 기록도 함께 옮김)
+
+    Args:
+        source: 원본 체크포인트 경로
+        target: 새 체크포인트 경로
+
+    Returns:
+        원본이 있어 복사했는지 여부
+    """
+    if not Path(source).exists():
+        return False
+    Path(target).parent.mkdir(parents=True, exist_ok=True)
+    # 파일 복사 대신 SQLite 백업 (WAL에만 있는 기록까지 포함)
+    with sqlite3.connect(str(source)) as src, sqlite3.connect(str(target)) as dst:
+        src.backup(dst)
+    return True
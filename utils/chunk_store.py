@@ -0,0 +1,312 @@
+"""
+청크 저장소 모듈
+RAG용 문서를 청크로 나눈 결과(청크 id, 본문, 원문 오프셋, 내용 해시, 출처)를 SQLite에 저장하여,
+색인 구축이 매번 문서를 다시 읽고 나누지 않고 저장된 청크를 순서대로 읽어서(스트리밍) 처리하게 합니다.
+- 문서 본문 해시와 청크 설정(CHUNK_SIZE/CHUNK_OVERLAP/CHUNK_SIZE_UNIT)이 같으면 다시 나누지 않음
+- 문서 하나씩 읽고 나눠 저장하므로 말뭉치 전체를 메모리에 올리지 않음
+- 임베딩 모델이나 색인(Chroma, 메모리 색인, 키워드 색인 등)을 바꿔 다시 구축할 때는 iter_chunks만 읽으면 됨
+
+사용 예 (rag_docs 또는 세그먼트 저장소에서 청크 갱신 / 통계):
+    python utils/chunk_store.py update
+    python utils/chunk_store.py update --store
+    python utils/chunk_store.py stats
+"""
+
+import sys
+import time
+import sqlite3
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.config import CHUNK_STORE_PATH, CHUNK_SIZE, CHUNK_OVERLAP, CHUNK_SIZE_UNIT, DOC_STORE_DIR, DATA_ROOT
+from utils.doc_store import SegmentStore, text_sha
+from utils.text_processor import TextProcessor
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    chunker TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    chunk_count INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    doc_id TEXT NOT NULL,
+    chunk_index INTEGER NOT NULL,
+    char_start INTEGER NOT NULL,
+    char_end INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    PRIMARY KEY (doc_id, chunk_index)
+);
+"""
+
+CHUNK_QUERY = ("SELECT c.doc_id, d.source, c.chunk_index, d.chunk_count, c.char_start, c.char_end, c.text, "
+               "c.text_hash, d.size FROM chunks c JOIN documents d ON d.doc_id = c.doc_id")
+
+# 원본 문서: (문서 id, 출처 경로, 본문)
+SourceDocument = Tuple[str, str, str]
+
+
+def chunker_signature() -> str:
+    """청크 설정 식별자 (설정이 바뀌면 모든 문서를 다시 나눔)"""
+    return f"{CHUNK_SIZE_UNIT}:{CHUNK_SIZE}:{CHUNK_OVERLAP}"
+
+
+def chunk_id(doc_id: str, chunk_index: int) -> str:
+    """청크 id (벡터 저장소의 id와 같은 형식)"""
+    return f"{doc_id}_chunk_{chunk_index}"
+
+
+def _chunk_dict(row: tuple) -> Dict[str, Any]:
+    """CHUNK_QUERY 결과 행 → 청크 딕셔너리"""
+    doc_id, source, index, count, start, end, text, text_hash, size = row
+    return {"chunk_id": chunk_id(doc_id, index), "doc_id": doc_id, "source": source, "chunk_index": index,
+            "chunk_count": count, "char_start": start, "char_end": end, "text": text, "text_hash": text_hash,
+            "doc_size": size}
+
+
+def iter_source_documents(data_dir: Union[str, Path], store_dir: Optional[Union[str, Path]] = None
+                          ) -> Iterator[SourceDocument]:
+    """
+    RAG용 문서를 하나씩 읽음
+
+    Args:
+        data_dir: rag_docs 디렉토리 (*.txt)
+        store_dir: 세그먼트 저장소의 rag 디렉토리 (지정하면 data_dir 대신 사용)
+
+    Yields:
+        (문서 id, 출처 경로, 본문)
+    """
+    if store_dir:
+        store_dir = Path(store_dir)
+        if not SegmentStore.exists(store_dir):
+            print(f"문서 저장소를 찾을 수 없습니다: {store_dir}")
+            return
+        with SegmentStore(store_dir) as store:
+            for key in store.keys():
+                yield key, str(store_dir / key), store.get(key)
+        return
+
+    for file_path in sorted(Path(data_dir).glob("*.txt")):
+        yield file_path.stem, str(file_path), file_path.read_text(encoding='utf-8')
+
+
+class ChunkStore:
+    """문서별 청크를 저장하는 SQLite 저장소"""
+
+    def __init__(self, path: Union[str, Path] = CHUNK_STORE_PATH, chunker: Optional[str] = None):
+        """
+        Args:
+            path: SQLite 파일 경로
+            chunker: 청크 설정 식별자 (None이면 현재 config의 chunker_signature())
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.chunker = chunker or chunker_signature()
+        self.text_processor = TextProcessor()
+
+        # 구축 파이프라인의 청크 단계 스레드로 넘겨 사용할 수 있음 (동시에 두 스레드가 쓰지는 않음)
+        self.conn = sqlite3.connect(str(self.path), timeout=60, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def is_current(self, doc_id: str, content_hash: str) -> bool:
+        """같은 본문을 같은 청크 설정으로 이미 나눠 두었는지"""
+        row = self.conn.execute("SELECT content_hash, chunker FROM documents WHERE doc_id = ?", (doc_id,)).fetchone()
+        return row is not None and row[0] == content_hash and row[1] == self.chunker
+
+    def update_document(self, doc_id: str, source: str, content: str) -> Optional[int]:
+        """
+        문서를 청크로 나눠 저장 (본문과 청크 설정이 그대로면 건너뜀)
+
+        Args:
+            doc_id: 문서 id
+            source: 출처 경로
+            content: 본문
+
+        Returns:
+            새로 저장한 청크 수 (건너뛰었으면 None)
+        """
+        content_hash = text_sha(content)
+        if self.is_current(doc_id, content_hash):
+            return None
+
+        chunks = self.text_processor.chunk_with_offsets(content)
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute("DELETE FROM chunks WHERE doc_id = ?", (doc_id,))
+            self.conn.executemany(
+                "INSERT INTO chunks (doc_id, chunk_index, char_start, char_end, text, text_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(doc_id, chunk["index"], chunk["start"], chunk["end"], chunk["text"], text_sha(chunk["text"]))
+                 for chunk in chunks])
+            self.conn.execute(
+                "INSERT OR REPLACE INTO documents (doc_id, source, content_hash, chunker, size, chunk_count, "
+                "updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (doc_id, source, content_hash, self.chunker, len(content), len(chunks), time.time()))
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+        return len(chunks)
+
+    def update(self, documents: Iterable[SourceDocument], remove_missing: bool = True) -> Dict[str, int]:
+        """
+        원본 문서들로 저장소 갱신 (문서 하나씩 처리)
+
+        Args:
+            documents: (문서 id, 출처 경로, 본문) 이터러블
+            remove_missing: documents에 없는 문서의 청크 삭제
+
+        Returns:
+            {"documents", "chunked", "unchanged", "removed", "chunks"}
+        """
+        stats = {"documents": 0, "chunked": 0, "unchanged": 0, "removed": 0, "chunks": 0}
+        self.clear_seen()
+        for doc_id, source, content in documents:
+            self.mark_seen(doc_id)
+            stats["documents"] += 1
+            count = self.update_document(doc_id, source, content)
+            if count is None:
+                stats["unchanged"] += 1
+            else:
+                stats["chunked"] += 1
+                stats["chunks"] += count
+
+        if remove_missing:
+            stats["removed"] = self.remove_unseen()
+        return stats
+
+    def clear_seen(self) -> None:
+        """이번 갱신에서 본 문서 목록 비우기 (연결별 임시 테이블이라 메모리에 모으지 않음)"""
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS seen (doc_id TEXT PRIMARY KEY)")
+        self.conn.execute("DELETE FROM temp.seen")
+
+    def mark_seen(self, doc_id: str) -> None:
+        """이번 갱신에서 본 문서로 기록 (remove_unseen에서 남길 문서)"""
+        self.conn.execute("INSERT OR IGNORE INTO temp.seen (doc_id) VALUES (?)", (doc_id,))
+
+    def remove_unseen(self) -> int:
+        """clear_seen() 뒤로 mark_seen()하지 않은 문서 삭제 (삭제한 문서 수 반환)"""
+        missing = [doc_id for (doc_id,) in self.conn.execute(
+            "SELECT doc_id FROM documents WHERE doc_id NOT IN (SELECT doc_id FROM temp.seen)").fetchall()]
+        for doc_id in missing:
+            self.remove(doc_id)
+        self.conn.execute("DELETE FROM temp.seen")
+        return len(missing)
+
+    def remove_missing(self, seen: Iterable[str]) -> int:
+        """seen에 없는 문서 삭제 (삭제한 문서 수 반환)"""
+        self.clear_seen()
+        for doc_id in seen:
+            self.mark_seen(doc_id)
+        return self.remove_unseen()
+
+    def remove(self, doc_id: str) -> None:
+        """문서와 청크 삭제"""
+        self.conn.execute("BEGIN IMMEDIATE")
+        self.conn.execute("DELETE FROM chunks WHERE doc_id = ?", (doc_id,))
+        self.conn.execute("DELETE FROM documents WHERE doc_id = ?", (doc_id,))
+        self.conn.execute("COMMIT")
+
+    def iter_chunks(self, doc_ids: Optional[Iterable[str]] = None, fetch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        저장된 청크를 문서 id, 청크 순서대로 읽음 (fetch_size개씩 가져오므로 메모리 사용량이 일정)
+
+        Args:
+            doc_ids: 읽을 문서 id (None이면 전체)
+            fetch_size: 한 번에 가져올 행 수
+
+        Yields:
+            {"chunk_id", "doc_id", "source", "chunk_index", "chunk_count", "char_start", "char_end",
+             "text", "text_hash", "doc_size"}
+        """
+        query = CHUNK_QUERY
+        params: list = []
+        if doc_ids is not None:
+            doc_ids = list(doc_ids)
+            query += f" WHERE c.doc_id IN ({','.join('?' * len(doc_ids))})"
+            params = doc_ids
+        query += " ORDER BY c.doc_id, c.chunk_index"
+
+        # 읽는 동안 다른 연결의 쓰기와 섞이지 않도록 별도 연결에서 읽음
+        reader = sqlite3.connect(str(self.path), timeout=60)
+        try:
+            cursor = reader.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield _chunk_dict(row)
+        finally:
+            reader.close()
+
+    def chunks_of(self, doc_id: str) -> List[Dict[str, Any]]:
+        """문서 하나의 청크 (청크 순서, iter_chunks와 같은 형식)"""
+        rows = self.conn.execute(CHUNK_QUERY + " WHERE c.doc_id = ? ORDER BY c.chunk_index", (doc_id,))
+        return [_chunk_dict(row) for row in rows]
+
+    def get_chunk(self, doc_id: str, chunk_index: int) -> Optional[Dict[str, Any]]:
+        """청크 하나 (없으면 None)"""
+        row = self.conn.execute(CHUNK_QUERY + " WHERE c.doc_id = ? AND c.chunk_index = ?",
+                                (doc_id, chunk_index)).fetchone()
+        return _chunk_dict(row) if row else None
+
+    def documents(self) -> Iterator[Dict[str, Any]]:
+        """저장된 문서 목록 (문서 id 순서)"""
+        for doc_id, source, size, count in self.conn.execute(
+                "SELECT doc_id, source, size, chunk_count FROM documents ORDER BY doc_id"):
+            yield {"doc_id": doc_id, "source": source, "size": size, "chunk_count": count}
+
+    def stats(self) -> Dict[str, Any]:
+        """문서 수, 청크 수, 본문/청크 글자 수, 청크 설정"""
+        documents, chars = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM documents").fetchone()
+        chunks, chunk_chars = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(text)), 0) FROM chunks").fetchone()
+        return {"documents": documents, "chunks": chunks, "document_chars": chars, "chunk_chars": chunk_chars,
+                "chunker": self.chunker}
+
+    def close(self) -> None:
+        """연결 종료"""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def main():
+    """청크 저장소 관리 명령 (update / stats)"""
+    parser = argparse.ArgumentParser(description="청크 저장소 관리")
+    parser.add_argument("command", choices=("update", "stats"))
+    parser.add_argument("--path", default=str(CHUNK_STORE_PATH), help=f"청크 저장소 경로 (기본값: {CHUNK_STORE_PATH})")
+    parser.add_argument("--data-dir", default=str(DATA_ROOT / "rag_docs"), help="RAG용 텍스트 파일 디렉토리")
+    parser.add_argument("--store", nargs="?", const=str(DOC_STORE_DIR), default=None,
+                        help=f"rag_docs 파일 대신 세그먼트 저장소의 rag/ 문서를 읽음 (경로 생략 시 {DOC_STORE_DIR})")
+    args = parser.parse_args()
+
+    with ChunkStore(args.path) as chunk_store:
+        if args.command == "update":
+            started = time.perf_counter()
+            store_dir = Path(args.store) / "rag" if args.store else None
+            stats = chunk_store.update(iter_source_documents(args.data_dir, store_dir))
+            print(f"  - 문서 {stats['documents']}개: 새로 분할 {stats['chunked']}개 (청크 {stats['chunks']}개), "
+                  f"변경 없음 {stats['unchanged']}개, 삭제 {stats['removed']}개 "
+                  f"({time.perf_counter() - started:.1f}s)")
+        print(f"  - {chunk_store.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+RAG 청크 분할 모듈
+원문을 복사하지 않고 (시작, 끝) 오프셋만으로 문단 → 문장 단위를 나눈 뒤, 크기 제한 안에서 이어 붙여 청크를 만듭니다.
+- 한국어 문장 경계: '다.', '요?', '!' 등 종결 부호 뒤 공백/줄바꿈 (소수점, 영문 이니셜/약어는 제외)
+- 청크 사이 겹침(overlap): 앞 청크의 마지막 문장들을 다음 청크 앞에 다시 포함 (문장 단위)
+- 크기 단위: 글자 수 또는 토큰 수 (토큰 수는 단위별로 한 번만 세어 누적 합으로 계산)
+- 청크마다 원문의 글자 오프셋을 기록 (하이라이트, 중복 비교에 사용)
+전체 과정은 텍스트 길이에 선형입니다 (두 포인터로 청크 경계를 옮김).
+"""
+
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.config import CHUNK_SIZE, CHUNK_OVERLAP
+
+# 문단 경계 (빈 줄)
+PARAGRAPH_BREAK = re.compile(r'\n[ \t]*\n\s*')
+# 문장 경계: 종결 부호(+닫는 따옴표/괄호) 뒤 공백, 또는 문단 안의 줄바꿈
+SENTENCE_END = re.compile(r'[.?!…。？！]+["\'”’」』)\]]*(?=\s|$)|\n')
+# 문장 끝으로 보지 않는 약어 (마침표 앞 단어)
+ABBREVIATIONS = frozenset({"e.g", "i.e", "vs", "cf", "Dr", "Mr", "Mrs", "Ms", "Prof", "St", "Jr", "Sr", "No", "Fig"})
+# 청크에 포함할 내용이 있는 단어
+WORD = re.compile(r'\S+')
+
+_HANGUL = re.compile(r'[가-힣ㄱ-ㆎ]')
+
+Span = Tuple[int, int]
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 근사값 (OpenAI BPE 기준 한글은 대략 글자당 1토큰, 그 밖의 문자는 4글자당 1토큰)
+
+    정확한 값이 필요하면 tiktoken 등의 인코더로 만든 함수를 chunk_text의 count에 넘기면 됩니다.
+    """
+    hangul = len(_HANGUL.findall(text))
+    others = len(text) - hangul - text.count(' ')
+    return hangul + (others + 3) // 4
+
+
+def _is_abbreviation(text: str, dot: int) -> bool:
+    """dot 위치의 마침표가 영문 이니셜(J. R.)이나 약어(e.g., Dr.) 끝인지"""
+    start = dot
+    while start > 0 and (text[start - 1].isascii() and (text[start - 1].isalpha() or text[start - 1] == '.')):
+        start -= 1
+    word = text[start:dot]
+    return (len(word) == 1 and word.isupper()) or word in ABBREVIATIONS
+
+
+def sentence_spans(text: str, start: int, end: int) -> List[Span]:
+    """
+    text[start:end] 구간의 문장 오프셋 (앞뒤 공백 제외)
+
+    Args:
+        text: 원문
+        start: 구간 시작
+        end: 구간 끝
+
+    Returns:
+        [(문장 시작, 문장 끝)]
+    """
+    spans: List[Span] = []
+    position = start
+    for match in SENTENCE_END.finditer(text, start, end):
+        if match.group() != '\n' and text[match.start()] == '.' and _is_abbreviation(text, match.start()):
+            continue
+        _append_trimmed(text, position, match.end(), spans)
+        position = match.end()
+    _append_trimmed(text, position, end, spans)
+    return spans
+
+
+def _append_trimmed(text: str, start: int, end: int, spans: List[Span]) -> None:
+    """앞뒤 공백을 뺀 구간이 비어 있지 않으면 추가"""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if start < end:
+        spans.append((start, end))
+
+
+def unit_spans(text: str, max_size: int, count: Optional[Callable[[str], int]] = None) -> List[Span]:
+    """
+    청크를 이루는 최소 단위(문장) 오프셋 목록 (max_size보다 긴 문장은 단어 경계에서 나눔)
+
+    Args:
+        text: 원문
+        max_size: 청크 최대 크기
+        count: 크기 함수 (None이면 글자 수)
+
+    Returns:
+        [(시작, 끝)] (원문 순서)
+    """
+    units: List[Span] = []
+    paragraph_start = 0
+    for match in PARAGRAPH_BREAK.finditer(text):
+        _add_units(text, paragraph_start, match.start(), max_size, count, units)
+        paragraph_start = match.end()
+    _add_units(text, paragraph_start, len(text), max_size, count, units)
+    return units
+
+
+def _add_units(text: str, start: int, end: int, max_size: int,
+               count: Optional[Callable[[str], int]], units: List[Span]) -> None:
+    for sentence_start, sentence_end in sentence_spans(text, start, end):
+        if _size(text, sentence_start, sentence_end, count) <= max_size:
+            units.append((sentence_start, sentence_end))
+        else:
+            units.extend(_split_long(text, sentence_start, sentence_end, max_size, count))
+
+
+def _size(text: str, start: int, end: int, count: Optional[Callable[[str], int]]) -> int:
+    return end - start if count is None else count(text[start:end])
+
+
+def _split_long(text: str, start: int, end: int, max_size: int,
+                count: Optional[Callable[[str], int]]) -> List[Span]:
+    """긴 문장을 단어 경계에서 max_size 이하 조각으로 나눔 (공백 없는 긴 단어는 글자 단위로 자름)"""
+    pieces: List[Span] = []
+    piece_start = piece_end = None
+    piece_size = 0
+    for word in WORD.finditer(text, start, end):
+        word_size = _size(text, word.start(), word.end(), count)
+        if piece_start is not None:
+            grown = word.end() - piece_start if count is None else piece_size + word_size
+            if grown <= max_size:
+                piece_end, piece_size = word.end(), grown
+                continue
+            pieces.append((piece_start, piece_end))
+            piece_start = None
+        if word_size > max_size:
+            # 글자 수로 자름 (글자 수 ≥ 토큰 수인 크기 함수라면 토큰 단위에서도 제한을 넘지 않음)
+            pieces.extend((cut, min(cut + max_size, word.end())) for cut in range(word.start(), word.end(), max_size))
+            continue
+        piece_start, piece_end, piece_size = word.start(), word.end(), word_size
+    if piece_start is not None:
+        pieces.append((piece_start, piece_end))
+    return pieces
+
+
+def chunk_text(text: str, max_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP,
+               count: Optional[Callable[[str], int]] = None) -> List[Dict[str, object]]:
+    """
+    텍스트를 문장 단위로 이어 붙여 청크로 분할 (청크 사이는 문장 단위로 겹침)
+
+    Args:
+        text: 분할할 텍스트
+        max_size: 청크 최대 크기 (count 기준)
+        overlap: 다음 청크 앞에 다시 포함할 최대 크기 (0이면 겹치지 않음, max_size보다 작아야 함)
+        count: 크기 함수 (None이면 글자 수, 예: estimate_tokens)
+
+    Returns:
+        [{"index", "start", "end", "text", "size"}] (start/end는 text의 글자 오프셋)
+    """
+    if overlap >= max_size:
+        raise ValueError(f"overlap({overlap})은 max_size({max_size})보다 작아야 합니다.")
+
+    units = unit_spans(text, max_size, count)
+    if not units:
+        return []
+
+    # 크기 누적 합: 글자 단위는 오프셋 차이, 토큰 단위는 문장별로 한 번만 센 값의 누적 합
+    if count is None:
+        def size(first: int, last: int) -> int:
+            return units[last][1] - units[first][0]
+    else:
+        prefix = [0]
+        for unit_start, unit_end in units:
+            prefix.append(prefix[-1] + count(text[unit_start:unit_end]))
+
+        def size(first: int, last: int) -> int:
+            return prefix[last + 1] - prefix[first]
+
+    chunks: List[Dict[str, object]] = []
+    first, last = 0, 0
+    while True:
+        while last + 1 < len(units) and size(first, last + 1) <= max_size:
+            last += 1
+        start, end = units[first][0], units[last][1]
+        chunks.append({"index": len(chunks), "start": start, "end": end,
+                       "text": text[start:end], "size": size(first, last)})
+        if last + 1 >= len(units):
+            return chunks
+
+        # 다음 청크: 앞 청크 끝의 문장들(overlap 이하) + 다음 문장이 들어가는 위치에서 시작
+        following = last + 1
+        while following - 1 > first and size(following - 1, last) <= overlap:
+            following -= 1
+        while following <= last and size(following, last + 1) > max_size:
+            following += 1
+        first = following
+        last = max(last, first)
@@ -13,6 +13,7 @@ PROJECT_ROOT = Path(__file__).parent.parent
 # 데이터 경로 설정
 DATA_ROOT = PROJECT_ROOT / "data"
 RAW_DATA_DIR = DATA_ROOT / "raw"
+HTTP_CACHE_DIR = DATA_ROOT / "http_cache"   # 크롤링 응답 캐시 (ETag/Last-Modified)
 
 # API 설정
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
@@ -22,6 +23,74 @@ DEFAULT_HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
 
+# 세그먼트 문서 저장소 설정 (utils/doc_store.py, 하위 디렉토리 raw/, mcp/, rag/)
+DOC_STORE_DIR = DATA_ROOT / "store"
+DOC_STORE_SEGMENT_BYTES = 64 * 1024 * 1024   # 세그먼트 파일 크기 상한
+DOC_STORE_COMPRESS_MIN = 1024  # 이 크기(바이트) 이상인 문서만 zlib 압축
+
+# 동시 크롤러 설정 (utils/crawler.py)
+CRAWL_WORKERS = 8              # 동시 요청 스레드 수
+CRAWL_RATE_PER_HOST = 5.0      # 호스트별 초당 요청 수
+CRAWL_BURST = 5                # 호스트별 순간 최대 요청 수
+CRAWL_MAX_RETRIES = 3          # 요청당 최대 재시도 횟수
+CRAWL_BACKOFF = 0.5            # 재시도 백오프 기본 대기 시간 (초)
+CRAWL_TIMEOUT = 10             # 요청 타임아웃 (초)
+
+# 수집 파이프라인 설정 (utils/ingest.py)
+INGEST_PROCESSES = os.cpu_count() or 1   # 파싱/전처리 프로세스 수
+
+# 작업 장부 설정 (utils/job_ledger.py)
+LEDGER_PATH = DATA_ROOT / "ingest_ledger.sqlite"   # 문서별 단계 진행 상황
+LEDGER_SHARDS = 64             # 문서 샤드 수 (작업자/노드가 "i/n"으로 나눠 맡음)
+LEDGER_LEASE_SECONDS = 300     # 임대 시간 (단계를 끝낼 때마다 연장)
+LEDGER_CLAIM_BATCH = 200       # 다운로드 스크립트가 한 번에 임대할 문서 수 (초당 5회 제한이면 40초 분량, 임대 시간 안)
+LEDGER_MAX_ATTEMPTS = 3        # 문서당 연속 실패 허용 횟수
+LEDGER_RETRY_BACKOFF = 5.0     # 재시도 기본 대기 시간 (초, 실패할 때마다 두 배)
+
+# 청크 분할 설정 (utils/chunker.py)
+CHUNK_SIZE = 2000              # 청크 최대 크기 (CHUNK_SIZE_UNIT 기준)
+CHUNK_OVERLAP = 200            # 앞 청크 끝에서 다음 청크로 다시 포함할 최대 크기 (문장 단위)
+CHUNK_SIZE_UNIT = "chars"      # "chars" (글자 수) 또는 "tokens" (토큰 수 근사값)
+CHUNK_STORE_PATH = DATA_ROOT / "chunks.sqlite"   # 청크 저장소 (utils/chunk_store.py)
+
+# 벡터 DB 구축 파이프라인 설정 (rag/build_pipeline.py)
+BUILD_QUEUE_SIZE = 8           # 단계 사이 큐에 쌓아 둘 최대 항목 수 (문서 또는 청크 배치)
+BUILD_EMBED_WORKERS = 4        # 동시 임베딩 요청 수
+EMBED_MAX_RETRIES = 5          # 임베딩 배치당 최대 재시도 횟수 (429/5xx/연결 오류, 장부 기반 구축)
+EMBED_BACKOFF = 1.0            # 임베딩 재시도 기본 대기 시간 (초, 재시도마다 두 배, Retry-After가 더 길면 그만큼)
+BUILD_CHECKPOINT_FILE = "build_checkpoint.sqlite"   # 벡터 DB 디렉토리 안의 구축 체크포인트 (utils/build_checkpoint.py)
+
+# 벡터 색인 설정 (rag/vector_store.py, Chroma HNSW - 컬렉션을 만들 때 정해지며 바꾸면 다음 구축에서 임베딩을 새 색인으로 복사)
+# 값은 rag/benchmark_index.py로 말뭉치 크기에 맞는 재현율/지연 시간을 비교해 정함
+VECTOR_SPACE = "cosine"        # 거리: "cosine" (1 - 코사인), "ip" (1 - 내적), "l2" (유클리드 거리 제곱)
+HNSW_M = 16                    # 노드당 최대 이웃 수 (클수록 재현율과 메모리 증가)
+HNSW_CONSTRUCTION_EF = 100     # 색인 구축 시 후보 목록 크기 (클수록 구축이 느리고 색인 품질 향상)
+HNSW_SEARCH_EF = 10            # 검색 시 후보 목록 크기 (클수록 재현율 증가, 지연 시간 증가, 최소 n_results)
+
+# 양자화 검색 설정 (utils/quantized_index.py, utils/benchmark_quantization.py로 재현율/메모리 비교)
+VECTOR_INDEX_MODE = "hnsw"     # "hnsw" (Chroma 검색), "int8" (1/4 메모리), "binary" (1/32 메모리) + 원본 벡터 재점수
+QUANTIZED_RESCORE = 4          # 원본 벡터로 다시 점수를 매길 후보 수 배율 (후보 n_results × 배율개)
+QUANTIZED_RESCORE_DTYPE = "float16"   # 메모리 맵 원본 벡터 자료형 ("float16" 또는 "float32")
+
+# 벡터 DB 버전 설정 (utils/index_versions.py)
+INDEX_ACTIVE_FILE = "ACTIVE"   # 검색에 사용할 버전을 가리키는 포인터 파일 (벡터 DB 디렉토리 안)
+INDEX_KEEP_VERSIONS = 2        # 남길 완료된 버전 수 (활성 버전 포함, 나머지는 전환 후 삭제)
+INDEX_GC_GRACE_SECONDS = 600   # 활성 버전에서 물러난 버전을 삭제하기 전 기다리는 시간 (검색하는 쪽이 전환할 시간)
+
+# 유사 중복 청크 제거 설정 (utils/dedup.py)
+DEDUP_THRESHOLD = 0.8          # 중복으로 볼 최소 자카드 유사도 (글자 5-gram 기준)
+DEDUP_NUM_PERM = 128           # MinHash 서명 길이
+DEDUP_BANDS = 32               # LSH 밴드 수 (밴드당 4행)
+DEDUP_SHINGLE_SIZE = 5         # k-gram 글자 수
+
+# GPT 요약 설정 (utils/summarizer.py)
+SUMMARY_MODEL = "gpt-3.5-turbo"
+SUMMARY_CACHE_DIR = DATA_ROOT / "summary_cache"   # 본문 해시별 요약 캐시
+SUMMARY_CONCURRENCY = 4        # 최대 동시 요청 수
+SUMMARY_BATCH_SIZE = 10        # 한 요청에 묶을 최대 문서 수
+SUMMARY_BATCH_DOC_CHARS = 2000 # 이 길이 이하의 문서만 묶음
+SUMMARY_BATCH_CHARS = 12000    # 한 묶음의 본문 길이 합 상한
+
 # 위키피디아 문서 목록
 WIKI_DOCUMENTS = {
     "인공지능": "https://ko.wikipedia.org/wiki/인공지능",
@@ -36,3 +105,18 @@ WIKI_DOCUMENTS = {
     "alphago": "https://ko.wikipedia.org/wiki/알파고",
     "강화학습": "https://ko.wikipedia.org/wiki/강화_학습"
 }
+
+# 위키피디아 문서 제목 → 영어명 매핑 (MCP 서버의 제목 별칭에도 사용)
+WIKI_ENGLISH_NAMES = {
+    "인공지능": "Artificial Intelligence",
+    "기계 학습": "Machine Learning",
+    "딥 러닝": "Deep Learning",
+    "합성곱 신경망": "CNN",
+    "순환 신경망": "RNN",
+    "장단기 메모리": "LSTM",
+    "게이트 순환 유닛": "GRU",
+    "트랜스포머 (기계 학습)": "Transformer",
+    "GPT (언어 모델)": "GPT",
+    "알파고": "AlphaGo",
+    "강화 학습": "Reinforcement Learning"
+}
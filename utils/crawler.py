@@ -0,0 +1,313 @@
+"""
+동시 크롤러 모듈
+- 스레드 풀 + 공유 keep-alive 세션 (호스트별 커넥션 풀 재사용)
+- 호스트별 토큰 버킷 속도 제한 (재시도 요청도 토큰을 소모)
+- 지수 백오프 재시도 (429/5xx, 연결 오류, Retry-After 헤더 존중)
+- 진행률 및 처리량 보고
+- 선택적 HTTP 조건부 요청 캐시 (304 응답이면 본문 재전송 없음)
+"""
+
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.http_cache import HttpCache, NOT_MODIFIED
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """토큰 버킷 (초당 rate개 보충, 최대 burst개 저장, 스레드 안전)"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Args:
+            rate: 초당 허용 요청 수
+            burst: 한 번에 몰아서 보낼 수 있는 최대 요청 수
+        """
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다.")
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        토큰 하나를 얻을 때까지 대기
+
+        Returns:
+            대기한 시간 (초)
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class HostRateLimiter:
+    """호스트별 토큰 버킷 모음"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> float:
+        """URL의 호스트 버킷에서 토큰 하나를 얻음 (대기 시간 반환)"""
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return bucket.acquire()
+
+
+def create_session(pool_size: int = 10, headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    """
+    keep-alive 커넥션 풀을 가진 공유 세션 생성
+
+    Args:
+        pool_size: 호스트당 유지할 커넥션 수 (워커 수 이상 권장)
+        headers: 기본 요청 헤더
+
+    Returns:
+        requests.Session
+    """
+    session = requests.Session()
+    # 재시도는 WikiCrawler가 속도 제한을 거쳐 직접 수행
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def retry_after_seconds(response) -> Optional[float]:
+    """Retry-After 헤더를 초 단위로 변환 (requests/httpx 응답, 없거나 해석 불가면 None)"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CrawlProgress:
+    """진행률/처리량 집계 (스레드 안전)"""
+
+    def __init__(self, total: int, report_every: float = 5.0):
+        self.total = total
+        self.report_every = report_every
+        self.done = 0
+        self.failed = 0
+        self.not_modified = 0
+        self.retries = 0
+        self.bytes = 0
+        self.wait_s = 0.0
+        self.started_at = time.monotonic()
+        self._last_report = self.started_at
+        self._lock = threading.Lock()
+
+    def add_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_s += seconds
+
+    def add_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def finish(self, size: int, ok: bool, not_modified: bool = False) -> None:
+        """작업 하나 완료를 기록하고 주기가 되면 진행률 출력"""
+        with self._lock:
+            self.done += 1
+            self.bytes += size
+            if not ok:
+                self.failed += 1
+            if not_modified:
+                self.not_modified += 1
+            now = time.monotonic()
+            if self.done == self.total or now - self._last_report >= self.report_every:
+                self._last_report = now
+                print(f"  [{self.done}/{self.total}] {self.summary()}")
+
+    def summary(self) -> str:
+        """처리량 요약 문자열"""
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return (f"{self.done / elapsed:.2f} pages/s, {self.bytes / elapsed / 1024:.1f} KB/s, "
+                f"변경 없음 {self.not_modified}, 실패 {self.failed}, 재시도 {self.retries}, "
+                f"속도 제한 대기 {self.wait_s:.1f}s, 경과 {elapsed:.1f}s")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """통계 딕셔너리"""
+        elapsed = time.monotonic() - self.started_at
+        return {
+            "total": self.total,
+            "done": self.done,
+            "failed": self.failed,
+            "not_modified": self.not_modified,
+            "retries": self.retries,
+            "bytes": self.bytes,
+            "rate_limit_wait_s": round(self.wait_s, 3),
+            "elapsed_s": round(elapsed, 3),
+            "pages_per_s": round(self.done / elapsed, 3) if elapsed > 0 else 0.0
+        }
+
+
+class WikiCrawler:
+    """공유 세션과 호스트별 속도 제한을 쓰는 스레드 풀 크롤러"""
+
+    def __init__(self, workers: int = 8, rate_per_host: float = 5.0, burst: int = 5,
+                 max_retries: int = 3, backoff: float = 0.5, timeout: float = 10.0,
+                 headers: Optional[Dict[str, str]] = None, session: Optional[requests.Session] = None,
+                 cache: Optional[HttpCache] = None):
+        """
+        Args:
+            workers: 동시 요청 스레드 수
+            rate_per_host: 호스트별 초당 요청 수 (크롤링 예의 정책)
+            burst: 호스트별 순간 최대 요청 수
+            max_retries: 요청당 최대 재시도 횟수
+            backoff: 백오프 기본 대기 시간 (초, 시도마다 2배)
+            timeout: 요청 타임아웃 (초)
+            headers: 기본 요청 헤더
+            session: 외부에서 만든 세션 (없으면 생성)
+            cache: 조건부 요청 캐시 (있으면 ETag/Last-Modified로 재검증)
+        """
+        self.workers = max(1, workers)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.limiter = HostRateLimiter(rate_per_host, burst)
+        self.session = session or create_session(self.workers, headers)
+        self.cache = cache
+        self.progress: Optional[CrawlProgress] = None
+
+    def fetch(self, url: str, update_cache: bool = True, **kwargs) -> requests.Response:
+        """
+        속도 제한과 재시도를 적용하여 URL 하나를 GET
+
+        Args:
+            url: 요청 URL
+            update_cache: 받은 응답을 바로 캐시에 기록 (False면 호출한 쪽이 처리를 마친 뒤 update_cache())
+            **kwargs: session.get에 넘길 추가 인자 (headers 등)
+
+        Returns:
+            성공 응답 (2xx/3xx, 캐시를 쓰면 변경이 없을 때 304)
+
+        Raises:
+            requests.RequestException: 재시도 후에도 실패한 경우
+        """
+        if self.cache:
+            kwargs["headers"] = {**self.cache.conditional_headers(url), **kwargs.get("headers", {})}
+
+        attempt = 0
+        while True:
+            waited = self.limiter.acquire(url)
+            if self.progress:
+                self.progress.add_wait(waited)
+
+            retry_after = None
+            try:
+                response = self.session.get(url, timeout=self.timeout, **kwargs)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    if update_cache:
+                        self.update_cache(url, response)
+                    return response
+                retry_after = retry_after_seconds(response)
+                error: Exception = requests.HTTPError(f"{response.status_code} 응답: {url}", response=response)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+
+            if attempt >= self.max_retries:
+                raise error
+
+            attempt += 1
+            if self.progress:
+                self.progress.add_retry()
+            delay = self.backoff * (2 ** (attempt - 1)) * (1 + random.random() * 0.1)
+            time.sleep(max(delay, retry_after or 0.0))
+
+    def update_cache(self, url: str, response: requests.Response) -> None:
+        """응답의 검증자(ETag/Last-Modified)와 본문을 캐시에 기록 (304면 확인 시각만 갱신)"""
+        if not self.cache:
+            return
+        if response.status_code == NOT_MODIFIED:
+            self.cache.touch(url)
+        else:
+            self.cache.store(url, response)
+
+    def crawl(self, urls: Dict[str, str],
+              handler: Optional[Callable[[str, requests.Response], Any]] = None,
+              report_every: float = 5.0) -> Dict[str, Dict[str, Any]]:
+        """
+        여러 URL을 동시에 크롤링
+
+        Args:
+            urls: {키워드: URL} 딕셔너리
+            handler: 응답 처리 함수 handler(키워드, 응답) → 결과 (워커 스레드에서 실행,
+                     캐시를 쓰면 304 응답도 전달되므로 response.status_code로 구분,
+                     캐시는 handler가 성공한 뒤에 갱신하고 예외가 나면 항목을 지움)
+            report_every: 진행률 출력 주기 (초)
+
+        Returns:
+            {키워드: {"ok": bool, "result": 처리 결과 또는 None, "error": 오류 메시지 또는 None,
+                     "not_modified": 304 응답 여부}}
+        """
+        self.progress = CrawlProgress(len(urls), report_every)
+        results: Dict[str, Dict[str, Any]] = {}
+
+        def _task(keyword: str, url: str) -> Dict[str, Any]:
+            size = 0
+            not_modified = False
+            try:
+                response = self.fetch(url, update_cache=False)
+                size = len(response.content)
+                not_modified = response.status_code == NOT_MODIFIED
+                try:
+                    result = handler(keyword, response) if handler else response.content
+                except Exception:
+                    # 처리하지 못한 본문의 검증자를 남기면 다음 실행이 304를 받아 바뀐 내용을 놓침
+                    if self.cache:
+                        self.cache.invalidate(url)
+                    raise
+                self.update_cache(url, response)
+                outcome = {"ok": True, "result": result, "error": None, "not_modified": not_modified}
+            except Exception as e:
+                outcome = {"ok": False, "result": None, "error": str(e), "not_modified": False}
+            self.progress.finish(size, outcome["ok"], not_modified)
+            return outcome
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="crawler") as executor:
+            futures = {executor.submit(_task, keyword, url): keyword for keyword, url in urls.items()}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+
+        return results
+
+    def close(self) -> None:
+        """세션 종료 (커넥션 풀 반환)"""
+        self.session.close()
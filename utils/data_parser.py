@@ -6,9 +6,12 @@
 """
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, UnicodeDammit, Tag
+import lxml.html
+import lxml.etree
 import re
 import os
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 import openai
@@ -16,18 +19,126 @@ from openai import OpenAI
 import time
 import json
 
+# 프로젝트 루트를 Python 경로에 추가 (직접 실행 시 공통 설정 사용)
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from utils.config import WIKI_DOCUMENTS, WIKI_ENGLISH_NAMES, HTTP_CACHE_DIR, SUMMARY_CACHE_DIR
+from utils.http_cache import HttpCache, NOT_MODIFIED
+from utils.sections import should_skip_section, is_main_section
+from utils.summarizer import Summarizer, SummaryCache
+from utils.symbols import to_latex, operator_to_latex
+
+# HTML 파싱 방식
+# - "lxml": 페이지 전체는 lxml(C)로 파싱하고, 본문(div.mw-parser-output)만 BeautifulSoup 트리로 만듦 (기본값)
+# - "html.parser": 페이지 전체를 순수 파이썬 파서로 BeautifulSoup 트리로 만듦 (이전 방식)
+HTML_PARSERS = ("lxml", "html.parser")
+TITLE_XPATH = lxml.etree.XPath('//h1[contains(concat(" ", normalize-space(@class), " "), " firstHeading ")]')
+CONTENT_XPATH = lxml.etree.XPath('//div[contains(concat(" ", normalize-space(@class), " "), " mw-parser-output ")]')
+
+# 본문에서 제거할 위키피디아 템플릿/네비게이션 요소 (단순 선택자: .class, #id, [attr="값"], tag.class)
+TEMPLATE_SELECTORS = [
+    # 네비게이션 박스
+    '.navbox', '.navbox-inner', '.navbox-group', '.navigation-box',
+    # 사이드바
+    '.sidebar', '.infobox', '.infobox-above', '.infobox-subheader',
+    # 메시지 박스
+    '.mbox', '.ambox', '.tmbox', '.cmbox', '.ombox', '.fmbox', '.dmbox',
+    # 카테고리 박스
+    '.catlinks', '.mw-normal-catlinks',
+    # 기타 템플릿들
+    '.hatnote', '.dablink', '.rellink', '.navframe', '.collapsible',
+    # 편집 관련
+    '.mw-editsection', '.mw-editsection-bracket',
+    # 참조 관련
+    '.reference', '.reflist', '.refbegin', '.refend',
+    # 목차
+    '.toc', '#toc',
+    # 기타
+    '.printfooter', '.mw-jump-link', '.visualhide', '.nomobile',
+    # role 속성
+    '[role="navigation"]',
+    # 테이블 형태의 템플릿
+    'table.navbox', 'table.infobox', 'table.sidebar', 'table.vertical-navbox', 'table.geography', 'table.biota',
+]
+NAV_TABLE_MAX_LINKS = 20    # 링크가 이보다 많은 테이블은 네비게이션으로 간주
+HEADER_TAGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+
+
+class RemovalSelector:
+    """
+    TEMPLATE_SELECTORS를 한 번에 검사하는 결합 선택자 (모듈 로드 시 한 번 컴파일)
+    단순 선택자만 쓰므로 soupsieve 대신 집합 조회로 요소당 O(클래스 수)에 매칭합니다.
+    """
+    
+    def __init__(self, selectors: List[str]):
+        self.classes = set()
+        self.ids = set()
+        self.attributes = set()
+        self.tag_classes = set()
+        
+        for selector in selectors:
+            attribute = re.fullmatch(r'\[([\w-]+)="([^"]*)"\]', selector)
+            tag_class = re.fullmatch(r'([a-z][a-z0-9]*)\.([\w-]+)', selector)
+            if re.fullmatch(r'\.[\w-]+', selector):
+                self.classes.add(selector[1:])
+            elif re.fullmatch(r'#[\w-]+', selector):
+                self.ids.add(selector[1:])
+            elif attribute:
+                self.attributes.add((attribute.group(1), attribute.group(2)))
+            elif tag_class:
+                self.tag_classes.add((tag_class.group(1), tag_class.group(2)))
+            else:
+                raise ValueError(f"지원하지 않는 제거 선택자입니다: {selector}")
+        
+        self.classes = frozenset(self.classes)
+        self.tag_class_names = frozenset(cls for _, cls in self.tag_classes)
+    
+    def match(self, element: Tag) -> bool:
+        """요소가 선택자 중 하나라도 만족하면 True"""
+        attrs = element.attrs
+        if attrs.get('id') in self.ids:
+            return True
+        
+        classes = attrs.get('class')
+        if classes:
+            if not self.classes.isdisjoint(classes):
+                return True
+            if not self.tag_class_names.isdisjoint(classes) and any(
+                    (element.name, cls) in self.tag_classes for cls in classes):
+                return True
+        
+        for name, value in self.attributes:
+            if attrs.get(name) == value:
+                return True
+        return False
+
+
+REMOVAL_SELECTOR = RemovalSelector(TEMPLATE_SELECTORS)
+
 
 class WikiDataParser:
     """위키피디아 데이터 파싱 및 처리 클래스"""
     
-    def __init__(self, openai_api_key: str, output_dir: str = "data/raw/"):
+    def __init__(self, openai_api_key: Optional[str] = None, output_dir: str = "data/raw/",
+                 session: Optional[requests.Session] = None, cache: Optional[HttpCache] = None,
+                 html_parser: str = "lxml"):
         """
         초기화
         Args:
-            openai_api_key: OpenAI API 키
+            openai_api_key: OpenAI API 키 (요약할 때만 필요, 없으면 OPENAI_API_KEY 환경변수 사용)
             output_dir: 출력 디렉토리 경로
+            session: 공유 HTTP 세션 (없으면 새로 생성, keep-alive 재사용)
+            cache: HTTP 조건부 요청 캐시 (있으면 변경되지 않은 페이지는 다시 받지 않음)
+            html_parser: HTML 파싱 방식 ("lxml" 또는 "html.parser", HTML_PARSERS 참고)
         """
-        self.client = OpenAI(api_key=openai_api_key)
+        if html_parser not in HTML_PARSERS:
+            raise ValueError(f"지원하지 않는 HTML 파서입니다: {html_parser} (가능: {', '.join(HTML_PARSERS)})")
+
+        self.openai_api_key = openai_api_key
+        self._client: Optional[OpenAI] = None
+        self._summarizer: Optional[Summarizer] = None
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
@@ -35,44 +146,111 @@ class WikiDataParser:
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        self.session = session or requests.Session()
+        self.cache = cache
+        self.html_parser = html_parser
     
-    def crawl_wikipedia_page(self, url: str) -> Tuple[str, str]:
+    def fetch_wikipedia_page(self, url: str) -> requests.Response:
+        """
+        위키피디아 페이지 요청 (캐시가 있으면 조건부 요청, 캐시는 갱신하지 않음)
+        
+        Args:
+            url: 위키피디아 URL
+            
+        Returns:
+            requests.Response (페이지가 바뀌지 않았으면 304 응답)
+        """
+        headers = dict(self.headers)
+        if self.cache:
+            headers.update(self.cache.conditional_headers(url))
+        
+        response = self.session.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
+        return response
+    
+    def crawl_wikipedia_page(self, url: str) -> Optional[Tuple[str, str]]:
         """
         위키피디아 페이지를 크롤링하여 제목과 본문을 Markdown+LaTeX 형식으로 추출
+        (캐시 검증자는 저장하지 않음, 결과를 저장한 뒤 호출하는 쪽에서 cache.store)
         
         Args:
             url: 위키피디아 URL
             
         Returns:
             Tuple[제목, Markdown 형식의 본문텍스트]
+            (캐시를 쓰고 페이지가 바뀌지 않았으면 None, 파싱 생략)
         """
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
+            response = self.fetch_wikipedia_page(url)
+        except Exception as e:
+            print(f"크롤링 오류 ({url}): {e}")
+            return "크롤링 실패", f"오류 발생: {e}"
+        
+        if response.status_code == NOT_MODIFIED:
+            return None
+        return self.parse_wikipedia_html(response.content)
+    
+    def parse_wikipedia_html(self, html: bytes) -> Tuple[str, str]:
+        """
+        위키피디아 페이지 HTML에서 제목과 본문을 Markdown+LaTeX 형식으로 추출
+        (동시 크롤러처럼 요청을 따로 보내는 경우에 사용)
+        
+        Args:
+            html: 페이지 HTML
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+        Returns:
+            Tuple[제목, Markdown 형식의 본문텍스트]
+        """
+        title_text, content_div = self._parse_content(html)
+        if not content_div:
+            return title_text, "내용을 찾을 수 없습니다."
+        
+        # Markdown 형식으로 변환
+        markdown_content = self._convert_to_markdown(content_div, title_text)
+        
+        return title_text, markdown_content.strip()
+    
+    def _parse_content(self, html) -> Tuple[str, Optional[object]]:
+        """
+        페이지 HTML에서 제목과 본문 컨테이너(div.mw-parser-output) 추출
+        
+        Args:
+            html: 페이지 HTML (bytes 또는 str)
+            
+        Returns:
+            Tuple[제목, 본문 BeautifulSoup 요소 또는 None]
+        """
+        if self.html_parser == "html.parser":
+            soup = BeautifulSoup(html, 'html.parser')
             
             # 제목 추출
             title = soup.find('h1', {'class': 'firstHeading'})
             title_text = title.get_text().strip() if title else "제목없음"
             
             # 본문 추출 (mw-parser-output 클래스 내의 모든 요소들)
-            content_div = soup.find('div', {'class': 'mw-parser-output'})
-            if not content_div:
-                return title_text, "내용을 찾을 수 없습니다."
-            
-            # Markdown 형식으로 변환
-            markdown_content = self._convert_to_markdown(content_div, title_text)
-            
-            return title_text, markdown_content.strip()
-            
-        except Exception as e:
-            print(f"크롤링 오류 ({url}): {e}")
-            return "크롤링 실패", f"오류 발생: {e}"
+            return title_text, soup.find('div', {'class': 'mw-parser-output'})
+        
+        # lxml로 페이지 전체를 파싱한 뒤 본문 컨테이너만 BeautifulSoup 트리로 변환
+        # (스킨, 메뉴, 스크립트 등 본문 밖 요소는 파이썬 객체로 만들지 않음)
+        if isinstance(html, bytes):
+            html = UnicodeDammit(html, ['utf-8']).unicode_markup
+        root = lxml.html.document_fromstring(html)
+        
+        titles = TITLE_XPATH(root)
+        title_text = titles[0].text_content().strip() if titles else "제목없음"
+        
+        contents = CONTENT_XPATH(root)
+        if not contents:
+            return title_text, None
+        
+        contents[0].tail = None
+        fragment = lxml.etree.tostring(contents[0], encoding='unicode', method='html')
+        return title_text, BeautifulSoup(fragment, 'lxml').find('div')
     
     def _convert_to_markdown(self, content_div, title: str) -> str:
         """
         HTML 내용을 Markdown+LaTeX 형식으로 변환
+        (문서 순서대로 한 번만 순회, 출력한 요소의 하위 요소는 다시 방문하지 않음)
         
         Args:
             content_div: BeautifulSoup 요소
@@ -81,20 +259,21 @@ class WikiDataParser:
         Returns:
             Markdown 형식의 텍스트
         """
-        markdown_text = f"# {title}\n\n"
+        parts = [f"# {title}\n\n"]
         
         # 템플릿과 네비게이션 요소 제거
         self._remove_template_elements(content_div)
         
-        # 처리할 요소들을 순서대로 가져오기
-        elements = content_div.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'ul', 'ol', 'div'])
-        
         # 제외할 섹션 감지용 플래그
         skip_content = False
         
-        for element in elements:
+        stack = [child for child in reversed(content_div.contents) if isinstance(child, Tag)]
+        while stack:
+            element = stack.pop()
+            name = element.name
+            
             # 제외할 섹션인지 확인
-            if element.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
+            if name in HEADER_TAGS:
                 header_text = self._clean_text(element.get_text()).lower()
                 if self._should_skip_section(header_text):
                     skip_content = True
@@ -104,6 +283,12 @@ class WikiDataParser:
                 elif self._is_main_section(header_text):
                     skip_content = False
             
+            is_math_block = name == 'div' and 'mwe-math-element' in element.get('class', [])
+            if name not in HEADER_TAGS and name not in ('p', 'ul', 'ol') and not is_math_block:
+                # 컨테이너 요소는 하위 요소를 문서 순서대로 방문
+                stack.extend(child for child in reversed(element.contents) if isinstance(child, Tag))
+                continue
+            
             # 제외할 섹션 내용이면 건너뛰기
             if skip_content:
                 continue
@@ -112,29 +297,30 @@ class WikiDataParser:
             self._process_math_elements(element)
             
             # 요소별 처리
-            if element.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                level = int(element.name[1]) + 1  # h1은 이미 사용했으므로 +1
+            if name in HEADER_TAGS:
+                level = int(name[1]) + 1  # h1은 이미 사용했으므로 +1
                 if level <= 6:
                     header_text = self._clean_text(element.get_text())
-                    markdown_text += f"{'#' * level} {header_text}\n\n"
+                    parts.append(f"{'#' * level} {header_text}\n\n")
             
-            elif element.name == 'p':
+            elif name == 'p':
                 para_text = self._process_paragraph(element)
                 if para_text and len(para_text.strip()) > 10:
-                    markdown_text += f"{para_text}\n\n"
+                    parts.append(f"{para_text}\n\n")
             
-            elif element.name in ['ul', 'ol']:
+            elif name in ('ul', 'ol'):
                 list_text = self._process_list(element)
                 if list_text:
-                    markdown_text += f"{list_text}\n\n"
+                    parts.append(f"{list_text}\n\n")
             
-            elif element.name == 'div' and 'mwe-math-element' in element.get('class', []):
+            else:
                 # 수식 블록 처리
                 math_text = self._extract_math_latex(element)
                 if math_text:
-                    markdown_text += f"$$\n{math_text}\n$$\n\n"
+                    parts.append(f"$$\n{math_text}\n$$\n\n")
         
         # 텍스트 정리
+        markdown_text = "".join(parts)
         markdown_text = re.sub(r'\n{3,}', '\n\n', markdown_text)  # 과도한 줄바꿈 제거
         markdown_text = re.sub(r'\[\d+\]', '', markdown_text)     # 각주 번호 제거
         
@@ -143,89 +329,38 @@ class WikiDataParser:
     def _remove_template_elements(self, content_div):
         """
         위키피디아 템플릿과 네비게이션 요소들을 제거
+        (결합 선택자 REMOVAL_SELECTOR로 한 번 순회하며 제거하고,
+         링크가 많은 테이블은 하위 요소 처리 후 남은 링크 수로 판단)
         
         Args:
             content_div: BeautifulSoup 요소
         """
-        # 제거할 요소들의 클래스와 ID 목록
-        removal_selectors = [
-            # 네비게이션 박스
-            '.navbox',
-            '.navbox-inner', 
-            '.navbox-group',
-            '.navigation-box',
-            
-            # 사이드바
-            '.sidebar',
-            '.infobox',
-            '.infobox-above',
-            '.infobox-subheader',
-            
-            # 메시지 박스
-            '.mbox',
-            '.ambox',
-            '.tmbox',
-            '.cmbox',
-            '.ombox',
-            '.fmbox',
-            '.dmbox',
-            
-            # 카테고리 박스
-            '.catlinks',
-            '.mw-normal-catlinks',
-            
-            # 기타 템플릿들
-            '.hatnote',
-            '.dablink',
-            '.rellink',
-            '.navframe',
-            '.collapsible',
-            
-            # 편집 관련
-            '.mw-editsection',
-            '.mw-editsection-bracket',
-            
-            # 참조 관련
-            '.reference',
-            '.reflist',
-            '.refbegin',
-            '.refend',
-            
-            # 목차
-            '.toc',
-            '#toc',
-            
-            # 기타
-            '.printfooter',
-            '.mw-jump-link',
-            '.visualhide',
-            '.nomobile',
-        ]
-        
-        # CSS 선택자로 요소 제거
-        for selector in removal_selectors:
-            elements = content_div.select(selector)
-            for element in elements:
-                element.decompose()
+        table_links = []   # 열려 있는 테이블별 남은 링크 수
+        stack = [(child, False) for child in reversed(content_div.contents) if isinstance(child, Tag)]
         
-        # role 속성으로 제거
-        navigation_elements = content_div.find_all(attrs={'role': 'navigation'})
-        for element in navigation_elements:
-            element.decompose()
-        
-        # 테이블 형태의 템플릿 제거 (특정 클래스가 있는 것들)
-        tables = content_div.find_all('table')
-        for table in tables:
-            table_classes = table.get('class', [])
-            if any(cls in ['navbox', 'infobox', 'sidebar', 'vertical-navbox', 'geography', 'biota'] 
-                   for cls in table_classes):
-                table.decompose()
+        while stack:
+            element, leaving = stack.pop()
+            
+            if leaving:
+                # 테이블이 너무 많은 링크를 포함하고 있으면 네비게이션 박스일 가능성이 높음
+                links = table_links.pop()
+                if table_links:
+                    table_links[-1] += links
+                if links > NAV_TABLE_MAX_LINKS:
+                    element.decompose()
                 continue
             
-            # 테이블이 너무 많은 링크를 포함하고 있으면 네비게이션 박스일 가능성이 높음
-            links = table.find_all('a')
-            if len(links) > 20:  # 링크가 20개 이상이면 네비게이션으로 간주
-                table.decompose()
+            if REMOVAL_SELECTOR.match(element):
+                element.decompose()
+                continue
+            
+            if element.name == 'a' and table_links:
+                table_links[-1] += 1
+            elif element.name == 'table':
+                table_links.append(0)
+                stack.append((element, True))
+            
+            stack.extend((child, False) for child in reversed(element.contents) if isinstance(child, Tag))
         
         # 본문 시작 전 리스트들 제거 (첫 번째 문단 이전의 리스트들)
         self._remove_pre_content_lists(content_div)
@@ -296,7 +431,7 @@ class WikiDataParser:
     
     def _should_skip_section(self, header_text: str) -> bool:
         """
-        제외할 섹션인지 확인
+        제외할 섹션인지 확인 (utils/sections.py 규칙)
         
         Args:
             header_text: 소문자로 변환된 헤더 텍스트
@@ -304,30 +439,11 @@ class WikiDataParser:
         Returns:
             제외할 섹션이면 True
         """
-        skip_keywords = [
-            # 한글
-            '같이 보기', '같이보기', '관련 항목', '관련항목',
-            '각주', '주석', '참조', '출처', '참고 문헌', '참고문헌',
-            '외부 링크', '외부링크', '바깥 링크', '바깥링크',
-            '더 보기', '더보기', '참고 자료', '참고자료',
-            '외부 고리', '바깥 고리', '읽을거리', '읽을 거리',
-            
-            # 영글 (혹시 영문 위키 처리할 경우)
-            'see also', 'references', 'external links', 'further reading',
-            'notes', 'citations', 'bibliography', 'sources',
-            'related articles', 'related topics'
-        ]
-        
-        # 정확히 일치하거나 포함하는 경우
-        for keyword in skip_keywords:
-            if keyword in header_text or header_text.strip() == keyword:
-                return True
-        
-        return False
+        return should_skip_section(header_text)
     
     def _is_main_section(self, header_text: str) -> bool:
         """
-        메인 섹션인지 확인 (제외 섹션 이후에 나오는 주요 섹션)
+        메인 섹션인지 확인 (제외 섹션 이후에 나오는 주요 섹션, utils/sections.py 규칙)
         
         Args:
             header_text: 소문자로 변환된 헤더 텍스트
@@ -335,17 +451,7 @@ class WikiDataParser:
         Returns:
             메인 섹션이면 True
         """
-        main_keywords = [
-            '개요', '정의', '역사', '특징', '원리', '방법', '구조',
-            '종류', '분류', '응용', '활용', '장점', '단점', '한계',
-            '알고리즘', '모델', '이론', '수식', '공식'
-        ]
-        
-        for keyword in main_keywords:
-            if keyword in header_text:
-                return True
-        
-        return False
+        return is_main_section(header_text)
     
     def _process_math_elements(self, element):
         """
@@ -540,40 +646,7 @@ class WikiDataParser:
         Returns:
             LaTeX 변환된 텍스트
         """
-        replacements = {
-            # 그리스 문자 (소문자)
-            'α': r'\alpha', 'β': r'\beta', 'γ': r'\gamma', 'δ': r'\delta',
-            'ε': r'\epsilon', 'ζ': r'\zeta', 'η': r'\eta', 'θ': r'\theta',
-            'ι': r'\iota', 'κ': r'\kappa', 'λ': r'\lambda', 'μ': r'\mu',
-            'ν': r'\nu', 'ξ': r'\xi', 'π': r'\pi', 'ρ': r'\rho',
-            'σ': r'\sigma', 'τ': r'\tau', 'υ': r'\upsilon', 'φ': r'\phi',
-            'χ': r'\chi', 'ψ': r'\psi', 'ω': r'\omega',
-            
-            # 그리스 문자 (대문자)
-            'Α': r'A', 'Β': r'B', 'Γ': r'\Gamma', 'Δ': r'\Delta',
-            'Ε': r'E', 'Ζ': r'Z', 'Η': r'H', 'Θ': r'\Theta',
-            'Ι': r'I', 'Κ': r'K', 'Λ': r'\Lambda', 'Μ': r'M',
-            'Ν': r'N', 'Ξ': r'\Xi', 'Π': r'\Pi', 'Ρ': r'P',
-            'Σ': r'\Sigma', 'Τ': r'T', 'Υ': r'\Upsilon', 'Φ': r'\Phi',
-            'Χ': r'X', 'Ψ': r'\Psi', 'Ω': r'\Omega',
-            
-            # 특수 기호
-            '∞': r'\infty', '∂': r'\partial', '∇': r'\nabla',
-            '∅': r'\emptyset', '∈': r'\in', '∉': r'\notin',
-            '∪': r'\cup', '∩': r'\cap', '⊂': r'\subset', '⊃': r'\supset',
-            '⊆': r'\subseteq', '⊇': r'\supseteq', '≡': r'\equiv',
-            '≈': r'\approx', '≠': r'\neq', '≤': r'\leq', '≥': r'\geq',
-            '±': r'\pm', '∓': r'\mp', '×': r'\times', '÷': r'\div',
-            '·': r'\cdot', '→': r'\rightarrow', '←': r'\leftarrow',
-            '↔': r'\leftrightarrow', '⇒': r'\Rightarrow', '⇐': r'\Leftarrow',
-            '⇔': r'\Leftrightarrow', '∀': r'\forall', '∃': r'\exists',
-            '√': r'\sqrt', '∑': r'\sum', '∏': r'\prod', '∫': r'\int'
-        }
-        
-        for symbol, latex in replacements.items():
-            text = text.replace(symbol, latex)
-        
-        return text
+        return to_latex(text)
     
     def _apply_operator_replacements(self, text: str) -> str:
         """
@@ -585,42 +658,7 @@ class WikiDataParser:
         Returns:
             LaTeX 연산자
         """
-        operator_map = {
-            '=': '=',
-            '+': '+', 
-            '-': '-',
-            '±': r'\pm',
-            '∓': r'\mp',
-            '×': r'\times',
-            '·': r'\cdot',
-            '÷': r'\div',
-            '/': '/',
-            '≤': r'\leq',
-            '≥': r'\geq',
-            '<': '<',
-            '>': '>',
-            '≠': r'\neq',
-            '≈': r'\approx',
-            '≡': r'\equiv',
-            '∝': r'\propto',
-            '∼': r'\sim',
-            '→': r'\rightarrow',
-            '←': r'\leftarrow',
-            '↔': r'\leftrightarrow',
-            '∈': r'\in',
-            '∉': r'\notin',
-            '⊂': r'\subset',
-            '⊃': r'\supset',
-            '∪': r'\cup',
-            '∩': r'\cap',
-            '∧': r'\land',
-            '∨': r'\lor',
-            '¬': r'\neg',
-            '∀': r'\forall',
-            '∃': r'\exists'
-        }
-        
-        return operator_map.get(text.strip(), text)
+        return operator_to_latex(text)
     
     def _process_paragraph(self, paragraph) -> str:
         """
@@ -725,9 +763,23 @@ class WikiDataParser:
         text = text.strip()
         return text
     
+    @property
+    def client(self) -> OpenAI:
+        """OpenAI 클라이언트 (처음 사용할 때 생성, 파싱만 할 때는 API 키가 필요 없음)"""
+        if self._client is None:
+            self._client = OpenAI(api_key=self.openai_api_key)
+        return self._client
+
+    @property
+    def summarizer(self) -> Summarizer:
+        """GPT 요약기 (처음 사용할 때 생성, 요약 캐시는 data/summary_cache)"""
+        if self._summarizer is None:
+            self._summarizer = Summarizer(self.client, cache=SummaryCache(str(SUMMARY_CACHE_DIR)))
+        return self._summarizer
+
     def summarize_with_gpt(self, text: str, max_length: int = 100) -> str:
         """
-        GPT API를 사용하여 텍스트 요약
+        GPT API를 사용하여 텍스트 요약 (같은 본문은 캐시된 요약 사용)
         
         Args:
             text: 요약할 텍스트
@@ -736,42 +788,20 @@ class WikiDataParser:
         Returns:
             요약된 텍스트
         """
-        try:
-            # 텍스트가 너무 길면 자르기 (GPT 토큰 제한 고려)
-            if len(text) > 8000:
-                text = text[:8000] + "..."
-            
-            prompt = f"""
-다음 위키피디아 문서를 {max_length}자 이내로 핵심 내용만 간단히 요약해주세요.
-전문용어는 그대로 유지하고, MCP 시스템에서 파일명으로 사용할 수 있도록 명확하고 간결하게 작성해주세요.
-
-문서 내용:
-{text}
+        return self.summarizer.summarize(text, max_length)
 
-요약:
-"""
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "당신은 기술 문서 요약 전문가입니다. 핵심 내용을 간결하고 정확하게 요약합니다."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=200,
-                temperature=0.3
-            )
-            
-            summary = response.choices[0].message.content.strip()
-            
-            # 요약 길이 체크 및 조정
-            if len(summary) > max_length:
-                summary = summary[:max_length-3] + "..."
-            
-            return summary
+    def summarize_documents(self, texts: Dict[str, str], max_length: int = 100) -> Dict[str, str]:
+        """
+        여러 문서를 한 번에 요약 (캐시/중복 제거 후 짧은 문서는 묶어서 동시에 요청)
+        
+        Args:
+            texts: {키워드: 요약할 텍스트}
+            max_length: 최대 요약 길이
             
-        except Exception as e:
-            print(f"GPT 요약 오류: {e}")
-            return "AI/ML 관련 기술 문서"
+        Returns:
+            {키워드: 요약}
+        """
+        return self.summarizer.summarize_many(texts, max_length)
     
     def get_english_name(self, korean_name: str) -> str:
         """
@@ -783,22 +813,7 @@ class WikiDataParser:
         Returns:
             영어명
         """
-        # 한글-영어 매핑 사전
-        name_mapping = {
-            "인공지능": "Artificial Intelligence",
-            "기계 학습": "Machine Learning", 
-            "딥 러닝": "Deep Learning",
-            "합성곱 신경망": "CNN",
-            "순환 신경망": "RNN", 
-            "장단기 메모리": "LSTM",
-            "게이트 순환 유닛": "GRU",
-            "트랜스포머 (기계 학습)": "Transformer",
-            "GPT (언어 모델)": "GPT",
-            "알파고": "AlphaGo",
-            "강화 학습": "Reinforcement Learning"
-        }
-        
-        return name_mapping.get(korean_name, korean_name)
+        return WIKI_ENGLISH_NAMES.get(korean_name, korean_name)
     
     def create_filename(self, korean_name: str, english_name: str, summary: str) -> str:
         """
@@ -903,12 +918,14 @@ format: markdown
         print(f"📁 MCP Markdown 파일 저장 완료: {mcp_path}")
         return mcp_results
 
-    def process_wiki_documents(self, wiki_data: Dict[str, str]) -> Dict[str, str]:
+    def process_wiki_documents(self, wiki_data: Dict[str, str], mcp_dir: str = "data/mcp_docs") -> Dict[str, str]:
         """
         위키피디아 문서들을 일괄 처리
+        (캐시 검증자는 문서를 저장한 뒤에 기록, 304 응답이어도 MCP 파일이 없으면 캐시된 본문으로 다시 생성)
         
         Args:
             wiki_data: {키워드: URL} 형태의 딕셔너리
+            mcp_dir: MCP 문서 저장 디렉토리 (copy_to_mcp_docs에 전달)
             
         Returns:
             {키워드: 저장된_파일_경로} 형태의 딕셔너리
@@ -923,15 +940,32 @@ format: markdown
             try:
                 # 1. 위키피디아 크롤링
                 print("  - 크롤링 중...")
-                title, content = self.crawl_wikipedia_page(url)
+                response = self.fetch_wikipedia_page(url)
+                html = response.content
+                
+                if response.status_code == NOT_MODIFIED:
+                    if (Path(mcp_dir) / f"{keyword}.md").exists():
+                        self.cache.touch(url)
+                        print(f"  - 건너뜀: 변경 없음")
+                        continue
+                    # 결과 파일이 지워졌거나 저장된 적이 없으면 캐시된 본문으로 다시 생성
+                    html = self.cache.load_body(url)
+                    if html is None:
+                        raise RuntimeError("304 응답이지만 캐시된 본문이 없습니다.")
                 
+                title, content = self.parse_wikipedia_html(html)
                 if content == "내용을 찾을 수 없습니다.":
                     print(f"  - 건너뜀: 내용 없음")
                     continue
                 
-                # 2. 파일 저장
+                # 2. 파일 저장 (저장에 성공한 뒤에 검증자 기록, 실패하면 다음 실행이 304로 건너뛰지 않음)
                 print("  - 파일 저장 중...")
                 file_path = self.save_document(title, content)
+                if self.cache:
+                    if response.status_code == NOT_MODIFIED:
+                        self.cache.touch(url)
+                    else:
+                        self.cache.store(url, response)
                 
                 results[keyword] = file_path
                 print(f"  - 완료: {file_path}")
@@ -947,7 +981,7 @@ format: markdown
         
         # MCP용 파일 복사
         if results:
-            mcp_results = self.copy_to_mcp_docs(results)
+            mcp_results = self.copy_to_mcp_docs(results, mcp_dir)
             return results
         
         return results
@@ -956,20 +990,8 @@ format: markdown
 def main():
     """메인 실행 함수"""
     
-    # 위키피디아 데이터
-    wiki_data = {
-        "인공지능": "https://ko.wikipedia.org/wiki/인공지능",
-        "머신러닝": "https://ko.wikipedia.org/wiki/기계_학습", 
-        "딥러닝": "https://ko.wikipedia.org/wiki/딥_러닝",
-        "cnn": "https://ko.wikipedia.org/wiki/합성곱_신경망",
-        "rnn": "https://ko.wikipedia.org/wiki/순환_신경망",
-        "lstm": "https://ko.wikipedia.org/wiki/장단기_메모리",
-        "gru": "https://ko.wikipedia.org/wiki/게이트_순환_유닛", 
-        "transformer": "https://ko.wikipedia.org/wiki/트랜스포머_(기계_학습)",
-        "gpt": "https://ko.wikipedia.org/wiki/GPT_(언어_모델)",
-        "alphago": "https://ko.wikipedia.org/wiki/알파고",
-        "강화학습": "https://ko.wikipedia.org/wiki/강화_학습"
-    }
+    # 위키피디아 데이터 (공통 설정의 문서 목록)
+    wiki_data = WIKI_DOCUMENTS
     
     # OpenAI API 키 (환경변수에서 가져오기)
     api_key = os.getenv('OPENAI_API_KEY')
@@ -977,8 +999,8 @@ def main():
         print("오류: OPENAI_API_KEY 환경변수가 설정되지 않았습니다.")
         return
     
-    # 파서 초기화 및 실행
-    parser = WikiDataParser(api_key)
+    # 파서 초기화 및 실행 (바뀌지 않은 페이지는 HTTP 캐시로 건너뜀)
+    parser = WikiDataParser(api_key, cache=HttpCache(str(HTTP_CACHE_DIR)))
     results = parser.process_wiki_documents(wiki_data)
     
     # 결과 출력
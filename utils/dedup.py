@@ -0,0 +1,224 @@
+"""
+유사 중복 청크 탐지 모듈 (MinHash + LSH 밴딩)
+겹치는 위키 문서(인공지능/머신러닝/딥러닝 등)에서 거의 같은 문단이 여러 번 임베딩되지 않도록
+청크 분할 후, 임베딩 전에 대표 청크 하나만 남기고 나머지는 대표 청크의 중복 목록으로 기록합니다.
+- 정규화한 텍스트의 글자 k-gram 집합에 대한 MinHash 서명 (한국어는 띄어쓰기보다 글자 단위가 안정적)
+- 서명을 밴드로 나눠 같은 버킷에 들어간 청크만 비교 (전체 쌍을 비교하지 않음)
+- 후보는 서명으로 추정한 자카드 유사도가 기준 이상일 때 중복으로 판단
+- 대표 청크의 서명/버킷/본문 해시와 중복 목록은 SQLite에 저장 (파일을 지정하면 메모리 사용량이 청크 수와
+  관계없이 일정, 디스크에는 대표 청크당 약 1KB: 서명 512바이트 + 버킷 32행 + 본문 SHA-1)
+"""
+
+import re
+import zlib
+import sqlite3
+import hashlib
+import itertools
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from utils.config import DEDUP_THRESHOLD, DEDUP_NUM_PERM, DEDUP_BANDS, DEDUP_SHINGLE_SIZE
+
+# 해시 함수 h(x) = (a * x + b) mod p (x, a, b < 2^32이므로 uint64에서 넘치지 않음)
+_PRIME = np.uint64(4294967311)
+_WHITESPACE = re.compile(r'\s+')
+
+# 대표 청크 인덱스 (청크당 저장 크기: 서명 num_perm × 4바이트 + 버킷 bands행 + 본문 SHA-1 20바이트)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    row INTEGER PRIMARY KEY,
+    chunk_id TEXT NOT NULL,
+    signature BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    bucket INTEGER NOT NULL,
+    row INTEGER NOT NULL,
+    PRIMARY KEY (bucket, row)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS exact (
+    digest BLOB PRIMARY KEY,
+    chunk_id TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS duplicates (
+    seq INTEGER PRIMARY KEY,
+    canonical TEXT NOT NULL,
+    chunk_id TEXT NOT NULL
+);
+"""
+
+
+def normalize_for_dedup(text: str) -> str:
+    """비교용 정규화 (소문자, 연속 공백 하나로)"""
+    return _WHITESPACE.sub(' ', text).strip().lower()
+
+
+class MinHasher:
+    """글자 k-gram 집합의 MinHash 서명 계산기"""
+
+    def __init__(self, num_perm: int = DEDUP_NUM_PERM, shingle_size: int = DEDUP_SHINGLE_SIZE, seed: int = 1):
+        """
+        Args:
+            num_perm: 서명 길이 (해시 함수 수)
+            shingle_size: k-gram 글자 수
+            seed: 해시 함수 계수 난수 시드 (같은 시드끼리만 서명 비교 가능)
+        """
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2**32, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, 2**32, size=(num_perm, 1), dtype=np.uint64)
+
+    def shingles(self, text: str) -> np.ndarray:
+        """정규화한 텍스트의 k-gram 해시 (중복 제거, k보다 짧으면 텍스트 전체를 하나로)"""
+        text = normalize_for_dedup(text)
+        k = self.shingle_size
+        grams = {text[i:i + k] for i in range(max(1, len(text) - k + 1))}
+        return np.fromiter((zlib.crc32(gram.encode('utf-8')) for gram in grams), dtype=np.uint64, count=len(grams))
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash 서명 (num_perm개의 최솟값)"""
+        hashes = self.shingles(text)
+        return ((self._a * hashes + self._b) % _PRIME).min(axis=1)
+
+
+def compact_signature(signature: np.ndarray) -> np.ndarray:
+    """서명을 uint32로 저장 (해시 값은 p = 2^32 + 15 미만이라 2^32 이상인 드문 값만 잘림)"""
+    return np.minimum(signature, np.uint64(2**32 - 1)).astype(np.uint32)
+
+
+def estimate_jaccard(signature_a: np.ndarray, signature_b: np.ndarray) -> float:
+    """두 서명이 같은 위치의 비율 (자카드 유사도 추정값)"""
+    return float(np.count_nonzero(signature_a == signature_b)) / len(signature_a)
+
+
+class ChunkDeduplicator:
+    """대표 청크만 색인하고 유사 중복 청크는 대표 청크에 연결하는 LSH 인덱스 (SQLite에 저장)"""
+
+    def __init__(self, threshold: float = DEDUP_THRESHOLD, num_perm: int = DEDUP_NUM_PERM,
+                 bands: int = DEDUP_BANDS, shingle_size: int = DEDUP_SHINGLE_SIZE,
+                 path: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            threshold: 중복으로 볼 최소 자카드 유사도
+            num_perm: MinHash 서명 길이 (bands로 나누어떨어져야 함)
+            bands: LSH 밴드 수 (밴드가 많을수록 낮은 유사도까지 후보로 잡음)
+            shingle_size: k-gram 글자 수
+            path: 인덱스를 저장할 SQLite 파일 (None이면 메모리, 말뭉치 전체를 처리할 때는 파일을 지정해야
+                  메모리 사용량이 청크 수와 관계없이 일정)
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm({num_perm})은 bands({bands})로 나누어떨어져야 합니다.")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm, shingle_size)
+        self.path = Path(path) if path else None
+        # 구축 파이프라인의 청크 단계 스레드로 넘겨 사용할 수 있음 (동시에 두 스레드가 쓰지는 않음)
+        self.conn = sqlite3.connect(str(self.path) if self.path else ":memory:", check_same_thread=False)
+        # 한 번의 구축 동안만 쓰는 인덱스이므로 저널/동기화 생략
+        self.conn.execute("PRAGMA journal_mode=OFF")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.executescript(SCHEMA)
+        self.stats = {"chunks": 0, "exact_duplicates": 0, "near_duplicates": 0, "candidates": 0}
+
+    def band_keys(self, signature: np.ndarray) -> List[int]:
+        """밴드별 버킷 키 (밴드 번호와 밴드 서명의 64비트 해시)"""
+        keys = []
+        for band in range(self.bands):
+            digest = hashlib.blake2b(signature[band * self.rows:(band + 1) * self.rows].tobytes(),
+                                     digest_size=8, person=band.to_bytes(2, 'little')).digest()
+            keys.append(int.from_bytes(digest, 'little', signed=True))
+        return keys
+
+    def find_or_add(self, chunk_id: str, text: str) -> Optional[str]:
+        """
+        유사 중복이면 대표 청크 id를 반환하고(중복 목록에 기록), 아니면 새 대표 청크로 등록
+
+        Args:
+            chunk_id: 청크 id
+            text: 청크 텍스트
+
+        Returns:
+            대표 청크 id (새 대표 청크면 None)
+        """
+        self.stats["chunks"] += 1
+
+        digest = hashlib.sha1(normalize_for_dedup(text).encode('utf-8')).digest()
+        row = self.conn.execute("SELECT chunk_id FROM exact WHERE digest = ?", (digest,)).fetchone()
+        if row:
+            self.stats["exact_duplicates"] += 1
+            return self._link(row[0], chunk_id)
+
+        signature = compact_signature(self.hasher.signature(text))
+        keys = self.band_keys(signature)
+        candidates = self.conn.execute(
+            f"SELECT s.chunk_id, s.signature FROM signatures s WHERE s.row IN "
+            f"(SELECT DISTINCT row FROM buckets WHERE bucket IN ({','.join('?' * len(keys))}))", keys).fetchall()
+        self.stats["candidates"] += len(candidates)
+
+        best_id, best_score = None, self.threshold
+        for candidate, stored in candidates:
+            score = estimate_jaccard(signature, np.frombuffer(stored, dtype=np.uint32))
+            if score >= best_score:
+                best_id, best_score = candidate, score
+        if best_id is not None:
+            self.stats["near_duplicates"] += 1
+            return self._link(best_id, chunk_id)
+
+        with self.conn:
+            row = self.conn.execute("INSERT INTO signatures (chunk_id, signature) VALUES (?, ?)",
+                                    (chunk_id, signature.tobytes())).lastrowid
+            self.conn.execute("INSERT INTO exact (digest, chunk_id) VALUES (?, ?)", (digest, chunk_id))
+            self.conn.executemany("INSERT OR IGNORE INTO buckets (bucket, row) VALUES (?, ?)",
+                                  [(key, row) for key in keys])
+        return None
+
+    def _link(self, canonical: str, chunk_id: str) -> str:
+        """중복 청크를 대표 청크의 중복 목록에 기록"""
+        with self.conn:
+            self.conn.execute("INSERT INTO duplicates (canonical, chunk_id) VALUES (?, ?)", (canonical, chunk_id))
+        return canonical
+
+    def duplicate_groups(self) -> Iterator[Tuple[str, List[str]]]:
+        """
+        대표 청크별 중복 청크 목록 (대표 청크 id 순서, 한 번에 한 묶음씩 읽음)
+
+        Yields:
+            (대표 청크 id, [중복 청크 id] 기록 순서)
+        """
+        cursor = self.conn.execute("SELECT canonical, chunk_id FROM duplicates ORDER BY canonical, seq")
+        for canonical, rows in itertools.groupby(cursor, key=lambda row: row[0]):
+            yield canonical, [chunk_id for _, chunk_id in rows]
+
+    def close(self, remove: bool = True) -> None:
+        """
+        연결 종료
+
+        Args:
+            remove: 인덱스 파일도 삭제
+        """
+        self.conn.close()
+        if self.path and remove:
+            self.path.unlink(missing_ok=True)
+
+    def deduplicate(self, chunks: Sequence[Tuple[str, str]]) -> Tuple[List[int], Dict[str, List[str]]]:
+        """
+        청크 목록에서 대표 청크만 고름 (앞에 나온 청크가 대표)
+
+        Args:
+            chunks: [(청크 id, 텍스트)]
+
+        Returns:
+            (남길 청크의 위치 목록, {대표 청크 id: [중복 청크 id]})
+        """
+        kept: List[int] = []
+        duplicates: Dict[str, List[str]] = {}
+        for index, (chunk_id, text) in enumerate(chunks):
+            canonical = self.find_or_add(chunk_id, text)
+            if canonical is None:
+                kept.append(index)
+            else:
+                duplicates.setdefault(canonical, []).append(chunk_id)
+        return kept, duplicates
@@ -0,0 +1,394 @@
+"""
+세그먼트 문서 저장소 모듈
+문서마다 파일 하나를 만드는 대신, 여러 문서를 추가 전용(append-only) 세그먼트 파일에 이어서 기록하고
+키 → (세그먼트, 오프셋, 길이) 색인으로 찾습니다. 위키백과 규모에서 디렉토리 스캔(rglob), 파일별 stat/open이
+병목이 되지 않도록, 문서 조회는 메모리의 색인과 mmap으로 O(1)에 처리합니다.
+
+디렉토리 구성:
+- {이름}.seg: 레코드를 이어 붙인 데이터 파일 (헤더 + 키 + 본문, 본문은 크기가 크면 zlib 압축)
+- {이름}.idx: 세그먼트의 색인 로그 (레코드마다 JSON 한 줄, 데이터를 기록한 뒤에 추가)
+같은 키를 다시 쓰면 새 레코드가 추가되고 색인은 가장 최근 레코드를 가리킵니다 (compact로 정리).
+쓰는 쪽(프로세스/인스턴스)마다 자기 세그먼트를 만들기 때문에 여러 프로세스가 잠금 없이 동시에 쓸 수 있습니다.
+"""
+
+import os
+import re
+import sys
+import json
+import mmap
+import time
+import zlib
+import struct
+import hashlib
+import argparse
+import itertools
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.config import DOC_STORE_DIR, DOC_STORE_SEGMENT_BYTES, DOC_STORE_COMPRESS_MIN
+
+# 레코드 헤더: 매직, 플래그, 키 길이, 본문 길이, 본문 CRC32
+RECORD_HEADER = struct.Struct("<4sBHII")
+RECORD_MAGIC = b"DSR1"
+FLAG_ZLIB = 1
+
+SEGMENT_SUFFIX = ".seg"
+INDEX_SUFFIX = ".idx"
+
+# 저장소 종류별 (하위 디렉토리, 파일 기반 디렉토리, 파일 패턴)
+STORE_SOURCES = (("raw", "raw", "*.txt"), ("mcp", "mcp_docs", "*.md"), ("rag", "rag_docs", "*.txt"))
+
+_segment_counter = itertools.count()
+
+
+def text_sha(text: str) -> str:
+    """본문 해시 (문서 버전/변경 감지용)"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class SegmentStore:
+    """추가 전용 세그먼트 파일 + 오프셋 색인 문서 저장소"""
+
+    def __init__(self, directory: Union[str, Path], segment_bytes: int = DOC_STORE_SEGMENT_BYTES,
+                 compress_min: Optional[int] = DOC_STORE_COMPRESS_MIN, sync: bool = False):
+        """
+        Args:
+            directory: 저장소 디렉토리 (없으면 생성)
+            segment_bytes: 세그먼트 파일 크기 상한 (넘으면 새 세그먼트로 이어서 기록)
+            compress_min: 이 크기(UTF-8 바이트) 이상인 본문만 압축 (None이면 압축하지 않음)
+            sync: 레코드마다 fsync할지 여부 (전원 장애까지 대비할 때)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.compress_min = compress_min
+        self.sync = sync
+
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._index_offsets: Dict[str, int] = {}
+        self._maps: Dict[str, mmap.mmap] = {}
+        self._files: Dict[str, Any] = {}
+        self._writer: Optional[Dict[str, Any]] = None
+        self.refresh()
+
+    @staticmethod
+    def exists(directory: Union[str, Path]) -> bool:
+        """디렉토리에 세그먼트 색인이 있는지 (파일 기반 디렉토리 대신 저장소를 읽을지 판단)"""
+        directory = Path(directory)
+        return directory.is_dir() and any(directory.glob(f"*{INDEX_SUFFIX}"))
+
+    # ---- 읽기 ----
+
+    def refresh(self) -> int:
+        """
+        다른 프로세스가 추가한 레코드를 색인에 반영 (색인 로그의 새 줄만 읽음)
+
+        Returns:
+            갱신된 키 수
+        """
+        updated = 0
+        for index_path in sorted(self.directory.glob(f"*{INDEX_SUFFIX}")):
+            name = index_path.stem
+            offset = self._index_offsets.get(name, 0)
+            with open(index_path, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+            # 쓰다가 중단된 마지막 줄은 완성될 때까지 읽지 않음
+            complete = data.rfind(b"\n") + 1
+            for line in data[:complete].splitlines():
+                entry = json.loads(line)
+                entry["segment"] = name
+                current = self._entries.get(entry["key"])
+                if current is None or (entry["time"], name) >= (current["time"], current["segment"]):
+                    self._entries[entry["key"]] = entry
+                    updated += 1
+            self._index_offsets[name] = offset + complete
+        return updated
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and not entry.get("deleted")
+
+    def __len__(self) -> int:
+        return sum(1 for entry in self._entries.values() if not entry.get("deleted"))
+
+    def keys(self) -> List[str]:
+        """저장된 키 목록 (정렬)"""
+        return sorted(key for key, entry in self._entries.items() if not entry.get("deleted"))
+
+    def entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        키의 색인 항목 (본문을 읽지 않고 크기/해시/메타데이터 확인)
+
+        Returns:
+            {"key", "segment", "offset", "length", "flags", "size", "sha", "time", "meta"} 또는 None
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.get("deleted"):
+            return None
+        return entry
+
+    def get(self, key: str) -> Optional[str]:
+        """키의 본문 (없으면 None)"""
+        entry = self.entry(key)
+        if entry is None:
+            return None
+        return self._read_payload(entry).decode('utf-8')
+
+    def items(self) -> Iterator[tuple]:
+        """(키, 본문)을 키 순서대로 반환"""
+        for key in self.keys():
+            yield key, self.get(key)
+
+    def _segment_map(self, name: str, end: int) -> mmap.mmap:
+        """세그먼트의 mmap (세그먼트가 자라서 end를 넘으면 다시 매핑)"""
+        mapped = self._maps.get(name)
+        if mapped is None or len(mapped) < end:
+            if mapped is not None:
+                mapped.close()
+            handle = self._files.get(name)
+            if handle is None:
+                handle = self._files[name] = open(self.directory / f"{name}{SEGMENT_SUFFIX}", 'rb')
+            mapped = self._maps[name] = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return mapped
+
+    def _read_payload(self, entry: Dict[str, Any]) -> bytes:
+        """레코드를 읽고 헤더/CRC를 확인한 뒤 본문 반환 (압축 해제 포함)"""
+        key = entry["key"].encode('utf-8')
+        start = entry["offset"]
+        body = start + RECORD_HEADER.size + len(key)
+        mapped = self._segment_map(entry["segment"], body + entry["length"])
+
+        magic, flags, key_length, length, crc = RECORD_HEADER.unpack_from(mapped, start)
+        payload = mapped[body:body + length]
+        if (magic != RECORD_MAGIC or mapped[start + RECORD_HEADER.size:body] != key
+                or length != entry["length"] or zlib.crc32(payload) != crc):
+            raise ValueError(f"손상된 레코드입니다: {entry['segment']}@{start} ({entry['key']})")
+        return zlib.decompress(payload) if flags & FLAG_ZLIB else payload
+
+    # ---- 쓰기 ----
+
+    def put(self, key: str, text: str, meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        문서 기록 (같은 키는 새 레코드로 덮어씀)
+
+        Args:
+            key: 문서 키 (예: 파일 이름에 쓰던 키워드)
+            text: 본문
+            meta: 색인에 함께 저장할 작은 메타데이터 (본문을 읽지 않고 조회 가능)
+
+        Returns:
+            색인 항목
+        """
+        data = text.encode('utf-8')
+        flags = 0
+        payload = data
+        if self.compress_min is not None and len(data) >= self.compress_min:
+            compressed = zlib.compress(data, 6)
+            if len(compressed) < len(data):
+                payload, flags = compressed, FLAG_ZLIB
+
+        return self._append(key, payload, flags, {
+            "size": len(data), "sha": text_sha(text), "time": time.time_ns(), "meta": meta or {}
+        })
+
+    def delete(self, key: str) -> bool:
+        """키 삭제 (삭제 표시를 색인에 추가)"""
+        if key not in self:
+            return False
+        writer = self._open_writer()
+        entry = {"key": key, "deleted": True, "time": time.time_ns()}
+        self._write_index(writer, entry)
+        self._entries[key] = {**entry, "segment": writer["name"]}
+        return True
+
+    def _open_writer(self) -> Dict[str, Any]:
+        """이 인스턴스 전용 세그먼트를 열거나, 크기 상한을 넘었으면 새 세그먼트로 교체"""
+        writer = self._writer
+        if writer is not None and writer["size"] < self.segment_bytes:
+            return writer
+        if writer is not None:
+            self._close_writer()
+
+        name = f"{time.time_ns():020d}-{os.getpid()}-{next(_segment_counter)}"
+        writer = self._writer = {
+            "name": name,
+            "data": open(self.directory / f"{name}{SEGMENT_SUFFIX}", 'ab'),
+            "index": open(self.directory / f"{name}{INDEX_SUFFIX}", 'ab'),
+            "size": 0
+        }
+        return writer
+
+    def _append(self, key: str, payload: bytes, flags: int, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """레코드를 세그먼트에 기록한 뒤 색인 로그에 추가 (색인은 항상 기록된 데이터만 가리킴)"""
+        writer = self._open_writer()
+        key_bytes = key.encode('utf-8')
+        header = RECORD_HEADER.pack(RECORD_MAGIC, flags, len(key_bytes), len(payload), zlib.crc32(payload))
+
+        offset = writer["size"]
+        writer["data"].write(header + key_bytes + payload)
+        writer["data"].flush()
+        if self.sync:
+            os.fsync(writer["data"].fileno())
+        writer["size"] += len(header) + len(key_bytes) + len(payload)
+
+        entry = {"key": key, "offset": offset, "length": len(payload), "flags": flags, **fields}
+        self._write_index(writer, entry)
+        self._entries[key] = {**entry, "segment": writer["name"]}
+        return self._entries[key]
+
+    def _write_index(self, writer: Dict[str, Any], entry: Dict[str, Any]) -> None:
+        """색인 로그에 한 줄 추가 (이 세그먼트는 이 인스턴스만 쓰므로 읽은 위치도 함께 옮김)"""
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode('utf-8')
+        writer["index"].write(line)
+        writer["index"].flush()
+        if self.sync:
+            os.fsync(writer["index"].fileno())
+        self._index_offsets[writer["name"]] = writer["index"].tell()
+
+    def _close_writer(self) -> None:
+        if self._writer is not None:
+            self._writer["data"].close()
+            self._writer["index"].close()
+            self._writer = None
+
+    # ---- 정리 ----
+
+    def compact(self) -> Dict[str, int]:
+        """
+        살아 있는 레코드만 새 세그먼트로 옮기고 이전 세그먼트 삭제 (다른 쓰는 쪽이 없을 때 실행)
+
+        Returns:
+            {"records", "segments_removed", "bytes_before", "bytes_after"}
+        """
+        self.refresh()
+        old = sorted({path.stem for path in self.directory.glob(f"*{INDEX_SUFFIX}")})
+        bytes_before = sum((self.directory / f"{name}{SEGMENT_SUFFIX}").stat().st_size
+                           for name in old if (self.directory / f"{name}{SEGMENT_SUFFIX}").exists())
+
+        live = [self._entries[key] for key in self.keys()]
+        self._close_writer()
+        self._entries = {}
+        for entry in live:
+            # 압축 상태와 해시/시간은 그대로 두고 레코드만 옮김
+            payload = self._read_raw(entry)
+            fields = {name: entry[name] for name in ("size", "sha", "time", "meta")}
+            self._append(entry["key"], payload, entry["flags"], fields)
+        self._close_writer()
+
+        for name in old:
+            for handle in (self._maps.pop(name, None), self._files.pop(name, None)):
+                if handle is not None:
+                    handle.close()
+            for suffix in (SEGMENT_SUFFIX, INDEX_SUFFIX):
+                (self.directory / f"{name}{suffix}").unlink(missing_ok=True)
+            self._index_offsets.pop(name, None)
+
+        bytes_after = sum(path.stat().st_size for path in self.directory.glob(f"*{SEGMENT_SUFFIX}"))
+        return {"records": len(live), "segments_removed": len(old),
+                "bytes_before": bytes_before, "bytes_after": bytes_after}
+
+    def _read_raw(self, entry: Dict[str, Any]) -> bytes:
+        """압축을 풀지 않은 본문"""
+        body = entry["offset"] + RECORD_HEADER.size + len(entry["key"].encode('utf-8'))
+        mapped = self._segment_map(entry["segment"], body + entry["length"])
+        return mapped[body:body + entry["length"]]
+
+    def stats(self) -> Dict[str, int]:
+        """저장소 통계 (문서 수, 본문 크기 합, 세그먼트 수/크기)"""
+        segments = list(self.directory.glob(f"*{SEGMENT_SUFFIX}"))
+        live = [entry for entry in self._entries.values() if not entry.get("deleted")]
+        return {
+            "documents": len(live),
+            "text_bytes": sum(entry["size"] for entry in live),
+            "stored_bytes": sum(entry["length"] for entry in live),
+            "segments": len(segments),
+            "segment_bytes": sum(path.stat().st_size for path in segments)
+        }
+
+    def close(self) -> None:
+        """쓰기 파일과 mmap 닫기"""
+        self._close_writer()
+        for mapped in self._maps.values():
+            mapped.close()
+        for handle in self._files.values():
+            handle.close()
+        self._maps, self._files = {}, {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def open_stores(store_root: Union[str, Path]) -> Dict[str, SegmentStore]:
+    """저장소 루트 아래의 raw/mcp/rag 저장소 ({종류: SegmentStore})"""
+    return {kind: SegmentStore(Path(store_root) / kind) for kind, _, _ in STORE_SOURCES}
+
+
+def pack_directory(source_dir: Union[str, Path], store: SegmentStore, pattern: str = "*") -> int:
+    """
+    파일 하나당 문서 하나인 디렉토리를 저장소로 옮김 (키는 확장자를 뺀 파일 이름)
+
+    Args:
+        source_dir: 원본 디렉토리 (예: data/mcp_docs)
+        store: 대상 저장소
+        pattern: 옮길 파일 패턴 (예: "*.md")
+
+    Returns:
+        옮긴 문서 수
+    """
+    count = 0
+    for path in sorted(Path(source_dir).glob(pattern)):
+        if path.is_file():
+            text = path.read_text(encoding='utf-8')
+            if store.entry(path.stem) is None or store.entry(path.stem)["sha"] != text_sha(text):
+                store.put(path.stem, text, document_meta(text))
+            count += 1
+    return count
+
+
+def document_meta(text: str) -> Dict[str, Any]:
+    """색인에 함께 저장할 메타데이터 (본문 첫 '# 제목' 헤더, MCP 서버의 제목 별칭에 사용)"""
+    header = re.match(r'#\s+(.+)', text.lstrip())
+    return {"heading": header.group(1).strip()} if header else {}
+
+
+def main():
+    """저장소 관리 명령 (pack / stats / compact)"""
+    parser = argparse.ArgumentParser(description="세그먼트 문서 저장소 관리")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    pack = subparsers.add_parser("pack", help="기존 raw/mcp_docs/rag_docs 파일을 저장소로 옮김")
+    pack.add_argument("--data-root", default=str(DOC_STORE_DIR.parent), help="raw/, mcp_docs/, rag_docs/가 있는 디렉토리")
+    pack.add_argument("--store", default=str(DOC_STORE_DIR), help=f"저장소 디렉토리 (기본값: {DOC_STORE_DIR})")
+    for name in ("stats", "compact"):
+        sub = subparsers.add_parser(name, help="저장소 통계" if name == "stats" else "덮어쓴 레코드 정리")
+        sub.add_argument("--store", default=str(DOC_STORE_DIR), help=f"저장소 디렉토리 (기본값: {DOC_STORE_DIR})")
+    args = parser.parse_args()
+
+    store_root = Path(args.store)
+    if args.command == "pack":
+        data_root = Path(args.data_root)
+        for kind, source, pattern in STORE_SOURCES:
+            with SegmentStore(store_root / kind) as store:
+                count = pack_directory(data_root / source, store, pattern)
+            print(f"  - {source}/ → {store_root / kind}: {count}개 문서")
+        return
+
+    for kind, _, _ in STORE_SOURCES:
+        if not SegmentStore.exists(store_root / kind):
+            continue
+        with SegmentStore(store_root / kind) as store:
+            stats = store.compact() if args.command == "compact" else store.stats()
+        print(f"  - {kind}: {stats}")
+
+
+
+if __name__ == "__main__":
+    main()
@@ -1,165 +1,325 @@
 """
 위키피디아 데이터 다운로드 및 처리 스크립트
-1. 크롤링한 원본 텍스트를 raw 폴더에 저장
+문서마다 한 번만 크롤링(또는 raw 파일을 한 번만 읽기)하고, 프로세스 풀에서 파싱과 전처리를 나눠 수행하여
+1. 원본 텍스트를 raw 폴더에 저장
 2. MCP용 마크다운 처리된 파일을 mcp_docs에 저장  
 3. RAG용 전처리된 파일을 rag_docs에 저장
+(세 파일 모두 원자적으로 저장, --store를 지정하면 문서별 파일 대신 세그먼트 저장소에 기록)
+--ledger를 지정하면 문서별 crawl → process 진행 상황을 작업 장부에 기록하여, 중단 후 다시 실행하면
+끝나지 않은 문서만 처리하고 실패한 문서는 재시도합니다 (--shard로 여러 노드가 나눠 실행).
 """
 
 import sys
-import os
+import argparse
 from pathlib import Path
 
 # 프로젝트 루트를 Python 경로에 추가
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
-from utils.data_parser import WikiDataParser
-from utils.markdown_processor import MarkdownProcessor
-from utils.text_processor import TextProcessor
+from utils.config import (
+    WIKI_DOCUMENTS, DEFAULT_HEADERS, HTTP_CACHE_DIR, CRAWL_WORKERS, CRAWL_RATE_PER_HOST, CRAWL_BURST,
+    CRAWL_MAX_RETRIES, CRAWL_BACKOFF, CRAWL_TIMEOUT, INGEST_PROCESSES, LEDGER_PATH, LEDGER_CLAIM_BATCH, DOC_STORE_DIR
+)
+from utils.crawler import WikiCrawler
+from utils.doc_store import open_stores
+from utils.http_cache import HttpCache, NOT_MODIFIED
+from utils.ingest import IngestPipeline
+from utils.job_ledger import JobLedger, parse_shard, worker_id
 
 
-def main():
-    """위키피디아 데이터 다운로드 및 처리 메인 실행"""
+def parse_args() -> argparse.Namespace:
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="위키피디아 문서 다운로드 및 처리")
+    parser.add_argument("--workers", type=int, default=CRAWL_WORKERS,
+                        help=f"동시 요청 스레드 수 (기본값: {CRAWL_WORKERS})")
+    parser.add_argument("--rate", type=float, default=CRAWL_RATE_PER_HOST,
+                        help=f"호스트별 초당 요청 수 (기본값: {CRAWL_RATE_PER_HOST})")
+    parser.add_argument("--burst", type=int, default=CRAWL_BURST,
+                        help=f"호스트별 순간 최대 요청 수 (기본값: {CRAWL_BURST})")
+    parser.add_argument("--retries", type=int, default=CRAWL_MAX_RETRIES,
+                        help=f"요청당 최대 재시도 횟수 (기본값: {CRAWL_MAX_RETRIES})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="HTTP 캐시를 무시하고 모든 페이지를 다시 받아 처리")
+    parser.add_argument("--processes", type=int, default=INGEST_PROCESSES,
+                        help=f"파싱/전처리 프로세스 수 (기본값: {INGEST_PROCESSES})")
+    parser.add_argument("--from-raw", action="store_true",
+                        help="크롤링 없이 data/raw의 원본 텍스트를 한 번씩 읽어 MCP/RAG 파일만 다시 생성")
+    parser.add_argument("--ledger", nargs="?", const=str(LEDGER_PATH), default=None,
+                        help=f"작업 장부로 진행 상황을 기록하고 끝나지 않은 문서만 처리 (경로 생략 시 {LEDGER_PATH})")
+    parser.add_argument("--shard", default=None,
+                        help="장부 모드에서 맡을 샤드 (\"i/n\": n개 노드 중 i번째)")
+    parser.add_argument("--batch", type=int, default=LEDGER_CLAIM_BATCH,
+                        help=f"장부 모드에서 한 번에 임대해서 처리할 문서 수 (기본값: {LEDGER_CLAIM_BATCH})")
+    parser.add_argument("--store", nargs="?", const=str(DOC_STORE_DIR), default=None,
+                        help=f"문서별 파일 대신 세그먼트 저장소에 기록/읽기 (경로 생략 시 {DOC_STORE_DIR})")
+    return parser.parse_args()
+
+
+class OutputLocation:
+    """결과를 저장하는 위치 (문서별 파일 디렉토리 또는 세그먼트 저장소)"""
     
-    print("=== 위키피디아 AI/ML 문서 다운로드 및 처리 ===")
+    def __init__(self, raw_dir: Path, mcp_dir: Path, rag_dir: Path, store_dir: str = None):
+        self.dirs = (raw_dir, mcp_dir, rag_dir)
+        self.stores = open_stores(store_dir) if store_dir else None
     
-    # OpenAI API 키 확인
-    api_key = os.getenv('OPENAI_API_KEY')
-    if not api_key:
-        print("❌ 오류: OPENAI_API_KEY 환경변수가 설정되지 않았습니다.")
-        print("다음 명령어로 API 키를 설정하세요:")
-        print("export OPENAI_API_KEY='your-api-key-here'")
-        return
+    def paths(self, keyword: str) -> tuple:
+        """문서의 raw/mcp/rag 결과 위치 (출력용)"""
+        if self.stores:
+            return tuple(str(self.stores[kind].directory / keyword) for kind in ("raw", "mcp", "rag"))
+        raw_dir, mcp_dir, rag_dir = self.dirs
+        return (str(raw_dir / f"{keyword}.txt"), str(mcp_dir / f"{keyword}.md"), str(rag_dir / f"{keyword}.txt"))
     
-    # 위키피디아 문서 URL 목록
-    wiki_data = {
-        "인공지능": "https://ko.wikipedia.org/wiki/인공지능",
-        "머신러닝": "https://ko.wikipedia.org/wiki/기계_학습", 
-        "딥러닝": "https://ko.wikipedia.org/wiki/딥_러닝",
-        "cnn": "https://ko.wikipedia.org/wiki/합성곱_신경망",
-        "rnn": "https://ko.wikipedia.org/wiki/순환_신경망",
-        "lstm": "https://ko.wikipedia.org/wiki/장단기_메모리",
-        "gru": "https://ko.wikipedia.org/wiki/게이트_순환_유닛", 
-        "transformer": "https://ko.wikipedia.org/wiki/트랜스포머_(기계_학습)",
-        "gpt": "https://ko.wikipedia.org/wiki/GPT_(언어_모델)",
-        "alphago": "https://ko.wikipedia.org/wiki/알파고",
-        "강화학습": "https://ko.wikipedia.org/wiki/강화_학습"
-    }
+    def has_raw(self, keyword: str) -> bool:
+        if self.stores:
+            return keyword in self.stores["raw"]
+        return (self.dirs[0] / f"{keyword}.txt").exists()
     
-    try:
-        # 1단계: 원본 텍스트 크롤링 및 저장
-        print("\n📥 1단계: 원본 텍스트 크롤링 및 저장")
-        raw_dir = project_root / "data" / "raw"
-        raw_dir.mkdir(parents=True, exist_ok=True)
-        
-        raw_results = {}
-        for i, (keyword, url) in enumerate(wiki_data.items(), 1):
-            print(f"\n[{i}/{len(wiki_data)}] 크롤링 중: {keyword}")
-            
-            try:
-                # 위키피디아 크롤링
-                parser = WikiDataParser(api_key, str(raw_dir))
-                title, content = parser.crawl_wikipedia_page(url)
-                
-                if content == "내용을 찾을 수 없습니다.":
-                    print(f"  - 건너뜀: 내용 없음")
-                    continue
-                
-                # 원본 텍스트를 .txt 파일로 저장
-                raw_file_path = raw_dir / f"{keyword}.txt"
-                with open(raw_file_path, 'w', encoding='utf-8') as f:
-                    f.write(f"제목: {title}\n\n")
-                    f.write(content)
-                
-                raw_results[keyword] = str(raw_file_path)
-                print(f"  - 완료: {raw_file_path}")
-                
-            except Exception as e:
-                print(f"  - 오류 발생: {e}")
-                continue
-        
-        print(f"\n✅ 원본 텍스트 저장 완료: {len(raw_results)}개 파일")
-        
-        # 2단계: MCP용 마크다운 처리
-        print("\n📝 2단계: MCP용 마크다운 처리")
-        mcp_dir = project_root / "data" / "mcp_docs"
-        mcp_dir.mkdir(parents=True, exist_ok=True)
-        
-        markdown_processor = MarkdownProcessor()
-        mcp_results = {}
-        
-        for keyword, raw_path in raw_results.items():
-            try:
-                print(f"  - 처리 중: {keyword}")
-                
-                # 원본 텍스트 읽기
-                with open(raw_path, 'r', encoding='utf-8') as f:
-                    raw_content = f.read()
-                
-                # 마크다운 처리
-                markdown_content = markdown_processor.process_for_mcp(raw_content)
-                
-                # MCP용 마크다운 파일 저장
-                mcp_file_path = mcp_dir / f"{keyword}.md"
-                with open(mcp_file_path, 'w', encoding='utf-8') as f:
-                    f.write(markdown_content)
-                
-                mcp_results[keyword] = str(mcp_file_path)
-                print(f"    - 완료: {mcp_file_path}")
-                
-            except Exception as e:
-                print(f"    - 오류 발생: {e}")
-                continue
+    def read_raw(self, keyword: str) -> str:
+        if self.stores:
+            return self.stores["raw"].get(keyword)
+        with open(self.dirs[0] / f"{keyword}.txt", 'r', encoding='utf-8') as f:
+            return f.read()
+    
+    def has_all(self, keyword: str) -> bool:
+        """raw/mcp/rag 결과가 모두 있는지 (워커 프로세스가 기록한 내용까지 반영)"""
+        if self.stores:
+            for store in self.stores.values():
+                store.refresh()
+            return all(keyword in store for store in self.stores.values())
+        return all(Path(path).exists() for path in self.paths(keyword))
+
+
+def register_documents(ledger: JobLedger, wiki_data: dict, output: OutputLocation, from_raw: bool) -> None:
+    """
+    장부에 문서를 등록
+    
+    Args:
+        ledger: 작업 장부
+        wiki_data: {키워드: URL}
+        output: 결과 저장 위치 (raw 파일/저장소 확인)
+        from_raw: raw 파일만 다시 처리하는지 여부 (crawl 단계는 끝난 것으로 봄)
+    """
+    ledger.release_dead_owners()
+    ledger.register({keyword: None for keyword in wiki_data})
+    if from_raw:
+        ledger.register({keyword: None for keyword in wiki_data if output.has_raw(keyword)},
+                        completed_stage="crawl")
+
+
+def claim_documents(ledger: JobLedger, owner: str, wiki_data: dict, from_raw: bool, shard: str,
+                    batch: int) -> dict:
+    """
+    처리할 문서를 batch개까지 임대 (임대 시간 안에 크롤링/처리를 끝낼 수 있도록 나눠서 임대)
+    
+    Args:
+        ledger: 작업 장부
+        owner: 작업자 식별자
+        wiki_data: {키워드: URL}
+        from_raw: raw 파일만 다시 처리하는지 여부
+        shard: 맡을 샤드 ("i/n" 또는 None)
+        batch: 최대 임대 문서 수
         
-        print(f"✅ MCP용 마크다운 처리 완료: {len(mcp_results)}개 파일")
+    Returns:
+        임대한 문서의 {키워드: URL} (할 일이 없으면 빈 딕셔너리)
+    """
+    stages = ["process"] if from_raw else ["crawl", "process"]
+    jobs = ledger.claim(owner, stages, limit=max(1, batch), shards=parse_shard(shard, ledger.num_shards))
+    claimed = {job["doc_id"] for job in jobs}
+    return {keyword: url for keyword, url in wiki_data.items() if keyword in claimed}
+
+
+def record_results(ledger: JobLedger, owner: str, claimed: dict, results: dict, unchanged: list,
+                   from_raw: bool) -> int:
+    """
+    처리 결과를 장부에 기록 (성공/변경 없음은 완료, 크롤링 실패/처리 실패/본문 없음은 재시도 대상)
+    
+    Returns:
+        임대를 잃어 기록하지 못한 문서 수 (임대가 만료되어 다른 작업자가 이어받은 문서)
+    """
+    lost = 0
+    for keyword in claimed:
+        result = results.get(keyword)
+        if keyword in unchanged or (result and result["ok"] and not result["skipped"]):
+            stages = ["process"] if from_raw else ["crawl", "process"]
+            if not all(ledger.complete(keyword, stage, owner) for stage in stages):
+                print(f"  - {keyword}: 임대를 잃어 완료를 기록하지 못했습니다 (다른 작업자가 이어받음)")
+                lost += 1
+        elif result:
+            ledger.fail(keyword, owner, result["error"] or "내용 없음")
+        else:
+            ledger.fail(keyword, owner, "크롤링 실패")
+    ledger.release(owner)
+    return lost
+
+
+def document_batches(args: argparse.Namespace, ledger: JobLedger, owner: str, wiki_data: dict,
+                     output: OutputLocation):
+    """
+    이번 실행에서 처리할 문서 묶음 (장부가 없으면 전체 한 묶음, 있으면 할 일이 없어질 때까지 batch개씩 임대)
+    
+    Yields:
+        {키워드: URL}
+    """
+    if not ledger:
+        yield wiki_data
+        return
+    register_documents(ledger, wiki_data, output, args.from_raw)
+    claimed_total = 0
+    while True:
+        claimed = claim_documents(ledger, owner, wiki_data, args.from_raw, args.shard, args.batch)
+        if not claimed:
+            break
+        claimed_total += len(claimed)
+        print(f"\n📒 작업 장부: {len(claimed)}개 문서 임대 (이번 실행 누적 {claimed_total}개)")
+        yield claimed
+    print(f"\n📒 작업 장부: 임대할 문서 없음 (나머지는 이미 끝났거나 다른 작업자가 처리 중/재시도 대기 중)")
+
+
+def crawl_documents(args: argparse.Namespace, wiki_data: dict, pipeline: IngestPipeline,
+                    output: OutputLocation, unchanged: list, cache: HttpCache = None) -> dict:
+    """
+    문서를 동시에 크롤링하고, 받은 HTML은 곧바로 처리 파이프라인에 넘김
+    
+    Args:
+        args: 명령행 인자
+        wiki_data: {키워드: URL}
+        pipeline: 파싱/전처리 파이프라인
+        output: 결과 저장 위치
+        unchanged: 변경 없는 문서 키워드를 담을 리스트
+        cache: 조건부 요청 캐시 (바뀌지 않은 페이지는 304 응답만 받고 이후 처리 전체를 건너뜀)
         
-        # 3단계: RAG용 전처리
-        print("\n🔧 3단계: RAG용 전처리")
-        rag_dir = project_root / "data" / "rag_docs"
-        rag_dir.mkdir(parents=True, exist_ok=True)
+    Returns:
+        {키워드: 처리 작업 Future}
+    """
+    crawler = WikiCrawler(
+        workers=args.workers,
+        rate_per_host=args.rate,
+        burst=args.burst,
+        max_retries=args.retries,
+        backoff=CRAWL_BACKOFF,
+        timeout=CRAWL_TIMEOUT,
+        headers=DEFAULT_HEADERS,
+        cache=cache
+    )
+    
+    def submit(keyword, response):
+        """응답 HTML을 처리 파이프라인에 제출 (워커 스레드에서 실행)"""
+        html = response.content
         
-        text_processor = TextProcessor()
-        rag_results = {}
+        if response.status_code == NOT_MODIFIED:
+            if output.has_all(keyword):
+                return NOT_MODIFIED
+            # 결과 파일이 지워졌으면 캐시된 본문으로 다시 생성
+            html = cache.load_body(wiki_data[keyword])
+            if html is None:
+                raise RuntimeError("304 응답이지만 캐시된 본문이 없습니다.")
         
-        for keyword, raw_path in raw_results.items():
-            try:
-                print(f"  - 처리 중: {keyword}")
-                
-                # 원본 텍스트 읽기
-                with open(raw_path, 'r', encoding='utf-8') as f:
-                    raw_content = f.read()
-                
-                # RAG용 전처리
-                processed_content = text_processor.process_for_rag(raw_content)
-                
-                # RAG용 텍스트 파일 저장
-                rag_file_path = rag_dir / f"{keyword}.txt"
-                with open(rag_file_path, 'w', encoding='utf-8') as f:
-                    f.write(processed_content)
+        return pipeline.submit_html(keyword, html)
+    
+    try:
+        crawl_results = crawler.crawl(wiki_data, submit)
+    finally:
+        crawler.close()
+    
+    futures = {}
+    for keyword in wiki_data:
+        outcome = crawl_results[keyword]
+        if not outcome["ok"]:
+            print(f"  - {keyword}: 오류 발생: {outcome['error']}")
+        elif outcome["result"] == NOT_MODIFIED:
+            unchanged.append(keyword)
+            print(f"  - {keyword}: 변경 없음 (건너뜀)")
+        else:
+            futures[keyword] = outcome["result"]
+    
+    print(f"  - 처리량: {crawler.progress.summary()}")
+    print(f"\n✅ 크롤링 완료: {len(futures)}개 문서 (변경 없음 {len(unchanged)}개)")
+    return futures
+
+
+def main():
+    """위키피디아 데이터 다운로드 및 처리 메인 실행"""
+    
+    args = parse_args()
+    
+    print("=== 위키피디아 AI/ML 문서 다운로드 및 처리 ===")
+    
+    # 위키피디아 문서 URL 목록
+    wiki_data = WIKI_DOCUMENTS
+    
+    raw_dir = project_root / "data" / "raw"
+    mcp_dir = project_root / "data" / "mcp_docs"
+    rag_dir = project_root / "data" / "rag_docs"
+    
+    output = OutputLocation(raw_dir, mcp_dir, rag_dir, args.store)
+    ledger = JobLedger(args.ledger) if args.ledger else None
+    owner = worker_id()
+    
+    cache = None if args.no_cache or args.from_raw else HttpCache(str(HTTP_CACHE_DIR))
+    
+    try:
+        # 파싱과 MCP/RAG 전처리는 프로세스 풀에서 문서 단위로 나눠 수행 (크롤링과 겹쳐서 진행)
+        unchanged = []
+        results = {}
+        lost = 0
+        with IngestPipeline(raw_dir, mcp_dir, rag_dir, processes=args.processes,
+                            store_dir=args.store) as pipeline:
+            for batch in document_batches(args, ledger, owner, wiki_data, output):
+                batch_unchanged = []
+                if args.from_raw:
+                    print("\n📂 1단계: 원본 텍스트 읽기 (크롤링 생략)")
+                    futures = {}
+                    for keyword in batch:
+                        if not output.has_raw(keyword):
+                            print(f"  - {keyword}: 건너뜀: 원본 파일 없음")
+                            continue
+                        futures[keyword] = pipeline.submit_raw(keyword, output.read_raw(keyword))
+                else:
+                    print("\n📥 1단계: 원본 텍스트 크롤링")
+                    print(f"  - 동시 요청 {args.workers}개, 호스트별 초당 {args.rate}회 제한")
+                    futures = crawl_documents(args, batch, pipeline, output, batch_unchanged, cache)
                 
-                rag_results[keyword] = str(rag_file_path)
-                print(f"    - 완료: {rag_file_path}")
+                print(f"\n⚙️  2단계: 파싱 및 MCP/RAG 전처리 (프로세스 {pipeline.processes}개)")
+                batch_results = pipeline.wait(futures)
+                if cache:
+                    # 크롤러는 처리를 제출한 뒤 검증자를 저장하므로, 처리에 실패한 문서는 캐시를 지워
+                    # 다음 실행이 304(변경 없음)로 건너뛰지 않고 본문을 다시 받게 함
+                    for keyword, result in batch_results.items():
+                        if not result["ok"] or result["skipped"]:
+                            cache.invalidate(batch[keyword])
                 
-            except Exception as e:
-                print(f"    - 오류 발생: {e}")
-                continue
+                if ledger:
+                    lost += record_results(ledger, owner, batch, batch_results, batch_unchanged, args.from_raw)
+                results.update(batch_results)
+                unchanged.extend(batch_unchanged)
         
-        print(f"✅ RAG용 전처리 완료: {len(rag_results)}개 파일")
+        processed = {keyword: result for keyword, result in results.items()
+                     if result["ok"] and not result["skipped"]}
+        failed = [keyword for keyword, result in results.items() if not result["ok"]]
         
         # 결과 요약
         print("\n" + "="*60)
         print("📋 처리 결과 요약")
         print("="*60)
-        print(f"✅ 원본 텍스트: {len(raw_results)}개 파일 (data/raw/)")
-        print(f"✅ MCP용 마크다운: {len(mcp_results)}개 파일 (data/mcp_docs/)")
-        print(f"✅ RAG용 전처리: {len(rag_results)}개 파일 (data/rag_docs/)")
+        locations = ("data/raw/", "data/mcp_docs/", "data/rag_docs/") if not args.store else tuple(
+            str(output.stores[kind].directory) for kind in ("raw", "mcp", "rag"))
+        print(f"✅ 원본 텍스트: {len(processed)}개 문서 ({locations[0]})")
+        print(f"⏭️  변경 없음: {len(unchanged)}개 문서")
+        print(f"✅ MCP용 마크다운: {len(processed)}개 문서 ({locations[1]})")
+        print(f"✅ RAG용 전처리: {len(processed)}개 문서 ({locations[2]})")
+        if failed:
+            print(f"❌ 실패: {len(failed)}개 문서 ({', '.join(failed)})")
+        if lost:
+            print(f"⚠️  임대를 잃어 장부에 기록하지 못함: {lost}개 문서 (--batch를 줄이세요)")
         
         print("\n📄 생성된 파일 목록:")
-        for keyword in raw_results.keys():
+        for keyword in processed:
+            raw_path, mcp_path, rag_path = output.paths(keyword)
             print(f"  • {keyword}:")
-            print(f"    - 원본: data/raw/{keyword}.txt")
-            print(f"    - MCP: data/mcp_docs/{keyword}.md")
-            print(f"    - RAG: data/rag_docs/{keyword}.txt")
+            print(f"    - 원본: {raw_path}")
+            print(f"    - MCP: {mcp_path}")
+            print(f"    - RAG: {rag_path}")
             
         print("\n🎉 모든 처리 완료!")
         
@@ -182,6 +342,11 @@ def main():
     except Exception as e:
         print(f"\n❌ 오류 발생: {e}")
         print("문제가 지속되면 API 키와 네트워크 연결을 확인해주세요.")
+    finally:
+        if ledger:
+            # 끝내지 못한 문서의 임대를 풀어 다음 실행에서 바로 이어받게 함
+            ledger.release(owner)
+            ledger.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,123 @@
+"""
+HTTP 조건부 요청 캐시 모듈
+- 응답 본문과 ETag / Last-Modified를 디스크에 저장
+- 다음 요청 때 If-None-Match / If-Modified-Since 헤더 생성
+- 304 응답이면 본문을 다시 받지 않고 캐시된 본문 사용
+"""
+
+import json
+import time
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from utils.atomic_io import atomic_write_bytes
+
+NOT_MODIFIED = 304
+
+
+class HttpCache:
+    """URL별 응답 본문과 검증자(ETag, Last-Modified)를 저장하는 디스크 캐시"""
+
+    def __init__(self, cache_dir: str):
+        """
+        Args:
+            cache_dir: 캐시 디렉토리 경로
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, url: str):
+        """URL의 (메타데이터 경로, 본문 경로)"""
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def get_entry(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        캐시 메타데이터 조회
+
+        Args:
+            url: 요청 URL
+
+        Returns:
+            {"url", "etag", "last_modified", "fetched_at", "size"} 또는 None (본문이 없으면 None)
+        """
+        meta_path, body_path = self._paths(url)
+        if not meta_path.exists() or not body_path.exists():
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        조건부 요청 헤더 생성
+
+        Args:
+            url: 요청 URL
+
+        Returns:
+            If-None-Match / If-Modified-Since 헤더 (캐시가 없으면 빈 딕셔너리)
+        """
+        entry = self.get_entry(url)
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def load_body(self, url: str) -> Optional[bytes]:
+        """캐시된 응답 본문 (없으면 None)"""
+        _, body_path = self._paths(url)
+        try:
+            return body_path.read_bytes()
+        except OSError:
+            return None
+
+    def store(self, url: str, response) -> None:
+        """
+        200 응답을 캐시에 저장 (검증자가 없는 응답은 저장하지 않음)
+
+        Args:
+            url: 요청 URL
+            response: requests.Response
+        """
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+
+        meta_path, body_path = self._paths(url)
+        entry = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+            "size": len(response.content)
+        }
+        # 본문을 먼저 쓰고 메타데이터를 나중에 써서, 중단되어도 메타데이터가 본문보다 앞서지 않게 함
+        self._atomic_write(body_path, response.content)
+        self._atomic_write(meta_path, json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+
+    def touch(self, url: str) -> None:
+        """304 응답을 받은 항목의 확인 시각 갱신"""
+        entry = self.get_entry(url)
+        if entry:
+            entry["checked_at"] = time.time()
+            meta_path, _ = self._paths(url)
+            self._atomic_write(meta_path, json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+
+    def invalidate(self, url: str) -> None:
+        """캐시 항목 삭제 (받은 본문을 처리하지 못했을 때, 다음 요청이 304 대신 본문을 다시 받도록)"""
+        for path in self._paths(url):
+            path.unlink(missing_ok=True)
+
+    def _atomic_write(self, path: Path, data: bytes) -> None:
+        """임시 파일에 쓴 뒤 이름을 바꿔 원자적으로 저장"""
+        atomic_write_bytes(path, data)
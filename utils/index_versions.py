@@ -0,0 +1,233 @@
+"""
+벡터 DB 버전 관리 모듈 (블루/그린 재구축)
+구축은 data/vectordb/versions/<버전>/ 아래 새 Chroma 디렉토리에서 진행하고, 검증을 마치면 ACTIVE 포인터 파일을
+원자적으로 바꿔 새 버전으로 전환합니다. 검색하는 쪽(VectorStore)은 포인터가 바뀌면 다시 시작하지 않고 새 버전을
+열기 때문에, 재구축하는 동안에도 이전 버전으로 계속 검색할 수 있습니다.
+- 새 버전은 현재 활성 버전을 복사해서 시작하므로 바뀌지 않은 청크는 다시 임베딩하지 않음 (체크포인트도 함께 복사)
+- 구축 중인 버전에는 BUILDING 표시(구축 방식 포함)를 남겨, 중단되면 --resume으로 같은 버전에 이어서 구축
+  (장부 기반 구축은 장부의 완료 상태가 그 버전에 기록된 것이므로 항상 자기 구축 중인 버전에 이어서 구축)
+- 활성 버전과 최근 버전 몇 개만 남기고 나머지는 삭제 (활성 버전에서 물러난 지 얼마 안 된 버전은 이전 버전을
+  열고 있던 검색이 전환할 수 있도록 남김)
+ACTIVE 포인터가 없으면 data/vectordb 자체(버전 관리 이전 구조)를 활성 버전으로 봅니다.
+
+사용법:
+    python utils/index_versions.py status
+    python utils/index_versions.py activate <버전>   # 이전 버전으로 되돌리기
+    python utils/index_versions.py gc
+"""
+
+import json
+import time
+import shutil
+import argparse
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.atomic_io import atomic_write_text
+from utils.config import INDEX_ACTIVE_FILE, INDEX_KEEP_VERSIONS, INDEX_GC_GRACE_SECONDS
+
+VERSIONS_DIR = "versions"
+BUILDING_FILE = "BUILDING"   # 구축 중인 버전 디렉토리 안의 표시 파일
+RETIRED_FILE = "RETIRED"     # 활성 버전에서 물러난 버전 디렉토리 안의 표시 파일 (수정 시각 = 물러난 시각)
+
+
+class IndexVersions:
+    """벡터 DB 디렉토리 아래의 버전 디렉토리와 ACTIVE 포인터 관리"""
+
+    def __init__(self, root: Union[str, Path], keep: int = INDEX_KEEP_VERSIONS,
+                 grace_seconds: float = INDEX_GC_GRACE_SECONDS):
+        """
+        Args:
+            root: 벡터 DB 디렉토리 (data/vectordb)
+            keep: gc()에서 남길 완료된 버전 수 (활성 버전 포함)
+            grace_seconds: 활성 버전에서 물러난 뒤 이 시간 동안은 gc()에서 삭제하지 않음
+        """
+        self.root = Path(root)
+        self.versions_dir = self.root / VERSIONS_DIR
+        self.pointer = self.root / INDEX_ACTIVE_FILE
+        self.keep = max(1, keep)
+        self.grace_seconds = grace_seconds
+
+    def pointer_stamp(self) -> Optional[int]:
+        """ACTIVE 포인터 파일의 수정 시각 (바뀌었는지 값싸게 확인하는 용도, 없으면 None)"""
+        try:
+            return self.pointer.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def active_info(self) -> Dict[str, Any]:
+        """ACTIVE 포인터 내용 ({"version", "activated_at", ...}, 없으면 빈 딕셔너리)"""
+        try:
+            return json.loads(self.pointer.read_text(encoding='utf-8'))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def active(self) -> Optional[str]:
+        """활성 버전 이름 (버전 관리 이전 구조면 None)"""
+        version = self.active_info().get("version")
+        return version if version and self.path(version).is_dir() else None
+
+    def path(self, version: str) -> Path:
+        """버전 디렉토리 경로"""
+        return self.versions_dir / version
+
+    def active_dir(self) -> Path:
+        """검색에 사용할 Chroma 디렉토리"""
+        version = self.active()
+        return self.path(version) if version else self.root
+
+    def create(self, seed: bool = True, builder: str = "streaming") -> str:
+        """
+        새 버전 디렉토리 생성 (BUILDING 표시)
+
+        Args:
+            seed: 현재 활성 버전을 복사해서 시작 (False면 빈 디렉토리에서 모두 다시 임베딩)
+            builder: 구축 방식 ("streaming": 기본 구축, "ledger": 장부 기반 구축, pending()에서 구분)
+
+        Returns:
+            새 버전 이름
+        """
+        self.versions_dir.mkdir(parents=True, exist_ok=True)
+        # 이름 순서 = 생성 순서 (밀리초까지 넣고, 가장 최근 버전보다 뒤에 오게 하여 삭제된 버전의 이름을 다시 쓰지 않음)
+        now = time.time()
+        version = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f"-{int(now * 1000) % 1000:03d}"
+        latest = max((entry.name for entry in self.versions_dir.iterdir() if not entry.name.startswith(".")),
+                     default="")
+        if version <= latest:
+            version = f"{latest}-1"
+
+        source = self.active_dir()
+        target = self.path(version)
+        seeded = seed and self._has_chroma(source)
+        if seeded:
+            # 복사가 끝난 뒤 이름을 바꾸므로, 복사하다 중단된 임시 디렉토리는 gc()에서 지워짐
+            staging = self.versions_dir / f".{version}.tmp"
+            shutil.copytree(source, staging, ignore=self._ignore_versions)
+            staging.rename(target)
+        else:
+            target.mkdir()
+        atomic_write_text(target / BUILDING_FILE, json.dumps(
+            {"started_at": time.time(), "seeded_from": (self.active() or "vectordb") if seeded else None,
+             "builder": builder}, ensure_ascii=False))
+        return version
+
+    def _has_chroma(self, directory: Path) -> bool:
+        """복사할 Chroma 파일이 있는지 (버전 디렉토리와 포인터 제외)"""
+        return directory.is_dir() and any(entry.name not in (VERSIONS_DIR, INDEX_ACTIVE_FILE)
+                                          for entry in directory.iterdir())
+
+    def _ignore_versions(self, directory: str, names: List[str]) -> List[str]:
+        """copytree에서 루트의 버전 디렉토리와 포인터 제외"""
+        if Path(directory) == self.root:
+            return [name for name in names if name in (VERSIONS_DIR, INDEX_ACTIVE_FILE)]
+        return []
+
+    def pending(self, builder: Optional[str] = None) -> Optional[str]:
+        """이어서 구축할 수 있는 가장 최근의 구축 중인 버전 (builder를 지정하면 그 방식으로 만든 버전만)"""
+        building = [version["version"] for version in self.versions()
+                    if version["building"] and builder in (None, version["builder"])]
+        return building[-1] if building else None
+
+    def _builder(self, directory: Path) -> str:
+        """BUILDING 표시에 기록된 구축 방식 (기록이 없으면 "streaming")"""
+        try:
+            return json.loads((directory / BUILDING_FILE).read_text(encoding='utf-8')).get("builder", "streaming")
+        except (OSError, json.JSONDecodeError):
+            return "streaming"
+
+    def activate(self, version: str, info: Optional[Dict[str, Any]] = None) -> None:
+        """
+        버전을 활성화 (ACTIVE 포인터를 원자적으로 교체)
+
+        Args:
+            version: 활성화할 버전
+            info: 포인터에 함께 기록할 정보 (청크 수 등)
+        """
+        target = self.path(version)
+        if not target.is_dir():
+            raise ValueError(f"버전을 찾을 수 없습니다: {version}")
+        (target / BUILDING_FILE).unlink(missing_ok=True)
+        (target / RETIRED_FILE).unlink(missing_ok=True)
+        previous = self.active()
+        pointer = {"version": version, "activated_at": time.time(), "previous": previous, **(info or {})}
+        atomic_write_text(self.pointer, json.dumps(pointer, ensure_ascii=False, indent=2))
+        if previous and previous != version:
+            (self.path(previous) / RETIRED_FILE).touch()
+
+    def versions(self) -> List[Dict[str, Any]]:
+        """버전 목록 (오래된 순): {"version", "active", "building", "builder", "path"} (builder는 구축 중일 때만)"""
+        if not self.versions_dir.is_dir():
+            return []
+        active = self.active()
+        versions = []
+        for entry in sorted(self.versions_dir.iterdir()):
+            if not entry.is_dir() or entry.name.startswith("."):
+                continue
+            building = (entry / BUILDING_FILE).exists()
+            versions.append({"version": entry.name, "active": entry.name == active, "building": building,
+                             "builder": self._builder(entry) if building else None, "path": entry})
+        return versions
+
+    def gc(self) -> List[str]:
+        """
+        오래된 버전 삭제: 활성 버전, 완료된 최근 버전 keep - 1개, 구축 방식별로 가장 최근의 구축 중인 버전,
+        활성 버전에서 물러난 지 grace_seconds가 지나지 않은 버전만 남김
+
+        Returns:
+            삭제한 버전 이름 목록
+        """
+        versions = self.versions()
+        pending = {version["builder"]: version["version"] for version in versions if version["building"]}
+        active = self.active()
+        finished = [version["version"] for version in versions
+                    if not version["building"] and version["version"] != active]
+        keep = {active, *pending.values(), *(finished[-(self.keep - 1):] if self.keep > 1 else [])}
+
+        removed = []
+        now = time.time()
+        for version in versions:
+            retired = version["path"] / RETIRED_FILE
+            if retired.exists() and now - retired.stat().st_mtime < self.grace_seconds:
+                continue
+            if version["version"] not in keep:
+                shutil.rmtree(version["path"], ignore_errors=True)
+                removed.append(version["version"])
+        # 복사 도중 중단된 임시 디렉토리
+        if self.versions_dir.is_dir():
+            for entry in self.versions_dir.glob(".*.tmp"):
+                shutil.rmtree(entry, ignore_errors=True)
+        return removed
+
+
+def main():
+    """명령행 실행"""
+    parser = argparse.ArgumentParser(description="벡터 DB 버전 관리")
+    parser.add_argument("command", choices=["status", "activate", "gc"])
+    parser.add_argument("version", nargs="?", help="activate할 버전")
+    parser.add_argument("--root", default=str(project_root / "data" / "vectordb"), help="벡터 DB 디렉토리")
+    args = parser.parse_args()
+
+    versions = IndexVersions(args.root)
+    if args.command == "activate":
+        if not args.version:
+            parser.error("activate에는 버전이 필요합니다.")
+        versions.activate(args.version)
+        print(f"활성 버전: {args.version}")
+    elif args.command == "gc":
+        removed = versions.gc()
+        print(f"삭제한 버전: {', '.join(removed) if removed else '없음'}")
+    else:
+        print(f"활성 Chroma 디렉토리: {versions.active_dir()}")
+        for version in versions.versions():
+            state = ("활성" if version["active"] else f"구축 중 ({version['builder']})" if version["building"]
+                     else "이전 버전")
+            print(f"  - {version['version']}: {state}")
+
+
+if __name__ == "__main__":
+    main()
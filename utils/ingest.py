@@ -0,0 +1,251 @@
+"""
+문서 수집(ingestion) 파이프라인 모듈
+- 문서마다 원본 텍스트를 한 번만 만듦 (크롤링한 HTML 파싱, 덤프 위키텍스트 변환, 또는 raw 파일을 한 번 읽음)
+- 프로세스 풀에서 HTML 파싱과 MCP용/RAG용 전처리를 메모리 위에서 수행 (raw 파일을 다시 읽지 않음)
+- raw / mcp_docs / rag_docs 결과를 원자적으로 저장하고 문서별 진행률과 소요 시간을 보고
+  (store_dir를 지정하면 문서별 파일 대신 utils/doc_store.py 세그먼트 저장소에 기록)
+"""
+
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from utils.atomic_io import atomic_write_text
+from utils.doc_store import SegmentStore, document_meta, open_stores
+from utils.markdown_processor import MarkdownProcessor
+from utils.text_processor import TextProcessor
+from utils.wikitext import wikitext_to_markdown
+
+# WikiDataParser.parse_wikipedia_html이 본문을 찾지 못했을 때의 본문
+NO_CONTENT = "내용을 찾을 수 없습니다."
+
+TIMING_LABELS = {"convert_s": "변환", "parse_s": "파싱", "mcp_s": "MCP", "rag_s": "RAG", "write_s": "저장"}
+
+# 워커 프로세스마다 하나씩 만드는 파서/프로세서/저장소 (_init_worker에서 설정, 파서는 HTML을 처음 처리할 때 생성)
+_parser = None
+_parser_options: Optional[Tuple[str, str]] = None
+_stores: Optional[Dict[str, SegmentStore]] = None
+_markdown_processor = MarkdownProcessor()
+_text_processor = TextProcessor()
+
+
+def _init_worker(raw_dir: str, html_parser: str, store_dir: Optional[str] = None) -> None:
+    """워커 프로세스 초기화 (저장소 모드면 워커 전용 세그먼트로 기록)"""
+    global _parser_options, _stores
+    _parser_options = (raw_dir, html_parser)
+    if store_dir:
+        _stores = open_stores(store_dir)
+
+
+def normalize_newlines(text: str) -> str:
+    """raw 파일을 텍스트 모드로 다시 읽었을 때와 같도록 줄바꿈을 '\\n'으로 통일"""
+    if '\r' not in text:
+        return text
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def process_document(keyword: str, raw_content: str, raw_dir: str, mcp_dir: str, rag_dir: str,
+                     write_raw: bool = True) -> Dict[str, Any]:
+    """
+    원본 텍스트 하나로 MCP용 마크다운과 RAG용 텍스트를 만들어 저장 (워커 프로세스에서 실행,
+    워커가 저장소 모드면 디렉토리 대신 raw/mcp/rag 저장소에 기록)
+
+    Args:
+        keyword: 문서 키워드 (파일 이름)
+        raw_content: "제목: ...\\n\\n본문" 형식의 원본 텍스트
+        raw_dir: 원본 텍스트 디렉토리
+        mcp_dir: MCP용 마크다운 디렉토리
+        rag_dir: RAG용 텍스트 디렉토리
+        write_raw: 원본 텍스트도 저장할지 여부 (raw 파일에서 읽어 온 경우 False)
+
+    Returns:
+        {"keyword", "ok", "skipped", "error", "paths": {"raw", "mcp", "rag"},
+         "timings": {"mcp_s", "rag_s", "write_s"}}
+    """
+    timings: Dict[str, float] = {}
+    if _stores is not None:
+        paths = {kind: str(store.directory / keyword) for kind, store in _stores.items()}
+    else:
+        paths = {
+            "raw": str(Path(raw_dir) / f"{keyword}.txt"),
+            "mcp": str(Path(mcp_dir) / f"{keyword}.md"),
+            "rag": str(Path(rag_dir) / f"{keyword}.txt")
+        }
+
+    content = normalize_newlines(raw_content)
+
+    started = time.perf_counter()
+    markdown_content = _markdown_processor.process_for_mcp(content)
+    timings["mcp_s"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    processed_content = _text_processor.process_for_rag(content)
+    timings["rag_s"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    if _stores is not None:
+        if write_raw:
+            _stores["raw"].put(keyword, raw_content)
+        _stores["mcp"].put(keyword, markdown_content, document_meta(markdown_content))
+        _stores["rag"].put(keyword, processed_content)
+    else:
+        if write_raw:
+            atomic_write_text(paths["raw"], raw_content)
+        atomic_write_text(paths["mcp"], markdown_content)
+        atomic_write_text(paths["rag"], processed_content)
+    timings["write_s"] = time.perf_counter() - started
+
+    return {"keyword": keyword, "ok": True, "skipped": False, "error": None,
+            "paths": paths, "timings": timings}
+
+
+def process_html(keyword: str, html: bytes, raw_dir: str, mcp_dir: str, rag_dir: str) -> Dict[str, Any]:
+    """
+    페이지 HTML을 파싱한 뒤 process_document로 세 가지 결과를 저장 (워커 프로세스에서 실행)
+
+    Args:
+        keyword: 문서 키워드
+        html: 페이지 HTML
+        raw_dir, mcp_dir, rag_dir: 출력 디렉토리
+
+    Returns:
+        process_document 결과 (timings에 "parse_s" 추가, 본문이 없으면 skipped=True)
+    """
+    global _parser
+    if _parser is None:
+        # 파싱에는 OpenAI 클라이언트가 필요 없으므로 API 키 없이 생성 (클라이언트는 요약할 때 생성)
+        from utils.data_parser import WikiDataParser
+        raw_dir_option, html_parser = _parser_options
+        _parser = WikiDataParser(output_dir=raw_dir_option, html_parser=html_parser)
+
+    started = time.perf_counter()
+    title, content = _parser.parse_wikipedia_html(html)
+    parse_s = time.perf_counter() - started
+
+    if content == NO_CONTENT:
+        return {"keyword": keyword, "ok": True, "skipped": True, "error": None,
+                "paths": {}, "timings": {"parse_s": parse_s}}
+
+    result = process_document(keyword, f"제목: {title}\n\n{content}", raw_dir, mcp_dir, rag_dir)
+    result["timings"] = {"parse_s": parse_s, **result["timings"]}
+    return result
+
+
+def process_wikitext(keyword: str, title: str, wikitext: str,
+                     raw_dir: str, mcp_dir: str, rag_dir: str) -> Dict[str, Any]:
+    """
+    덤프의 위키텍스트를 원본 텍스트로 변환한 뒤 process_document로 세 가지 결과를 저장 (워커 프로세스에서 실행)
+
+    Args:
+        keyword: 문서 키워드
+        title: 문서 제목
+        wikitext: 문서 위키텍스트
+        raw_dir, mcp_dir, rag_dir: 출력 디렉토리
+
+    Returns:
+        process_document 결과 (timings에 "convert_s" 추가, 본문이 없으면 skipped=True)
+    """
+    started = time.perf_counter()
+    content = wikitext_to_markdown(wikitext, title)
+    convert_s = time.perf_counter() - started
+
+    if content == f"# {title}":
+        return {"keyword": keyword, "ok": True, "skipped": True, "error": None,
+                "paths": {}, "timings": {"convert_s": convert_s}}
+
+    result = process_document(keyword, f"제목: {title}\n\n{content}", raw_dir, mcp_dir, rag_dir)
+    result["timings"] = {"convert_s": convert_s, **result["timings"]}
+    return result
+
+
+class IngestPipeline:
+    """문서를 프로세스 풀로 나눠 파싱/전처리/저장하는 파이프라인"""
+
+    def __init__(self, raw_dir: str, mcp_dir: str, rag_dir: str, processes: Optional[int] = None,
+                 html_parser: str = "lxml", store_dir: Optional[str] = None):
+        """
+        Args:
+            raw_dir: 원본 텍스트 디렉토리
+            mcp_dir: MCP용 마크다운 디렉토리
+            rag_dir: RAG용 텍스트 디렉토리
+            processes: 워커 프로세스 수 (None이면 CPU 코어 수)
+            html_parser: HTML 파싱 방식 (WikiDataParser의 html_parser)
+            store_dir: 세그먼트 저장소 루트 (지정하면 세 디렉토리 대신 raw/, mcp/, rag/ 저장소에 기록)
+        """
+        self.dirs = (str(raw_dir), str(mcp_dir), str(rag_dir))
+        self.store_dir = str(store_dir) if store_dir else None
+        if not self.store_dir:
+            for directory in self.dirs:
+                Path(directory).mkdir(parents=True, exist_ok=True)
+
+        self.processes = max(1, processes or os.cpu_count() or 1)
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            initializer=_init_worker,
+            initargs=(self.dirs[0], html_parser, self.store_dir)
+        )
+
+    def submit_html(self, keyword: str, html: bytes) -> Future:
+        """페이지 HTML 처리 작업 제출 (크롤러 워커 스레드에서 호출해도 안전)"""
+        return self.executor.submit(process_html, keyword, html, *self.dirs)
+
+    def submit_raw(self, keyword: str, raw_content: str) -> Future:
+        """이미 저장된 원본 텍스트 처리 작업 제출 (raw 파일은 다시 쓰지 않음)"""
+        return self.executor.submit(process_document, keyword, raw_content, *self.dirs, False)
+
+    def submit_wikitext(self, keyword: str, title: str, wikitext: str) -> Future:
+        """덤프에서 읽은 위키텍스트 변환/처리 작업 제출 (API 키 없이 사용 가능)"""
+        return self.executor.submit(process_wikitext, keyword, title, wikitext, *self.dirs)
+
+    def wait(self, futures: Dict[str, Future]) -> Dict[str, Dict[str, Any]]:
+        """
+        제출한 작업이 끝나는 순서대로 문서별 진행률과 소요 시간 출력
+
+        Args:
+            futures: {키워드: Future}
+
+        Returns:
+            {키워드: 처리 결과} (실패한 문서는 ok=False와 error 메시지)
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        if not futures:
+            return results
+
+        started = time.perf_counter()
+        keywords = {future: keyword for keyword, future in futures.items()}
+        for done, future in enumerate(as_completed(keywords), 1):
+            keyword = keywords[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"keyword": keyword, "ok": False, "skipped": False, "error": str(e),
+                          "paths": {}, "timings": {}}
+            results[keyword] = result
+
+            if not result["ok"]:
+                status = f"오류 발생: {result['error']}"
+            elif result["skipped"]:
+                status = "건너뜀: 내용 없음"
+            else:
+                status = "완료 (" + ", ".join(
+                    f"{TIMING_LABELS[name]} {seconds:.2f}s" for name, seconds in result["timings"].items()) + ")"
+            print(f"  [{done}/{len(futures)}] {keyword}: {status}")
+
+        elapsed = time.perf_counter() - started
+        busy = sum(sum(result["timings"].values()) for result in results.values())
+        print(f"  - 처리량: {len(results) / max(elapsed, 1e-9):.2f} docs/s, 경과 {elapsed:.2f}s, "
+              f"작업 시간 합계 {busy:.2f}s (프로세스 {self.processes}개)")
+        return results
+
+    def close(self, cancel: bool = False) -> None:
+        """프로세스 풀 종료 (cancel이면 아직 시작하지 않은 작업은 취소)"""
+        self.executor.shutdown(cancel_futures=cancel)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # 중단(KeyboardInterrupt 등)으로 빠져나가면 남은 작업을 기다리지 않음
+        self.close(cancel=exc_type is not None)
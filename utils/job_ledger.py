@@ -0,0 +1,494 @@
+"""
+수집/색인 작업 장부(ledger) 모듈
+문서마다 crawl → process → chunk → embed → index 중 마지막으로 끝난 단계를 SQLite에 기록하여,
+중단된 download_wiki_data.py / build_vectordb.py를 마지막으로 끝난 단계부터 이어서 실행합니다.
+- 여러 프로세스(또는 같은 파일을 보는 여러 노드)가 임대(lease)를 걸어 문서를 나눠 가져감
+- 임대가 만료되면(작업자가 죽으면) 다른 작업자가 이어받고, 실패한 문서는 백오프 후 재시도
+- 문서 id의 해시로 정한 샤드를 작업자별로 나눠 맡아 수평 확장 ("i/n" 형식)
+- 단계 결과(청크, 임베딩 등)를 함께 저장하여 비용이 큰 단계를 다시 하지 않음
+
+사용 예 (상태 확인 / 실패 문서 재시도 / 특정 단계부터 다시 실행):
+    python utils/job_ledger.py status
+    python utils/job_ledger.py retry-failed
+    python utils/job_ledger.py reset --from-stage chunk
+"""
+
+import os
+import sys
+import time
+import zlib
+import socket
+import sqlite3
+import argparse
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.config import LEDGER_PATH, LEDGER_SHARDS, LEDGER_LEASE_SECONDS, LEDGER_MAX_ATTEMPTS, LEDGER_RETRY_BACKOFF
+
+STAGES = ("crawl", "process", "chunk", "embed", "index")
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id TEXT PRIMARY KEY,
+    shard INTEGER NOT NULL,
+    stage INTEGER NOT NULL DEFAULT -1,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    content_hash TEXT,
+    lease_owner TEXT,
+    lease_expires REAL,
+    not_before REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_claim ON documents (status, stage, shard);
+CREATE TABLE IF NOT EXISTS artifacts (
+    doc_id TEXT NOT NULL,
+    stage INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (doc_id, stage)
+);
+"""
+
+# 단계 함수: (문서 id, 이전 단계 결과를 읽는 함수) → 이 단계 결과 (저장할 것이 없으면 None)
+StageHandler = Callable[[str, Callable[[str], Optional[bytes]]], Optional[bytes]]
+
+
+def worker_id() -> str:
+    """작업자 식별자 ("호스트:pid", 같은 호스트의 죽은 작업자 임대를 회수할 때 사용)"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def parse_shard(spec: Optional[str], num_shards: int) -> Optional[List[int]]:
+    """
+    "i/n" 형식의 작업자 몫을 샤드 번호 목록으로 변환
+
+    Args:
+        spec: "i/n" (n개 작업자 중 i번째, 0부터) 또는 None (모든 샤드)
+        num_shards: 장부의 샤드 수
+
+    Returns:
+        맡을 샤드 번호 목록 (None이면 제한 없음)
+    """
+    if not spec:
+        return None
+    index, _, count = spec.partition("/")
+    index, count = int(index), int(count)
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"샤드 형식이 잘못되었습니다: {spec} (예: 0/4)")
+    return [shard for shard in range(num_shards) if shard % count == index]
+
+
+class JobLedger:
+    """문서별 단계 진행 상황과 임대를 기록하는 SQLite 작업 장부 (프로세스마다 하나씩 열어서 사용)"""
+
+    def __init__(self, path: str = str(LEDGER_PATH), num_shards: int = LEDGER_SHARDS,
+                 lease_seconds: float = LEDGER_LEASE_SECONDS, max_attempts: int = LEDGER_MAX_ATTEMPTS,
+                 retry_backoff: float = LEDGER_RETRY_BACKOFF):
+        """
+        Args:
+            path: SQLite 파일 경로
+            num_shards: 샤드 수 (처음 만들 때만 사용, 이후에는 장부에 기록된 값 사용)
+            lease_seconds: 임대 시간 (단계를 끝낼 때마다 연장)
+            max_attempts: 연속 실패 허용 횟수 (넘으면 failed 상태로 재시도 중단)
+            retry_backoff: 재시도 기본 대기 시간 (실패할 때마다 두 배)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+
+        # 트랜잭션은 직접 관리 (BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡아 임대 경쟁을 직렬화)
+        self.conn = sqlite3.connect(str(self.path), timeout=60, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('num_shards', ?)", (str(num_shards),))
+        self.num_shards = int(self.conn.execute("SELECT value FROM meta WHERE key = 'num_shards'").fetchone()[0])
+
+    def _transaction(self):
+        """쓰기 트랜잭션 (BEGIN IMMEDIATE ... COMMIT, 예외 시 ROLLBACK)"""
+        return _Transaction(self.conn)
+
+    def shard_of(self, doc_id: str) -> int:
+        """문서 id의 샤드 번호"""
+        return zlib.crc32(doc_id.encode('utf-8')) % self.num_shards
+
+    @staticmethod
+    def stage_index(stage: Optional[str]) -> int:
+        """단계 이름 → 번호 (None이면 -1: 아무 단계도 끝나지 않음)"""
+        if stage is None:
+            return -1
+        if stage not in STAGES:
+            raise ValueError(f"알 수 없는 단계입니다: {stage} (가능: {', '.join(STAGES)})")
+        return STAGES.index(stage)
+
+    def register(self, documents: Dict[str, Optional[str]], completed_stage: Optional[str] = None) -> Dict[str, int]:
+        """
+        문서 등록 (이미 있으면 유지, 내용 해시가 바뀌었으면 completed_stage 다음 단계부터 다시 실행)
+
+        Args:
+            documents: {문서 id: 내용 해시 또는 None}
+            completed_stage: 이미 끝난 것으로 볼 단계 (예: rag_docs 파일이 있으면 "process")
+
+        Returns:
+            {"added", "changed", "advanced"} 문서 수
+        """
+        start = self.stage_index(completed_stage)
+        now = time.time()
+        counts = {"added": 0, "changed": 0, "advanced": 0}
+        with self._transaction():
+            for doc_id, content_hash in documents.items():
+                row = self.conn.execute("SELECT stage, content_hash, lease_owner FROM documents WHERE doc_id = ?",
+                                        (doc_id,)).fetchone()
+                if row is None:
+                    self.conn.execute(
+                        "INSERT INTO documents (doc_id, shard, stage, content_hash, updated_at) VALUES (?, ?, ?, ?, ?)",
+                        (doc_id, self.shard_of(doc_id), start, content_hash, now))
+                    counts["added"] += 1
+                elif content_hash is not None and row[1] is not None and row[1] != content_hash:
+                    self._rewind(doc_id, start, now)
+                    self.conn.execute("UPDATE documents SET content_hash = ? WHERE doc_id = ?", (content_hash, doc_id))
+                    counts["changed"] += 1
+                elif row[0] < start and row[2] is None:
+                    # 장부 밖에서 끝난 단계 반영 (예: 장부 없이 만든 rag_docs 파일)
+                    self.conn.execute(
+                        "UPDATE documents SET stage = ?, content_hash = COALESCE(?, content_hash), updated_at = ? "
+                        "WHERE doc_id = ?", (start, content_hash, now, doc_id))
+                    counts["advanced"] += 1
+                elif row[1] is None and content_hash is not None:
+                    self.conn.execute("UPDATE documents SET content_hash = ? WHERE doc_id = ?", (content_hash, doc_id))
+        return counts
+
+    def claim(self, owner: str, stages: Sequence[str], limit: int = 1,
+              shards: Optional[Iterable[int]] = None) -> List[Dict[str, object]]:
+        """
+        다음 단계가 stages에 속하는 문서를 임대 (다른 작업자가 임대 중이거나 재시도 대기 중인 문서는 제외)
+
+        Args:
+            owner: 작업자 식별자
+            stages: 이 작업자가 실행할 단계 이름
+            limit: 최대 임대 문서 수
+            shards: 맡을 샤드 번호 (None이면 전체)
+
+        Returns:
+            [{"doc_id", "stage": 다음에 실행할 단계 이름, "attempts"}] (많이 진행된 문서 먼저)
+        """
+        next_stages = [self.stage_index(stage) - 1 for stage in stages]
+        now = time.time()
+        query = (f"SELECT doc_id, stage, attempts FROM documents WHERE status = ? "
+                 f"AND stage IN ({','.join('?' * len(next_stages))}) "
+                 f"AND (lease_owner IS NULL OR lease_expires < ?) AND not_before <= ?")
+        params: List[object] = [PENDING, *next_stages, now, now]
+        if shards is not None:
+            shards = list(shards)
+            if not shards:
+                return []
+            query += f" AND shard IN ({','.join('?' * len(shards))})"
+            params.extend(shards)
+        query += " ORDER BY stage DESC, doc_id LIMIT ?"
+        params.append(limit)
+
+        with self._transaction():
+            rows = self.conn.execute(query, params).fetchall()
+            self.conn.executemany(
+                "UPDATE documents SET lease_owner = ?, lease_expires = ?, updated_at = ? WHERE doc_id = ?",
+                [(owner, now + self.lease_seconds, now, row[0]) for row in rows])
+        return [{"doc_id": doc_id, "stage": STAGES[stage + 1], "attempts": attempts}
+                for doc_id, stage, attempts in rows]
+
+    def complete(self, doc_id: str, stage: str, owner: str, artifact: Optional[bytes] = None) -> bool:
+        """
+        단계 완료 기록 (임대는 연장되어 같은 작업자가 다음 단계를 이어서 실행)
+
+        Args:
+            doc_id: 문서 id
+            stage: 끝낸 단계 이름
+            owner: 작업자 식별자
+            artifact: 다음 단계가 사용할 결과 (None이면 저장하지 않음)
+
+        Returns:
+            기록했으면 True (임대를 잃었거나 이미 다른 작업자가 끝냈으면 False)
+        """
+        index = self.stage_index(stage)
+        now = time.time()
+        final = index == len(STAGES) - 1
+        with self._transaction():
+            updated = self.conn.execute(
+                "UPDATE documents SET stage = ?, status = ?, attempts = 0, last_error = NULL, not_before = 0, "
+                "lease_owner = ?, lease_expires = ?, updated_at = ? "
+                "WHERE doc_id = ? AND stage = ? AND lease_owner = ?",
+                (index, DONE if final else PENDING, None if final else owner,
+                 None if final else now + self.lease_seconds, now, doc_id, index - 1, owner)).rowcount
+            if updated and artifact is not None:
+                self.conn.execute("INSERT OR REPLACE INTO artifacts (doc_id, stage, data) VALUES (?, ?, ?)",
+                                  (doc_id, index, sqlite3.Binary(artifact)))
+        return bool(updated)
+
+    def fail(self, doc_id: str, owner: str, error: str) -> None:
+        """
+        단계 실패 기록 (임대 해제, 백오프 후 재시도, max_attempts번 연속 실패하면 failed)
+
+        Args:
+            doc_id: 문서 id
+            owner: 작업자 식별자
+            error: 오류 메시지
+        """
+        now = time.time()
+        with self._transaction():
+            self.conn.execute(
+                "UPDATE documents SET attempts = attempts + 1, "
+                "status = CASE WHEN attempts + 1 >= ? THEN ? ELSE ? END, "
+                "not_before = ? + ? * (1 << attempts), last_error = ?, "
+                "lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE doc_id = ? AND lease_owner = ?",
+                (self.max_attempts, FAILED, PENDING, now, self.retry_backoff, error[:1000], now, doc_id, owner))
+
+    def release(self, owner: str, doc_ids: Optional[Iterable[str]] = None) -> None:
+        """임대 해제 (doc_ids가 None이면 이 작업자의 모든 임대)"""
+        with self._transaction():
+            if doc_ids is None:
+                self.conn.execute("UPDATE documents SET lease_owner = NULL, lease_expires = NULL "
+                                  "WHERE lease_owner = ?", (owner,))
+            else:
+                self.conn.executemany("UPDATE documents SET lease_owner = NULL, lease_expires = NULL "
+                                      "WHERE doc_id = ? AND lease_owner = ?",
+                                      [(doc_id, owner) for doc_id in doc_ids])
+
+    def release_dead_owners(self) -> int:
+        """
+        같은 호스트에서 이미 종료된 작업자의 임대 회수 (임대 만료를 기다리지 않고 바로 이어서 실행)
+
+        Returns:
+            회수한 문서 수
+        """
+        host = socket.gethostname()
+        owners = [row[0] for row in self.conn.execute(
+            "SELECT DISTINCT lease_owner FROM documents WHERE lease_owner LIKE ?", (f"{host}:%",))]
+        dead = [owner for owner in owners if not _process_alive(owner.rsplit(":", 1)[-1])]
+        released = 0
+        with self._transaction():
+            for owner in dead:
+                released += self.conn.execute("UPDATE documents SET lease_owner = NULL, lease_expires = NULL "
+                                              "WHERE lease_owner = ?", (owner,)).rowcount
+        return released
+
+    def load_artifact(self, doc_id: str, stage: str) -> Optional[bytes]:
+        """단계 결과 (없으면 None)"""
+        row = self.conn.execute("SELECT data FROM artifacts WHERE doc_id = ? AND stage = ?",
+                                (doc_id, self.stage_index(stage))).fetchone()
+        return bytes(row[0]) if row else None
+
+    def waiting(self, stages: Sequence[str], shards: Optional[Iterable[int]] = None) -> int:
+        """다음 단계가 stages에 속하지만 지금은 임대 중이거나 재시도 대기 중인 문서 수"""
+        next_stages = [self.stage_index(stage) - 1 for stage in stages]
+        query = (f"SELECT COUNT(*) FROM documents WHERE status = ? "
+                 f"AND stage IN ({','.join('?' * len(next_stages))})")
+        params: List[object] = [PENDING, *next_stages]
+        if shards is not None:
+            shards = list(shards)
+            if not shards:
+                return 0
+            query += f" AND shard IN ({','.join('?' * len(shards))})"
+            params.extend(shards)
+        return self.conn.execute(query, params).fetchone()[0]
+
+    def retry_failed(self) -> int:
+        """failed 문서를 다시 대기 상태로 (재시도 횟수 초기화)"""
+        with self._transaction():
+            return self.conn.execute(
+                "UPDATE documents SET status = ?, attempts = 0, not_before = 0, updated_at = ? WHERE status = ?",
+                (PENDING, time.time(), FAILED)).rowcount
+
+    def reset(self, from_stage: str, doc_ids: Optional[Iterable[str]] = None) -> int:
+        """
+        from_stage부터 다시 실행하도록 되돌림 (그 단계 이후의 결과 삭제)
+
+        Args:
+            from_stage: 다시 실행할 첫 단계
+            doc_ids: 대상 문서 (None이면 전체)
+
+        Returns:
+            되돌린 문서 수
+        """
+        start = self.stage_index(from_stage) - 1
+        now = time.time()
+        with self._transaction():
+            if doc_ids is None:
+                doc_ids = [row[0] for row in self.conn.execute(
+                    "SELECT doc_id FROM documents WHERE stage > ? OR status = ?", (start, FAILED))]
+            count = 0
+            for doc_id in doc_ids:
+                count += self._rewind(doc_id, start, now)
+        return count
+
+    def _rewind(self, doc_id: str, stage: int, now: float) -> int:
+        """문서를 stage까지 끝난 상태로 되돌림 (트랜잭션 안에서 호출)"""
+        self.conn.execute("DELETE FROM artifacts WHERE doc_id = ? AND stage > ?", (doc_id, stage))
+        return self.conn.execute(
+            "UPDATE documents SET stage = MIN(stage, ?), status = ?, attempts = 0, not_before = 0, "
+            "last_error = NULL, updated_at = ? WHERE doc_id = ?", (stage, PENDING, now, doc_id)).rowcount
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """
+        단계별 문서 수
+
+        Returns:
+            {마지막으로 끝난 단계 이름(없으면 "new"): {"pending" / "leased" / "done" / "failed": 문서 수}}
+        """
+        now = time.time()
+        counts: Dict[str, Dict[str, int]] = {}
+        for stage, status, leased, count in self.conn.execute(
+                "SELECT stage, status, lease_owner IS NOT NULL AND lease_expires >= ?, COUNT(*) "
+                "FROM documents GROUP BY 1, 2, 3", (now,)):
+            name = STAGES[stage] if stage >= 0 else "new"
+            key = "leased" if leased else status
+            counts.setdefault(name, {})
+            counts[name][key] = counts[name].get(key, 0) + count
+        return counts
+
+    def failures(self, limit: int = 20) -> List[Dict[str, object]]:
+        """실패 문서 목록 (최근 오류 메시지 포함)"""
+        rows = self.conn.execute(
+            "SELECT doc_id, stage, attempts, last_error FROM documents WHERE status = ? "
+            "ORDER BY updated_at DESC LIMIT ?", (FAILED, limit)).fetchall()
+        return [{"doc_id": doc_id, "failed_stage": STAGES[stage + 1], "attempts": attempts, "error": error}
+                for doc_id, stage, attempts, error in rows]
+
+    def close(self) -> None:
+        """연결 종료"""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE 트랜잭션 컨텍스트"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+def _process_alive(pid: str) -> bool:
+    """같은 호스트의 프로세스가 살아 있는지 확인"""
+    try:
+        os.kill(int(pid), 0)
+    except (ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def run_worker(ledger: JobLedger, handlers: Dict[str, StageHandler], owner: Optional[str] = None,
+               shards: Optional[Iterable[int]] = None, batch: int = 1, idle_wait: float = 1.0,
+               max_documents: Optional[int] = None) -> Dict[str, int]:
+    """
+    장부에서 문서를 임대하여 handlers의 단계를 차례로 실행 (할 일이 없어질 때까지)
+
+    Args:
+        ledger: 작업 장부
+        handlers: {단계 이름: 단계 함수}
+        owner: 작업자 식별자 (None이면 worker_id())
+        shards: 맡을 샤드 번호 (None이면 전체)
+        batch: 한 번에 임대할 문서 수
+        idle_wait: 다른 작업자의 임대나 재시도 대기가 끝나기를 기다리는 간격 (초)
+        max_documents: 최대 처리 문서 수 (None이면 제한 없음)
+
+    Returns:
+        {"documents", "stages", "failed", "lost"} (lost: 임대를 잃어 결과를 기록하지 못한 문서 수)
+    """
+    owner = owner or worker_id()
+    stages = [stage for stage in STAGES if stage in handlers]
+    shards = list(shards) if shards is not None else None
+    stats = {"documents": 0, "stages": 0, "failed": 0, "lost": 0}
+
+    while max_documents is None or stats["documents"] < max_documents:
+        jobs = ledger.claim(owner, stages, limit=batch, shards=shards)
+        if not jobs:
+            if not ledger.waiting(stages, shards):
+                break
+            time.sleep(idle_wait)
+            continue
+
+        for job in jobs:
+            doc_id, stage = job["doc_id"], job["stage"]
+            stats["documents"] += 1
+            try:
+                while stage in handlers:
+                    artifact = handlers[stage](doc_id, lambda name, doc_id=doc_id: ledger.load_artifact(doc_id, name))
+                    if not ledger.complete(doc_id, stage, owner, artifact):
+                        stats["lost"] += 1
+                        break
+                    stats["stages"] += 1
+                    index = STAGES.index(stage) + 1
+                    stage = STAGES[index] if index < len(STAGES) else None
+            except Exception as e:
+                print(f"  - {doc_id}: {stage} 단계 오류: {e}")
+                ledger.fail(doc_id, owner, f"{stage}: {e}")
+                stats["failed"] += 1
+            finally:
+                ledger.release(owner, [doc_id])
+
+    return stats
+
+
+def print_status(ledger: JobLedger) -> None:
+    """단계별 진행 상황과 실패 문서 출력"""
+    counts = ledger.counts()
+    total = sum(sum(by_status.values()) for by_status in counts.values())
+    print(f"📒 작업 장부: {ledger.path} (문서 {total}개, 샤드 {ledger.num_shards}개)")
+    for name in ("new", *STAGES):
+        if name in counts:
+            detail = ", ".join(f"{status} {count}" for status, count in sorted(counts[name].items()))
+            print(f"  - {name} 까지 완료: {detail}")
+    for failure in ledger.failures():
+        print(f"  ❌ {failure['doc_id']}: {failure['failed_stage']} 단계 {failure['attempts']}회 실패 "
+              f"({failure['error']})")
+
+
+def main():
+    """작업 장부 관리 명령"""
+    parser = argparse.ArgumentParser(description="수집/색인 작업 장부 관리")
+    parser.add_argument("command", choices=["status", "retry-failed", "reset"], help="실행할 명령")
+    parser.add_argument("--ledger", default=str(LEDGER_PATH), help=f"장부 파일 경로 (기본값: {LEDGER_PATH})")
+    parser.add_argument("--from-stage", choices=STAGES, help="reset: 다시 실행할 첫 단계")
+    parser.add_argument("--doc", nargs="+", default=None, help="reset: 대상 문서 id (기본값: 전체)")
+    args = parser.parse_args()
+
+    with JobLedger(args.ledger) as ledger:
+        if args.command == "retry-failed":
+            print(f"🔁 실패 문서 {ledger.retry_failed()}개를 다시 대기 상태로 바꿨습니다.")
+        elif args.command == "reset":
+            if not args.from_stage:
+                parser.error("reset에는 --from-stage가 필요합니다.")
+            print(f"⏪ 문서 {ledger.reset(args.from_stage, args.doc)}개를 {args.from_stage} 단계부터 다시 실행합니다.")
+        print_status(ledger)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,37 @@ MCP용 마크다운 처리 모듈
 원본 텍스트를 MCP 시스템에 적합한 마크다운 형식으로 변환합니다.
 """
 
-import re
-from typing import Optional
+from typing import Iterable, Iterator
+
+from utils.text_pipeline import (
+    TextPipeline, SectionSkipRule, split_title,
+    HTML_TAG_PASS, LINK_PASS, CODE_BLOCK_PASS, INLINE_CODE_PASS, CITATION_PASSES
+)
+
+# 강조 처리('**\1**', '*\1*')는 매칭된 문자열을 그대로 되돌려 놓는 치환이라 패스에서 뺌
+MCP_PASSES = [
+    # HTML 태그 제거
+    HTML_TAG_PASS,
+    # 링크 처리 (간단한 형태)
+    LINK_PASS,
+    # 코드 블록 처리
+    CODE_BLOCK_PASS,
+    INLINE_CODE_PASS,
+    # 각주 번호 패턴 제거
+    *CITATION_PASSES,
+]
+
+MCP_SECTION_RULES = [
+    # 참조 섹션 제거 (# 로 시작하는 줄에서 재시작)
+    SectionSkipRule(
+        ['참고 문헌', '참고문헌', '각주', '외부 링크', '외부링크',
+         '같이 보기', '같이보기', '바깥 링크', '바깥링크'],
+        resume_prefix='#',
+        strip_before_prefix=False
+    ),
+]
+
+MCP_PIPELINE = TextPipeline(MCP_PASSES, MCP_SECTION_RULES)
 
 
 class MarkdownProcessor:
@@ -25,31 +54,29 @@ class MarkdownProcessor:
             MCP용 마크다운 텍스트
         """
         # 제목과 본문 분리
-        lines = raw_content.split('\n')
-        title = ""
-        content_lines = []
+        title, content_lines = split_title(raw_content.split('\n'))
         
-        # 제목 추출
-        for i, line in enumerate(lines):
-            if line.startswith('제목:'):
-                title = line.replace('제목:', '').strip()
-                content_lines = lines[i+1:]
-                break
-            else:
-                content_lines.append(line)
-        
-        # 본문 처리
-        processed_content = self._process_content('\n'.join(content_lines))
-        
-        # 최종 마크다운 구성
-        markdown = f"# {title}\n\n"
-        markdown += processed_content
+        # 본문 처리 및 최종 마크다운 구성
+        return f"# {title}\n\n" + self._process_content('\n'.join(content_lines))
+    
+    def stream_for_mcp(self, lines: Iterable[str]) -> Iterator[str]:
+        """
+        원본 텍스트를 줄 단위로 읽으며 MCP용 마크다운으로 처리 (대용량 파일용)
         
-        return markdown
+        Args:
+            lines: 줄바꿈 문자를 포함한 줄 반복자 (텍스트 모드 파일 객체 등)
+            
+        Yields:
+            마크다운 조각 (모두 이으면 process_for_mcp 결과와 같음)
+        """
+        title, content_lines = split_title(lines)
+        yield f"# {title}\n\n"
+        yield from MCP_PIPELINE.stream(content_lines)
     
     def _process_content(self, content: str) -> str:
         """
         본문 내용을 마크다운 형식으로 처리
+        (HTML 태그 → 링크/코드 → 각주 → 참조 섹션 → 공백 정리)
         
         Args:
             content: 원본 본문
@@ -57,80 +84,4 @@ class MarkdownProcessor:
         Returns:
             처리된 마크다운 텍스트
         """
-        # HTML 태그 제거
-        content = self._remove_html_tags(content)
-        
-        # 마크다운 특수문자 처리
-        content = self._process_markdown_syntax(content)
-        
-        # 각주 및 참조 제거
-        content = self._remove_citations(content)
-        
-        # 텍스트 정리
-        content = self._clean_text(content)
-        
-        return content
-    
-    def _remove_html_tags(self, text: str) -> str:
-        """HTML 태그 제거"""
-        # 간단한 HTML 태그 제거
-        text = re.sub(r'<[^>]+>', '', text)
-        return text
-    
-    def _process_markdown_syntax(self, text: str) -> str:
-        """마크다운 문법 처리"""
-        # 강조 처리
-        text = re.sub(r'\*\*(.*?)\*\*', r'**\1**', text)  # 굵게
-        text = re.sub(r'\*(.*?)\*', r'*\1*', text)        # 기울임
-        
-        # 링크 처리 (간단한 형태)
-        text = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', text)
-        
-        # 코드 블록 처리
-        text = re.sub(r'```.*?```', '', text, flags=re.DOTALL)
-        text = re.sub(r'`([^`]+)`', r'\1', text)
-        
-        return text
-    
-    def _remove_citations(self, text: str) -> str:
-        """각주 및 참조 제거"""
-        # 각주 번호 패턴 제거
-        text = re.sub(r'\[\d+\]', '', text)
-        text = re.sub(r'\[\d+,\s*\d+\]', '', text)
-        text = re.sub(r'\[\d+-\d+\]', '', text)
-        
-        # 참조 섹션 제거
-        lines = text.split('\n')
-        filtered_lines = []
-        skip_mode = False
-        
-        for line in lines:
-            line_lower = line.lower().strip()
-            
-            # 제외할 섹션 시작 감지
-            if any(keyword in line_lower for keyword in [
-                '참고 문헌', '참고문헌', '각주', '외부 링크', '외부링크',
-                '같이 보기', '같이보기', '바깥 링크', '바깥링크'
-            ]):
-                skip_mode = True
-                continue
-            
-            # 메인 섹션 재시작 감지
-            if skip_mode and line.startswith('#'):
-                skip_mode = False
-            
-            if not skip_mode:
-                filtered_lines.append(line)
-        
-        return '\n'.join(filtered_lines)
-    
-    def _clean_text(self, text: str) -> str:
-        """텍스트 정리"""
-        # 과도한 공백 제거
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        text = re.sub(r' +', ' ', text)
-        
-        # 앞뒤 공백 제거
-        text = text.strip()
-        
-        return text 
\ No newline at end of file
+        return MCP_PIPELINE.process(content)
@@ -0,0 +1,267 @@
+"""
+양자화 벡터 색인 모듈
+1536차원 float32 임베딩은 청크당 6KB라 말뭉치가 커지면 메모리를 대부분 차지합니다. 이 색인은 메모리에
+양자화한 벡터만 두고 후보를 고른 뒤, 디스크의 원본 정밀도 벡터(float16/float32, 메모리 맵)로 후보만 다시
+점수를 매깁니다.
+- int8: 차원별 스케일로 -127~127 정수화 (float32 대비 1/4)
+- binary: 차원별 평균을 뺀 부호 1비트 (float32 대비 1/32, 후보 거리는 해밍 거리)
+- 후보 수 = k × rescore, 다시 점수를 매긴 거리는 Chroma와 같은 기준 (cosine/ip: 1 - 유사도, l2: 거리 제곱)
+
+파일 (색인 디렉토리, 벡터 DB 버전 디렉토리의 quantized/):
+    meta.json       모드, 차원, 개수, 거리, 원본 벡터 자료형
+    ids.bin         행 순서의 청크 id (UTF-8로 이어 붙임, 메모리 맵)
+    id_offsets.npy  행별 청크 id 시작 위치 (개수 + 1, 메모리에 읽음, 행당 8바이트)
+    codes.npy       양자화 벡터 (메모리에 읽음)
+    scales.npy      int8 차원별 스케일 / means.npy  binary 차원별 평균 / norms.npy  l2 거리용 벡터 크기 제곱
+    vectors.npy     원본 정밀도 벡터 (np.load(mmap_mode='r'))
+"""
+
+import json
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+MODES = ("int8", "binary")
+RESCORE_DTYPES = ("float16", "float32")
+BLOCK_ROWS = 4096    # 한 번에 처리할 행 수 (1536차원이면 임시 float32 배열 24MB)
+
+# 바이트 값 → 1인 비트 수
+POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def exact_scores(vectors: np.ndarray, query: np.ndarray, space: str) -> np.ndarray:
+    """
+    정확한 점수 (클수록 가까움, cosine은 vectors와 query가 정규화되어 있다고 가정)
+
+    Args:
+        vectors: (n, d) 벡터
+        query: (d,) 쿼리
+        space: "cosine", "ip", "l2"
+
+    Returns:
+        (n,) 점수 (cosine/ip: 유사도, l2: -거리 제곱)
+    """
+    dots = vectors @ query
+    if space == "l2":
+        return -((vectors ** 2).sum(axis=1) - 2 * dots + query @ query)
+    return dots
+
+
+def score_to_distance(score: float, space: str) -> float:
+    """exact_scores() 점수 → Chroma 거리"""
+    return -score if space == "l2" else 1 - score
+
+
+class ChunkIdList:
+    """행 번호 → 청크 id (파이썬 문자열 목록 대신 오프셋 배열과 메모리 맵 바이트로 보관)"""
+
+    def __init__(self, directory: Path):
+        """
+        Args:
+            directory: ids.bin과 id_offsets.npy가 있는 색인 디렉토리
+        """
+        self.offsets = np.load(directory / "id_offsets.npy")
+        size = int(self.offsets[-1])
+        # 빈 파일은 메모리 맵으로 열 수 없음
+        self.blob = np.memmap(directory / "ids.bin", dtype=np.uint8, mode='r') if size else np.zeros(0, np.uint8)
+
+    @staticmethod
+    def write(directory: Path, ids: List[str]) -> None:
+        """청크 id 목록을 ids.bin / id_offsets.npy로 기록"""
+        encoded = [chunk_id.encode('utf-8') for chunk_id in ids]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(chunk_id) for chunk_id in encoded], out=offsets[1:])
+        (directory / "ids.bin").write_bytes(b"".join(encoded))
+        np.save(directory / "id_offsets.npy", offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row: int) -> str:
+        return self.blob[self.offsets[row]:self.offsets[row + 1]].tobytes().decode('utf-8')
+
+    def __iter__(self):
+        return (self[row] for row in range(len(self)))
+
+
+class QuantizedIndex:
+    """양자화 벡터로 후보를 고르고 메모리 맵 원본 벡터로 다시 점수를 매기는 색인"""
+
+    def __init__(self, directory: Union[str, Path]):
+        """
+        Args:
+            directory: build()로 만든 색인 디렉토리
+        """
+        self.directory = Path(directory)
+        self.meta = json.loads((self.directory / "meta.json").read_text(encoding='utf-8'))
+        self.mode = self.meta["mode"]
+        self.space = self.meta["space"]
+        self.ids = ChunkIdList(self.directory)
+        self.codes = np.load(self.directory / "codes.npy")
+        self.scales = np.load(self.directory / "scales.npy") if self.mode == "int8" else None
+        self.means = np.load(self.directory / "means.npy") if self.mode == "binary" else None
+        self.norms = np.load(self.directory / "norms.npy") if self.space == "l2" else None
+        self.vectors = np.load(self.directory / "vectors.npy", mmap_mode='r')
+
+    @staticmethod
+    def exists(directory: Union[str, Path]) -> bool:
+        return (Path(directory) / "meta.json").exists()
+
+    @staticmethod
+    def stamp(directory: Union[str, Path]) -> Optional[Tuple[int, int]]:
+        """색인 식별값 (meta.json의 수정 시각과 inode, 다시 구축하면 바뀜, 없으면 None)"""
+        try:
+            stat = (Path(directory) / "meta.json").stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_ino
+
+    @classmethod
+    def build(cls, directory: Union[str, Path], batches: Iterable[Tuple[List[str], np.ndarray]], count: int,
+              dim: int, mode: str = "int8", space: str = "cosine",
+              rescore_dtype: str = "float16") -> "QuantizedIndex":
+        """
+        색인 구축 (원본 벡터를 메모리 맵 파일에 쓰면서 읽으므로 메모리에는 배치 하나와 양자화 벡터만 머묾)
+
+        Args:
+            directory: 만들 색인 디렉토리 (있으면 교체)
+            batches: (청크 id 목록, (m, dim) 벡터) 배치
+            count: 전체 벡터 수
+            dim: 차원
+            mode: "int8" 또는 "binary"
+            space: 거리 ("cosine"이면 정규화해서 저장)
+            rescore_dtype: 원본 벡터 자료형 ("float16" 또는 "float32")
+
+        Returns:
+            새 색인
+        """
+        if mode not in MODES:
+            raise ValueError(f"지원하지 않는 양자화 모드입니다: {mode} (가능: {', '.join(MODES)})")
+        if rescore_dtype not in RESCORE_DTYPES:
+            raise ValueError(f"지원하지 않는 자료형입니다: {rescore_dtype} (가능: {', '.join(RESCORE_DTYPES)})")
+        directory = Path(directory)
+        staging = directory.with_name(directory.name + ".tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        try:
+            cls.write(staging, batches, count, dim, mode, space, rescore_dtype)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        shutil.rmtree(directory, ignore_errors=True)
+        staging.rename(directory)
+        return cls(directory)
+
+    @staticmethod
+    def write(staging: Path, batches: Iterable[Tuple[List[str], np.ndarray]], count: int, dim: int, mode: str,
+              space: str, rescore_dtype: str):
+        """build()의 파일 기록 (원본 벡터 → 양자화 벡터 순서로 두 번 읽음)"""
+        # 1단계: 원본 벡터를 메모리 맵 파일에 기록하고 차원별 최대 절댓값과 평균 계산
+        vectors = np.lib.format.open_memmap(staging / "vectors.npy", mode='w+', dtype=rescore_dtype,
+                                            shape=(count, dim))
+        ids: List[str] = []
+        max_abs = np.zeros(dim, dtype=np.float32)
+        sums = np.zeros(dim, dtype=np.float64)
+        for batch_ids, batch in batches:
+            batch = np.asarray(batch, dtype=np.float32)
+            if space == "cosine":
+                batch = batch / np.maximum(np.linalg.norm(batch, axis=1, keepdims=True), 1e-12)
+            if len(ids) + len(batch) > count:
+                raise ValueError(f"벡터 수가 예상({count}개)보다 많습니다.")
+            vectors[len(ids):len(ids) + len(batch)] = batch
+            np.maximum(max_abs, np.abs(batch).max(axis=0), out=max_abs)
+            sums += batch.sum(axis=0)
+            ids.extend(batch_ids)
+        if len(ids) != count:
+            raise ValueError(f"벡터 수가 예상과 다릅니다: {len(ids)}개 (예상 {count}개)")
+
+        # 2단계: 기록한 원본 벡터를 블록 단위로 양자화
+        scales = np.where(max_abs > 0, max_abs / 127, 1).astype(np.float32)
+        # 임베딩은 모든 차원에 공통 성분이 있어 평균을 빼야 부호 비트가 벡터를 구별함
+        means = (sums / max(count, 1)).astype(np.float32)
+        width = dim if mode == "int8" else (dim + 7) // 8
+        codes = np.lib.format.open_memmap(staging / "codes.npy", mode='w+',
+                                          dtype=np.int8 if mode == "int8" else np.uint8, shape=(count, width))
+        norms = np.zeros(count, dtype=np.float32)
+        for start in range(0, count, BLOCK_ROWS):
+            block = np.asarray(vectors[start:start + BLOCK_ROWS], dtype=np.float32)
+            if mode == "int8":
+                codes[start:start + len(block)] = np.clip(np.rint(block / scales), -127, 127)
+            else:
+                codes[start:start + len(block)] = np.packbits(block > means, axis=1)
+            norms[start:start + len(block)] = (block ** 2).sum(axis=1)
+        vectors.flush()
+        codes.flush()
+        del vectors, codes
+
+        if mode == "int8":
+            np.save(staging / "scales.npy", scales)
+        else:
+            np.save(staging / "means.npy", means)
+        if space == "l2":
+            np.save(staging / "norms.npy", norms)
+        ChunkIdList.write(staging, ids)
+        (staging / "meta.json").write_text(json.dumps(
+            {"mode": mode, "space": space, "dim": dim, "count": count, "rescore_dtype": rescore_dtype}), encoding='utf-8')
+
+    def candidate_scores(self, query: np.ndarray) -> np.ndarray:
+        """양자화 벡터로 계산한 근사 점수 (클수록 가까움)"""
+        scores = np.empty(len(self.ids), dtype=np.float32)
+        if self.mode == "int8":
+            scaled = (query * self.scales).astype(np.float32)
+        else:
+            bits = np.packbits(query > self.means)
+        for start in range(0, len(self.ids), BLOCK_ROWS):
+            block = self.codes[start:start + BLOCK_ROWS]
+            if self.mode == "int8":
+                dots = block.astype(np.float32) @ scaled
+                if self.space == "l2":
+                    dots = 2 * dots - self.norms[start:start + BLOCK_ROWS]
+                scores[start:start + len(block)] = dots
+            else:
+                scores[start:start + len(block)] = -POPCOUNT[block ^ bits].sum(axis=1, dtype=np.int32)
+        return scores
+
+    def search(self, query: Union[List[float], np.ndarray], k: int = 10, rescore: int = 4) -> List[Tuple[str, float]]:
+        """
+        검색
+
+        Args:
+            query: 쿼리 임베딩
+            k: 결과 수
+            rescore: 원본 벡터로 다시 점수를 매길 후보 수 배율 (후보 k × rescore개)
+
+        Returns:
+            [(청크 id, Chroma 기준 거리)] 가까운 순
+        """
+        if not self.ids:
+            return []
+        query = np.asarray(query, dtype=np.float32)
+        if self.space == "cosine":
+            query = query / max(float(np.linalg.norm(query)), 1e-12)
+        k = min(k, len(self.ids))
+        candidates = min(len(self.ids), max(k, k * rescore))
+
+        approximate = self.candidate_scores(query)
+        rows = np.argpartition(-approximate, candidates - 1)[:candidates]
+        rows.sort()   # 메모리 맵 파일을 앞에서부터 읽도록
+        scores = exact_scores(np.asarray(self.vectors[rows], dtype=np.float32), query, self.space)
+        best = np.argsort(-scores)[:k]
+        return [(self.ids[rows[i]], score_to_distance(float(scores[i]), self.space)) for i in best]
+
+    def memory(self) -> Dict[str, Any]:
+        """
+        메모리 사용량 (바이트)
+
+        Returns:
+            {"resident": 메모리에 두는 양자화 벡터/스케일/크기/청크 id 오프셋,
+             "mapped": 메모리 맵 원본 벡터와 청크 id 파일, "baseline": 같은 벡터를 float32로 메모리에 둘 때,
+             "ratio": baseline / resident}
+        """
+        resident = sum(array.nbytes for array in (self.codes, self.scales, self.means, self.norms, self.ids.offsets)
+                       if array is not None)
+        baseline = len(self.ids) * self.meta["dim"] * 4
+        return {"resident": resident, "mapped": self.vectors.nbytes + self.ids.blob.nbytes, "baseline": baseline,
+                "ratio": baseline / resident if resident else 0.0}
@@ -0,0 +1,58 @@
+"""
+문서 섹션 분류 모듈
+- 제외할 섹션(같이 보기, 각주, 외부 링크 등)과 다시 포함할 주요 섹션(개요, 역사 등)의 헤더 키워드
+- HTML 파서(WikiDataParser)와 위키텍스트 변환기(utils/wikitext.py)가 같은 규칙을 사용
+"""
+
+from typing import List
+
+SKIP_SECTION_KEYWORDS: List[str] = [
+    # 한글
+    '같이 보기', '같이보기', '관련 항목', '관련항목',
+    '각주', '주석', '참조', '출처', '참고 문헌', '참고문헌',
+    '외부 링크', '외부링크', '바깥 링크', '바깥링크',
+    '더 보기', '더보기', '참고 자료', '참고자료',
+    '외부 고리', '바깥 고리', '읽을거리', '읽을 거리',
+
+    # 영글 (혹시 영문 위키 처리할 경우)
+    'see also', 'references', 'external links', 'further reading',
+    'notes', 'citations', 'bibliography', 'sources',
+    'related articles', 'related topics'
+]
+
+MAIN_SECTION_KEYWORDS: List[str] = [
+    '개요', '정의', '역사', '특징', '원리', '방법', '구조',
+    '종류', '분류', '응용', '활용', '장점', '단점', '한계',
+    '알고리즘', '모델', '이론', '수식', '공식'
+]
+
+
+def should_skip_section(header_text: str) -> bool:
+    """
+    제외할 섹션인지 확인
+
+    Args:
+        header_text: 소문자로 변환된 헤더 텍스트
+
+    Returns:
+        제외할 섹션이면 True
+    """
+    # 정확히 일치하거나 포함하는 경우
+    for keyword in SKIP_SECTION_KEYWORDS:
+        if keyword in header_text or header_text.strip() == keyword:
+            return True
+
+    return False
+
+
+def is_main_section(header_text: str) -> bool:
+    """
+    메인 섹션인지 확인 (제외 섹션 이후에 나오는 주요 섹션)
+
+    Args:
+        header_text: 소문자로 변환된 헤더 텍스트
+
+    Returns:
+        메인 섹션이면 True
+    """
+    return any(keyword in header_text for keyword in MAIN_SECTION_KEYWORDS)
@@ -0,0 +1,207 @@
+"""
+단계별 스트리밍 파이프라인 모듈
+read → chunk → embed → write처럼 이어지는 단계를 각자의 스레드에서 실행하고 단계 사이를 크기 제한이 있는 큐로
+연결합니다. 앞 단계가 빨라도 큐가 차면 기다리므로 메모리에 쌓이는 항목 수는 큐 크기를 넘지 않고,
+파일 읽기, 임베딩 요청, DB 쓰기가 서로를 기다리지 않고 겹쳐서 실행됩니다.
+- 단계마다 작업 스레드 수 지정 (예: 임베딩 요청은 여러 개 동시에, Chroma 쓰기는 하나)
+- 단계별 처리 건수, 작업 시간, 처리량 집계
+- 한 단계에서 예외가 나면 파이프라인 전체를 멈추고 run()에서 다시 발생
+"""
+
+import time
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+# 입력이 끝났음을 알리는 표시
+_DONE = object()
+# 멈춤 신호를 확인하는 간격 (초)
+_POLL = 0.1
+
+
+class Stage:
+    """파이프라인 단계 (입력 항목 하나 → 다음 단계로 보낼 항목들)"""
+
+    def __init__(self, name: str, handler: Callable[[Any], Optional[Iterable[Any]]], workers: int = 1,
+                 flush: Optional[Callable[[], Optional[Iterable[Any]]]] = None,
+                 count: Optional[Callable[[Any], int]] = None, unit: str = "건"):
+        """
+        Args:
+            name: 단계 이름 (통계 출력용)
+            handler: 항목 처리 함수 (다음 단계로 보낼 항목들을 반환하거나 yield, 없으면 None)
+            workers: 작업 스레드 수 (handler가 스레드 안전해야 함)
+            flush: 입력이 모두 끝난 뒤 한 번 호출 (모아 둔 항목을 마저 보낼 때 사용)
+            count: 항목 하나의 처리량 단위 수 (예: 배치의 청크 수, None이면 1)
+            unit: 처리량 단위 이름
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.flush = flush
+        self.count = count
+        self.unit = unit
+        self.items = 0
+        self.units = 0
+        self.busy = 0.0
+        self.max_queued = 0
+        self._lock = threading.Lock()
+
+    def record(self, item: Any, elapsed: float) -> None:
+        """항목 하나 처리 기록"""
+        with self._lock:
+            self.items += 1
+            self.units += self.count(item) if self.count else 1
+            self.busy += elapsed
+
+    def stats(self, elapsed: float) -> Dict[str, Any]:
+        """
+        단계 통계
+
+        Args:
+            elapsed: 파이프라인 전체 실행 시간 (초)
+
+        Returns:
+            {"items", "units", "unit", "busy", "rate", "workers", "max_queued"}
+            (rate는 전체 실행 시간 기준 초당 처리 단위 수, busy는 작업 스레드들이 일한 시간 합)
+        """
+        return {"items": self.items, "units": self.units, "unit": self.unit, "busy": self.busy,
+                "rate": self.units / elapsed if elapsed > 0 else 0.0, "workers": self.workers,
+                "max_queued": self.max_queued}
+
+
+class StagePipeline:
+    """입력 이터러블과 단계들을 크기 제한 큐로 이어서 실행하는 파이프라인"""
+
+    def __init__(self, source: Iterable[Any], stages: Sequence[Stage], queue_size: int = 8,
+                 source_name: str = "read", source_unit: str = "건"):
+        """
+        Args:
+            source: 첫 단계에 넣을 항목 (별도 스레드에서 하나씩 읽음, 읽는 시간도 단계로 집계)
+            stages: 차례로 실행할 단계 (마지막 단계의 출력은 버림)
+            queue_size: 단계 사이 큐에 쌓아 둘 최대 항목 수
+            source_name: 입력 단계 이름
+            source_unit: 입력 단계 처리량 단위 이름
+        """
+        self.source = source
+        self.source_stage = Stage(source_name, lambda item: None, unit=source_unit)
+        self.stages = list(stages)
+        self.queue_size = queue_size
+        self._stop = threading.Event()
+        self._errors: List[BaseException] = []
+        self._error_lock = threading.Lock()
+
+    def run(self) -> Dict[str, Any]:
+        """
+        모든 단계를 실행하고 끝날 때까지 기다림
+
+        Returns:
+            {"elapsed": 실행 시간, "stages": {단계 이름: Stage.stats()}}
+
+        Raises:
+            단계에서 처음 발생한 예외
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        threads = [threading.Thread(target=self._guard, args=(self._feed, queues[0]),
+                                    name=f"stage-{self.source_stage.name}", daemon=True)]
+        for index, stage in enumerate(self.stages):
+            output = queues[index + 1] if index + 1 < len(queues) else None
+            remaining = [stage.workers]
+            lock = threading.Lock()
+            for worker in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._guard, args=(self._work, stage, queues[index], output, remaining, lock),
+                    name=f"stage-{stage.name}-{worker}", daemon=True))
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        if self._errors:
+            raise self._errors[0]
+        return {"elapsed": elapsed,
+                "stages": {stage.name: stage.stats(elapsed) for stage in [self.source_stage, *self.stages]}}
+
+    def _guard(self, target: Callable, *args) -> None:
+        """스레드 본문 실행 (예외를 기록하고 다른 단계를 멈춤)"""
+        try:
+            target(*args)
+        except BaseException as e:
+            with self._error_lock:
+                self._errors.append(e)
+            self._stop.set()
+
+    def _put(self, output: Optional[queue.Queue], item: Any) -> bool:
+        """다음 단계 큐에 넣음 (큐가 차 있으면 기다림, 멈췄으면 False)"""
+        if output is None:
+            return True
+        while not self._stop.is_set():
+            try:
+                output.put(item, timeout=_POLL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source: queue.Queue) -> Any:
+        """입력 큐에서 꺼냄 (멈췄으면 _DONE)"""
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=_POLL)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _feed(self, output: queue.Queue) -> None:
+        """입력 이터러블을 읽어 첫 단계 큐에 넣음"""
+        iterator = iter(self.source)
+        while True:
+            started = time.perf_counter()
+            item = next(iterator, _DONE)
+            if item is _DONE:
+                break
+            self.source_stage.record(item, time.perf_counter() - started)
+            self.source_stage.max_queued = max(self.source_stage.max_queued, output.qsize())
+            if not self._put(output, item):
+                return
+        self._put(output, _DONE)
+
+    def _work(self, stage: Stage, source: queue.Queue, output: Optional[queue.Queue],
+              remaining: List[int], lock: threading.Lock) -> None:
+        """단계 작업 스레드 (입력이 끝나면 마지막 스레드가 flush 후 다음 단계에 끝을 알림)"""
+        while True:
+            stage.max_queued = max(stage.max_queued, source.qsize())
+            item = self._get(source)
+            if item is _DONE:
+                # 같은 단계의 다른 작업 스레드도 끝나도록 표시를 다시 넣음
+                self._put(source, _DONE)
+                break
+            # 작업 시간에서 다음 단계 큐가 비기를 기다린 시간은 뺌
+            started = time.perf_counter()
+            waited = 0.0
+            for result in stage.handler(item) or ():
+                put_started = time.perf_counter()
+                if not self._put(output, result):
+                    return
+                waited += time.perf_counter() - put_started
+            stage.record(item, time.perf_counter() - started - waited)
+
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if not last or self._stop.is_set():
+            return
+        for result in (stage.flush() if stage.flush else None) or ():
+            if not self._put(output, result):
+                return
+        self._put(output, _DONE)
+
+
+def print_stage_stats(stats: Dict[str, Any]) -> None:
+    """단계별 처리량 출력"""
+    print(f"\n=== 단계별 처리량 (전체 {stats['elapsed']:.1f}s) ===")
+    for name, stage in stats["stages"].items():
+        print(f"  - {name}: {stage['units']:,}{stage['unit']} ({stage['rate']:.1f}{stage['unit']}/s), "
+              f"작업 시간 {stage['busy']:.1f}s (스레드 {stage['workers']}개), 최대 대기 {stage['max_queued']}건")
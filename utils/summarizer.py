@@ -0,0 +1,289 @@
+"""
+GPT 문서 요약 모듈
+- 요약 결과를 (프롬프트 버전, 모델, 길이, 본문) 해시로 디스크에 캐시하여 같은 본문은 다시 요청하지 않음
+- 같은 실행 안에서 본문이 같은 문서는 한 번만 요청
+- 짧은 문서는 여러 개를 한 요청에 묶고 JSON 형식으로 응답받음 (응답이 잘못되면 문서별 요청으로 다시 시도)
+- 공유 클라이언트 하나로 최대 동시 요청 수를 제한하여 병렬 요청
+"""
+
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from utils.atomic_io import atomic_write_text
+from utils.config import (
+    SUMMARY_MODEL, SUMMARY_CONCURRENCY, SUMMARY_BATCH_SIZE, SUMMARY_BATCH_DOC_CHARS, SUMMARY_BATCH_CHARS
+)
+
+# 프롬프트를 바꾸면 올려서 이전 캐시를 쓰지 않게 함
+PROMPT_VERSION = 1
+
+MAX_INPUT_CHARS = 8000          # 단일 요청 본문 최대 길이 (GPT 토큰 제한 고려)
+SUMMARY_MAX_TOKENS = 200        # 문서 하나당 요약 최대 토큰 수
+FALLBACK_SUMMARY = "AI/ML 관련 기술 문서"
+
+SYSTEM_PROMPT = "당신은 기술 문서 요약 전문가입니다. 핵심 내용을 간결하고 정확하게 요약합니다."
+
+
+def build_prompt(text: str, max_length: int) -> str:
+    """문서 하나를 요약하는 프롬프트"""
+    return f"""
+다음 위키피디아 문서를 {max_length}자 이내로 핵심 내용만 간단히 요약해주세요.
+전문용어는 그대로 유지하고, MCP 시스템에서 파일명으로 사용할 수 있도록 명확하고 간결하게 작성해주세요.
+
+문서 내용:
+{text}
+
+요약:
+"""
+
+
+def build_batch_prompt(documents: Dict[str, str], max_length: int) -> str:
+    """여러 문서를 한 번에 요약하는 프롬프트 (JSON 응답)"""
+    sections = "\n\n".join(f"[문서 {doc_id}]\n{text}" for doc_id, text in documents.items())
+    return f"""
+다음 위키피디아 문서들을 각각 {max_length}자 이내로 핵심 내용만 간단히 요약해주세요.
+전문용어는 그대로 유지하고, MCP 시스템에서 파일명으로 사용할 수 있도록 명확하고 간결하게 작성해주세요.
+다른 문서의 내용을 섞지 말고, 다음 JSON 형식으로만 답해주세요:
+{{"summaries": [{{"id": "문서 id", "summary": "요약"}}]}}
+
+{sections}
+"""
+
+
+def clip_summary(summary: str, max_length: int) -> str:
+    """요약 길이 체크 및 조정"""
+    summary = summary.strip()
+    if len(summary) > max_length:
+        summary = summary[:max_length-3] + "..."
+    return summary
+
+
+def parse_batch_response(content: str) -> Dict[str, str]:
+    """
+    묶음 요청의 JSON 응답 파싱
+
+    Args:
+        content: 응답 본문 ({"summaries": [{"id", "summary"}]} 또는 {id: 요약})
+
+    Returns:
+        {문서 id: 요약} (형식이 잘못되면 빈 딕셔너리)
+    """
+    try:
+        data = json.loads(content)
+    except (TypeError, json.JSONDecodeError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+
+    items = data.get("summaries")
+    if isinstance(items, list):
+        return {str(item["id"]): item["summary"] for item in items
+                if isinstance(item, dict) and "id" in item and isinstance(item.get("summary"), str)}
+    return {str(doc_id): summary for doc_id, summary in data.items() if isinstance(summary, str)}
+
+
+class SummaryCache:
+    """본문 해시별 요약을 저장하는 디스크 캐시"""
+
+    def __init__(self, cache_dir: str):
+        """
+        Args:
+            cache_dir: 캐시 디렉토리 경로
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(text: str, model: str, max_length: int) -> str:
+        """캐시 키 (프롬프트 버전, 모델, 요약 길이, 본문의 SHA-256)"""
+        digest = hashlib.sha256(f"{PROMPT_VERSION}\0{model}\0{max_length}\0".encode('utf-8'))
+        digest.update(text.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 요약 (없으면 None)"""
+        try:
+            with open(self.cache_dir / f"{key}.json", 'r', encoding='utf-8') as f:
+                return json.load(f)["summary"]
+        except (OSError, KeyError, json.JSONDecodeError):
+            return None
+
+    def put(self, key: str, summary: str, model: str) -> None:
+        """요약 저장"""
+        entry = {"summary": summary, "model": model, "prompt_version": PROMPT_VERSION, "created_at": time.time()}
+        atomic_write_text(self.cache_dir / f"{key}.json", json.dumps(entry, ensure_ascii=False))
+
+
+class Summarizer:
+    """캐시, 중복 제거, 묶음 요청, 동시 요청을 적용한 GPT 요약기"""
+
+    def __init__(self, client, model: str = SUMMARY_MODEL, cache: Optional[SummaryCache] = None,
+                 max_workers: int = SUMMARY_CONCURRENCY, batch_size: int = SUMMARY_BATCH_SIZE,
+                 batch_doc_chars: int = SUMMARY_BATCH_DOC_CHARS, batch_chars: int = SUMMARY_BATCH_CHARS):
+        """
+        Args:
+            client: OpenAI 클라이언트 (모든 요청이 공유, 429/5xx 재시도는 클라이언트의 max_retries 사용)
+            model: 요약 모델
+            cache: 요약 캐시 (None이면 캐시하지 않음)
+            max_workers: 최대 동시 요청 수
+            batch_size: 한 요청에 묶을 최대 문서 수 (1이면 묶지 않음)
+            batch_doc_chars: 이 길이 이하의 문서만 묶음
+            batch_chars: 한 묶음의 본문 길이 합 상한
+        """
+        self.client = client
+        self.model = model
+        self.cache = cache
+        self.max_workers = max(1, max_workers)
+        self.batch_size = max(1, batch_size)
+        self.batch_doc_chars = batch_doc_chars
+        self.batch_chars = batch_chars
+        self.stats = {"documents": 0, "cache_hits": 0, "duplicates": 0, "requests": 0,
+                      "batched_documents": 0, "failures": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        self._stats_lock = threading.Lock()
+
+    def summarize(self, text: str, max_length: int = 100) -> str:
+        """
+        문서 하나 요약
+
+        Args:
+            text: 요약할 텍스트
+            max_length: 최대 요약 길이
+
+        Returns:
+            요약된 텍스트 (요청이 실패하면 FALLBACK_SUMMARY)
+        """
+        return self.summarize_many({"doc": text}, max_length)["doc"]
+
+    def summarize_many(self, texts: Dict[str, str], max_length: int = 100) -> Dict[str, str]:
+        """
+        여러 문서 요약 (캐시 → 중복 제거 → 짧은 문서 묶기 → 동시 요청)
+
+        Args:
+            texts: {키워드: 요약할 텍스트}
+            max_length: 최대 요약 길이
+
+        Returns:
+            {키워드: 요약} (요청이 실패한 문서는 FALLBACK_SUMMARY, 캐시에 저장하지 않음)
+        """
+        self._count("documents", len(texts))
+
+        # 캐시 확인과 중복 제거 (캐시 키 → 그 본문을 쓰는 키워드들)
+        summaries: Dict[str, str] = {}
+        pending: Dict[str, List[str]] = {}
+        pending_text: Dict[str, str] = {}
+        for name, text in texts.items():
+            key = SummaryCache.make_key(text, self.model, max_length)
+            if key in pending:
+                pending[key].append(name)
+                self._count("duplicates")
+                continue
+            cached = self.cache.get(key) if self.cache else None
+            if cached is not None:
+                summaries[name] = cached
+                self._count("cache_hits")
+                continue
+            pending[key] = [name]
+            pending_text[key] = text
+
+        results: Dict[str, Optional[str]] = {}
+        if pending:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                jobs = [executor.submit(self._summarize_group, group, max_length)
+                        for group in self._plan_requests(pending_text)]
+                for job in jobs:
+                    results.update(job.result())
+
+        for key, names in pending.items():
+            summary = results.get(key)
+            if summary is None:
+                self._count("failures")
+                summary = FALLBACK_SUMMARY
+            elif self.cache:
+                self.cache.put(key, summary, self.model)
+            for name in names:
+                summaries[name] = summary
+
+        return {name: summaries[name] for name in texts}
+
+    def _plan_requests(self, texts: Dict[str, str]) -> List[Dict[str, str]]:
+        """요청 단위로 나누기 (짧은 문서는 batch_size/batch_chars 한도 안에서 묶고, 긴 문서는 하나씩)"""
+        groups: List[Dict[str, str]] = []
+        batch: Dict[str, str] = {}
+        batch_length = 0
+        for key, text in texts.items():
+            if self.batch_size == 1 or len(text) > self.batch_doc_chars:
+                groups.append({key: text})
+                continue
+            if batch and (len(batch) >= self.batch_size or batch_length + len(text) > self.batch_chars):
+                groups.append(batch)
+                batch, batch_length = {}, 0
+            batch[key] = text
+            batch_length += len(text)
+        if batch:
+            groups.append(batch)
+        return groups
+
+    def _summarize_group(self, group: Dict[str, str], max_length: int) -> Dict[str, Optional[str]]:
+        """요청 하나 실행 (묶음 응답에서 빠진 문서는 하나씩 다시 요청, 실패하면 None)"""
+        if len(group) == 1:
+            key, text = next(iter(group.items()))
+            return {key: self._request_single(text, max_length)}
+
+        ids = {f"d{i}": key for i, key in enumerate(group)}
+        parsed: Dict[str, str] = {}
+        try:
+            content = self._chat(build_batch_prompt({doc_id: group[key] for doc_id, key in ids.items()}, max_length),
+                                 SUMMARY_MAX_TOKENS * len(group), json_output=True)
+            parsed = parse_batch_response(content)
+        except Exception as e:
+            print(f"GPT 묶음 요약 오류: {e}")
+
+        results: Dict[str, Optional[str]] = {}
+        for doc_id, key in ids.items():
+            if parsed.get(doc_id, "").strip():
+                results[key] = clip_summary(parsed[doc_id], max_length)
+                self._count("batched_documents")
+            else:
+                results[key] = self._request_single(group[key], max_length)
+        return results
+
+    def _request_single(self, text: str, max_length: int) -> Optional[str]:
+        """문서 하나 요청 (실패하면 None)"""
+        # 텍스트가 너무 길면 자르기 (GPT 토큰 제한 고려)
+        if len(text) > MAX_INPUT_CHARS:
+            text = text[:MAX_INPUT_CHARS] + "..."
+        try:
+            return clip_summary(self._chat(build_prompt(text, max_length), SUMMARY_MAX_TOKENS), max_length)
+        except Exception as e:
+            print(f"GPT 요약 오류: {e}")
+            return None
+
+    def _chat(self, prompt: str, max_tokens: int, json_output: bool = False) -> str:
+        """채팅 요청 하나 (사용량 집계)"""
+        options: Dict[str, Any] = {"response_format": {"type": "json_object"}} if json_output else {}
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=max_tokens,
+            temperature=0.3,
+            **options
+        )
+        self._count("requests")
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            self._count("prompt_tokens", getattr(usage, "prompt_tokens", 0) or 0)
+            self._count("completion_tokens", getattr(usage, "completion_tokens", 0) or 0)
+        return response.choices[0].message.content or ""
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        """통계 누적 (요청 스레드에서 호출)"""
+        with self._stats_lock:
+            self.stats[name] += amount
@@ -0,0 +1,106 @@
+"""
+수학 기호 변환 테이블 모듈
+- 그리스 문자/특수 기호 → LaTeX (WikiDataParser)
+- 그리스 문자/특수 기호 → 일반 텍스트 (TextProcessor)
+- 모듈 로드 시 str.maketrans 테이블을 한 번 만들어 두고 str.translate 한 번으로 변환
+  (모든 키가 한 글자이므로 여러 글자 출력도 같은 패스에서 처리되고, 출력이 다시 치환되지 않음)
+"""
+
+from typing import Dict
+
+# 그리스 문자 및 특수 기호 → LaTeX
+LATEX_SYMBOLS: Dict[str, str] = {
+    # 그리스 문자 (소문자)
+    'α': r'\alpha', 'β': r'\beta', 'γ': r'\gamma', 'δ': r'\delta',
+    'ε': r'\epsilon', 'ζ': r'\zeta', 'η': r'\eta', 'θ': r'\theta',
+    'ι': r'\iota', 'κ': r'\kappa', 'λ': r'\lambda', 'μ': r'\mu',
+    'ν': r'\nu', 'ξ': r'\xi', 'π': r'\pi', 'ρ': r'\rho',
+    'σ': r'\sigma', 'τ': r'\tau', 'υ': r'\upsilon', 'φ': r'\phi',
+    'χ': r'\chi', 'ψ': r'\psi', 'ω': r'\omega',
+
+    # 그리스 문자 (대문자)
+    'Α': r'A', 'Β': r'B', 'Γ': r'\Gamma', 'Δ': r'\Delta',
+    'Ε': r'E', 'Ζ': r'Z', 'Η': r'H', 'Θ': r'\Theta',
+    'Ι': r'I', 'Κ': r'K', 'Λ': r'\Lambda', 'Μ': r'M',
+    'Ν': r'N', 'Ξ': r'\Xi', 'Π': r'\Pi', 'Ρ': r'P',
+    'Σ': r'\Sigma', 'Τ': r'T', 'Υ': r'\Upsilon', 'Φ': r'\Phi',
+    'Χ': r'X', 'Ψ': r'\Psi', 'Ω': r'\Omega',
+
+    # 특수 기호
+    '∞': r'\infty', '∂': r'\partial', '∇': r'\nabla',
+    '∅': r'\emptyset', '∈': r'\in', '∉': r'\notin',
+    '∪': r'\cup', '∩': r'\cap', '⊂': r'\subset', '⊃': r'\supset',
+    '⊆': r'\subseteq', '⊇': r'\supseteq', '≡': r'\equiv',
+    '≈': r'\approx', '≠': r'\neq', '≤': r'\leq', '≥': r'\geq',
+    '±': r'\pm', '∓': r'\mp', '×': r'\times', '÷': r'\div',
+    '·': r'\cdot', '→': r'\rightarrow', '←': r'\leftarrow',
+    '↔': r'\leftrightarrow', '⇒': r'\Rightarrow', '⇐': r'\Leftarrow',
+    '⇔': r'\Leftrightarrow', '∀': r'\forall', '∃': r'\exists',
+    '√': r'\sqrt', '∑': r'\sum', '∏': r'\prod', '∫': r'\int'
+}
+
+# MathML 연산자(<mo>) → LaTeX (연산자 하나 단위로 조회)
+LATEX_OPERATORS: Dict[str, str] = {
+    '=': '=', '+': '+', '-': '-', '/': '/', '<': '<', '>': '>',
+    '±': r'\pm', '∓': r'\mp', '×': r'\times', '·': r'\cdot', '÷': r'\div',
+    '≤': r'\leq', '≥': r'\geq', '≠': r'\neq', '≈': r'\approx', '≡': r'\equiv',
+    '∝': r'\propto', '∼': r'\sim',
+    '→': r'\rightarrow', '←': r'\leftarrow', '↔': r'\leftrightarrow',
+    '∈': r'\in', '∉': r'\notin', '⊂': r'\subset', '⊃': r'\supset',
+    '∪': r'\cup', '∩': r'\cap',
+    '∧': r'\land', '∨': r'\lor', '¬': r'\neg', '∀': r'\forall', '∃': r'\exists'
+}
+
+# 수학 기호 → 일반 텍스트 (RAG용 전처리)
+PLAIN_TEXT_SYMBOLS: Dict[str, str] = {
+    'α': 'alpha', 'β': 'beta', 'γ': 'gamma', 'δ': 'delta',
+    'ε': 'epsilon', 'ζ': 'zeta', 'η': 'eta', 'θ': 'theta',
+    'ι': 'iota', 'κ': 'kappa', 'λ': 'lambda', 'μ': 'mu',
+    'ν': 'nu', 'ξ': 'xi', 'π': 'pi', 'ρ': 'rho',
+    'σ': 'sigma', 'τ': 'tau', 'υ': 'upsilon', 'φ': 'phi',
+    'χ': 'chi', 'ψ': 'psi', 'ω': 'omega',
+    '∞': '무한', '∂': '편미분', '∇': '나블라',
+    '∑': '합계', '∏': '곱', '∫': '적분'
+}
+
+LATEX_TABLE = str.maketrans(LATEX_SYMBOLS)
+PLAIN_TEXT_TABLE = str.maketrans(PLAIN_TEXT_SYMBOLS)
+
+
+def to_latex(text: str) -> str:
+    """
+    그리스 문자 및 특수 기호를 LaTeX로 변환 (한 번의 패스)
+
+    Args:
+        text: 원본 텍스트
+
+    Returns:
+        LaTeX 변환된 텍스트
+    """
+    return text.translate(LATEX_TABLE)
+
+
+def to_plain_text(text: str) -> str:
+    """
+    수학 기호를 일반 텍스트로 변환 (한 번의 패스)
+
+    Args:
+        text: 원본 텍스트
+
+    Returns:
+        변환된 텍스트
+    """
+    return text.translate(PLAIN_TEXT_TABLE)
+
+
+def operator_to_latex(operator: str) -> str:
+    """
+    연산자 하나를 LaTeX로 변환 (알 수 없는 연산자는 그대로)
+
+    Args:
+        operator: 연산자 텍스트
+
+    Returns:
+        LaTeX 연산자
+    """
+    return LATEX_OPERATORS.get(operator.strip(), operator)
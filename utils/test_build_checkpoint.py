@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+벡터 DB 구축 체크포인트 테스트 스크립트
+체크포인트 기록/비교, 그리고 가짜 벡터 저장소(임베딩 요청 수 기록, 지정한 배치에서 중단)로 중단된 구축을 이어서
+실행할 때 기록된 청크를 다시 임베딩하지 않는지, 바뀐/삭제된 문서와 실패한 배치가 일관성 검사에 반영되는지
+확인합니다 (실제 API와 Chroma는 사용하지 않음).
+"""
+
+import sys
+import random
+import tempfile
+import threading
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.build_checkpoint import BuildCheckpoint
+from utils.chunk_store import ChunkStore, iter_source_documents
+
+SYLLABLES = "가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허"
+
+
+class Interrupted(Exception):
+    """구축 중단 (프로세스 종료 흉내)"""
+
+
+class FakeVectorStore:
+    """build_streaming이 사용하는 메서드만 흉내 내는 메모리 벡터 저장소"""
+
+    def __init__(self, fail_on_write: int = 0, failing_texts: str = ""):
+        self.rows = {}
+        self.embedded = 0
+        self.writes = 0
+        self.fail_on_write = fail_on_write
+        self.failing_texts = failing_texts
+        self.lock = threading.Lock()
+
+    def get_embeddings(self, texts):
+        if self.failing_texts and any(self.failing_texts in text for text in texts):
+            return []
+        with self.lock:
+            self.embedded += len(texts)
+        return [[float(len(text))] for text in texts]
+
+    def write_embeddings(self, texts, metadatas, ids, embeddings):
+        self.writes += 1
+        if self.writes == self.fail_on_write:
+            raise Interrupted()
+        for chunk_id, text, metadata in zip(ids, texts, metadatas):
+            # Chroma처럼 기존 메타데이터에 새 값을 합침
+            self.rows[chunk_id] = (text, {**self.rows.get(chunk_id, ("", {}))[1], **metadata})
+        return len(ids)
+
+    def update_metadatas(self, ids, metadatas):
+        for chunk_id, metadata in zip(ids, metadatas):
+            if chunk_id in self.rows:
+                self.rows[chunk_id] = (self.rows[chunk_id][0], {**self.rows[chunk_id][1], **metadata})
+
+    def delete_ids(self, ids):
+        for chunk_id in ids:
+            self.rows.pop(chunk_id, None)
+
+    def existing_ids(self, ids):
+        return {chunk_id for chunk_id in ids if chunk_id in self.rows}
+
+    def iter_ids(self, batch_size=1000):
+        ids = sorted(self.rows)
+        for i in range(0, len(ids), batch_size):
+            yield ids[i:i + batch_size]
+
+    def get_collection_info(self):
+        return {"document_count": len(self.rows)}
+
+
+def make_docs(directory: Path, count: int, seed: int = 0) -> None:
+    """서로 다른 무작위 단어로 이루어진 문서 생성 (유사 중복으로 빠지지 않게)"""
+    rng = random.Random(seed)
+    for i in range(count):
+        paragraphs = [" ".join("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(60))
+                      + "." for _ in range(rng.randint(2, 4))]
+        (directory / f"문서{i}.txt").write_text("\n\n".join(paragraphs), encoding='utf-8')
+
+
+def test_checkpoint_records():
+    """기록/기대 청크 비교와 임베딩 모델 변경 시 초기화를 테스트"""
+    print("\n📝 체크포인트 기록 테스트")
+    print("-" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "checkpoint.sqlite"
+        with BuildCheckpoint(path, "model-a") as checkpoint:
+            checkpoint.mark_written([("a_chunk_0", "a", "t0", "m0"), ("a_chunk_1", "a", "t1", "m1"),
+                                     ("b_chunk_0", "b", "t2", "m2")])
+            checkpoint.begin_run()
+            checkpoint.expect("a", ["a_chunk_0", "a_chunk_1", "a_chunk_2"])
+        with BuildCheckpoint(path, "model-a") as checkpoint:
+            reopened = checkpoint.written_of("a") == {"a_chunk_0": ("t0", "m0"), "a_chunk_1": ("t1", "m1")}
+            compared = checkpoint.unexpected_ids() == ["b_chunk_0"] and checkpoint.missing_ids() == ["a_chunk_2"]
+            flags = checkpoint.is_expected(["a_chunk_2", "b_chunk_0"]) == [True, False]
+        with redirect_stdout(StringIO()), BuildCheckpoint(path, "model-b") as checkpoint:
+            cleared = checkpoint.counts() == {"written": 0, "expected": 0}
+
+    ok = reopened and compared and flags and cleared
+    print(f"   다시 열어도 유지: {reopened}, 기대/기록 비교: {compared}, 모델 변경 시 초기화: {cleared}")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_resume_after_interruption():
+    """중단된 구축을 이어서 실행하면 남은 청크만 임베딩하고, 끝난 뒤 저장된 id가 기대 id와 같은지 테스트"""
+    print("\n⏯️  중단 후 이어서 구축 테스트")
+    print("-" * 50)
+
+    from rag.build_pipeline import build_streaming
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        docs_dir = tmp / "rag_docs"
+        docs_dir.mkdir()
+        make_docs(docs_dir, 60)
+        checkpoint_path = tmp / "vectordb" / "checkpoint.sqlite"
+        vector_store = FakeVectorStore(fail_on_write=4)
+
+        def build():
+            with ChunkStore(tmp / "chunks.sqlite") as chunk_store, redirect_stdout(StringIO()):
+                return build_streaming(vector_store, chunk_store, iter_source_documents(docs_dir),
+                                       checkpoint_path=checkpoint_path, batch_size=5, embed_workers=2)
+
+        try:
+            build()
+            interrupted = False
+        except Interrupted:
+            interrupted = True
+        embedded_before = vector_store.embedded
+        written_before = len(vector_store.rows)
+
+        resumed = build()
+        total = resumed["verification"]["expected"]
+        again = build()
+
+        # 문서 하나 수정, 하나 삭제 후 다시 실행
+        (docs_dir / "문서7.txt").write_text("완전히 새로 쓴 문서 7의 본문이다.", encoding='utf-8')
+        (docs_dir / "문서8.txt").unlink()
+        embedded = vector_store.embedded
+        changed = build()
+        changed_embedded = vector_store.embedded - embedded
+        stored_docs = {metadata["file_name"] for _, metadata in vector_store.rows.values()}
+
+    ok = (interrupted and written_before > 0
+          and resumed["resumed"] == written_before
+          and resumed["verification"]["missing"] == 0 and resumed["verification"]["stored"] == total
+          # 중단 전에 기록된 청크는 다시 임베딩하지 않음
+          and embedded - embedded_before == total - written_before
+          and again["written"] == 0 and again["resumed"] == total
+          and changed_embedded == 1 and "문서8" not in stored_docs
+          and changed["verification"]["missing"] == 0 and changed["verification"]["removed"] > 0)
+    print(f"   중단 전 임베딩 {embedded_before}개/기록 {written_before}개 → 이어서 {resumed['written']}개 기록 "
+          f"(이전 기록 {resumed['resumed']}개 건너뜀), 기대 {total}개 = 저장 {resumed['verification']['stored']}개")
+    print(f"   다시 실행: 새로 기록 {again['written']}개, 문서 수정/삭제 후: 임베딩 {changed_embedded}개, "
+          f"정리 {changed['verification']['removed']}개")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_failed_batches_reported():
+    """임베딩에 실패한 배치가 일관성 검사에서 누락으로 보고되고, 다시 실행하면 채워지는지 테스트"""
+    print("\n🧾 일관성 검사 테스트")
+    print("-" * 50)
+
+    from rag.build_pipeline import build_streaming
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        docs_dir = tmp / "rag_docs"
+        docs_dir.mkdir()
+        make_docs(docs_dir, 20, seed=1)
+        vector_store = FakeVectorStore(failing_texts=(docs_dir / "문서3.txt").read_text(encoding='utf-8')[:20])
+
+        def build():
+            with ChunkStore(tmp / "chunks.sqlite") as chunk_store, redirect_stdout(StringIO()):
+                return build_streaming(vector_store, chunk_store, iter_source_documents(docs_dir),
+                                       checkpoint_path=tmp / "checkpoint.sqlite", batch_size=4)
+
+        first = build()
+        vector_store.failing_texts = ""
+        second = build()
+
+    ok = (first["failed"] > 0 and first["verification"]["missing"] == first["failed"]
+          and second["written"] == first["failed"] and second["verification"]["missing"] == 0)
+    print(f"   실패 {first['failed']}개 → 누락 보고 {first['verification']['missing']}개 "
+          f"(예: {', '.join(first['verification']['missing_ids'][:2])}), 다시 실행 후 누락 "
+          f"{second['verification']['missing']}개")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_duplicate_references_shrink():
+    """중복 문서를 지우고 다시 구축하면 대표 청크의 중복 목록도 지워지는지 테스트 (체크포인트 유무 모두)"""
+    print("\n🔗 중복 목록 갱신 테스트")
+    print("-" * 50)
+
+    from rag.build_pipeline import build_streaming
+
+    paragraph = "두 문서가 함께 쓰는 문단이다. 여러 문장으로 이루어져 있고 청크 하나에 들어갈 만큼 짧다."
+    results = {}
+    for mode in ("checkpoint", "plain"):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            docs_dir = tmp / "rag_docs"
+            docs_dir.mkdir()
+            (docs_dir / "A.txt").write_text(paragraph, encoding='utf-8')
+            (docs_dir / "B.txt").write_text(paragraph, encoding='utf-8')
+            vector_store = FakeVectorStore()
+
+            def build():
+                with ChunkStore(tmp / "chunks.sqlite") as chunk_store, redirect_stdout(StringIO()):
+                    return build_streaming(vector_store, chunk_store, iter_source_documents(docs_dir),
+                                           checkpoint_path=tmp / "checkpoint.sqlite" if mode == "checkpoint" else None)
+
+            build()
+            before = vector_store.rows["A_chunk_0"][1].get("duplicate_ids")
+            (docs_dir / "B.txt").unlink()
+            build()
+            after = vector_store.rows["A_chunk_0"][1]
+            results[mode] = (before, after.get("duplicate_count"), after.get("duplicate_ids"),
+                             after.get("duplicate_files"))
+
+    ok = all(result == ("B_chunk_0", 0, "", "") for result in results.values())
+    for mode, (before, count, ids, files) in results.items():
+        print(f"   {mode}: 중복 목록 {before!r} → B 삭제 후 {count}개 {ids!r} {files!r}")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def main():
+    """메인 테스트 함수"""
+    print("🚀 벡터 DB 구축 체크포인트 테스트 시작")
+    print("=" * 60)
+
+    success = True
+    success &= test_checkpoint_records()
+    success &= test_resume_after_interruption()
+    success &= test_failed_batches_reported()
+    success &= test_duplicate_references_shrink()
+
+    print("\n" + "=" * 60)
+    if success:
+        print("🎉 모든 테스트가 성공적으로 완료되었습니다!")
+    else:
+        print("⚠️  일부 테스트에서 문제가 발견되었습니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+청크 저장소 테스트 스크립트
+바뀐 문서만 다시 분할하는지, 저장된 청크가 원문 오프셋/해시와 일치하는지, 세그먼트 저장소에서도 같은 결과가
+나오는지, 그리고 청크를 읽는 동안 메모리 사용량이 말뭉치 크기와 무관한지 확인합니다.
+"""
+
+import sys
+import random
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.chunk_store import ChunkStore, iter_source_documents
+from utils.doc_store import SegmentStore, text_sha
+
+SENTENCES = ("인공지능은 인간의 학습 능력을 컴퓨터로 구현한 기술이다.", "기계 학습은 데이터에서 규칙을 찾는다.",
+             "딥 러닝은 여러 층의 신경망을 사용한다.", "합성곱 신경망은 이미지 인식에 쓰인다.",
+             "순환 신경망은 순서가 있는 데이터를 다룬다.", "트랜스포머는 어텐션으로 문맥을 본다.")
+
+
+def make_text(rng: random.Random, paragraphs: int) -> str:
+    return "\n\n".join(" ".join(rng.choice(SENTENCES) for _ in range(rng.randint(3, 12)))
+                       for _ in range(paragraphs))
+
+
+def test_incremental_update():
+    """두 번째 갱신은 다시 분할하지 않고, 바뀐/삭제된 문서와 청크 설정 변경만 반영하는지 테스트"""
+    print("\n🔁 증분 갱신 테스트")
+    print("-" * 50)
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        docs_dir = Path(tmp) / "rag_docs"
+        docs_dir.mkdir()
+        for i in range(30):
+            (docs_dir / f"문서{i}.txt").write_text(make_text(rng, 20), encoding='utf-8')
+
+        path = Path(tmp) / "chunks.sqlite"
+        with ChunkStore(path) as store:
+            first = store.update(iter_source_documents(docs_dir))
+            second = store.update(iter_source_documents(docs_dir))
+
+            (docs_dir / "문서3.txt").write_text(make_text(rng, 5), encoding='utf-8')
+            (docs_dir / "문서4.txt").unlink()
+            third = store.update(iter_source_documents(docs_dir))
+
+            texts = {p.stem: p.read_text(encoding='utf-8') for p in docs_dir.glob("*.txt")}
+            chunks = list(store.iter_chunks())
+            offsets = all(texts[c["doc_id"]][c["char_start"]:c["char_end"]] == c["text"]
+                          and c["text_hash"] == text_sha(c["text"]) for c in chunks)
+            ordered = [(c["doc_id"], c["chunk_index"]) for c in chunks] == sorted(
+                (c["doc_id"], c["chunk_index"]) for c in chunks)
+            stats = store.stats()
+
+        with ChunkStore(path, chunker="chars:500:50") as store:
+            rechunked = store.update(iter_source_documents(docs_dir))
+
+    ok = (first["chunked"] == 30 and second["chunked"] == 0 and second["unchanged"] == 30
+          and third["chunked"] == 1 and third["removed"] == 1 and third["unchanged"] == 28
+          and offsets and ordered and stats["documents"] == 29 and stats["chunks"] == len(chunks)
+          and rechunked["chunked"] == 29)
+    print(f"   처음 {first['chunked']}개 분할 → 다시 실행 {second['chunked']}개 → 변경 후 "
+          f"{third['chunked']}개 분할/{third['removed']}개 삭제 → 설정 변경 후 {rechunked['chunked']}개")
+    print(f"   청크 {stats['chunks']}개, 원문 오프셋/해시 일치: {offsets}")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_segment_store_source():
+    """세그먼트 저장소에서 읽은 청크가 파일에서 읽은 청크와 같은지 테스트"""
+    print("\n📦 세그먼트 저장소 입력 테스트")
+    print("-" * 50)
+
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        docs_dir = Path(tmp) / "rag_docs"
+        docs_dir.mkdir()
+        with SegmentStore(Path(tmp) / "store" / "rag") as segments:
+            for i in range(10):
+                text = make_text(rng, 10)
+                (docs_dir / f"문서{i}.txt").write_text(text, encoding='utf-8')
+                segments.put(f"문서{i}", text)
+
+        with ChunkStore(Path(tmp) / "files.sqlite") as files_store, \
+                ChunkStore(Path(tmp) / "segments.sqlite") as segment_store:
+            files_store.update(iter_source_documents(docs_dir))
+            segment_store.update(iter_source_documents(docs_dir, Path(tmp) / "store" / "rag"))
+            strip = lambda chunk: {k: v for k, v in chunk.items() if k != "source"}
+            same = [strip(c) for c in files_store.iter_chunks()] == [strip(c) for c in segment_store.iter_chunks()]
+            count = segment_store.stats()["chunks"]
+        missing = list(iter_source_documents(docs_dir, Path(tmp) / "없음"))
+
+    ok = same and count > 0 and missing == []
+    print(f"   청크 {count}개, 파일 입력과 같은 결과: {same}")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def _read_peak(path: Path) -> tuple:
+    """청크를 끝까지 읽는 동안의 최대 메모리 사용량 (청크 수, 글자 수, 바이트)"""
+    with ChunkStore(path) as store:
+        tracemalloc.start()
+        count = chars = 0
+        for chunk in store.iter_chunks():
+            count += 1
+            chars += len(chunk["text"])
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return count, chars, peak
+
+
+def test_streaming_memory(documents: int = 200):
+    """말뭉치가 4배가 되어도 청크를 읽는 동안의 최대 메모리 사용량이 늘지 않는지 테스트"""
+    print("\n💾 스트리밍 메모리 테스트")
+    print("-" * 50)
+
+    rng = random.Random(2)
+    ok = True
+    peaks = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in (1, 4):
+            path = Path(tmp) / f"chunks{scale}.sqlite"
+            with ChunkStore(path) as store:
+                store.update((f"문서{i}", f"rag_docs/문서{i}.txt", make_text(rng, 60))
+                             for i in range(documents * scale))
+                stats = store.stats()
+            count, chars, peak = _read_peak(path)
+            peaks.append(peak)
+            ok &= count == stats["chunks"] and chars == stats["chunk_chars"]
+            print(f"   문서 {stats['documents']}개, 청크 {count}개 ({chars * 3 / 1e6:.1f} MB), "
+                  f"읽는 동안 최대 메모리 {peak / 1e6:.2f} MB")
+
+    ok &= peaks[1] < peaks[0] * 1.5
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def main():
+    """메인 테스트 함수"""
+    print("🚀 청크 저장소 테스트 시작")
+    print("=" * 60)
+
+    success = True
+    success &= test_incremental_update()
+    success &= test_segment_store_source()
+    success &= test_streaming_memory()
+
+    print("\n" + "=" * 60)
+    if success:
+        print("🎉 모든 테스트가 성공적으로 완료되었습니다!")
+    else:
+        print("⚠️  일부 테스트에서 문제가 발견되었습니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
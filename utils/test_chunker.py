@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+청크 분할 테스트 스크립트
+한국어 문장 경계, 청크 사이 겹침, 원문 오프셋, 글자/토큰 크기 제한, 그리고 텍스트 길이에 선형인 분할 시간을
+확인합니다.
+"""
+
+import sys
+import time
+import random
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.chunker import chunk_text, estimate_tokens, sentence_spans
+from utils.text_processor import TextProcessor
+
+WORDS = ("인공지능은 기계 학습과 딥 러닝을 포함하는 넓은 분야이며 신경망 모델은 데이터에서 가중치를 학습하고 "
+         "손실 함수를 최적화하여 분류와 회귀 문제를 푼다 GPT-4 Transformer attention 3.14 J. R. R. Tolkien").split()
+ENDINGS = ("다.", "요?", "다!", "이다.", "한다.", "습니다.")
+
+
+def make_document(rng: random.Random, paragraphs: int) -> str:
+    """문단/문장 길이가 제각각인 한국어 문서"""
+    return "\n\n".join(
+        " ".join(" ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 30))) + rng.choice(ENDINGS)
+                 for _ in range(rng.randint(1, 8)))
+        for _ in range(paragraphs))
+
+
+def test_sentence_boundaries():
+    """종결 부호에서는 나누고 소수점/이니셜/약어에서는 나누지 않는지 테스트"""
+    print("\n✂️  한국어 문장 경계 테스트")
+    print("-" * 50)
+
+    text = ("인공지능은 컴퓨터 과학의 한 분야이다. 정말 그럴까요? 그렇다! 원주율은 3.14이다. "
+            "J. R. R. 톨킨은 작가이다. 예를 들어 e.g. 같은 약어도 있다.\n줄바꿈 뒤 문장")
+    sentences = [text[start:end] for start, end in sentence_spans(text, 0, len(text))]
+    expected = ["인공지능은 컴퓨터 과학의 한 분야이다.", "정말 그럴까요?", "그렇다!", "원주율은 3.14이다.",
+                "J. R. R. 톨킨은 작가이다.", "예를 들어 e.g. 같은 약어도 있다.", "줄바꿈 뒤 문장"]
+
+    ok = sentences == expected
+    for sentence in sentences:
+        print(f"   | {sentence}")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_offsets_and_overlap():
+    """청크가 원문 오프셋과 일치하고, 크기 제한을 지키며, 앞 청크의 끝 문장과 겹치는지 테스트"""
+    print("\n🧩 오프셋/겹침/크기 제한 테스트")
+    print("-" * 50)
+
+    rng = random.Random(0)
+    text = make_document(rng, 300)
+    ok = True
+    for label, max_size, overlap, count in (("글자", 500, 100, None), ("토큰", 300, 60, estimate_tokens)):
+        chunks = chunk_text(text, max_size, overlap, count)
+        measure = count or len
+        offsets = all(text[c["start"]:c["end"]] == c["text"] and measure(c["text"]) <= max_size for c in chunks)
+        overlapped = sum(current["start"] < previous["end"] for previous, current in zip(chunks, chunks[1:]))
+        advancing = all(previous["start"] < current["start"] and previous["end"] < current["end"]
+                        for previous, current in zip(chunks, chunks[1:]))
+        # 모든 문장이 적어도 하나의 청크 안에 통째로 들어가야 함
+        covered = all(any(c["start"] <= start and end <= c["end"] for c in chunks)
+                      for start, end in sentence_spans(text, 0, len(text)))
+        largest = max(measure(c["text"]) for c in chunks)
+        passed = offsets and advancing and covered and overlapped >= len(chunks) // 2
+        ok &= passed
+        print(f"   {label} 단위 (최대 {max_size}, 겹침 {overlap}): 청크 {len(chunks)}개, 최대 크기 {largest}, "
+              f"겹친 경계 {overlapped}/{len(chunks) - 1}, 문장 누락 없음: {covered} {'✅' if passed else '❌'}")
+
+    # 공백 없는 긴 문장과 겹침 검증
+    long_word = "가" * 1200 + "다."
+    pieces = chunk_text(long_word, 500, 0)
+    ok &= all(len(p["text"]) <= 500 for p in pieces) and "".join(p["text"] for p in pieces) == long_word
+    try:
+        chunk_text(text, 100, 100)
+        ok = False
+    except ValueError:
+        pass
+
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_text_processor():
+    """TextProcessor.split_into_chunks가 기존 문단 단위 분할보다 내용을 잃지 않는지 테스트"""
+    print("\n📄 TextProcessor 분할 테스트")
+    print("-" * 50)
+
+    processor = TextProcessor()
+    rng = random.Random(1)
+    text = make_document(rng, 200)
+    chunks = processor.split_into_chunks(text, 800, 0)
+    with_offsets = processor.chunk_with_offsets(text, 800, 0)
+
+    # 겹침이 없으면 청크를 이어 붙인 단어열이 원문 단어열과 같아야 함
+    same_words = " ".join(chunks).split() == text.split()
+    ok = (same_words and chunks == [c["text"] for c in with_offsets]
+          and all(len(chunk) <= 800 for chunk in chunks) and processor.split_into_chunks("   \n\n ") == [])
+    print(f"   청크 {len(chunks)}개, 단어 누락/중복 없음: {same_words}")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_linear_time():
+    """문서 길이를 늘려도 글자당 분할 시간이 거의 일정한지 테스트"""
+    print("\n⏱️  분할 시간 테스트")
+    print("-" * 50)
+
+    rng = random.Random(2)
+    base = make_document(rng, 400)
+    rates = []
+    for repeat in (2, 8, 32):
+        text = "\n\n".join([base] * repeat)
+        started = time.perf_counter()
+        chunks = chunk_text(text, 2000, 200)
+        elapsed = time.perf_counter() - started
+        rates.append(elapsed / len(text))
+        print(f"   {len(text) / 1e6:.2f}M 글자: {elapsed * 1000:.0f}ms, 청크 {len(chunks)}개 "
+              f"({rates[-1] * 1e9:.0f}ns/글자)")
+
+    ok = rates[-1] < rates[0] * 3
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def main():
+    """메인 테스트 함수"""
+    print("🚀 청크 분할 테스트 시작")
+    print("=" * 60)
+
+    success = True
+    success &= test_sentence_boundaries()
+    success &= test_offsets_and_overlap()
+    success &= test_text_processor()
+    success &= test_linear_time()
+
+    print("\n" + "=" * 60)
+    if success:
+        print("🎉 모든 테스트가 성공적으로 완료되었습니다!")
+    else:
+        print("⚠️  일부 테스트에서 문제가 발견되었습니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
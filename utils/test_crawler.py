@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+동시 크롤러 테스트 스크립트
+로컬 HTTP 서버를 띄워 동시성, 호스트별 속도 제한, 재시도, 커넥션 재사용을 확인합니다.
+"""
+
+import sys
+import time
+import tempfile
+import threading
+from contextlib import redirect_stdout
+from io import StringIO
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.crawler import WikiCrawler, TokenBucket
+from utils.http_cache import HttpCache
+
+PAGE_HTML = """<html><body>
+<h1 class="firstHeading">{title}</h1>
+<div class="mw-parser-output"><p>{title} 문서 본문입니다.</p></div>
+</body></html>"""
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """위키 페이지 흉내 (/flaky 는 처음 두 번 503, /slow 는 0.2초 지연, /cached 는 ETag 검증)"""
+
+    protocol_version = "HTTP/1.1"   # keep-alive
+    lock = threading.Lock()
+    hits = {}
+    connections = set()
+
+    def do_GET(self):
+        with self.lock:
+            self.hits[self.path] = self.hits.get(self.path, 0) + 1
+            self.connections.add(self.client_address)
+            count = self.hits[self.path]
+
+        if self.path.startswith("/flaky") and count <= 2:
+            self._send(503, b"busy", {"Retry-After": "0"})
+            return
+        if self.path.startswith("/missing"):
+            self._send(404, b"not found")
+            return
+        if self.path.startswith("/slow"):
+            time.sleep(0.2)
+        if self.path.startswith("/cached"):
+            etag = '"v1"'
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, b"", {"ETag": etag})
+                return
+            title = self.path.strip("/")
+            self._send(200, PAGE_HTML.format(title=title).encode("utf-8"), {"ETag": etag})
+            return
+
+        title = self.path.strip("/")
+        self._send(200, PAGE_HTML.format(title=title).encode("utf-8"))
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server():
+    """로컬 테스트 서버 시작 (주소, 서버 반환)"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}", server
+
+
+def test_token_bucket():
+    """토큰 버킷 속도 제한 테스트"""
+    print("\n🪣 토큰 버킷 테스트")
+    print("-" * 50)
+
+    bucket = TokenBucket(rate=20, burst=2)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    elapsed = time.monotonic() - start
+
+    # 버스트 2개는 즉시, 나머지 4개는 초당 20개 → 약 0.2초
+    print(f"   6회 획득 소요: {elapsed:.3f}s (예상 약 0.2s)")
+    return 0.15 <= elapsed < 0.5
+
+
+def test_concurrent_crawl(base_url):
+    """동시 크롤링과 커넥션 재사용 테스트"""
+    print("\n🕸️  동시 크롤링 테스트")
+    print("-" * 50)
+
+    FixtureHandler.connections.clear()
+    urls = {f"page{i}": f"{base_url}/slow/page{i}" for i in range(8)}
+    crawler = WikiCrawler(workers=8, rate_per_host=1000, burst=100)
+
+    start = time.monotonic()
+    results = crawler.crawl(urls, lambda keyword, response: len(response.content), report_every=60)
+    elapsed = time.monotonic() - start
+
+    # 다시 한 번 요청하면 기존 keep-alive 커넥션을 재사용해야 함
+    before = len(FixtureHandler.connections)
+    crawler.crawl(urls, report_every=60)
+    reused = len(FixtureHandler.connections) == before
+    crawler.close()
+
+    ok = all(outcome["ok"] for outcome in results.values())
+    print(f"   8개 페이지(각 0.2s) 소요: {elapsed:.3f}s, 성공: {ok}, 커넥션 재사용: {reused}")
+    return ok and elapsed < 1.0 and reused
+
+
+def test_rate_limit(base_url):
+    """호스트별 속도 제한 테스트"""
+    print("\n⏱️  호스트별 속도 제한 테스트")
+    print("-" * 50)
+
+    urls = {f"page{i}": f"{base_url}/rate/page{i}" for i in range(6)}
+    crawler = WikiCrawler(workers=6, rate_per_host=10, burst=1)
+
+    start = time.monotonic()
+    crawler.crawl(urls, report_every=60)
+    elapsed = time.monotonic() - start
+    crawler.close()
+
+    # 버스트 1개 + 초당 10개 → 나머지 5개에 약 0.5초
+    print(f"   6개 요청 소요: {elapsed:.3f}s (예상 약 0.5s), {crawler.progress.summary()}")
+    return elapsed >= 0.45
+
+
+def test_retries(base_url):
+    """재시도와 실패 처리 테스트"""
+    print("\n🔁 재시도 테스트")
+    print("-" * 50)
+
+    urls = {"flaky": f"{base_url}/flaky/page", "missing": f"{base_url}/missing/page"}
+    crawler = WikiCrawler(workers=2, rate_per_host=1000, burst=10, max_retries=3, backoff=0.01)
+    results = crawler.crawl(urls, report_every=60)
+    crawler.close()
+
+    stats = crawler.progress.to_dict()
+    print(f"   flaky: {results['flaky']['ok']}, missing: {results['missing']['ok']} "
+          f"({results['missing']['error']}), 재시도 {stats['retries']}회")
+    # flaky는 503 두 번 후 성공, 404는 재시도 없이 실패
+    return results["flaky"]["ok"] and not results["missing"]["ok"] and stats["retries"] == 2
+
+
+def test_conditional_cache(base_url):
+    """조건부 요청 캐시 테스트 (두 번째 크롤링은 304로 본문 없이 끝나야 함)"""
+    print("\n💾 조건부 요청 캐시 테스트")
+    print("-" * 50)
+
+    from utils.data_parser import WikiDataParser
+
+    cache_dir = tempfile.mkdtemp(prefix="http_cache_")
+    urls = {f"page{i}": f"{base_url}/cached/page{i}" for i in range(4)}
+    parsed = []
+
+    def handler(keyword, response):
+        if response.status_code == 304:
+            return None
+        parsed.append(keyword)
+        return len(response.content)
+
+    crawler = WikiCrawler(workers=4, rate_per_host=1000, burst=100, cache=HttpCache(cache_dir))
+    crawler.crawl(urls, handler, report_every=60)
+    first = crawler.progress.to_dict()
+    results = crawler.crawl(urls, handler, report_every=60)
+    second = crawler.progress.to_dict()
+    crawler.close()
+
+    print(f"   1회차: {first['bytes']} bytes, 2회차: {second['bytes']} bytes, "
+          f"변경 없음 {second['not_modified']}개, 파싱 {len(parsed)}회")
+
+    # WikiDataParser.crawl_wikipedia_page도 같은 캐시로 304를 받으면 파싱을 건너뜀
+    parser = WikiDataParser("test-key", tempfile.mkdtemp(prefix="raw_"), cache=HttpCache(cache_dir))
+    page = parser.crawl_wikipedia_page(urls["page0"])
+    print(f"   crawl_wikipedia_page 재요청 결과: {page}")
+
+    return (second["not_modified"] == 4 and second["bytes"] == 0 and len(parsed) == 4
+            and all(outcome["not_modified"] for outcome in results.values())
+            and page is None)
+
+
+def test_failed_handler_not_cached(base_url):
+    """처리에 실패한 응답은 검증자를 남기지 않아, 다음 크롤링이 304 대신 본문을 다시 받는지 테스트"""
+    print("\n🧯 처리 실패 후 캐시 테스트")
+    print("-" * 50)
+
+    cache_dir = tempfile.mkdtemp(prefix="http_cache_")
+    urls = {f"page{i}": f"{base_url}/cached/failing{i}" for i in range(3)}
+    statuses = []
+
+    def failing(keyword, response):
+        raise ValueError("파싱 실패")
+
+    def handler(keyword, response):
+        statuses.append(response.status_code)
+        return None
+
+    cache = HttpCache(cache_dir)
+    crawler = WikiCrawler(workers=2, rate_per_host=1000, burst=100, cache=cache)
+    failed = crawler.crawl(urls, failing, report_every=60)
+    entries = [cache.get_entry(url) for url in urls.values()]
+    crawler.crawl(urls, handler, report_every=60)
+    refetched = list(statuses)
+    crawler.crawl(urls, handler, report_every=60)
+    crawler.close()
+
+    print(f"   실패 후 캐시 항목: {sum(entry is not None for entry in entries)}개, "
+          f"다시 받은 응답: {refetched}, 성공 후 재요청: {statuses[len(refetched):]}")
+    return (not any(outcome["ok"] for outcome in failed.values()) and entries == [None] * 3
+            and refetched == [200] * 3 and statuses[3:] == [304] * 3)
+
+
+def test_parser_cache_after_save(base_url):
+    """WikiDataParser가 문서를 저장한 뒤에만 검증자를 기록하고, 304여도 MCP 파일이 없으면 다시 만드는지 테스트"""
+    print("\n📝 문서 저장 후 캐시 테스트")
+    print("-" * 50)
+
+    from utils.data_parser import WikiDataParser
+
+    cache = HttpCache(tempfile.mkdtemp(prefix="http_cache_"))
+    mcp_dir = Path(tempfile.mkdtemp(prefix="mcp_"))
+    parser = WikiDataParser(output_dir=tempfile.mkdtemp(prefix="raw_"), cache=cache)
+    wiki_data = {"page": f"{base_url}/cached/saved"}
+    mcp_file = mcp_dir / "page.md"
+
+    def failing_save(title, content):
+        raise OSError("디스크 가득 참")
+
+    with redirect_stdout(StringIO()):
+        save_document, parser.save_document = parser.save_document, failing_save
+        parser.process_wiki_documents(wiki_data, str(mcp_dir))
+        parser.save_document = save_document
+        not_cached = cache.get_entry(wiki_data["page"]) is None
+
+        first = parser.process_wiki_documents(wiki_data, str(mcp_dir))
+        mcp_file.unlink()
+        regenerated = parser.process_wiki_documents(wiki_data, str(mcp_dir))
+        skipped = parser.process_wiki_documents(wiki_data, str(mcp_dir))
+
+    print(f"   저장 실패 후 캐시 없음: {not_cached}, 지운 MCP 파일 다시 생성: {mcp_file.exists()}, "
+          f"다시 받은 횟수: {FixtureHandler.hits.get('/cached/saved')}")
+    return (not_cached and list(first) == ["page"] and list(regenerated) == ["page"]
+            and mcp_file.exists() and skipped == {})
+
+
+def main():
+    """메인 테스트 함수"""
+    print("🚀 동시 크롤러 테스트 시작")
+    print("=" * 60)
+
+    base_url, server = start_fixture_server()
+    success = True
+
+    try:
+        success &= test_token_bucket()
+        success &= test_concurrent_crawl(base_url)
+        success &= test_rate_limit(base_url)
+        success &= test_retries(base_url)
+        success &= test_conditional_cache(base_url)
+        success &= test_failed_handler_not_cached(base_url)
+        success &= test_parser_cache_after_save(base_url)
+    finally:
+        server.shutdown()
+
+    print("\n" + "=" * 60)
+    if success:
+        print("🎉 모든 테스트가 성공적으로 완료되었습니다!")
+    else:
+        print("⚠️  일부 테스트에서 문제가 발견되었습니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
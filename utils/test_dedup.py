@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+유사 중복 청크 탐지 테스트 스크립트
+몇 글자만 다른 문단은 대표 청크 하나로 묶이고, 내용이 다른 문단은 남는지, LSH 후보 비교가 전체 쌍 비교보다
+훨씬 적은지 확인합니다.
+"""
+
+import sys
+import time
+import random
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.dedup import ChunkDeduplicator, MinHasher, estimate_jaccard
+
+WORDS = ("인공지능 기계 학습 딥 러닝 신경망 데이터 모델 학습률 손실 함수 최적화 경사 하강법 층 가중치 편향 "
+         "활성화 분류 회귀 군집 강화 보상 정책 에이전트 환경 상태 행동 토큰 문장 임베딩 합성곱 순환 게이트").split()
+
+
+def paragraph(rng: random.Random, words: int = 60) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)) + "다."
+
+
+def mutate(rng: random.Random, text: str, edits: int) -> str:
+    """단어 edits개를 다른 단어로 바꾼 문단"""
+    words = text.split()
+    for _ in range(edits):
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+    return " ".join(words)
+
+
+def test_similarity_estimate():
+    """MinHash 추정 유사도가 비슷한 문단은 높고 다른 문단은 낮은지 테스트"""
+    print("\n🔢 MinHash 유사도 추정 테스트")
+    print("-" * 50)
+
+    rng = random.Random(0)
+    hasher = MinHasher()
+    base, other = paragraph(rng), paragraph(rng)
+    same = estimate_jaccard(hasher.signature(base), hasher.signature("  " + base.upper() + "\n"))
+    near = estimate_jaccard(hasher.signature(base), hasher.signature(mutate(rng, base, 2)))
+    far = estimate_jaccard(hasher.signature(base), hasher.signature(other))
+
+    ok = same == 1.0 and near >= 0.8 and far < 0.3
+    print(f"   공백/대소문자만 다름: {same:.2f}, 단어 2개 변경: {near:.2f}, 다른 문단: {far:.2f}")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_deduplicate():
+    """겹치는 문서의 유사 중복 청크만 대표 청크로 묶이는지 테스트"""
+    print("\n🧹 유사 중복 청크 제거 테스트")
+    print("-" * 50)
+
+    rng = random.Random(1)
+    originals = [(f"원본_chunk_{i}", paragraph(rng)) for i in range(2000)]
+    near = [(f"사본_chunk_{i}", mutate(rng, originals[i][1], 1)) for i in range(0, 2000, 4)]
+    rewritten = [(f"재작성_chunk_{i}", mutate(rng, originals[i][1], 30)) for i in range(1, 2000, 8)]
+    chunks = originals + near + rewritten
+
+    deduplicator = ChunkDeduplicator()
+    started = time.perf_counter()
+    kept, duplicates = deduplicator.deduplicate(chunks)
+    elapsed = time.perf_counter() - started
+
+    expected = {f"원본_chunk_{i}": [f"사본_chunk_{i}"] for i in range(0, 2000, 4)}
+    kept_ids = {chunks[i][0] for i in kept}
+    all_pairs = len(chunks) * (len(chunks) - 1) // 2
+    ok = (duplicates == expected and len(kept) == len(originals) + len(rewritten)
+          and all(chunk_id in kept_ids for chunk_id, _ in rewritten)
+          and deduplicator.stats["candidates"] < all_pairs / 100)
+    print(f"   청크 {len(chunks)}개 → 임베딩 {len(kept)}개 (중복 {len(chunks) - len(kept)}개), {elapsed:.2f}s")
+    print(f"   후보 비교 {deduplicator.stats['candidates']:,}회 (전체 쌍 {all_pairs:,}회)")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_file_index():
+    """파일에 저장한 인덱스가 메모리 인덱스와 같은 결과를 내고, 중복 목록을 읽을 수 있고, 닫으면 지워지는지 테스트"""
+    print("\n💾 파일 인덱스 테스트")
+    print("-" * 50)
+
+    rng = random.Random(2)
+    originals = [(f"원본_chunk_{i}", paragraph(rng)) for i in range(500)]
+    copies = [(f"사본_chunk_{i}", mutate(rng, originals[i][1], 1)) for i in range(0, 500, 5)]
+    exact = [(f"복사_chunk_{i}", "  " + originals[i][1].upper()) for i in range(0, 500, 50)]
+    chunks = originals + copies + exact
+
+    expected = ChunkDeduplicator().deduplicate(chunks)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "dedup.sqlite"
+        deduplicator = ChunkDeduplicator(path=path)
+        result = deduplicator.deduplicate(chunks)
+        groups = dict(deduplicator.duplicate_groups())
+        stats = deduplicator.stats
+        deduplicator.close()
+        removed = not path.exists()
+
+    ok = result == expected and groups == result[1] and stats["exact_duplicates"] >= len(exact) and removed
+    print(f"   메모리 인덱스와 같은 결과: {result == expected}, 중복 목록 {len(groups)}개, "
+          f"완전 일치 {stats['exact_duplicates']}개, 닫은 뒤 파일 삭제: {removed}")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def main():
+    """메인 테스트 함수"""
+    print("🚀 유사 중복 청크 탐지 테스트 시작")
+    print("=" * 60)
+
+    success = True
+    success &= test_similarity_estimate()
+    success &= test_deduplicate()
+    success &= test_file_index()
+
+    print("\n" + "=" * 60)
+    if success:
+        print("🎉 모든 테스트가 성공적으로 완료되었습니다!")
+    else:
+        print("⚠️  일부 테스트에서 문제가 발견되었습니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
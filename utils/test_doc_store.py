@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+세그먼트 문서 저장소 테스트 스크립트
+여러 워커 프로세스가 잠금 없이 같은 저장소에 기록하는지, 덮어쓰기/삭제/정리(compact), 쓰다가 중단된 색인 줄과
+손상된 레코드 처리, 그리고 문서별 파일 디렉토리와 비교한 열기/조회 시간을 확인합니다.
+"""
+
+import sys
+import time
+import random
+import tempfile
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.doc_store import INDEX_SUFFIX, SEGMENT_SUFFIX, SegmentStore, open_stores
+from utils.ingest import IngestPipeline
+
+FIXTURES = Path(__file__).parent / "fixtures" / "processors"
+
+
+def test_pipeline_writes():
+    """수집 파이프라인 워커들이 저장소에 기록한 결과가 파일 모드 결과와 같은지 테스트"""
+    print("\n🏭 수집 파이프라인 저장소 기록 테스트")
+    print("-" * 50)
+
+    raw_files = sorted(path for path in FIXTURES.glob("*.txt") if not path.name.endswith(".rag.txt"))
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        dirs = (tmp / "raw", tmp / "mcp_docs", tmp / "rag_docs")
+        with redirect_stdout(StringIO()):
+            for store_dir in (None, tmp / "store"):
+                with IngestPipeline(*dirs, processes=2, store_dir=store_dir) as pipeline:
+                    futures = {path.stem: pipeline.submit_raw(path.stem, path.read_text(encoding='utf-8'))
+                               for path in raw_files}
+                    pipeline.wait(futures)
+
+        stores = open_stores(tmp / "store")
+        keywords = sorted(futures)
+        same = all(stores["mcp"].get(keyword) == (dirs[1] / f"{keyword}.md").read_text(encoding='utf-8')
+                   and stores["rag"].get(keyword) == (dirs[2] / f"{keyword}.txt").read_text(encoding='utf-8')
+                   for keyword in keywords)
+        headings = {keyword: stores["mcp"].entry(keyword)["meta"].get("heading") for keyword in keywords}
+        segments = len(list((tmp / "store" / "mcp").glob(f"*{SEGMENT_SUFFIX}")))
+
+    ok = (same and len(keywords) == len(raw_files) > 0 and stores["mcp"].keys() == keywords
+          and all(headings.values()))
+    print(f"   문서 {len(keywords)}개, mcp 세그먼트 {segments}개, 파일 모드와 같은 결과: {same}")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_overwrite_delete_compact():
+    """덮어쓰기/삭제가 다른 인스턴스에 반영되고 compact 후에도 내용이 같은지 테스트"""
+    print("\n♻️  덮어쓰기/삭제/정리 테스트")
+    print("-" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = SegmentStore(tmp, segment_bytes=4096)
+        reader = SegmentStore(tmp)
+        for i in range(50):
+            writer.put(f"doc{i}", f"# 문서 {i}\n" + "본문 문장. " * (i * 20))
+        for i in range(0, 50, 5):
+            writer.put(f"doc{i}", f"# 문서 {i}\n수정된 본문")
+        writer.delete("doc1")
+
+        refreshed = reader.refresh()
+        seen = reader.get("doc10") == "# 문서 10\n수정된 본문" and "doc1" not in reader and len(reader) == 49
+        compressed = reader.entry("doc49")["length"] < reader.entry("doc49")["size"]
+        before = {key: reader.get(key) for key in reader.keys()}
+        segments_before = len(list(Path(tmp).glob(f"*{SEGMENT_SUFFIX}")))
+        writer.close()
+
+        stats = reader.compact()
+        reopened = SegmentStore(tmp)
+        after = {key: reopened.get(key) for key in reopened.keys()}
+        segments_after = len(list(Path(tmp).glob(f"*{SEGMENT_SUFFIX}")))
+
+    ok = (seen and compressed and after == before and stats["records"] == 49
+          and stats["bytes_after"] < stats["bytes_before"] and segments_after < segments_before)
+    print(f"   갱신 {refreshed}건 반영, 압축 {reader.entry('doc49')['size']} → {reader.entry('doc49')['length']} bytes")
+    print(f"   정리: 세그먼트 {segments_before} → {segments_after}개, "
+          f"{stats['bytes_before']:,} → {stats['bytes_after']:,} bytes")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_torn_writes():
+    """쓰다가 중단된 색인 줄은 무시하고, 손상된 레코드는 읽을 때 오류가 나는지 테스트"""
+    print("\n💥 중단/손상 처리 테스트")
+    print("-" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with SegmentStore(tmp, compress_min=None) as store:
+            store.put("a", "첫 번째 문서")
+            store.put("b", "두 번째 문서")
+        index_path = next(Path(tmp).glob(f"*{INDEX_SUFFIX}"))
+        with open(index_path, 'ab') as f:
+            f.write(b'{"key": "c", "offs')
+
+        store = SegmentStore(tmp)
+        torn_ignored = store.keys() == ["a", "b"]
+
+        segment_path = next(Path(tmp).glob(f"*{SEGMENT_SUFFIX}"))
+        data = bytearray(segment_path.read_bytes())
+        data[-2] ^= 0xFF
+        segment_path.write_bytes(bytes(data))
+        store = SegmentStore(tmp)
+        try:
+            store.get("b")
+            detected = False
+        except ValueError:
+            detected = True
+        intact = store.get("a") == "첫 번째 문서"
+
+    ok = torn_ignored and detected and intact
+    print(f"   중단된 색인 줄 무시: {torn_ignored}, 손상 감지: {detected}, 다른 문서 정상: {intact}")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_lookup_speed(count: int = 5000):
+    """문서별 파일 디렉토리 스캔/읽기와 저장소 열기/조회 시간 비교"""
+    print("\n⏱️  조회 시간 비교 테스트")
+    print("-" * 50)
+
+    rng = random.Random(0)
+    texts = {f"문서{i}": f"# 문서 {i}\n" + "위키 본문 문장입니다. " * rng.randint(20, 200) for i in range(count)}
+    lookups = rng.sample(sorted(texts), 500)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files_dir = Path(tmp) / "files"
+        files_dir.mkdir()
+        for key, text in texts.items():
+            (files_dir / f"{key}.md").write_text(text, encoding='utf-8')
+        with SegmentStore(Path(tmp) / "store") as store:
+            for key, text in texts.items():
+                store.put(key, text)
+
+        # 기존 방식: rglob + stat로 카탈로그를 만들고 파일을 열어 읽음
+        started = time.perf_counter()
+        catalog = {path.stem: (path, path.stat().st_size) for path in files_dir.rglob("*") if path.is_file()}
+        file_hits = [catalog[key][0].read_text(encoding='utf-8') for key in lookups]
+        files_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        with SegmentStore(Path(tmp) / "store") as store:
+            store_hits = [store.get(key) for key in lookups]
+            stats = store.stats()
+        store_s = time.perf_counter() - started
+
+    ok = store_hits == file_hits == [texts[key] for key in lookups] and stats["segments"] == 1
+    print(f"   문서 {count}개: 파일 {files_s * 1000:.0f}ms, 저장소 {store_s * 1000:.0f}ms "
+          f"(조회 {len(lookups)}회 포함), 세그먼트 {stats['segments']}개 "
+          f"{stats['segment_bytes'] / 1024:.0f} KiB (본문 {stats['text_bytes'] / 1024:.0f} KiB)")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def main():
+    """메인 테스트 함수"""
+    print("🚀 세그먼트 문서 저장소 테스트 시작")
+    print("=" * 60)
+
+    success = True
+    success &= test_pipeline_writes()
+    success &= test_overwrite_delete_compact()
+    success &= test_torn_writes()
+    success &= test_lookup_speed()
+
+    print("\n" + "=" * 60)
+    if success:
+        print("🎉 모든 테스트가 성공적으로 완료되었습니다!")
+    else:
+        print("⚠️  일부 테스트에서 문제가 발견되었습니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
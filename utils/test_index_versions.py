@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+벡터 DB 버전 관리 테스트 스크립트
+새 버전이 활성 버전을 복사해서 시작하고 활성 버전과 분리되는지, 구축 중인 버전을 이어서 찾는지, 오래된 버전을
+정리하는지, 그리고 재구축과 전환을 반복하는 동안 계속 읽는 쪽이 항상 완성된 버전을 보는지 확인합니다
+(Chroma 대신 파일 하나를 버전 내용으로 사용).
+"""
+
+import os
+import sys
+import json
+import tempfile
+import threading
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.atomic_io import DEFAULT_FILE_MODE
+from utils.index_versions import IndexVersions
+
+DATA_FILE = "chroma.sqlite3"   # 가짜 Chroma 파일 (버전 번호를 기록)
+
+
+def build(versions: IndexVersions, number: int, resume: bool = False) -> str:
+    """가짜 구축: 버전 디렉토리에 구축 번호를 여러 번에 나눠 기록한 뒤 전환"""
+    version = (versions.pending("streaming") if resume else None) or versions.create()
+    data = versions.path(version) / DATA_FILE
+    data.write_text("", encoding='utf-8')
+    for part in str(number):
+        with open(data, 'a', encoding='utf-8') as f:
+            f.write(part)
+    data.write_text(json.dumps({"build": number}), encoding='utf-8')
+    versions.activate(version, {"chunks": number})
+    versions.gc()
+    return version
+
+
+def test_seed_and_isolation():
+    """새 버전이 활성 버전(또는 이전 구조)을 복사해서 시작하고, 구축 중인 버전의 변경이 활성 버전에 보이지 않는지 테스트"""
+    print("\n🗂️  버전 복사/분리 테스트")
+    print("-" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        # 버전 관리 이전 구조: data/vectordb에 바로 Chroma 파일
+        (root / DATA_FILE).write_text("legacy", encoding='utf-8')
+        versions = IndexVersions(root)
+        legacy = versions.active_dir() == root
+
+        first = versions.create()
+        seeded = (versions.path(first) / DATA_FILE).read_text(encoding='utf-8') == "legacy"
+        (versions.path(first) / DATA_FILE).write_text("v1", encoding='utf-8')
+        isolated = versions.active_dir() == root and (root / DATA_FILE).read_text(encoding='utf-8') == "legacy"
+        versions.activate(first)
+
+        second = versions.create()
+        (versions.path(second) / DATA_FILE).write_text("v2 (구축 중)", encoding='utf-8')
+        still_first = (versions.active_dir() / DATA_FILE).read_text(encoding='utf-8') == "v1"
+        fresh = versions.create(seed=False)
+        empty = not (versions.path(fresh) / DATA_FILE).exists()
+        nested = not (versions.path(first) / "versions").exists()
+
+    ok = legacy and seeded and isolated and still_first and empty and nested
+    print(f"   이전 구조 사용: {legacy}, 복사해서 시작: {seeded}, 구축 중 변경 분리: {isolated and still_first}, "
+          f"빈 버전: {empty}")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_resume_and_gc():
+    """중단된 구축 중인 버전을 구축 방식별로 찾고, 전환 후 활성 버전과 직전 버전(과 장부 구축 중인 버전)만 남기는지 테스트"""
+    print("\n🧹 이어서 구축/정리 테스트")
+    print("-" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        versions = IndexVersions(tmp, keep=2, grace_seconds=0)
+        built = [build(versions, n) for n in range(1, 4)]
+
+        interrupted = versions.create()
+        ledger = versions.create(builder="ledger")   # 장부 기반 구축이 실패를 남기고 멈춘 버전
+        stamp = versions.pointer_stamp()
+        pending = (versions.pending("streaming") == interrupted and versions.pending("ledger") == ledger
+                   and versions.active() == built[-1])
+        resumed = build(versions, 4, resume=True)
+        switched = versions.pointer_stamp() != stamp and versions.active_info()["chunks"] == 4
+
+        # 다른 사용자로 실행되는 검색 서버도 읽을 수 있도록 포인터는 open()과 같은 권한, 다시 쓰면 기존 권한 유지
+        readable = versions.pointer.stat().st_mode & 0o777 == DEFAULT_FILE_MODE
+        os.chmod(versions.pointer, 0o640)
+        remaining = [version["version"] for version in versions.versions()]
+        kept_ledger = ledger in remaining and versions.pending("ledger") == ledger
+        if kept_ledger:
+            remaining.remove(ledger)
+        versions.activate(built[-1])   # 이전 버전으로 되돌리기
+        rolled_back = json.loads((versions.active_dir() / DATA_FILE).read_text(encoding='utf-8'))["build"] == 3
+        kept_mode = versions.pointer.stat().st_mode & 0o777 == 0o640
+
+    ok = (pending and resumed == interrupted and switched
+          and remaining == [built[-1], resumed] and rolled_back and readable and kept_mode and kept_ledger)
+    print(f"   구축 방식별 구축 중인 버전 찾기: {pending}, 이어서 구축 후 전환: {switched}, "
+          f"남은 버전: {len(remaining)}개 (+ 장부 구축 중 버전 유지: {kept_ledger}), 되돌리기: {rolled_back}")
+    print(f"   포인터 권한: {oct(DEFAULT_FILE_MODE)} {readable}, 다시 써도 기존 권한 유지: {kept_mode}")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_readers_during_rebuilds():
+    """재구축/전환/정리를 반복하는 동안 읽는 쪽이 항상 완성된 버전을 읽고, 유예 시간이 지난 버전만 삭제되는지 테스트"""
+    print("\n🔁 무중단 전환 테스트")
+    print("-" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        versions = IndexVersions(tmp)
+        build(versions, 0)
+        stop = threading.Event()
+        seen = {"reads": 0, "errors": 0, "builds": set()}
+
+        def reader():
+            reader_versions = IndexVersions(tmp)
+            while not stop.is_set():
+                try:
+                    data = json.loads((reader_versions.active_dir() / DATA_FILE).read_text(encoding='utf-8'))
+                    seen["builds"].add(data["build"])
+                except (OSError, ValueError, KeyError):
+                    seen["errors"] += 1
+                seen["reads"] += 1
+
+        threads = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for number in range(1, 30):
+            build(versions, number)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        within_grace = len(versions.versions())
+        versions.grace_seconds = 0
+        versions.gc()
+        left = len(versions.versions())
+
+    ok = (seen["errors"] == 0 and seen["reads"] > 0 and len(seen["builds"]) > 1
+          and within_grace == 30 and left == 2)
+    print(f"   읽기 {seen['reads']}회 중 오류 {seen['errors']}회, 읽은 구축 {len(seen['builds'])}개")
+    print(f"   유예 시간 안에 남은 버전 {within_grace}개 → 유예 시간 후 {left}개")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def main():
+    """메인 테스트 함수"""
+    print("🚀 벡터 DB 버전 관리 테스트 시작")
+    print("=" * 60)
+
+    success = True
+    success &= test_seed_and_isolation()
+    success &= test_resume_and_gc()
+    success &= test_readers_during_rebuilds()
+
+    print("\n" + "=" * 60)
+    if success:
+        print("🎉 모든 테스트가 성공적으로 완료되었습니다!")
+    else:
+        print("⚠️  일부 테스트에서 문제가 발견되었습니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
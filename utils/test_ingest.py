@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+수집 파이프라인 테스트 스크립트
+합성 위키 페이지를 프로세스 풀로 처리한 결과가 기존 순차 방식(raw 저장 → 다시 읽어 MCP/RAG 처리)과
+같은지, 임시 파일이 남지 않는지 확인합니다.
+"""
+
+import sys
+import time
+import tempfile
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.benchmark_parsing import build_synthetic_page
+from utils.data_parser import WikiDataParser
+from utils.ingest import IngestPipeline
+from utils.markdown_processor import MarkdownProcessor
+from utils.text_processor import TextProcessor
+
+PAGE_COUNT = 12
+
+
+def build_pages():
+    """합성 페이지 HTML ({키워드: bytes}, CRLF 줄바꿈 페이지 포함)"""
+    pages = {f"문서{i}": build_synthetic_page(i, sections=8 + i % 5).encode('utf-8') for i in range(PAGE_COUNT)}
+    pages["crlf"] = build_synthetic_page(99).replace("\n", "\r\n").encode('utf-8')
+    return pages
+
+
+def sequential_outputs(pages, work_dir: Path):
+    """기존 download_wiki_data.py 방식의 결과 ({키워드: (raw, mcp, rag)})"""
+    parser = WikiDataParser(output_dir=str(work_dir))
+    outputs = {}
+    for keyword, html in pages.items():
+        title, content = parser.parse_wikipedia_html(html)
+        raw_path = work_dir / f"{keyword}.txt"
+        with open(raw_path, 'w', encoding='utf-8') as f:
+            f.write(f"제목: {title}\n\n")
+            f.write(content)
+        with open(raw_path, 'r', encoding='utf-8') as f:
+            raw_content = f.read()
+        outputs[keyword] = (raw_path.read_bytes(),
+                            MarkdownProcessor().process_for_mcp(raw_content).encode('utf-8'),
+                            TextProcessor().process_for_rag(raw_content).encode('utf-8'))
+    return outputs
+
+
+def run_pipeline(pages, work_dir: Path, processes: int):
+    """프로세스 풀 파이프라인 실행 (결과, 경과 시간)"""
+    dirs = (work_dir / "raw", work_dir / "mcp_docs", work_dir / "rag_docs")
+    started = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        with IngestPipeline(*dirs, processes=processes) as pipeline:
+            futures = {keyword: pipeline.submit_html(keyword, html) for keyword, html in pages.items()}
+            results = pipeline.wait(futures)
+    return dirs, results, time.perf_counter() - started
+
+
+def test_matches_sequential():
+    """순차 방식과 결과 파일이 같은지 테스트"""
+    print("\n🔁 순차 방식과 결과 비교")
+    print("-" * 50)
+
+    pages = build_pages()
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        (tmp_path / "seq").mkdir()
+        with redirect_stdout(StringIO()):
+            expected = sequential_outputs(pages, tmp_path / "seq")
+        dirs, results, _ = run_pipeline(pages, tmp_path / "pool", processes=2)
+
+        mismatched = []
+        for keyword, (raw, mcp, rag) in expected.items():
+            actual = ((dirs[0] / f"{keyword}.txt").read_bytes(),
+                      (dirs[1] / f"{keyword}.md").read_bytes(),
+                      (dirs[2] / f"{keyword}.txt").read_bytes())
+            if actual != (raw, mcp, rag):
+                mismatched.append(keyword)
+
+        leftovers = [path.name for directory in dirs for path in directory.iterdir() if path.suffix == ".tmp"]
+        ok = all(result["ok"] and not result["skipped"] for result in results.values())
+
+    print(f"   문서 {len(expected)}개, 불일치: {mismatched or '없음'}, 임시 파일: {leftovers or '없음'}")
+    return ok and not mismatched and not leftovers
+
+
+def test_submit_raw():
+    """raw 파일에서 읽은 원본 텍스트 처리 테스트 (raw 파일은 다시 쓰지 않음)"""
+    print("\n📂 원본 텍스트 재처리 테스트")
+    print("-" * 50)
+
+    raw_content = "제목: 재처리 문서\n\n## 개요\n**굵은** 본문[1] 입니다.\n\n## 각주\n1. 참조\n"
+    with tempfile.TemporaryDirectory() as tmp:
+        dirs = [Path(tmp) / name for name in ("raw", "mcp_docs", "rag_docs")]
+        with redirect_stdout(StringIO()):
+            with IngestPipeline(*dirs, processes=1) as pipeline:
+                results = pipeline.wait({"재처리": pipeline.submit_raw("재처리", raw_content)})
+
+        result = results["재처리"]
+        mcp = (dirs[1] / "재처리.md").read_text(encoding='utf-8')
+        rag = (dirs[2] / "재처리.txt").read_text(encoding='utf-8')
+        raw_written = (dirs[0] / "재처리.txt").exists()
+
+    ok = (result["ok"] and not raw_written
+          and mcp == MarkdownProcessor().process_for_mcp(raw_content)
+          and rag == TextProcessor().process_for_rag(raw_content))
+    print(f"   결과: {'✅' if ok else '❌'} (raw 재저장: {raw_written})")
+    return ok
+
+
+def test_scaling():
+    """프로세스 수에 따른 처리 시간 (참고용 출력)"""
+    print("\n📈 프로세스 수별 처리 시간")
+    print("-" * 50)
+
+    pages = {f"{keyword}-{n}": html for n in range(2) for keyword, html in build_pages().items()}
+    with tempfile.TemporaryDirectory() as tmp:
+        for processes in (1, 2, 4):
+            _, results, elapsed = run_pipeline(pages, Path(tmp) / str(processes), processes)
+            print(f"   프로세스 {processes}개: 문서 {len(results)}개 {elapsed:.2f}s")
+    return True
+
+
+def main():
+    """메인 테스트 함수"""
+    print("🚀 수집 파이프라인 테스트 시작")
+    print("=" * 60)
+
+    success = True
+    success &= test_matches_sequential()
+    success &= test_submit_raw()
+    success &= test_scaling()
+
+    print("\n" + "=" * 60)
+    if success:
+        print("🎉 모든 테스트가 성공적으로 완료되었습니다!")
+    else:
+        print("⚠️  일부 테스트에서 문제가 발견되었습니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+작업 장부 테스트 스크립트
+여러 프로세스가 같은 장부에서 문서를 나눠 처리할 때 단계가 한 번씩만 실행되는지, 작업자가 죽었을 때
+마지막으로 끝난 단계부터 이어지는지, 실패한 문서의 재시도와 샤드 분할, 내용 변경 시 재실행,
+임베딩 배치 단위 재시도를 확인합니다.
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import multiprocessing
+from array import array
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import openai
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.job_ledger import STAGES, JobLedger, parse_shard, run_worker
+from rag.ledger_build import embed_handler
+
+DOCUMENTS = 60
+
+
+def logging_handlers(log_path: str, slow_stage: str = None, delay: float = 0.0):
+    """단계마다 "문서 단계 pid"를 기록하고 이전 단계 결과에 단계 이름을 덧붙이는 단계 함수들"""
+    def make(stage):
+        def handle(doc_id, load):
+            if stage == slow_stage:
+                time.sleep(delay)
+            with open(log_path, 'a', encoding='utf-8') as f:
+                f.write(f"{doc_id} {stage} {os.getpid()}\n")
+            index = STAGES.index(stage)
+            previous = load(STAGES[index - 1]) if index > 0 else b""
+            return previous + stage[0].encode()
+        return handle
+    return {stage: make(stage) for stage in STAGES}
+
+
+def _worker(ledger_path: str, log_path: str, shard: str = None, slow_stage: str = None, delay: float = 0.0):
+    """별도 프로세스 작업자"""
+    with JobLedger(ledger_path, retry_backoff=0) as ledger, redirect_stdout(StringIO()):
+        run_worker(ledger, logging_handlers(log_path, slow_stage, delay),
+                   shards=parse_shard(shard, ledger.num_shards), batch=2, idle_wait=0.05)
+
+
+def read_log(log_path: Path):
+    """[(문서, 단계, pid)]"""
+    if not log_path.exists():
+        return []
+    return [tuple(line.split()) for line in log_path.read_text(encoding='utf-8').splitlines()]
+
+
+def test_parallel_workers():
+    """프로세스 3개가 문서를 나눠 처리하고 모든 단계가 정확히 한 번씩 실행되는지 테스트"""
+    print("\n👷 다중 프로세스 작업자 테스트")
+    print("-" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger_path, log_path = str(Path(tmp) / "ledger.sqlite"), Path(tmp) / "log.txt"
+        with JobLedger(ledger_path) as ledger:
+            ledger.register({f"doc{i}": None for i in range(DOCUMENTS)})
+
+        workers = [multiprocessing.Process(target=_worker, args=(ledger_path, str(log_path))) for _ in range(3)]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join()
+
+        log = read_log(log_path)
+        with JobLedger(ledger_path) as ledger:
+            counts = ledger.counts()
+            artifact = ledger.load_artifact("doc7", "index")
+
+    runs = {(doc, stage) for doc, stage, _ in log}
+    pids = {pid for _, _, pid in log}
+    ok = (len(log) == DOCUMENTS * len(STAGES) and len(runs) == len(log)
+          and counts == {"index": {"done": DOCUMENTS}} and artifact == b"cpcei")
+    print(f"   단계 실행 {len(log)}회 (기대 {DOCUMENTS * len(STAGES)}회), 중복 {len(log) - len(runs)}회, "
+          f"작업 프로세스 {len(pids)}개")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_crash_resume():
+    """작업자가 죽으면 다음 작업자가 끝난 단계는 건너뛰고 이어서 실행하는지 테스트"""
+    print("\n💥 중단 후 이어서 실행 테스트")
+    print("-" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger_path, log_path = str(Path(tmp) / "ledger.sqlite"), Path(tmp) / "log.txt"
+        with JobLedger(ledger_path) as ledger:
+            ledger.register({"doc0": None})
+
+        # crawl/process/chunk를 끝내고 embed 단계에서 멈춘 작업자를 강제 종료
+        process = multiprocessing.Process(target=_worker, args=(ledger_path, str(log_path), None, "embed", 30))
+        process.start()
+        deadline = time.time() + 10
+        while time.time() < deadline and len(read_log(log_path)) < 3:
+            time.sleep(0.05)
+        time.sleep(0.2)
+        process.kill()
+        process.join()
+        before = read_log(log_path)
+
+        with JobLedger(ledger_path, retry_backoff=0) as ledger:
+            reclaimed = ledger.release_dead_owners()
+            with redirect_stdout(StringIO()):
+                run_worker(ledger, logging_handlers(str(log_path)), idle_wait=0.05)
+            counts = ledger.counts()
+            artifact = ledger.load_artifact("doc0", "index")
+
+        resumed = [stage for _, stage, pid in read_log(log_path)[len(before):]]
+
+    ok = ([stage for _, stage, _ in before] == ["crawl", "process", "chunk"] and reclaimed == 1
+          and resumed == ["embed", "index"] and counts == {"index": {"done": 1}} and artifact == b"cpcei")
+    print(f"   중단 전: {[stage for _, stage, _ in before]}, 회수한 임대: {reclaimed}개, 이어서 실행: {resumed}")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_retry_and_failure():
+    """실패한 단계가 재시도되고, max_attempts번 연속 실패하면 failed로 멈추는지 테스트"""
+    print("\n🔁 재시도/실패 테스트")
+    print("-" * 50)
+
+    attempts = {"flaky": 0, "broken": 0}
+
+    def embed(doc_id, load):
+        attempts[doc_id] += 1
+        if doc_id == "broken" or attempts[doc_id] < 3:
+            raise RuntimeError("임베딩 API 오류")
+        return b"vector"
+
+    handlers = {"chunk": lambda doc_id, load: b"chunks", "embed": embed, "index": lambda doc_id, load: None}
+    with tempfile.TemporaryDirectory() as tmp:
+        with JobLedger(str(Path(tmp) / "ledger.sqlite"), max_attempts=3, retry_backoff=0) as ledger:
+            ledger.register({"flaky": None, "broken": None}, completed_stage="process")
+            with redirect_stdout(StringIO()):
+                stats = run_worker(ledger, handlers, idle_wait=0.01)
+            counts = ledger.counts()
+            failures = ledger.failures()
+            retried = ledger.retry_failed()
+            pending_after_retry = ledger.claim("test", ["embed"])
+
+    ok = (attempts == {"flaky": 3, "broken": 3} and counts == {"index": {"done": 1}, "chunk": {"failed": 1}}
+          and failures[0]["doc_id"] == "broken" and failures[0]["failed_stage"] == "embed"
+          and stats["failed"] == 5 and retried == 1 and pending_after_retry[0]["stage"] == "embed")
+    print(f"   시도 횟수: {attempts}, 상태: {counts}")
+    print(f"   실패 문서: {[(f['doc_id'], f['failed_stage'], f['attempts']) for f in failures]}")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_embed_batch_retry():
+    """임베딩 배치가 429/5xx로 실패하면 그 배치만 다시 요청하고, 클라이언트 하나를 문서 사이에 재사용하는지 테스트"""
+    print("\n⏳ 임베딩 배치 재시도 테스트")
+    print("-" * 50)
+
+    request = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+
+    class FlakyEmbeddings:
+        """배치마다 첫 요청은 429(Retry-After: 0), 두 번째는 503으로 실패시키는 가짜 임베딩 API"""
+        def __init__(self):
+            self.calls = []
+
+        def create(self, model, input):
+            self.calls.append(tuple(input))
+            tries = self.calls.count(tuple(input))
+            if tries == 1:
+                raise openai.RateLimitError("rate limited", body=None,
+                                            response=httpx.Response(429, headers={"Retry-After": "0"}, request=request))
+            if tries == 2:
+                raise openai.InternalServerError("unavailable", body=None,
+                                                 response=httpx.Response(503, request=request))
+            return SimpleNamespace(data=[SimpleNamespace(embedding=[float(len(text))]) for text in input])
+
+    class BadRequestEmbeddings:
+        """재시도할 수 없는 400 오류를 내는 가짜 임베딩 API"""
+        def __init__(self):
+            self.calls = 0
+
+        def create(self, model, input):
+            self.calls += 1
+            raise openai.BadRequestError("bad input", body=None, response=httpx.Response(400, request=request))
+
+    def chunks(doc_id):
+        return [f"{doc_id} 청크 {'가' * i}" for i in range(130)]
+
+    def loader(doc_id):
+        return lambda stage: json.dumps({"chunks": chunks(doc_id)}).encode("utf-8")
+
+    flaky = FlakyEmbeddings()
+    handle = embed_handler(SimpleNamespace(embeddings=flaky), max_retries=3, backoff=0)
+    vectors = [handle(doc_id, loader(doc_id)) for doc_id in ("doc-a", "doc-b")]
+    batches = len(set(flaky.calls))
+    expected = [array('f', [float(len(text)) for text in chunks(doc_id)]).tobytes() for doc_id in ("doc-a", "doc-b")]
+
+    bad = BadRequestEmbeddings()
+    try:
+        embed_handler(SimpleNamespace(embeddings=bad), max_retries=3, backoff=0)("doc-c", loader("doc-c"))
+        raised = False
+    except openai.BadRequestError:
+        raised = True
+
+    exhausted = FlakyEmbeddings()
+    try:
+        embed_handler(SimpleNamespace(embeddings=exhausted), max_retries=1, backoff=0)("doc-d", loader("doc-d"))
+        gave_up = False
+    except openai.InternalServerError:
+        gave_up = True
+
+    ok = (vectors == expected and batches > 2 and len(flaky.calls) == batches * 3
+          and raised and bad.calls == 1 and gave_up and len(exhausted.calls) == 2)
+    print(f"   배치 {batches}개 (문서 2개), 요청 {len(flaky.calls)}번 (배치마다 실패 2번 + 성공 1번)")
+    print(f"   400 오류 즉시 실패: {raised} ({bad.calls}번 요청), 재시도 소진 후 실패: {gave_up}")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_shards():
+    """샤드 분할이 겹치지 않고 전체를 덮는지, 샤드별 작업자가 자기 문서만 처리하는지 테스트"""
+    print("\n🧩 샤드 분할 테스트")
+    print("-" * 50)
+
+    partitions = [set(parse_shard(f"{i}/3", 64)) for i in range(3)]
+    covers = set().union(*partitions) == set(range(64)) and sum(map(len, partitions)) == 64
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger_path, log_path = str(Path(tmp) / "ledger.sqlite"), Path(tmp) / "log.txt"
+        with JobLedger(ledger_path) as ledger:
+            ledger.register({f"doc{i}": None for i in range(DOCUMENTS)})
+            shard_of = {f"doc{i}": ledger.shard_of(f"doc{i}") for i in range(DOCUMENTS)}
+
+        workers = [multiprocessing.Process(target=_worker, args=(ledger_path, str(log_path), f"{i}/2"))
+                   for i in range(2)]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join()
+        log = read_log(log_path)
+
+    docs_by_pid = {}
+    for doc, _, pid in log:
+        docs_by_pid.setdefault(pid, set()).add(doc)
+    shard_sets = [{shard_of[doc] % 2 for doc in docs} for docs in docs_by_pid.values()]
+    ok = (covers and len(log) == DOCUMENTS * len(STAGES)
+          and sorted(map(sorted, shard_sets)) == [[0], [1]])
+    print(f"   샤드 분할: {[len(p) for p in partitions]}, 작업자별 문서 수: "
+          f"{sorted(len(docs) for docs in docs_by_pid.values())}")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_content_change():
+    """내용 해시가 바뀐 문서만 chunk 단계부터 다시 실행되는지 테스트"""
+    print("\n✏️  내용 변경 재실행 테스트")
+    print("-" * 50)
+
+    runs = []
+    handlers = {stage: (lambda stage: lambda doc_id, load: runs.append((doc_id, stage)) or b"x")(stage)
+                for stage in ("chunk", "embed", "index")}
+    with tempfile.TemporaryDirectory() as tmp:
+        with JobLedger(str(Path(tmp) / "ledger.sqlite")) as ledger:
+            ledger.register({"a": "h1", "b": "h1"}, completed_stage="process")
+            run_worker(ledger, handlers)
+            first = len(runs)
+            registered = ledger.register({"a": "h2", "b": "h1"}, completed_stage="process")
+            run_worker(ledger, handlers)
+            rerun = runs[first:]
+            embed_artifact_kept = ledger.load_artifact("b", "embed") == b"x"
+
+    ok = (first == 6 and registered["changed"] == 1
+          and rerun == [("a", "chunk"), ("a", "embed"), ("a", "index")] and embed_artifact_kept)
+    print(f"   첫 실행 {first}단계, 변경 후 다시 실행: {rerun}")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def main():
+    """메인 테스트 함수"""
+    print("🚀 작업 장부 테스트 시작")
+    print("=" * 60)
+
+    success = True
+    success &= test_parallel_workers()
+    success &= test_crash_resume()
+    success &= test_retry_and_failure()
+    success &= test_embed_batch_retry()
+    success &= test_shards()
+    success &= test_content_change()
+
+    print("\n" + "=" * 60)
+    if success:
+        print("🎉 모든 테스트가 성공적으로 완료되었습니다!")
+    else:
+        print("⚠️  일부 테스트에서 문제가 발견되었습니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
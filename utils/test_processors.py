@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+텍스트/마크다운 전처리 골든 테스트 스크립트
+utils/fixtures/processors 의 기대 출력은 정규식 파이프라인으로 바꾸기 전의 TextProcessor /
+MarkdownProcessor로 만든 것이며, 전체 문자열 처리와 스트리밍 처리 모두 바이트 단위로 같아야 합니다.
+"""
+
+import io
+import sys
+import json
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.text_processor import TextProcessor, RAG_PASSES, RAG_SECTION_RULES
+from utils.markdown_processor import MarkdownProcessor, MCP_PASSES, MCP_SECTION_RULES
+from utils.text_pipeline import TextPipeline, split_title
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "processors"
+DOCUMENTS = ["synthetic0", "synthetic1", "edge_cases", "no_title", "title_only"]
+
+# 1이면 끊을 수 있는 모든 줄 경계에서 블록을 끊으려고 시도
+BLOCK_SIZES = [1, 256, 64 * 1024]
+
+
+def read_fixture(name: str) -> str:
+    with open(FIXTURE_DIR / name, 'r', encoding='utf-8', newline='\n') as f:
+        return f.read()
+
+
+def stream_text(raw: str, header: str, passes, rules, block_size: int) -> str:
+    """블록 크기를 바꿔 스트리밍 처리한 결과 (파일 객체처럼 줄 단위로 입력)"""
+    pipeline = TextPipeline(passes, rules, block_size=block_size)
+    title, lines = split_title(io.StringIO(raw, newline='\n'))
+    return header.format(title=title) + "".join(pipeline.stream(lines))
+
+
+def check_document(raw: str, expected_rag: str, expected_mcp: str) -> list:
+    """전체/스트리밍 처리 결과가 기대 출력과 다른 경우 목록"""
+    failures = []
+    if TextProcessor().process_for_rag(raw) != expected_rag:
+        failures.append("rag")
+    if MarkdownProcessor().process_for_mcp(raw) != expected_mcp:
+        failures.append("mcp")
+    if "".join(TextProcessor().stream_for_rag(io.StringIO(raw, newline='\n'))) != expected_rag:
+        failures.append("rag-stream")
+    if "".join(MarkdownProcessor().stream_for_mcp(io.StringIO(raw, newline='\n'))) != expected_mcp:
+        failures.append("mcp-stream")
+    for block_size in BLOCK_SIZES:
+        if stream_text(raw, "제목: {title}\n\n", RAG_PASSES, RAG_SECTION_RULES, block_size) != expected_rag:
+            failures.append(f"rag-stream-{block_size}")
+        if stream_text(raw, "# {title}\n\n", MCP_PASSES, MCP_SECTION_RULES, block_size) != expected_mcp:
+            failures.append(f"mcp-stream-{block_size}")
+    return failures
+
+
+def test_golden_documents():
+    """골든 문서 출력 비교"""
+    print("\n📄 골든 문서 테스트")
+    print("-" * 50)
+
+    success = True
+    for name in DOCUMENTS:
+        raw = read_fixture(f"{name}.txt")
+        failures = check_document(raw, read_fixture(f"{name}.rag.txt"), read_fixture(f"{name}.mcp.md"))
+        status = "✅" if not failures else f"❌ {', '.join(failures)}"
+        print(f"   {name}: {status}")
+        success &= not failures
+    return success
+
+
+def test_fuzz_cases():
+    """경계 사례를 섞은 무작위 입력의 출력 비교"""
+    print("\n🎲 퍼즈 케이스 테스트")
+    print("-" * 50)
+
+    with open(FIXTURE_DIR / "fuzz_cases.json", 'r', encoding='utf-8') as f:
+        cases = json.load(f)
+
+    failed = []
+    for index, case in enumerate(cases):
+        failures = check_document(case["input"], case["rag"], case["mcp"])
+        if failures:
+            failed.append(f"{index}({', '.join(failures)})")
+
+    print(f"   {len(cases) - len(failed)}/{len(cases)} 케이스 일치")
+    if failed:
+        print(f"   ❌ 불일치: {' '.join(failed[:10])}")
+    return not failed
+
+
+def test_streaming_blocks():
+    """큰 입력을 여러 블록으로 나눠 처리하는지 확인"""
+    print("\n🌊 스트리밍 블록 테스트")
+    print("-" * 50)
+
+    raw = read_fixture("edge_cases.txt")
+    body = raw.split("\n", 2)[2] * 200
+    document = "제목: 반복 문서\n" + body
+    expected = TextProcessor().process_for_rag(document)
+
+    pipeline = TextPipeline(RAG_PASSES, RAG_SECTION_RULES, block_size=1024)
+    blocks = []
+    original_transform = pipeline.transform
+
+    def counting_transform(text, checked=False):
+        result = original_transform(text, checked)
+        if result is not None:
+            blocks.append(len(text))
+        return result
+
+    pipeline.transform = counting_transform
+    title, lines = split_title(io.StringIO(document))
+    streamed = f"제목: {title}\n\n" + "".join(pipeline.stream(lines))
+
+    print(f"   입력 {len(document):,}자 → 블록 {len(blocks)}개 (최대 {max(blocks):,}자)")
+    return streamed == expected and len(blocks) > 10 and max(blocks) < len(document) / 10
+
+
+def main():
+    """메인 테스트 함수"""
+    print("🚀 전처리 파이프라인 골든 테스트 시작")
+    print("=" * 60)
+
+    success = True
+    success &= test_golden_documents()
+    success &= test_fuzz_cases()
+    success &= test_streaming_blocks()
+
+    print("\n" + "=" * 60)
+    if success:
+        print("🎉 모든 테스트가 성공적으로 완료되었습니다!")
+    else:
+        print("⚠️  일부 테스트에서 문제가 발견되었습니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+양자화 벡터 색인 테스트 스크립트
+int8/binary 색인이 float32 정확 검색 대비 메모리를 줄이면서 재점수로 recall을 회복하는지, 디스크에서 다시 열어도
+같은 결과를 내는지, 돌려주는 거리가 Chroma 기준의 정확한 거리인지 확인합니다.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.benchmark_quantization import synthetic_vectors
+from utils.quantized_index import QuantizedIndex, exact_scores
+
+COUNT, DIM, QUERIES, K = 3000, 256, 50, 10
+
+
+def make_data():
+    """색인할 벡터, 쿼리, 청크 id"""
+    vectors = synthetic_vectors(COUNT + QUERIES, DIM, clusters=20)
+    return vectors[QUERIES:], vectors[:QUERIES], [f"chunk-{i}" for i in range(COUNT)]
+
+
+def build(directory: Path, vectors: np.ndarray, ids, mode: str, space: str = "cosine") -> QuantizedIndex:
+    batches = ((ids[i:i + 500], vectors[i:i + 500]) for i in range(0, len(vectors), 500))
+    return QuantizedIndex.build(directory, batches, len(vectors), vectors.shape[1], mode=mode, space=space)
+
+
+def recall(index: QuantizedIndex, vectors: np.ndarray, queries: np.ndarray, ids, rescore: int) -> float:
+    """정확 검색 상위 K개 중 색인이 찾은 비율"""
+    hits = 0
+    for query in queries:
+        expected = {ids[i] for i in np.argsort(-exact_scores(vectors, query, index.space))[:K]}
+        hits += len({chunk_id for chunk_id, _ in index.search(query, K, rescore=rescore)} & expected)
+    return hits / (len(queries) * K)
+
+
+def test_int8():
+    """int8 색인이 메모리를 1/4 가까이 줄이고 재점수 후 정확 검색과 거의 같은 결과를 내는지 테스트"""
+    print("\n🔢 int8 색인 테스트")
+    print("-" * 50)
+
+    vectors, queries, ids = make_data()
+    with tempfile.TemporaryDirectory() as tmp:
+        index = build(Path(tmp) / "int8", vectors, ids, "int8")
+        memory = index.memory()
+        value = recall(index, vectors, queries, ids, rescore=4)
+        reopened = QuantizedIndex(Path(tmp) / "int8")
+        same = all(index.search(query, K) == reopened.search(query, K) for query in queries[:10])
+        same_ids = list(reopened.ids) == ids
+        del index, reopened
+
+    # 메모리에는 양자화 벡터(행당 DIM바이트)와 청크 id 오프셋(행당 8바이트)이 머묾
+    expected = DIM * 4 / (DIM + 8)
+    ok = abs(memory['ratio'] - expected) < 0.01 and value >= 0.95 and same and same_ids
+    print(f"   메모리 1/{memory['ratio']:.2f} (예상 1/{expected:.2f}), recall@{K} {value:.3f}, "
+          f"다시 열어도 같은 결과: {same}, 청크 id: {same_ids}")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_binary():
+    """binary 색인이 메모리를 1/32로 줄이고 재점수 후보를 늘릴수록 recall이 오르는지 테스트"""
+    print("\n⚫ binary 색인 테스트")
+    print("-" * 50)
+
+    vectors, queries, ids = make_data()
+    with tempfile.TemporaryDirectory() as tmp:
+        index = build(Path(tmp) / "binary", vectors, ids, "binary")
+        memory = index.memory()
+        values = [recall(index, vectors, queries, ids, rescore) for rescore in (1, 10, 40)]
+        del index
+
+    ok = memory['ratio'] > 25 and values[0] < values[1] < values[2] and values[2] >= 0.9
+    print(f"   메모리 1/{memory['ratio']:.1f}, recall@{K} (재점수 1/10/40배): "
+          f"{' / '.join(f'{value:.3f}' for value in values)}")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_distances():
+    """돌려주는 거리가 Chroma 기준의 정확한 거리(cosine: 1 - 유사도, l2: 거리 제곱)인지, 개수가 다르면 오류인지 테스트"""
+    print("\n📏 거리/입력 검사 테스트")
+    print("-" * 50)
+
+    vectors, queries, ids = make_data()
+    vectors = vectors * np.random.default_rng(2).uniform(0.5, 2.0, (len(vectors), 1)).astype(np.float32)
+    by_id = dict(zip(ids, vectors))
+    errors = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for space in ("cosine", "l2"):
+            index = QuantizedIndex.build(Path(tmp) / space, [(ids, vectors)], len(vectors), DIM, mode="int8",
+                                         space=space, rescore_dtype="float32")
+            worst = 0.0
+            for query in queries[:10]:
+                for chunk_id, distance in index.search(query, K):
+                    vector = by_id[chunk_id]
+                    if space == "cosine":
+                        expected = 1 - vector @ query / (np.linalg.norm(vector) * np.linalg.norm(query))
+                    else:
+                        expected = ((vector - query) ** 2).sum()
+                    worst = max(worst, abs(distance - float(expected)))
+            errors[space] = worst
+            del index
+
+        try:
+            QuantizedIndex.build(Path(tmp) / "short", [(ids[:10], vectors[:10])], 20, DIM)
+            mismatch = False
+        except ValueError:
+            mismatch = True
+        cleaned = not any(Path(tmp).glob("short*"))
+
+    ok = errors["cosine"] < 1e-4 and errors["l2"] < 1e-2 and mismatch and cleaned
+    print(f"   최대 거리 오차: cosine {errors['cosine']:.2e}, l2 {errors['l2']:.2e}")
+    print(f"   개수가 다르면 오류: {mismatch}, 색인을 만들지 않음: {cleaned}")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def main():
+    """메인 테스트 함수"""
+    print("🚀 양자화 벡터 색인 테스트 시작")
+    print("=" * 60)
+
+    success = True
+    success &= test_int8()
+    success &= test_binary()
+    success &= test_distances()
+
+    print("\n" + "=" * 60)
+    if success:
+        print("🎉 모든 테스트가 성공적으로 완료되었습니다!")
+    else:
+        print("⚠️  일부 테스트에서 문제가 발견되었습니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
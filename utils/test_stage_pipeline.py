@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+단계별 스트리밍 파이프라인 테스트 스크립트
+단계들이 겹쳐서 실행되는지, 큐 크기 제한으로 메모리에 머무는 항목 수가 일정한지, 여러 작업 스레드 단계의
+동시 실행 수, flush로 남은 배치를 보내는지, 한 단계의 예외가 파이프라인을 멈추는지 확인합니다.
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.stage_pipeline import Stage, StagePipeline
+
+DELAY = 0.01   # 가짜 작업 하나의 처리 시간 (초)
+
+
+def slow(item):
+    time.sleep(DELAY)
+    return [item]
+
+
+def test_overlap():
+    """세 단계가 겹쳐서 실행되어 전체 시간이 단계 시간의 합보다 훨씬 짧은지 테스트"""
+    print("\n⏩ 단계 겹침 테스트")
+    print("-" * 50)
+
+    items = 60
+    stats = StagePipeline(range(items), [Stage("chunk", slow), Stage("embed", slow), Stage("write", slow)]).run()
+    sequential = items * DELAY * 3
+
+    ok = (stats["elapsed"] < sequential * 0.6
+          and all(stage["items"] == items for stage in stats["stages"].values()))
+    print(f"   항목 {items}개: 순서대로 실행 {sequential:.2f}s → 파이프라인 {stats['elapsed']:.2f}s")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_bounded_queues():
+    """입력이 빨라도 읽었지만 아직 끝나지 않은 항목 수가 큐 크기로 제한되는지 테스트"""
+    print("\n📏 큐 크기 제한 테스트")
+    print("-" * 50)
+
+    queue_size = 4
+    lock = threading.Lock()
+    counts = {"read": 0, "done": 0, "max_in_flight": 0}
+
+    def source():
+        for item in range(500):
+            with lock:
+                counts["read"] += 1
+                counts["max_in_flight"] = max(counts["max_in_flight"], counts["read"] - counts["done"])
+            yield item
+
+    def split(item):
+        return [item, item]
+
+    def finish(item):
+        time.sleep(DELAY / 10)
+        if item % 2:
+            with lock:
+                counts["done"] += 1
+
+    stages = [Stage("split", split), Stage("write", finish)]
+    stats = StagePipeline(source(), stages, queue_size=queue_size).run()
+    # 큐마다 queue_size개 + 단계마다 처리 중인 1개 + 입력 스레드가 넣으려고 기다리는 1개
+    bound = queue_size * len(stages) + len(stages) + 1
+
+    ok = stats["stages"]["write"]["items"] == 1000 and counts["max_in_flight"] <= bound
+    print(f"   최대 {counts['max_in_flight']}개 문서가 처리 중 (상한 {bound}개), "
+          f"write 단계 최대 대기 {stats['stages']['write']['max_queued']}건")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_workers_and_flush():
+    """여러 작업 스레드 단계의 동시 실행 수와 처리량, flush로 보낸 마지막 배치를 테스트"""
+    print("\n🧵 작업 스레드/flush 테스트")
+    print("-" * 50)
+
+    lock = threading.Lock()
+    active = {"now": 0, "max": 0}
+    batch = []
+    received = []
+
+    def batcher(item):
+        batch.append(item)
+        if len(batch) == 3:
+            yield list(batch)
+            batch.clear()
+
+    def flush():
+        if batch:
+            yield list(batch)
+
+    def embed(items):
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        time.sleep(DELAY * 5)
+        with lock:
+            active["now"] -= 1
+        return [items]
+
+    stats = StagePipeline(range(100), [
+        Stage("chunk", batcher, flush=flush),
+        Stage("embed", embed, workers=4, count=len, unit="청크"),
+        Stage("write", received.extend),
+    ]).run()
+    serial = 34 * DELAY * 5
+
+    ok = (sorted(received) == list(range(100)) and active["max"] == 4
+          and stats["stages"]["embed"]["units"] == 100 and stats["elapsed"] < serial / 2)
+    print(f"   배치 {stats['stages']['embed']['items']}개 (청크 {stats['stages']['embed']['units']}개), "
+          f"최대 동시 실행 {active['max']}개, {stats['elapsed']:.2f}s (스레드 하나면 {serial:.2f}s)")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_error_stops_pipeline():
+    """한 단계에서 예외가 나면 나머지 단계가 멈추고 run()에서 예외가 발생하는지 테스트"""
+    print("\n🛑 예외 처리 테스트")
+    print("-" * 50)
+
+    def failing(item):
+        if item == 20:
+            raise RuntimeError("임베딩 API 오류")
+        return [item]
+
+    started = time.perf_counter()
+    try:
+        StagePipeline(range(10 ** 6), [Stage("embed", failing, workers=2), Stage("write", slow)],
+                      queue_size=2).run()
+        raised = None
+    except RuntimeError as e:
+        raised = str(e)
+    elapsed = time.perf_counter() - started
+
+    ok = raised == "임베딩 API 오류" and elapsed < 5
+    print(f"   예외: {raised}, {elapsed:.2f}s 만에 종료")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def main():
+    """메인 테스트 함수"""
+    print("🚀 단계별 스트리밍 파이프라인 테스트 시작")
+    print("=" * 60)
+
+    success = True
+    success &= test_overlap()
+    success &= test_bounded_queues()
+    success &= test_workers_and_flush()
+    success &= test_error_stops_pipeline()
+
+    print("\n" + "=" * 60)
+    if success:
+        print("🎉 모든 테스트가 성공적으로 완료되었습니다!")
+    else:
+        print("⚠️  일부 테스트에서 문제가 발견되었습니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+GPT 요약기 테스트 스크립트
+응답 지연이 있는 가짜 OpenAI 클라이언트로 캐시, 중복 제거, 묶음 요청(JSON), 동시 요청 수 제한과
+잘못된 묶음 응답의 문서별 재요청을 확인합니다 (실제 API는 호출하지 않음).
+"""
+
+import re
+import sys
+import json
+import time
+import tempfile
+import threading
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from types import SimpleNamespace
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.summarizer import FALLBACK_SUMMARY, Summarizer, SummaryCache
+
+LATENCY = 0.05   # 가짜 요청 하나의 응답 시간 (초)
+
+
+class FakeChatClient:
+    """client.chat.completions.create만 흉내 내는 가짜 클라이언트 (요청 수와 최대 동시 요청 수 기록)"""
+
+    def __init__(self, broken_batches: bool = False, fail: bool = False):
+        self.broken_batches = broken_batches
+        self.fail = fail
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    @staticmethod
+    def summary_of(text: str) -> str:
+        return f"요약 {text.split()[0]}"
+
+    def create(self, model, messages, max_tokens, temperature, response_format=None):
+        with self.lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(LATENCY)
+            if self.fail:
+                raise RuntimeError("API 오류")
+
+            prompt = messages[-1]["content"]
+            if response_format:
+                if self.broken_batches:
+                    content = "JSON이 아닌 응답"
+                else:
+                    documents = re.findall(r'\[문서 (d\d+)\]\n(.*?)(?=\n\n\[문서 |\n$)', prompt, re.DOTALL)
+                    content = json.dumps({"summaries": [{"id": doc_id, "summary": self.summary_of(text)}
+                                                        for doc_id, text in documents]}, ensure_ascii=False)
+            else:
+                content = self.summary_of(prompt.split("문서 내용:\n", 1)[1])
+            usage = SimpleNamespace(prompt_tokens=len(prompt), completion_tokens=len(content))
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+                                   usage=usage)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def build_corpus(count: int = 40):
+    """짧은 문서 count개 + 중복 문서 + 긴 문서 2개 ({키워드: 본문})"""
+    texts = {f"문서{i}": f"문서{i}번 " + "기계 학습 본문 문장. " * (5 + i % 7) for i in range(count)}
+    texts["중복"] = texts["문서0"]
+    texts["긴문서0"] = "긴문서0 " + "딥 러닝 설명 " * 1000
+    texts["긴문서1"] = "긴문서1 " + "강화 학습 설명 " * 1000
+    return texts
+
+
+def expected_summaries(texts):
+    return {name: FakeChatClient.summary_of(text) for name, text in texts.items()}
+
+
+def test_batching_and_cache():
+    """묶음 요청으로 요청 수가 줄고, 두 번째 실행은 캐시만 사용하는지 테스트"""
+    print("\n📦 묶음 요청 + 캐시 테스트")
+    print("-" * 50)
+
+    texts = build_corpus()
+    with tempfile.TemporaryDirectory() as tmp:
+        client = FakeChatClient()
+        summarizer = Summarizer(client, cache=SummaryCache(tmp), max_workers=4)
+        started = time.perf_counter()
+        first = summarizer.summarize_many(texts)
+        elapsed = time.perf_counter() - started
+        first_calls = client.calls
+
+        # 새 요약기 (새 프로세스에서 다시 실행한 것과 같음)
+        rerun_client = FakeChatClient()
+        second = Summarizer(rerun_client, cache=SummaryCache(tmp)).summarize_many(texts)
+
+    # 기존 방식: 문서마다 순차적으로 요청 1회
+    baseline_calls = len(texts)
+    ok = (first == expected_summaries(texts) and second == first
+          and first_calls < baseline_calls / 4 and rerun_client.calls == 0
+          and summarizer.stats["duplicates"] == 1 and client.max_active <= 4)
+    print(f"   문서 {len(texts)}개: 요청 {first_calls}회 (기존 {baseline_calls}회), "
+          f"{elapsed:.2f}s (기존 약 {baseline_calls * LATENCY:.2f}s), 최대 동시 요청 {client.max_active}개")
+    print(f"   재실행 요청: {rerun_client.calls}회, 통계: {summarizer.stats}")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_concurrency_limit():
+    """묶지 않을 때도 동시 요청 수가 max_workers를 넘지 않는지 테스트"""
+    print("\n🔀 동시 요청 수 제한 테스트")
+    print("-" * 50)
+
+    texts = build_corpus(12)
+    client = FakeChatClient()
+    summaries = Summarizer(client, max_workers=3, batch_size=1).summarize_many(texts)
+
+    ok = summaries == expected_summaries(texts) and client.calls == len(texts) - 1 and client.max_active == 3
+    print(f"   요청 {client.calls}회, 최대 동시 요청 {client.max_active}개 (제한 3)")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_broken_batch_fallback():
+    """묶음 응답이 JSON이 아니면 문서별로 다시 요청하는지, 실패한 요약은 캐시하지 않는지 테스트"""
+    print("\n🩹 잘못된 응답/오류 처리 테스트")
+    print("-" * 50)
+
+    texts = {f"문서{i}": f"문서{i} 짧은 본문" for i in range(5)}
+    with tempfile.TemporaryDirectory() as tmp, redirect_stdout(StringIO()):
+        client = FakeChatClient(broken_batches=True)
+        summaries = Summarizer(client, cache=SummaryCache(tmp)).summarize_many(texts)
+
+        failing = Summarizer(FakeChatClient(fail=True), cache=SummaryCache(tmp))
+        failed = failing.summarize("실패할 문서 본문")
+        cached_files = len(list(Path(tmp).glob("*.json")))
+
+    ok = (summaries == expected_summaries(texts) and client.calls == 1 + len(texts)
+          and failed == FALLBACK_SUMMARY and cached_files == len(texts))
+    print(f"   문서별 재요청: {client.calls - 1}회, 실패 시 요약: {failed!r}, 캐시 파일 {cached_files}개")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def main():
+    """메인 테스트 함수"""
+    print("🚀 GPT 요약기 테스트 시작")
+    print("=" * 60)
+
+    success = True
+    success &= test_batching_and_cache()
+    success &= test_concurrency_limit()
+    success &= test_broken_batch_fallback()
+
+    print("\n" + "=" * 60)
+    if success:
+        print("🎉 모든 테스트가 성공적으로 완료되었습니다!")
+    else:
+        print("⚠️  일부 테스트에서 문제가 발견되었습니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
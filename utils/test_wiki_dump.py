@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+위키백과 덤프 수집 테스트 스크립트
+작은 덤프 fixture(utils/fixtures/wiki_dump)를 bz2로 압축하여 문서 읽기, 제목/분류 선택,
+위키텍스트 변환, 파이프라인 수집 결과와 덤프 크기에 따른 메모리 사용량을 확인합니다.
+"""
+
+import sys
+import bz2
+import tempfile
+import tracemalloc
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.ingest import IngestPipeline
+from utils.markdown_processor import MarkdownProcessor
+from utils.text_processor import TextProcessor
+from utils.wiki_dump import corpus_titles, ingest_dump, iter_dump_pages, select_pages
+from utils.wikitext import wikitext_to_markdown
+
+FIXTURE_DUMP = Path(__file__).parent / "fixtures" / "wiki_dump" / "kowiki-test-pages-articles.xml"
+
+
+def compressed_fixture(tmp_path: Path) -> str:
+    """fixture 덤프를 실제 덤프처럼 bz2로 압축한 경로"""
+    dump_path = tmp_path / "kowiki-test-pages-articles.xml.bz2"
+    dump_path.write_bytes(bz2.compress(FIXTURE_DUMP.read_bytes()))
+    return str(dump_path)
+
+
+def build_large_dump(path: Path, pages: int) -> None:
+    """같은 크기의 문서가 pages개인 덤프 생성"""
+    body = "'''문서'''는 [[기계 학습]] 예시 문장이다. " * 50
+    with bz2.open(path, "wt", encoding="utf-8") as f:
+        f.write('<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.11/">\n')
+        for i in range(pages):
+            f.write(f"<page><title>문서 {i}</title><ns>0</ns><id>{i}</id><revision><id>{i}</id>"
+                    f"<text>{body}\n\n[[분류:테스트]]</text></revision></page>\n")
+        f.write("</mediawiki>\n")
+
+
+def test_iter_pages():
+    """bz2 덤프에서 문서를 순서대로 읽는지 테스트"""
+    print("\n📖 덤프 문서 읽기 테스트")
+    print("-" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pages = list(iter_dump_pages(compressed_fixture(Path(tmp))))
+
+    titles = [page["title"] for page in pages]
+    redirects = [page["title"] for page in pages if page["redirect"]]
+    ok = (titles == ["인공지능", "기계 학습", "머신 러닝", "틀:정보상자 학문", "딥 러닝", "수학"]
+          and redirects == ["머신 러닝"]
+          and pages[0]["id"] == "1001" and pages[3]["ns"] == "10"
+          and pages[1]["text"].startswith("'''기계 학습'''"))
+    print(f"   문서 {len(pages)}개, 넘겨주기: {redirects}")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_select_pages():
+    """제목/분류 조건으로 문서를 고르는지 테스트 (넘겨주기와 틀 문서 제외)"""
+    print("\n🔎 문서 선택 테스트")
+    print("-" * 50)
+
+    cases = [
+        ({}, ["인공지능", "기계 학습", "딥 러닝", "수학"]),
+        ({"titles": ["기계_학습", "머신 러닝", "인공지능"]}, ["인공지능", "기계 학습"]),
+        ({"categories": ["기계 학습"]}, ["기계 학습", "딥 러닝"]),
+        ({"titles": ["수학"], "categories": ["인공지능"]}, ["인공지능", "기계 학습", "수학"]),
+    ]
+
+    success = True
+    for kwargs, expected in cases:
+        selected = [page["title"] for page in select_pages(iter_dump_pages(str(FIXTURE_DUMP)), **kwargs)]
+        ok = selected == expected
+        success &= ok
+        print(f"   {kwargs or '조건 없음'}: {selected} {'✅' if ok else '❌'}")
+    return success
+
+
+def test_wikitext_conversion():
+    """위키텍스트가 HTML 파서와 같은 Markdown+LaTeX 형식으로 변환되는지 테스트"""
+    print("\n📝 위키텍스트 변환 테스트")
+    print("-" * 50)
+
+    pages = {page["title"]: page["text"] for page in iter_dump_pages(str(FIXTURE_DUMP))}
+    ai = wikitext_to_markdown(pages["인공지능"], "인공지능")
+    ml = wikitext_to_markdown(pages["기계 학습"], "기계 학습")
+
+    expected_parts = [
+        (ai, "# 인공지능\n\n**인공지능**(人工知能, artificial intelligence, AI)은"),
+        (ai, "프로그램으로 실현한 기술이다. 기계 학습과 딥 러닝을 포함한다."),
+        (ai, "### 개요\n\n인공지능은 *약한 인공지능*과 **강한 인공지능**으로"),
+        (ai, "자세한 내용은 외부 문서를 참고한다."),
+        (ai, "#### 목표\n\n- 추론과 문제 해결\n- 지식 표현\n\n1. 첫째 단계\n2. 둘째 단계"),
+        (ai, "### 역사\n\n1956년 다트머스 회의에서"),
+        (ml, "손실 함수 $L(\\theta)$를 최소화"),
+        (ml, "$$\n\\theta^* = \\arg\\min_\\theta L(\\theta)\n$$"),
+    ]
+    unexpected_parts = ["같이 보기", "각주", "정보상자", "섬네일", "분류", "wikitable", "Artificial intelligence",
+                        "{{", "}}", "[[", "]]", "<ref", "주석", "''"]
+
+    missing = [part for text, part in expected_parts if part not in text]
+    leaked = [part for part in unexpected_parts if part in ai or part in ml]
+    print(f"   누락: {missing or '없음'}, 남은 위키 문법: {leaked or '없음'}")
+    return not missing and not leaked
+
+
+def test_ingest_dump():
+    """덤프 → raw/mcp_docs/rag_docs 수집 테스트 (WIKI_DOCUMENTS 키워드 파일 이름 사용)"""
+    print("\n⚙️  덤프 수집 테스트")
+    print("-" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        dump_path = compressed_fixture(tmp_path)
+        dirs = [tmp_path / name for name in ("raw", "mcp_docs", "rag_docs")]
+        with redirect_stdout(StringIO()):
+            with IngestPipeline(*dirs, processes=2) as pipeline:
+                summary = ingest_dump(dump_path, pipeline, titles=corpus_titles())
+
+        written = sorted(path.stem for path in dirs[0].iterdir())
+        consistent = True
+        for keyword in written:
+            raw = (dirs[0] / f"{keyword}.txt").read_text(encoding="utf-8")
+            consistent &= (dirs[1] / f"{keyword}.md").read_text(encoding="utf-8") == \
+                MarkdownProcessor().process_for_mcp(raw)
+            consistent &= (dirs[2] / f"{keyword}.txt").read_text(encoding="utf-8") == \
+                TextProcessor().process_for_rag(raw)
+        raw_ai = (dirs[0] / "인공지능.txt").read_text(encoding="utf-8")
+
+    ok = (written == sorted(["인공지능", "머신러닝", "딥러닝"]) and consistent
+          and summary["written"] == 3 and not summary["failed"]
+          and raw_ai.startswith("제목: 인공지능\n\n# 인공지능\n\n"))
+    print(f"   저장: {written}, 읽은 문서 {summary['scanned']}개, MCP/RAG 일치: {consistent}")
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def test_constant_memory():
+    """덤프 크기가 커져도 읽기 메모리 사용량이 늘지 않는지 테스트"""
+    print("\n💾 메모리 사용량 테스트")
+    print("-" * 50)
+
+    peaks = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in (500, 5000):
+            dump_path = Path(tmp) / f"dump{pages}.xml.bz2"
+            build_large_dump(dump_path, pages)
+
+            tracemalloc.start()
+            count = sum(1 for _ in select_pages(iter_dump_pages(str(dump_path)), categories=["테스트"]))
+            peaks[pages] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"   문서 {count}개: 최대 {peaks[pages] / 1024:.0f} KiB")
+
+    # 문서 수가 10배여도 최대 메모리는 거의 같아야 함
+    ok = peaks[5000] < peaks[500] * 1.5
+    print(f"   결과: {'✅' if ok else '❌'}")
+    return ok
+
+
+def main():
+    """메인 테스트 함수"""
+    print("🚀 위키백과 덤프 수집 테스트 시작")
+    print("=" * 60)
+
+    success = True
+    success &= test_iter_pages()
+    success &= test_select_pages()
+    success &= test_wikitext_conversion()
+    success &= test_ingest_dump()
+    success &= test_constant_memory()
+
+    print("\n" + "=" * 60)
+    if success:
+        print("🎉 모든 테스트가 성공적으로 완료되었습니다!")
+    else:
+        print("⚠️  일부 테스트에서 문제가 발견되었습니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
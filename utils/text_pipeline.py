@@ -0,0 +1,316 @@
+"""
+텍스트 전처리 파이프라인 모듈 (TextProcessor / MarkdownProcessor 공용)
+- 정규식 패스를 모듈 로드 시 한 번 컴파일하고, 매칭에 필요한 문자가 없으면 패스 자체를 건너뜀
+- 섹션 건너뛰기 규칙 여러 개를 한 번의 줄 순회 상태 기계로 처리
+- 줄 단위 반복자(파일 객체 등)를 블록 단위로 스트리밍 처리
+  (블록 경계를 넘는 매칭이 없을 때만 블록을 끊으므로 전체 문자열 처리와 출력이 바이트 단위로 같음)
+"""
+
+import re
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# 스트리밍 시 블록을 끊기 시작하는 크기 (문자 수)
+DEFAULT_BLOCK_SIZE = 64 * 1024
+
+# 블록 경계 바로 뒤 줄의 첫 글자: 어떤 패스의 매칭도 시작할 수 없고 공백도 아닌 글자(문자)여야
+# '^#{1,6}\s+' 같은 패턴의 \s가 경계를 넘어 다음 블록을 먹지 않음
+SAFE_LINE_START = re.compile(r'[^\W\d_]')
+
+TITLE_PREFIX = '제목:'
+
+_EXCESS_NEWLINES = re.compile(r'\n{3,}')
+# ' +' → ' ' 와 같은 결과 (공백 하나짜리는 바꿔도 그대로이므로 두 개 이상만 치환)
+_SPACES = re.compile(r' {2,}')
+
+CrossCheck = Callable[[str, str], bool]
+
+
+def unclosed(open_char: str, close_char: str) -> CrossCheck:
+    """마지막 여는 문자 뒤에 닫는 문자가 없으면 매칭이 블록 끝을 넘을 수 있음"""
+    return lambda before, after: before.rfind(open_char) > before.rfind(close_char)
+
+
+def leftover(token: str) -> CrossCheck:
+    """패스를 적용한 뒤에도 여는 토큰이 남아 있으면 짝이 다음 블록에 있을 수 있음"""
+    return lambda before, after: token in after
+
+
+class RegexPass:
+    """미리 컴파일한 re.sub 패스 하나"""
+
+    def __init__(self, pattern: str, replacement: str, flags: int = 0,
+                 guards: Sequence[str] = (), crosses: Optional[CrossCheck] = None):
+        """
+        Args:
+            pattern: 정규식
+            replacement: 치환 문자열
+            flags: 정규식 플래그
+            guards: 매칭에 반드시 들어가는 부분 문자열 후보 (하나도 없으면 패스를 건너뜀,
+                    '\n' + 글자 형태의 가드는 문서 첫 글자가 그 글자인 경우도 포함)
+            crosses: 매칭이 블록 끝을 넘을 수 있는지 판정하는 함수 crosses(적용 전, 적용 후).
+                     None이면 한 줄 안에서만 매칭되는 패스
+        """
+        self.regex = re.compile(pattern, flags)
+        self.replacement = replacement
+        self.guards = tuple(guards)
+        self.line_start = ''.join(guard[1] for guard in self.guards
+                                  if len(guard) == 2 and guard[0] == '\n')
+        self.crosses = crosses
+
+    def apply(self, text: str) -> str:
+        if self.guards and not any(guard in text for guard in self.guards):
+            # 줄 시작 가드('\n' + 글자)는 문서 첫 글자도 확인
+            if not (self.line_start and text[:1] in self.line_start):
+                return text
+        return self.regex.sub(self.replacement, text)
+
+
+class SymbolPass:
+    """
+    한 글자 → 문자열 치환 패스 (str.translate와 같은 결과)
+
+    str.translate는 비ASCII 글자마다 딕셔너리를 조회하므로, 한 글자 클래스 정규식으로 실제 기호만 찾아 바꿈.
+    키가 모두 한 글자이고 치환 결과를 다시 검사하지 않으므로 블록 경계와 무관
+    """
+
+    crosses = None
+
+    def __init__(self, mapping: Dict[str, str]):
+        self.mapping = mapping
+        self.regex = re.compile('[' + ''.join(re.escape(char) for char in mapping) + ']')
+
+    def apply(self, text: str) -> str:
+        return self.regex.sub(lambda match: self.mapping[match.group()], text)
+
+
+def line_start_guards(chars: str) -> Tuple[str, ...]:
+    """줄 첫 글자에서만 매칭되는 패턴의 가드 (문서 첫 줄은 RegexPass가 따로 확인)"""
+    return tuple('\n' + char for char in chars)
+
+
+# 두 프로세서가 같은 순서로 쓰는 공용 패스
+HTML_TAG_PASS = RegexPass(r'<[^>]+>', '', guards=('<',), crosses=unclosed('<', '>'))
+LINK_PASS = RegexPass(r'\[([^\]]+)\]\([^)]+\)', r'\1', guards=('](',),
+                      crosses=lambda before, after: (unclosed('[', ']')(before, after)
+                                                     or unclosed('(', ')')(before, after)))
+CODE_BLOCK_PASS = RegexPass(r'```.*?```', '', re.DOTALL, guards=('```',), crosses=leftover('```'))
+INLINE_CODE_PASS = RegexPass(r'`([^`]+)`', r'\1', guards=('`',), crosses=leftover('`'))
+CITATION_PASSES = [
+    RegexPass(r'\[\d+\]', '', guards=('[',)),
+    RegexPass(r'\[\d+,\s*\d+\]', '', guards=('[',), crosses=unclosed('[', ']')),
+    RegexPass(r'\[\d+-\d+\]', '', guards=('[',)),
+]
+
+
+def _keyword_regex(keywords: Sequence[str], escape: bool = True) -> Optional['re.Pattern']:
+    """키워드(escape=False면 정규식) 중 하나라도 포함하는지 검사하는 정규식 (키워드가 없으면 None)"""
+    if not keywords:
+        return None
+    return re.compile('|'.join(re.escape(keyword) if escape else keyword for keyword in keywords))
+
+
+class SectionSkipRule:
+    """제외 키워드가 든 줄은 버리고, 그 뒤로 재시작 조건을 만족하는 줄 전까지 버리는 규칙"""
+
+    def __init__(self, skip_keywords: Sequence[str], resume_prefix: str,
+                 strip_before_prefix: bool = True, resume_keywords: Sequence[str] = ()):
+        """
+        Args:
+            skip_keywords: 제외 섹션 시작 키워드 (소문자로 바꾼 줄에서 부분 문자열로 검사)
+            resume_prefix: 이 접두사로 시작하는 줄에서 건너뛰기 종료
+            strip_before_prefix: 접두사 검사 전에 줄 앞뒤 공백을 제거할지 여부
+            resume_keywords: 이 키워드가 든 줄에서도 건너뛰기 종료
+        """
+        self.skip_regex = _keyword_regex(skip_keywords)
+        self.resume_prefix = resume_prefix
+        self.strip_before_prefix = strip_before_prefix
+        self.resume_regex = _keyword_regex(resume_keywords)
+
+    def resumes(self, line: str, line_lower: str) -> bool:
+        target = line.strip() if self.strip_before_prefix else line
+        if target.startswith(self.resume_prefix):
+            return True
+        return bool(self.resume_regex and self.resume_regex.search(line_lower))
+
+
+class SectionFilter:
+    """
+    섹션 건너뛰기 상태 기계 (규칙마다 건너뛰기 상태를 따로 둠)
+
+    규칙을 차례로 적용한 결과는 규칙별로 줄 목록을 나눠 다시 합치며 여러 번 거르는 것과 같음:
+    앞 규칙이 버린 줄은 뒤 규칙의 상태를 바꾸지 않음
+    """
+
+    def __init__(self, rules: Sequence[SectionSkipRule]):
+        self.rules = rules
+        self.skipping = [False] * len(rules)
+        # 모든 규칙의 제외 키워드를 합친 정규식 (건너뛰는 중이 아니면 이것 하나만 검사)
+        self.any_skip_regex = _keyword_regex([regex.pattern for regex in
+                                              (rule.skip_regex for rule in rules) if regex], escape=False)
+
+    def accept(self, line: str) -> bool:
+        """줄을 남길지 여부 (상태 갱신 포함)"""
+        line_lower = line.lower().strip()
+        if not any(self.skipping) and not (self.any_skip_regex and self.any_skip_regex.search(line_lower)):
+            return True
+        for index, rule in enumerate(self.rules):
+            if rule.skip_regex and rule.skip_regex.search(line_lower):
+                self.skipping[index] = True
+                return False
+            if self.skipping[index] and rule.resumes(line, line_lower):
+                self.skipping[index] = False
+            if self.skipping[index]:
+                return False
+        return True
+
+
+class _StreamCleaner:
+    """
+    줄을 하나씩 받아 '\\n{3,}' → '\\n\\n', ' +' → ' ', strip()을 점진적으로 적용
+
+    문서 끝에 올 수도 있는 공백은 다음 내용이 나올 때까지 보류
+    """
+
+    def __init__(self):
+        self.first = True
+        self.newlines = 0
+        self.started = False
+        self.pending = ""
+
+    def feed(self, line: str) -> str:
+        if not self.first:
+            self.newlines += 1
+        self.first = False
+        if not line:
+            return ""
+
+        separator = "\n\n" if self.newlines >= 3 else "\n" * self.newlines
+        self.newlines = 0
+        piece = separator + _SPACES.sub(' ', line)
+
+        if not self.started:
+            piece = piece.lstrip()
+            if not piece:
+                return ""
+            self.started = True
+
+        body = piece.rstrip()
+        if not body:
+            self.pending += piece
+            return ""
+        output = self.pending + body
+        self.pending = piece[len(body):]
+        return output
+
+
+def split_title(lines: Iterable[str]) -> Tuple[str, Iterator[str]]:
+    """
+    '제목:' 줄을 찾아 제목과 나머지 줄 반복자로 분리
+
+    Args:
+        lines: 줄 반복자 (줄바꿈 문자는 있어도 없어도 됨)
+
+    Returns:
+        (제목, 제목 줄 다음부터의 줄 반복자). 제목 줄이 없으면 ("", 모든 줄)
+    """
+    iterator = iter(lines)
+    head: List[str] = []
+    for line in iterator:
+        if line.startswith(TITLE_PREFIX):
+            return line.replace(TITLE_PREFIX, '').strip(), iterator
+        head.append(line)
+    return "", iter(head)
+
+
+class TextPipeline:
+    """정규식 패스 → 섹션 건너뛰기 → 공백 정리로 이어지는 전처리 파이프라인"""
+
+    def __init__(self, passes: Sequence, rules: Sequence[SectionSkipRule],
+                 block_size: int = DEFAULT_BLOCK_SIZE):
+        """
+        Args:
+            passes: 순서대로 적용할 패스 (RegexPass / SymbolPass)
+            rules: 섹션 건너뛰기 규칙 (순서대로 적용)
+            block_size: 스트리밍 시 블록을 끊기 시작하는 크기 (문자 수)
+        """
+        self.passes = list(passes)
+        self.rules = list(rules)
+        self.block_size = block_size
+
+    def transform(self, text: str, checked: bool = False) -> Optional[str]:
+        """
+        정규식 패스를 순서대로 적용
+
+        Args:
+            text: 입력 텍스트
+            checked: True면 매칭이 텍스트 끝을 넘을 수 있는 경우 None 반환 (스트리밍 블록용)
+
+        Returns:
+            변환된 텍스트 (checked이고 블록을 여기서 끊을 수 없으면 None)
+        """
+        for regex_pass in self.passes:
+            result = regex_pass.apply(text)
+            if checked and regex_pass.crosses and regex_pass.crosses(text, result):
+                return None
+            text = result
+        return text
+
+    def process(self, text: str) -> str:
+        """
+        문자열 전체를 전처리
+
+        Args:
+            text: 본문
+
+        Returns:
+            전처리된 텍스트
+        """
+        text = self.transform(text)
+        section_filter = SectionFilter(self.rules)
+        text = '\n'.join(line for line in text.split('\n') if section_filter.accept(line))
+        text = _EXCESS_NEWLINES.sub('\n\n', text)
+        text = _SPACES.sub(' ', text)
+        return text.strip()
+
+    def stream(self, lines: Iterable[str]) -> Iterator[str]:
+        """
+        줄 반복자를 블록 단위로 전처리하여 출력 조각을 차례로 생성
+
+        block_size를 넘은 뒤 경계를 넘는 매칭이 없는 줄 경계에서만 블록을 끊고, 끊을 수 없으면
+        다음 시도 크기를 두 배로 늘려 재처리 비용을 선형으로 유지
+
+        Args:
+            lines: 줄바꿈 문자를 포함한 줄 반복자 (텍스트 모드 파일 객체 등)
+
+        Yields:
+            출력 조각 (모두 이으면 process() 결과와 같음)
+        """
+        section_filter = SectionFilter(self.rules)
+        cleaner = _StreamCleaner()
+        carry = ""
+
+        def _emit(text: str, final: bool) -> Iterator[str]:
+            nonlocal carry
+            parts = (carry + text).split('\n')
+            carry = "" if final else parts.pop()
+            for line in parts:
+                if section_filter.accept(line):
+                    piece = cleaner.feed(line)
+                    if piece:
+                        yield piece
+
+        block: List[str] = []
+        size = 0
+        threshold = self.block_size
+        for line in lines:
+            if size >= threshold and block[-1].endswith('\n') and SAFE_LINE_START.match(line):
+                transformed = self.transform("".join(block), checked=True)
+                if transformed is None:
+                    threshold = size * 2
+                else:
+                    yield from _emit(transformed, final=False)
+                    block, size, threshold = [], 0, self.block_size
+            block.append(line)
+            size += len(line)
+
+        yield from _emit(self.transform("".join(block)), final=True)
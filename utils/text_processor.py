@@ -4,7 +4,66 @@ RAG용 텍스트 전처리 모듈
 """
 
 import re
-from typing import List
+from typing import Any, Dict, Iterable, Iterator, List
+
+from utils.chunker import chunk_text, estimate_tokens
+from utils.config import CHUNK_SIZE, CHUNK_OVERLAP, CHUNK_SIZE_UNIT
+from utils.symbols import PLAIN_TEXT_SYMBOLS
+from utils.text_pipeline import (
+    TextPipeline, RegexPass, SymbolPass, SectionSkipRule, split_title, unclosed, leftover, line_start_guards,
+    HTML_TAG_PASS, LINK_PASS, CODE_BLOCK_PASS, INLINE_CODE_PASS, CITATION_PASSES
+)
+
+# 기존 re.sub 호출과 같은 순서의 패스 (순서가 바뀌면 출력이 달라지므로 합치지 않음)
+RAG_PASSES = [
+    # HTML 태그 제거
+    HTML_TAG_PASS,
+    # 헤더 제거
+    RegexPass(r'^#{1,6}\s+', '', re.MULTILINE, guards=line_start_guards('#')),
+    # 강조 제거
+    RegexPass(r'\*\*(.*?)\*\*', r'\1', guards=('**',)),  # 굵게
+    RegexPass(r'\*(.*?)\*', r'\1', guards=('*',)),         # 기울임
+    RegexPass(r'__(.*?)__', r'\1', guards=('__',)),         # 굵게
+    RegexPass(r'_(.*?)_', r'\1', guards=('_',)),            # 기울임
+    # 링크 제거
+    LINK_PASS,
+    RegexPass(r'\[([^\]]+)\]', r'\1', guards=('[',), crosses=unclosed('[', ']')),
+    # 코드 블록 제거
+    CODE_BLOCK_PASS,
+    INLINE_CODE_PASS,
+    # 인용, 수평선, 리스트 마커 제거
+    RegexPass(r'^>\s*', '', re.MULTILINE, guards=line_start_guards('>')),
+    RegexPass(r'^[-*_]{3,}$', '', re.MULTILINE, guards=line_start_guards('-*_')),
+    RegexPass(r'^[-*+]\s+', '', re.MULTILINE, guards=line_start_guards('-*+')),
+    RegexPass(r'^\d+\.\s+', '', re.MULTILINE, guards=line_start_guards('0123456789')),
+    # LaTeX 수식 제거
+    RegexPass(r'\$\$.*?\$\$', '', re.DOTALL, guards=('$$',), crosses=leftover('$$')),
+    RegexPass(r'\$.*?\$', '', guards=('$',)),
+    # 수학 기호들을 일반 텍스트로 변환 (공유 기호 표, 한 번의 패스)
+    SymbolPass(PLAIN_TEXT_SYMBOLS),
+    # 각주 번호 패턴 제거
+    *CITATION_PASSES,
+]
+
+RAG_SECTION_RULES = [
+    # 참조 섹션 제거 (## 줄이나 본문 섹션 키워드에서 재시작)
+    SectionSkipRule(
+        ['참고 문헌', '참고문헌', '각주', '외부 링크', '외부링크',
+         '같이 보기', '같이보기', '바깥 링크', '바깥링크',
+         '더 보기', '더보기', '참고 자료', '참고자료'],
+        resume_prefix='##',
+        resume_keywords=['개요', '정의', '역사', '특징', '원리', '방법']
+    ),
+    # 불필요한 섹션 제거 (더 보수적으로, '역사'는 중요한 정보이므로 제외하지 않음)
+    SectionSkipRule(
+        ['편집', 'edit', '토론', 'talk',
+         '모니터링', 'monitoring', '보호', 'protection',
+         '분류', 'category', '카테고리'],
+        resume_prefix='##'
+    ),
+]
+
+RAG_PIPELINE = TextPipeline(RAG_PASSES, RAG_SECTION_RULES)
 
 
 class TextProcessor:
@@ -25,31 +84,29 @@ class TextProcessor:
             RAG용 전처리된 텍스트
         """
         # 제목과 본문 분리
-        lines = raw_content.split('\n')
-        title = ""
-        content_lines = []
+        title, content_lines = split_title(raw_content.split('\n'))
         
-        # 제목 추출
-        for i, line in enumerate(lines):
-            if line.startswith('제목:'):
-                title = line.replace('제목:', '').strip()
-                content_lines = lines[i+1:]
-                break
-            else:
-                content_lines.append(line)
-        
-        # 본문 처리
-        processed_content = self._process_content('\n'.join(content_lines))
-        
-        # 최종 텍스트 구성
-        final_text = f"제목: {title}\n\n"
-        final_text += processed_content
+        # 본문 처리 및 최종 텍스트 구성
+        return f"제목: {title}\n\n" + self._process_content('\n'.join(content_lines))
+    
+    def stream_for_rag(self, lines: Iterable[str]) -> Iterator[str]:
+        """
+        원본 텍스트를 줄 단위로 읽으며 RAG용으로 전처리 (대용량 파일용)
         
-        return final_text
+        Args:
+            lines: 줄바꿈 문자를 포함한 줄 반복자 (텍스트 모드 파일 객체 등)
+            
+        Yields:
+            전처리된 텍스트 조각 (모두 이으면 process_for_rag 결과와 같음)
+        """
+        title, content_lines = split_title(lines)
+        yield f"제목: {title}\n\n"
+        yield from RAG_PIPELINE.stream(content_lines)
     
     def _process_content(self, content: str) -> str:
         """
         본문 내용을 RAG용으로 전처리
+        (HTML 태그 → 마크다운 문법 → 수식 → 각주 → 참조/불필요 섹션 → 공백 정리)
         
         Args:
             content: 원본 본문
@@ -57,216 +114,36 @@ class TextProcessor:
         Returns:
             전처리된 텍스트
         """
-        # HTML 태그 제거
-        content = self._remove_html_tags(content)
-        
-        # 마크다운 특수문자 제거
-        content = self._remove_markdown_syntax(content)
-        
-        # 수식 제거
-        content = self._remove_math_expressions(content)
-        
-        # 각주 및 참조 제거
-        content = self._remove_citations(content)
-        
-        # 불필요한 섹션 제거
-        content = self._remove_unnecessary_sections(content)
-        
-        # 텍스트 정리
-        content = self._clean_text(content)
-        
-        return content
-    
-    def _remove_html_tags(self, text: str) -> str:
-        """HTML 태그 제거"""
-        # HTML 태그 제거
-        text = re.sub(r'<[^>]+>', '', text)
-        return text
-    
-    def _remove_markdown_syntax(self, text: str) -> str:
-        """마크다운 문법 제거"""
-        # 헤더 제거
-        text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
-        
-        # 강조 제거
-        text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)  # 굵게
-        text = re.sub(r'\*(.*?)\*', r'\1', text)      # 기울임
-        text = re.sub(r'__(.*?)__', r'\1', text)      # 굵게
-        text = re.sub(r'_(.*?)_', r'\1', text)        # 기울임
-        
-        # 링크 제거
-        text = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', text)
-        text = re.sub(r'\[([^\]]+)\]', r'\1', text)
-        
-        # 코드 블록 제거
-        text = re.sub(r'```.*?```', '', text, flags=re.DOTALL)
-        text = re.sub(r'`([^`]+)`', r'\1', text)
-        
-        # 인용 제거
-        text = re.sub(r'^>\s*', '', text, flags=re.MULTILINE)
-        
-        # 수평선 제거
-        text = re.sub(r'^[-*_]{3,}$', '', text, flags=re.MULTILINE)
-        
-        # 리스트 마커 제거
-        text = re.sub(r'^[-*+]\s+', '', text, flags=re.MULTILINE)
-        text = re.sub(r'^\d+\.\s+', '', text, flags=re.MULTILINE)
-        
-        return text
-    
-    def _remove_math_expressions(self, text: str) -> str:
-        """수식 제거"""
-        # LaTeX 수식 제거
-        text = re.sub(r'\$\$.*?\$\$', '', text, flags=re.DOTALL)
-        text = re.sub(r'\$.*?\$', '', text)
-        
-        # 수학 기호들을 일반 텍스트로 변환
-        math_symbols = {
-            'α': 'alpha', 'β': 'beta', 'γ': 'gamma', 'δ': 'delta',
-            'ε': 'epsilon', 'ζ': 'zeta', 'η': 'eta', 'θ': 'theta',
-            'ι': 'iota', 'κ': 'kappa', 'λ': 'lambda', 'μ': 'mu',
-            'ν': 'nu', 'ξ': 'xi', 'π': 'pi', 'ρ': 'rho',
-            'σ': 'sigma', 'τ': 'tau', 'υ': 'upsilon', 'φ': 'phi',
-            'χ': 'chi', 'ψ': 'psi', 'ω': 'omega',
-            '∞': '무한', '∂': '편미분', '∇': '나블라',
-            '∑': '합계', '∏': '곱', '∫': '적분'
-        }
-        
-        for symbol, replacement in math_symbols.items():
-            text = text.replace(symbol, replacement)
-        
-        return text
-    
-    def _remove_citations(self, text: str) -> str:
-        """각주 및 참조 제거"""
-        # 각주 번호 패턴 제거
-        text = re.sub(r'\[\d+\]', '', text)
-        text = re.sub(r'\[\d+,\s*\d+\]', '', text)
-        text = re.sub(r'\[\d+-\d+\]', '', text)
-        
-        # 참조 섹션 제거
-        lines = text.split('\n')
-        filtered_lines = []
-        skip_mode = False
-        
-        for line in lines:
-            line_lower = line.lower().strip()
-            
-            # 제외할 섹션 시작 감지
-            if any(keyword in line_lower for keyword in [
-                '참고 문헌', '참고문헌', '각주', '외부 링크', '외부링크',
-                '같이 보기', '같이보기', '바깥 링크', '바깥링크',
-                '더 보기', '더보기', '참고 자료', '참고자료'
-            ]):
-                skip_mode = True
-                continue
-            
-            # 메인 섹션 재시작 감지
-            if skip_mode and (line.strip().startswith('##') or 
-                             any(keyword in line_lower for keyword in [
-                                 '개요', '정의', '역사', '특징', '원리', '방법'
-                             ])):
-                skip_mode = False
-            
-            if not skip_mode:
-                filtered_lines.append(line)
-        
-        return '\n'.join(filtered_lines)
-    
-    def _remove_unnecessary_sections(self, text: str) -> str:
-        """불필요한 섹션 제거 (더 보수적으로)"""
-        lines = text.split('\n')
-        filtered_lines = []
-        skip_mode = False
-        
-        for line in lines:
-            line_lower = line.lower().strip()
-            
-            # 제외할 섹션들 (더 엄격하게)
-            skip_keywords = [
-                '편집', 'edit', '토론', 'talk', 
-                '모니터링', 'monitoring', '보호', 'protection',
-                '분류', 'category', '카테고리'
-            ]
-            
-            # '역사'는 중요한 정보이므로 제외하지 않음
-            if any(keyword in line_lower for keyword in skip_keywords):
-                skip_mode = True
-                continue
-            
-            # 새로운 섹션 시작 감지
-            if line.strip().startswith('##'):
-                skip_mode = False
-            
-            if not skip_mode:
-                filtered_lines.append(line)
-        
-        return '\n'.join(filtered_lines)
+        return RAG_PIPELINE.process(content)
     
-    def _clean_text(self, text: str) -> str:
-        """텍스트 정리"""
-        # 과도한 공백 제거
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        text = re.sub(r' +', ' ', text)
-        
-        # 특수문자 정리 (더 보수적으로)
-        # text = re.sub(r'[^\w\s가-힣.,!?;:()\-]', '', text)  # 이전: 너무 공격적
-        
-        # 앞뒤 공백 제거
-        text = text.strip()
-        
-        return text
-    
-    def split_into_chunks(self, text: str, max_chunk_size: int = 2000) -> List[str]:
+    def split_into_chunks(self, text: str, max_chunk_size: int = CHUNK_SIZE,
+                          overlap: int = CHUNK_OVERLAP) -> List[str]:
         """
         텍스트를 청크로 분할 (RAG용)
         
         Args:
             text: 분할할 텍스트
             max_chunk_size: 최대 청크 크기
+            overlap: 앞 청크 끝에서 다시 포함할 최대 크기 (문장 단위)
             
         Returns:
             청크 리스트
         """
-        # 문단 단위로 분할
-        paragraphs = text.split('\n\n')
-        chunks = []
-        current_chunk = ""
+        return [chunk["text"] for chunk in self.chunk_with_offsets(text, max_chunk_size, overlap)]
+    
+    def chunk_with_offsets(self, text: str, max_chunk_size: int = CHUNK_SIZE,
+                           overlap: int = CHUNK_OVERLAP) -> List[Dict[str, Any]]:
+        """
+        텍스트를 문단/한국어 문장 경계에서 청크로 분할하고 원문 오프셋을 함께 반환
+        (크기 단위는 utils/config.py의 CHUNK_SIZE_UNIT)
         
-        for paragraph in paragraphs:
-            paragraph = paragraph.strip()
-            if not paragraph:
-                continue
-            
-            # 단일 문단이 너무 길면 더 작게 분할
-            if len(paragraph) > max_chunk_size:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                    current_chunk = ""
-                
-                # 긴 문단을 문장 단위로 분할
-                sentences = paragraph.split('. ')
-                temp_chunk = ""
-                for sentence in sentences:
-                    if len(temp_chunk) + len(sentence) <= max_chunk_size:
-                        temp_chunk += sentence + ". "
-                    else:
-                        if temp_chunk:
-                            chunks.append(temp_chunk.strip())
-                        temp_chunk = sentence + ". "
-                
-                if temp_chunk:
-                    current_chunk = temp_chunk
-                continue
+        Args:
+            text: 분할할 텍스트
+            max_chunk_size: 최대 청크 크기
+            overlap: 앞 청크 끝에서 다시 포함할 최대 크기 (문장 단위)
             
-            if len(current_chunk) + len(paragraph) <= max_chunk_size:
-                current_chunk += paragraph + "\n\n"
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = paragraph + "\n\n"
-        
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-        
-        return chunks 
\ No newline at end of file
+        Returns:
+            [{"index", "start", "end", "text", "size"}] (text[start:end] == 청크)
+        """
+        count = estimate_tokens if CHUNK_SIZE_UNIT == "tokens" else None
+        return chunk_text(text, max_chunk_size, overlap, count)
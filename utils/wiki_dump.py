@@ -0,0 +1,269 @@
+"""
+위키백과 XML 덤프 수집 스크립트
+kowiki-*-pages-articles.xml(.bz2) 덤프를 iterparse로 한 문서씩 읽어(메모리 사용량 일정),
+제목/분류로 고른 문서를 위키텍스트 → 원본 텍스트로 변환하고 프로세스 풀에서 MCP/RAG 전처리까지 수행합니다.
+크롤링 없이 수천 개 문서를 한 번에 수집할 때 사용합니다.
+
+사용 예:
+    python utils/wiki_dump.py kowiki-latest-pages-articles.xml.bz2 --corpus
+    python utils/wiki_dump.py kowiki-latest-pages-articles.xml.bz2 --category 기계_학습 --limit 500
+    python utils/wiki_dump.py kowiki-latest-pages-articles.xml.bz2 --limit 100000 --store
+"""
+
+import sys
+import bz2
+import re
+import time
+import argparse
+from concurrent.futures import FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional
+from urllib.parse import unquote
+from xml.etree.ElementTree import iterparse
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.config import DATA_ROOT, DOC_STORE_DIR, INGEST_PROCESSES, WIKI_DOCUMENTS
+from utils.ingest import IngestPipeline
+from utils.wikitext import extract_categories, is_redirect, normalize_title
+
+ARTICLE_NAMESPACE = "0"
+REPORT_EVERY = 100            # 진행률 출력 간격 (처리한 문서 수)
+PENDING_PER_PROCESS = 4       # 프로세스당 최대 대기 작업 수 (덤프를 읽는 속도가 처리보다 빨라도 메모리 일정)
+
+_UNSAFE_FILENAME_CHARS = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+
+def open_dump(path: str):
+    """덤프 파일 열기 (.bz2면 압축을 풀면서 읽음)"""
+    if str(path).endswith(".bz2"):
+        return bz2.open(path, "rb")
+    return open(path, "rb")
+
+
+def _local_name(tag: str) -> str:
+    """'{네임스페이스}page' → 'page' (덤프 스키마 버전과 무관하게 처리)"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def iter_dump_pages(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    덤프의 <page>를 하나씩 읽어 반환 (읽은 요소는 바로 비워서 메모리 사용량 일정)
+
+    Args:
+        path: 덤프 파일 경로 (.xml 또는 .xml.bz2)
+
+    Yields:
+        {"id", "title", "ns", "redirect", "text"} (text는 마지막 판의 위키텍스트)
+    """
+    with open_dump(path) as f:
+        root = None
+        page: Dict[str, Any] = {}
+        depth = 0
+        for event, elem in iterparse(f, events=("start", "end")):
+            name = _local_name(elem.tag)
+            if event == "start":
+                if root is None:
+                    root = elem
+                elif name == "page":
+                    page = {"id": "", "title": "", "ns": ARTICLE_NAMESPACE, "redirect": False, "text": ""}
+                    depth = 0
+                elif name in ("revision", "contributor"):
+                    depth += 1
+                continue
+
+            if name in ("revision", "contributor"):
+                depth -= 1
+            elif name == "title":
+                page["title"] = elem.text or ""
+            elif name == "ns":
+                page["ns"] = (elem.text or "").strip()
+            elif name == "id" and depth == 0:
+                page["id"] = (elem.text or "").strip()
+            elif name == "redirect":
+                page["redirect"] = True
+            elif name == "text":
+                page["text"] = elem.text or ""
+            elif name == "page":
+                page["redirect"] = page["redirect"] or is_redirect(page["text"])
+                yield page
+                # 지금까지 읽은 문서 요소를 모두 버림
+                root.clear()
+
+
+def page_matches(page: Dict[str, Any], titles: Optional[set] = None,
+                 categories: Optional[set] = None) -> bool:
+    """
+    수집할 문서인지 확인 (일반 문서이고 넘겨주기가 아니며 제목/분류 조건 중 하나에 맞음)
+
+    Args:
+        page: iter_dump_pages가 반환한 문서
+        titles: 정규화된 제목 집합 (None이면 제목 조건 없음)
+        categories: 정규화된 분류 이름 집합 (None이면 분류 조건 없음, 문서에 직접 달린 분류만 비교)
+
+    Returns:
+        수집할 문서면 True
+    """
+    if page["ns"] != ARTICLE_NAMESPACE or page["redirect"]:
+        return False
+    if titles is None and categories is None:
+        return True
+    if titles and normalize_title(page["title"]) in titles:
+        return True
+    return bool(categories) and any(name in categories for name in extract_categories(page["text"]))
+
+
+def select_pages(pages: Iterable[Dict[str, Any]], titles: Optional[Iterable[str]] = None,
+                 categories: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+    """조건에 맞는 문서만 반환 (제목/분류는 normalize_title로 정규화하여 비교)"""
+    title_set = {normalize_title(title) for title in titles} if titles is not None else None
+    category_set = {normalize_title(name) for name in categories} if categories is not None else None
+    return (page for page in pages if page_matches(page, title_set, category_set))
+
+
+def safe_filename(title: str) -> str:
+    """문서 제목을 파일 이름으로 쓸 수 있게 변환 (경로 구분자 등은 '_'로)"""
+    return _UNSAFE_FILENAME_CHARS.sub("_", title).strip(" .") or "_"
+
+
+def corpus_titles() -> Dict[str, str]:
+    """WIKI_DOCUMENTS의 URL에서 {정규화된 제목: 키워드} 생성 (크롤링 결과와 같은 파일 이름 사용)"""
+    return {normalize_title(unquote(url.rsplit("/wiki/", 1)[-1])): keyword
+            for keyword, url in WIKI_DOCUMENTS.items()}
+
+
+def ingest_dump(path: str, pipeline: IngestPipeline, titles: Optional[Dict[str, str]] = None,
+                categories: Optional[Iterable[str]] = None, limit: Optional[int] = None,
+                report_every: int = REPORT_EVERY) -> Dict[str, Any]:
+    """
+    덤프를 읽으면서 고른 문서를 파이프라인에 제출하고 결과를 모음
+    대기 작업 수를 프로세스 수의 PENDING_PER_PROCESS배로 제한하여 덤프 크기와 무관하게 메모리 사용량이 일정합니다.
+
+    Args:
+        path: 덤프 파일 경로
+        pipeline: 변환/전처리 파이프라인
+        titles: {제목: 키워드} (키워드는 출력 파일 이름, 모두 찾으면 덤프를 끝까지 읽지 않음)
+        categories: 수집할 분류 이름
+        limit: 최대 수집 문서 수
+        report_every: 진행률 출력 간격
+
+    Returns:
+        {"scanned", "submitted", "written", "skipped", "failed": [키워드], "elapsed_s"}
+    """
+    keywords = {normalize_title(title): keyword for title, keyword in titles.items()} if titles else None
+    title_set = set(keywords) if keywords is not None else None
+    category_set = {normalize_title(name) for name in categories} if categories else None
+    max_pending = pipeline.processes * PENDING_PER_PROCESS
+
+    summary: Dict[str, Any] = {"scanned": 0, "submitted": 0, "written": 0, "skipped": 0, "failed": []}
+    pending: Dict[Any, str] = {}
+    started = time.perf_counter()
+
+    def _collect(futures) -> None:
+        for future in futures:
+            keyword = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"  - {keyword}: 오류 발생: {e}")
+                summary["failed"].append(keyword)
+                continue
+            summary["skipped" if result["skipped"] else "written"] += 1
+            done = summary["written"] + summary["skipped"] + len(summary["failed"])
+            if done % report_every == 0:
+                elapsed = time.perf_counter() - started
+                print(f"  - 처리 {done}개 (읽은 문서 {summary['scanned']}개), "
+                      f"{done / max(elapsed, 1e-9):.2f} docs/s")
+
+    for page in iter_dump_pages(path):
+        summary["scanned"] += 1
+        if not page_matches(page, title_set, category_set):
+            continue
+
+        title = normalize_title(page["title"])
+        keyword = keywords.get(title) if keywords else None
+        if keyword is None:
+            keyword = safe_filename(title)
+
+        if len(pending) >= max_pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            _collect(done)
+        pending[pipeline.submit_wikitext(keyword, title, page["text"])] = keyword
+        summary["submitted"] += 1
+
+        if keywords is not None and not category_set:
+            title_set.discard(title)
+            if not title_set:
+                break
+        if limit and summary["submitted"] >= limit:
+            break
+
+    _collect(list(pending))
+    summary["elapsed_s"] = time.perf_counter() - started
+    return summary
+
+
+def parse_args() -> argparse.Namespace:
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="위키백과 XML 덤프에서 문서 수집 및 처리")
+    parser.add_argument("dump", help="덤프 파일 경로 (kowiki-*-pages-articles.xml.bz2)")
+    parser.add_argument("--title", nargs="+", default=None, help="수집할 문서 제목 (공백은 _로)")
+    parser.add_argument("--category", nargs="+", default=None, help="수집할 분류 이름 (문서에 직접 달린 분류, 공백은 _로)")
+    parser.add_argument("--corpus", action="store_true",
+                        help="WIKI_DOCUMENTS 문서를 크롤링 결과와 같은 파일 이름으로 수집")
+    parser.add_argument("--limit", type=int, default=None, help="최대 수집 문서 수")
+    parser.add_argument("--processes", type=int, default=INGEST_PROCESSES,
+                        help=f"변환/전처리 프로세스 수 (기본값: {INGEST_PROCESSES})")
+    parser.add_argument("--output", default=str(DATA_ROOT),
+                        help="출력 루트 디렉토리 (raw/, mcp_docs/, rag_docs/ 생성)")
+    parser.add_argument("--store", nargs="?", const=str(DOC_STORE_DIR), default=None,
+                        help=f"문서별 파일 대신 세그먼트 저장소에 기록 (경로 생략 시 {DOC_STORE_DIR})")
+    return parser.parse_args()
+
+
+def main():
+    """덤프 수집 메인 실행"""
+    args = parse_args()
+
+    print("=== 위키백과 덤프 수집 ===")
+
+    if not Path(args.dump).exists():
+        print(f"❌ 덤프 파일이 없습니다: {args.dump}")
+        return
+
+    titles = None
+    if args.corpus or args.title:
+        titles = corpus_titles() if args.corpus else {}
+        for title in args.title or []:
+            titles.setdefault(normalize_title(title), safe_filename(normalize_title(title)))
+
+    output = Path(args.output)
+    dirs = (output / "raw", output / "mcp_docs", output / "rag_docs")
+
+    try:
+        with IngestPipeline(*dirs, processes=args.processes, store_dir=args.store) as pipeline:
+            print(f"\n📚 덤프 읽기: {args.dump} (프로세스 {pipeline.processes}개)")
+            summary = ingest_dump(args.dump, pipeline, titles=titles, categories=args.category,
+                                  limit=args.limit)
+
+        print("\n" + "=" * 60)
+        print("📋 처리 결과 요약")
+        print("=" * 60)
+        print(f"📖 읽은 문서: {summary['scanned']}개")
+        print(f"✅ 저장: {summary['written']}개 ({args.store or 'raw/, mcp_docs/, rag_docs/'})")
+        print(f"⏭️  건너뜀 (본문 없음): {summary['skipped']}개")
+        if summary["failed"]:
+            print(f"❌ 실패: {len(summary['failed'])}개 ({', '.join(summary['failed'][:20])})")
+        print(f"⏱️  {summary['elapsed_s']:.1f}s, "
+              f"{summary['submitted'] / max(summary['elapsed_s'], 1e-9):.2f} docs/s")
+        if titles is not None and not args.category and not args.limit and summary["submitted"] < len(titles):
+            print(f"⚠️  덤프에서 찾지 못한 제목: {len(titles) - summary['submitted']}개")
+
+    except KeyboardInterrupt:
+        print("\n\n⏹️  사용자에 의해 중단되었습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+위키텍스트 → Markdown+LaTeX 변환 모듈 (위키백과 XML 덤프용)
+WikiDataParser가 HTML에서 만드는 것과 같은 형식으로 변환합니다.
+- "# 제목" 다음에 섹션 헤더는 한 단계 내려서(== 개요 == → ### 개요) 출력
+- 틀({{...}}), 표({|...|}), 각주(<ref>), 주석, 파일/분류/언어 간 링크 제거
+- 내부/외부 링크는 보이는 글자만, 굵게/기울임은 **/*, 수식은 $...$ / $$...$$
+- 제외 섹션(같이 보기, 각주 등)은 utils/sections.py 규칙으로 건너뜀
+"""
+
+import re
+import html
+from typing import List, Tuple
+
+from utils.sections import should_skip_section, is_main_section
+
+# 수식/nowiki 내용을 다른 변환에서 보호하기 위한 자리표시자 (사용자 영역 문자)
+_PLACEHOLDER_OPEN, _PLACEHOLDER_CLOSE = '\uE000', '\uE001'
+_PLACEHOLDER = re.compile(_PLACEHOLDER_OPEN + r'(\d+)' + _PLACEHOLDER_CLOSE)
+
+_COMMENT = re.compile(r'<!--.*?-->', re.DOTALL)
+_REF = re.compile(r'<ref\b[^>]*/>|<ref\b[^>]*>.*?</ref\s*>', re.DOTALL | re.IGNORECASE)
+_DROPPED_BLOCKS = re.compile(r'<(syntaxhighlight|source|pre|gallery|timeline|score|graph|imagemap)\b[^>]*>.*?</\1\s*>',
+                             re.DOTALL | re.IGNORECASE)
+_MATH = re.compile(r'<math\b([^>]*)>(.*?)</math\s*>', re.DOTALL | re.IGNORECASE)
+_NOWIKI = re.compile(r'<nowiki\s*>(.*?)</nowiki\s*>', re.DOTALL | re.IGNORECASE)
+_LANG_TEMPLATE = re.compile(r'\{\{\s*(?:lang|llang|언어)\s*\|[^{}|]*\|([^{}|]*)\}\}', re.IGNORECASE)
+_NESTED_TOKEN = re.compile(r'\{\{|\}\}|^[ \t]*\{\||^[ \t]*\|\}', re.MULTILINE)
+_LINK_TOKEN = re.compile(r'\[\[|\]\]')
+_SPECIAL_LINK = re.compile(r'\s*:?\s*(?:파일|그림|file|image|분류|category|[a-z]{2,3}(?:-[a-z]+)*)\s*:', re.IGNORECASE)
+_PIPED_LINK = re.compile(r'\[\[([^\[\]|]*)\|([^\[\]]*)\]\]')
+_PLAIN_LINK = re.compile(r'\[\[([^\[\]|]*)\]\]')
+_EXTERNAL_LINK = re.compile(r'\[(?:https?:)?//[^\s\]]+\s+([^\]]*)\]')
+_BARE_EXTERNAL_LINK = re.compile(r'\[(?:https?:)?//[^\s\]]+\]')
+_MAGIC_WORD = re.compile(r'__[A-Z]+__')
+_LINE_BREAK = re.compile(r'<br\s*/?>', re.IGNORECASE)
+_HTML_TAG = re.compile(r'</?[A-Za-z][^>]*>')
+_BOLD_ITALIC = re.compile(r"'''''(.+?)'''''")
+_BOLD = re.compile(r"'''(.+?)'''")
+_ITALIC = re.compile(r"''(.+?)''")
+_QUOTES = re.compile(r"'{2,}")
+_HEADING = re.compile(r'^(={1,6})\s*(.+?)\s*\1\s*$')
+_LIST_ITEM = re.compile(r'^([*#]+)\s*(.*)$')
+_REDIRECT = re.compile(r'^\s*#\s*(?:넘겨주기|redirect)\b', re.IGNORECASE)
+_CATEGORY_LINK = re.compile(r'\[\[\s*(?:분류|category)\s*:\s*([^\]|]+)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+_CITATION = re.compile(r'\[\d+\]')
+_EXCESS_NEWLINES = re.compile(r'\n{3,}')
+
+
+def normalize_title(title: str) -> str:
+    """
+    문서 제목 정규화 (밑줄 → 공백, 연속 공백 정리, 첫 글자 대문자: 미디어위키 규칙)
+
+    Args:
+        title: 문서 제목 또는 URL 경로의 제목
+
+    Returns:
+        정규화된 제목
+    """
+    title = ' '.join(title.replace('_', ' ').split())
+    return title[:1].upper() + title[1:]
+
+
+def is_redirect(wikitext: str) -> bool:
+    """넘겨주기(#넘겨주기 / #REDIRECT) 문서인지 확인"""
+    return bool(_REDIRECT.match(wikitext))
+
+
+def extract_categories(wikitext: str) -> List[str]:
+    """
+    본문에 직접 달린 분류 목록 (정규화된 이름)
+
+    Args:
+        wikitext: 위키텍스트
+
+    Returns:
+        분류 이름 리스트
+    """
+    return [normalize_title(name) for name in _CATEGORY_LINK.findall(wikitext)]
+
+
+def _remove_nested(text: str) -> str:
+    """
+    틀({{...}})과 표({|...|})를 중첩을 고려하여 제거
+    (닫히지 않은 여는 기호부터는 원문 그대로 둠)
+    """
+    parts = []
+    stack: List[str] = []
+    keep_from = 0
+    outer_start = 0
+    position = 0
+    while True:
+        match = _NESTED_TOKEN.search(text, position)
+        if not match:
+            break
+        token = match.group().strip()
+        position = match.end()
+
+        if token in ('{{', '{|'):
+            if not stack:
+                parts.append(text[keep_from:match.start()])
+                outer_start = match.start()
+            stack.append(token)
+        elif token == '}}':
+            if stack and stack[-1] == '{{':
+                stack.pop()
+                if not stack:
+                    keep_from = match.end()
+        elif stack and stack[-1] == '{|':
+            stack.pop()
+            if not stack:
+                keep_from = match.end()
+        elif stack:
+            # 틀 안의 줄 시작 '|}}'는 표 닫기가 아니라 빈 인자 + 틀 닫기
+            position = match.end() - 1
+
+    parts.append(text[outer_start:] if stack else text[keep_from:])
+    return "".join(parts)
+
+
+def _remove_special_links(text: str) -> str:
+    """파일/분류/언어 간 링크를 캡션 안의 중첩 링크까지 포함하여 제거"""
+    parts = []
+    depth = 0
+    keep_from = 0
+    outer_start = 0
+    for match in _LINK_TOKEN.finditer(text):
+        if match.group() == '[[':
+            if depth == 0:
+                outer_start = match.start()
+            depth += 1
+        elif depth:
+            depth -= 1
+            if depth == 0 and _SPECIAL_LINK.match(text, outer_start + 2):
+                parts.append(text[keep_from:outer_start])
+                keep_from = match.end()
+    parts.append(text[keep_from:])
+    return "".join(parts)
+
+
+def _link_text(match) -> str:
+    """[[대상|보이는 글자]] → 보이는 글자 (비어 있으면 괄호 설명을 뺀 대상)"""
+    label = match.group(2).strip()
+    if label:
+        return label
+    return re.sub(r'\s*\([^)]*\)$', '', match.group(1)).strip().lstrip(':')
+
+
+def _convert_inline(text: str, emphasis: bool = True) -> str:
+    """문단/목록/헤더 한 줄의 인라인 문법 변환"""
+    if emphasis:
+        text = _BOLD_ITALIC.sub(r'***\1***', text)
+        text = _BOLD.sub(r'**\1**', text)
+        text = _ITALIC.sub(r'*\1*', text)
+    text = _QUOTES.sub('', text)
+    text = _LINE_BREAK.sub(' ', text)
+    text = _HTML_TAG.sub('', text)
+    text = html.unescape(text)
+    return _CITATION.sub('', _WHITESPACE.sub(' ', text).strip())
+
+
+def wikitext_to_markdown(wikitext: str, title: str) -> str:
+    """
+    위키텍스트를 Markdown+LaTeX 본문으로 변환 (WikiDataParser.parse_wikipedia_html의 본문과 같은 형식)
+
+    Args:
+        wikitext: 문서 위키텍스트
+        title: 문서 제목
+
+    Returns:
+        Markdown 형식의 본문 텍스트 ("# 제목"으로 시작)
+    """
+    protected: List[Tuple[str, str]] = []
+
+    def _protect(kind: str, content: str) -> str:
+        protected.append((kind, content))
+        return f"{_PLACEHOLDER_OPEN}{len(protected) - 1}{_PLACEHOLDER_CLOSE}"
+
+    text = _COMMENT.sub('', wikitext)
+    text = _NOWIKI.sub(lambda m: _protect("text", html.unescape(m.group(1))), text)
+    text = _MATH.sub(lambda m: _protect("block" if 'block' in m.group(1).lower() else "math",
+                                        ' '.join(m.group(2).split())), text)
+    text = _REF.sub('', text)
+    text = _DROPPED_BLOCKS.sub('', text)
+    text = _LANG_TEMPLATE.sub(r'\1', text)
+    text = _remove_nested(text)
+    text = _remove_special_links(text)
+    text = _PIPED_LINK.sub(_link_text, text)
+    text = _PLAIN_LINK.sub(lambda m: m.group(1).strip().lstrip(':'), text)
+    text = _EXTERNAL_LINK.sub(r'\1', text)
+    text = _BARE_EXTERNAL_LINK.sub('', text)
+    text = _MAGIC_WORD.sub('', text)
+
+    def _restore(line: str) -> str:
+        def _replace(match) -> str:
+            kind, content = protected[int(match.group(1))]
+            return content if kind == "text" else f"${content}$"
+        return _PLACEHOLDER.sub(_replace, line)
+
+    parts = [f"# {title}\n\n"]
+    paragraph: List[str] = []
+    list_items: List[str] = []
+    list_ordered = False
+    skip_content = False
+
+    def _flush_paragraph():
+        if paragraph:
+            para_text = _restore(_convert_inline(' '.join(paragraph)))
+            if not skip_content and len(para_text.strip()) > 10:
+                parts.append(f"{para_text}\n\n")
+            paragraph.clear()
+
+    def _flush_list():
+        if list_items:
+            if not skip_content:
+                parts.append("".join(list_items) + "\n\n")
+            list_items.clear()
+
+    for line in text.split('\n'):
+        stripped = line.strip()
+
+        heading = _HEADING.match(stripped)
+        if heading:
+            _flush_paragraph()
+            _flush_list()
+            header_text = _restore(_convert_inline(heading.group(2), emphasis=False))
+            header_lower = header_text.lower()
+            # 제외할 섹션인지 확인 (메인 섹션이면 다시 포함)
+            if should_skip_section(header_lower):
+                skip_content = True
+                continue
+            elif is_main_section(header_lower):
+                skip_content = False
+            level = len(heading.group(1)) + 1   # 문서 제목이 # 이므로 한 단계 내림
+            if not skip_content and level <= 6 and header_text:
+                parts.append(f"{'#' * level} {header_text}\n\n")
+            continue
+
+        item = _LIST_ITEM.match(stripped)
+        if item:
+            _flush_paragraph()
+            ordered = item.group(1).endswith('#')
+            if list_items and ordered != list_ordered:
+                _flush_list()
+            list_ordered = ordered
+            item_text = _restore(_convert_inline(item.group(2)))
+            if item_text:
+                marker = f"{len(list_items) + 1}." if ordered else "-"
+                list_items.append(f"{marker} {item_text}\n")
+            continue
+
+        # 들여쓰기(:)와 정의 목록(;)은 일반 문단으로 처리
+        content = stripped.lstrip(':;').strip()
+        block = _PLACEHOLDER.fullmatch(content)
+        if block and protected[int(block.group(1))][0] in ("math", "block"):
+            _flush_paragraph()
+            _flush_list()
+            if not skip_content:
+                parts.append(f"$$\n{protected[int(block.group(1))][1]}\n$$\n\n")
+            continue
+
+        if not content:
+            _flush_paragraph()
+            _flush_list()
+            continue
+
+        _flush_list()
+        paragraph.append(content)
+
+    _flush_paragraph()
+    _flush_list()
+
+    markdown_text = "".join(parts)
+    markdown_text = _EXCESS_NEWLINES.sub('\n\n', markdown_text)
+    markdown_text = _CITATION.sub('', markdown_text)
+    return markdown_text.strip()
+
+
+def to_raw_document(title: str, wikitext: str) -> str:
+    """
+    덤프 문서 하나를 raw 폴더의 원본 텍스트 형식("제목: ...\\n\\n본문")으로 변환
+
+    Args:
+        title: 문서 제목
+        wikitext: 위키텍스트
+
+    Returns:
+        원본 텍스트
+    """
+    return f"제목: {title}\n\n{wikitext_to_markdown(wikitext, title)}"